@@ -0,0 +1,79 @@
+"""
+CSR GPIO bank with atomic bit updates, shared by the SoC build
+(uartWishBoneCrsLed.py --gpio WIDTH) and the testbench (testBenchLedPeripheral.py).
+
+LedPeripheral is one CSRStorage bit: changing one bit of a wider bank that
+way is a read-modify-write, two bridge round trips, and two masters (host and
+CPU) doing it at the same time can undo each other's change. Here every
+update is a single register write, applied in the bus cycle it arrives in:
+
+  out     rw  output bank; a write replaces every bit
+  set     w   out |= value
+  clr     w   out &= ~value
+  toggle  w   out ^= value
+  masked  w   bits [2w-1:w] mask, [w-1:0] value: out = (out & ~mask) | (value & mask)
+  in      r   inputs, two-flop synchronised (only with `inputs`)
+
+The bus serialises the writes of different masters, so no update is lost.
+`masked` holds mask and value in one 32-bit word, hence at most 16 bits per
+bank.
+"""
+
+from migen import *
+from migen.genlib.cdc import MultiReg
+from litex.soc.interconnect.csr import AutoCSR, CSR, CSRStatus, CSRStorage
+
+# Widest bank: mask and value of `masked` share one 32-bit CSR
+MAX_WIDTH = 16
+
+
+# Create:
+#+--------------------------------------------+
+#|   GpioPeripheral (AutoCSR peripheral)      |
+#|     - out (rw), set / clr / toggle (w)     |
+#|     - masked (w): mask << width | value    |
+#|     - in (r): synchronised inputs          |
+#+--------------------------------------------+
+class GpioPeripheral(Module, AutoCSR):
+    """`width` outputs with SET / CLR / TOGGLE / masked writes, optional sampled inputs.
+
+    inputs : Signal (e.g. user_btn_n) sampled into `in` through a MultiReg, or None
+
+    `out` is the output bank (drive pins from it); it is not cacheable by the
+    host shadow cache, since set / clr / toggle / masked change it too.
+    """
+
+    def __init__(self, width=8, inputs=None):
+        if not 1 <= width <= MAX_WIDTH:
+            raise ValueError(f"GPIO width {width}: 1..{MAX_WIDTH} bits")
+        self.width = width
+        self.out   = Signal(width)
+
+        self._out    = CSRStorage(width, name="out", write_from_dev=True, description="Output bank")
+        self._set    = CSR(width, name="set")       # Plain CSRs: applied in the bus write cycle
+        self._clr    = CSR(width, name="clr")
+        self._toggle = CSR(width, name="toggle")
+        self._masked = CSR(2 * width, name="masked")  # mask << width | value
+
+        # # #
+
+        out   = self._out.storage
+        value = self._masked.r[:width]
+        mask  = self._masked.r[width:2 * width]
+        self.comb += [
+            self._out.we.eq(self._set.re | self._clr.re | self._toggle.re | self._masked.re),
+            If(self._set.re,
+                self._out.dat_w.eq(out | self._set.r),
+            ).Elif(self._clr.re,
+                self._out.dat_w.eq(out & ~self._clr.r),
+            ).Elif(self._toggle.re,
+                self._out.dat_w.eq(out ^ self._toggle.r),
+            ).Else(
+                self._out.dat_w.eq((out & ~mask) | (value & mask)),
+            ),
+            self.out.eq(out),
+        ]
+
+        if inputs is not None:
+            self._in = CSRStatus(len(inputs), name="in", description="Inputs, two-flop synchronised")
+            self.specials += MultiReg(inputs, self._in.status)
@@ -0,0 +1,87 @@
+"""
+Address map of the CSR LED SoC (uartWishBoneCrsLed.py).
+
+Plain constants with no Migen / LiteX imports, so testbenches and host
+scripts can use the register addresses without elaborating (or importing)
+the SoC.
+
+  Address = CSR_BASE + CSR_MAP[peripheral] × CSR_PAGING
+  ctrl        : location 0 → 0x40000000
+  led_control : location 1 → 0x40000400
+  perf_*      : location 2 → 0x40000800  (--perf-counters)
+  la_*        : location 3 → 0x40000C00  (--analyzer, buffer at LA_MAP["la"])
+  gpio_*      : location 4 → 0x40001000  (--gpio WIDTH)
+  seq_*       : location 5 → 0x40001400  (--sequencer DEPTH, table at SEQ_MAP["seq"])
+  ev_*        : location 6 → 0x40001800  (--events DEPTH, read window at EV_MAP["ev"])
+  notify_*    : location 7 → 0x40001C00  (--notify)
+  sram        : 0x40040000, --sram-size bytes of block RAM
+
+  With --wishbone-regs the LED register is a Wishbone-native register file:
+  led_control : REGS_MAP["led"] → 0x40010000
+"""
+
+# Default sys clock: the 10 MHz oscillator. Builds with --sys-clk-freq run sys
+# from the PLL instead (commonLib/gatemateCrg.py); csr.json then reports the
+# actual value as constant config_clock_frequency
+CLK_FREQ = int(10e6)
+BAUDRATE = 115200
+
+# CSR region base address and size of one CSR location slot
+CSR_BASE   = 0x40000000
+CSR_PAGING = 0x400
+
+# Optional on-chip SRAM (sram_size > 0), block RAM on the SoC bus. The region
+# is aligned to SRAM_MAX_SIZE, so any power-of-two size up to it decodes
+SRAM_BASE     = 0x40040000
+SRAM_MAX_SIZE = 0x20000
+
+# Merged over SoCMini.mem_map by Top
+MEM_MAP = {
+    "csr":  CSR_BASE,
+    "sram": SRAM_BASE,
+}
+
+# CSR location slot per peripheral: address = CSR_BASE + location × CSR_PAGING
+CSR_MAP = {
+    "ctrl":   0,   # 0x40000000
+    "led":    1,   # 0x40000400
+    "perf":   2,   # 0x40000800, only with perf_counters=True
+    "la":     3,   # 0x40000C00, only with analyzer=True
+    "gpio":   4,   # 0x40001000, only with gpio > 0
+    "seq":    5,   # 0x40001400, only with sequencer > 0
+    "ev":     6,   # 0x40001800, only with events > 0
+    "notify": 7,   # 0x40001C00, only with notify=True
+}
+
+# Wishbone-native register files (wishbone_regs=True), placed just above
+# the 64 KB CSR window. Each region is only as large as its registers.
+REGS_MAP = {
+    "led": 0x40010000,
+}
+
+# Logic analyzer capture buffer (analyzer=True, commonLib/logicAnalyzer.py),
+# read-only, LA_DEPTH entries of one or more 32-bit words
+LA_MAP = {
+    "la": 0x40020000,
+}
+LA_DEPTH = 1024
+
+# Pattern sequencer table (sequencer=DEPTH, commonLib/patternSequencer.py),
+# two words (value, duration) per entry; bit 0 of its SEQ_WIDTH outputs
+# lights the LED
+SEQ_MAP = {
+    "seq": 0x40030000,
+}
+SEQ_WIDTH     = 8
+SEQ_MAX_DEPTH = 4096
+
+# Input event FIFO (events=DEPTH, commonLib/eventFifo.py) on user_btn_n:
+# every read in the window returns the next FIFO word
+EV_MAP = {
+    "ev": 0x40038000,
+}
+EV_MAX_DEPTH = 4096
+
+# Register addresses of the default (CSR) build: ledRegs.py, the reference map.
+# The --wishbone-regs layout, for testbenches that model both:
+ADDR_LED_WB = REGS_MAP["led"]           # 0x40010000
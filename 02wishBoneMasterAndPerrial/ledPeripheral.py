@@ -0,0 +1,28 @@
+"""
+CSR LED peripheral, shared by the SoC build (uartWishBoneCrsLed.py) and the
+testbench (testBenchLedPeripheral.py).
+
+Kept apart from the SoC so users of the peripheral only import Migen and the
+LiteX CSR classes, not SoCMini / Builder / the board platform.
+"""
+
+from migen import *
+from litex.soc.interconnect.csr import AutoCSR, CSRStorage
+
+
+# Create:
+#+--------------------------------------------+
+#|   LedPeripheral (AutoCSR peripheral)       |
+#|     - 1-bit CSR storage register           |
+#|     - "control" register at 0x40000400     |
+#|     - bit 0 -> LED (active low)            |
+#+--------------------------------------------+
+class LedPeripheral(Module, AutoCSR):
+    """CSR-mapped LED peripheral. Bit 0 of the control register drives the LED."""
+
+    def __init__(self, led):
+        # 1-bit CSR register, directly accessible from the host via litex_server
+        self.control = CSRStorage(1, name="control", description="LED control (bit 0: 1=on, 0=off)")
+
+        # Active-low LED: reg=1 → pin driven low → LED on
+        self.comb += led.eq(~self.control.storage)
@@ -0,0 +1,314 @@
+"""
+Register map generated by commonLib/csrGen.py from csr.json; do not edit.
+
+Every build writes its map to build/; the copy beside the build script
+is the reference map, rewritten only with --reference-map. See
+commonLib/csrAccess.py for the API.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from commonLib.csrAccess import Field, Register, RegisterMap
+
+# Memory regions
+CSR_BASE = 0x40000000
+CSR_SIZE = 0x10000
+LA_BASE = 0x40020000
+LA_SIZE = 0x1000
+SEQ_BASE = 0x40030000
+SEQ_SIZE = 0x800
+EV_BASE = 0x40038000
+EV_SIZE = 0x400
+
+# Register addresses
+CTRL_RESET_ADDR              = 0x40000000
+CTRL_SCRATCH_ADDR            = 0x40000004
+CTRL_BUS_ERRORS_ADDR         = 0x40000008
+LED_CONTROL_ADDR             = 0x40000400
+PERF_CONTROL_ADDR            = 0x40000800
+PERF_CYCLES_ADDR             = 0x40000804
+PERF_BRIDGE_READS_ADDR       = 0x4000080c
+PERF_BRIDGE_WRITES_ADDR      = 0x40000810
+PERF_BRIDGE_BUSY_CYCLES_ADDR = 0x40000814
+PERF_BRIDGE_LATENCY0_ADDR    = 0x4000081c
+PERF_BRIDGE_LATENCY1_ADDR    = 0x40000820
+PERF_BRIDGE_LATENCY2_ADDR    = 0x40000824
+PERF_BRIDGE_LATENCY3_ADDR    = 0x40000828
+PERF_BRIDGE_LATENCY4_ADDR    = 0x4000082c
+PERF_BRIDGE_LATENCY5_ADDR    = 0x40000830
+PERF_BRIDGE_LATENCY6_ADDR    = 0x40000834
+PERF_BRIDGE_LATENCY7_ADDR    = 0x40000838
+PERF_BRIDGE_RX_BYTES_ADDR    = 0x4000083c
+PERF_BRIDGE_TX_BYTES_ADDR    = 0x40000840
+LA_ARM_ADDR                  = 0x40000c00
+LA_STOP_ADDR                 = 0x40000c04
+LA_TRIGGER_MASK_ADDR         = 0x40000c08
+LA_TRIGGER_VALUE_ADDR        = 0x40000c0c
+LA_POST_TRIGGER_ADDR         = 0x40000c10
+LA_STATUS_ADDR               = 0x40000c14
+LA_WRITE_PTR_ADDR            = 0x40000c18
+LA_COUNT_ADDR                = 0x40000c1c
+LA_TRIGGER_ENTRY_ADDR        = 0x40000c20
+GPIO_OUT_ADDR                = 0x40001000
+GPIO_SET_ADDR                = 0x40001004
+GPIO_CLR_ADDR                = 0x40001008
+GPIO_TOGGLE_ADDR             = 0x4000100c
+GPIO_MASKED_ADDR             = 0x40001010
+GPIO_IN_ADDR                 = 0x40001014
+SEQ_LENGTH_ADDR              = 0x40001400
+SEQ_LOOPS_ADDR               = 0x40001404
+SEQ_IDLE_ADDR                = 0x40001408
+SEQ_START_ADDR               = 0x4000140c
+SEQ_STOP_ADDR                = 0x40001410
+SEQ_STATUS_ADDR              = 0x40001414
+SEQ_ENTRY_ADDR               = 0x40001418
+SEQ_LOOP_COUNT_ADDR          = 0x4000141c
+EV_RISE_ADDR                 = 0x40001800
+EV_FALL_ADDR                 = 0x40001804
+EV_LEVEL_ADDR                = 0x40001808
+EV_MAX_LEVEL_ADDR            = 0x4000180c
+EV_EVENTS_ADDR               = 0x40001810
+EV_OVERFLOW_ADDR             = 0x40001814
+EV_TIME_ADDR                 = 0x40001818
+EV_CLEAR_ADDR                = 0x4000181c
+NOTIFY_ENABLE_ADDR           = 0x40001c00
+NOTIFY_MASK_ADDR             = 0x40001c04
+NOTIFY_STATUS_ADDR           = 0x40001c08
+NOTIFY_FRAMES_ADDR           = 0x40001c0c
+
+# Field masks and offsets
+CTRL_RESET_SOC_RST_MASK = 0x00000001
+CTRL_RESET_SOC_RST_OFFSET = 0
+CTRL_RESET_CPU_RST_MASK = 0x00000002
+CTRL_RESET_CPU_RST_OFFSET = 1
+CTRL_SCRATCH_SCRATCH_MASK = 0xffffffff
+CTRL_SCRATCH_SCRATCH_OFFSET = 0
+CTRL_BUS_ERRORS_BUS_ERRORS_MASK = 0xffffffff
+CTRL_BUS_ERRORS_BUS_ERRORS_OFFSET = 0
+LED_CONTROL_CONTROL_MASK = 0x00000001
+LED_CONTROL_CONTROL_OFFSET = 0
+PERF_CONTROL_CONTROL_MASK = 0x00000003
+PERF_CONTROL_CONTROL_OFFSET = 0
+PERF_CYCLES_CYCLES_MASK = 0xffffffffffffffff
+PERF_CYCLES_CYCLES_OFFSET = 0
+PERF_BRIDGE_READS_BRIDGE_READS_MASK = 0xffffffff
+PERF_BRIDGE_READS_BRIDGE_READS_OFFSET = 0
+PERF_BRIDGE_WRITES_BRIDGE_WRITES_MASK = 0xffffffff
+PERF_BRIDGE_WRITES_BRIDGE_WRITES_OFFSET = 0
+PERF_BRIDGE_BUSY_CYCLES_BRIDGE_BUSY_CYCLES_MASK = 0xffffffffffffffff
+PERF_BRIDGE_BUSY_CYCLES_BRIDGE_BUSY_CYCLES_OFFSET = 0
+PERF_BRIDGE_LATENCY0_BRIDGE_LATENCY0_MASK = 0xffffffff
+PERF_BRIDGE_LATENCY0_BRIDGE_LATENCY0_OFFSET = 0
+PERF_BRIDGE_LATENCY1_BRIDGE_LATENCY1_MASK = 0xffffffff
+PERF_BRIDGE_LATENCY1_BRIDGE_LATENCY1_OFFSET = 0
+PERF_BRIDGE_LATENCY2_BRIDGE_LATENCY2_MASK = 0xffffffff
+PERF_BRIDGE_LATENCY2_BRIDGE_LATENCY2_OFFSET = 0
+PERF_BRIDGE_LATENCY3_BRIDGE_LATENCY3_MASK = 0xffffffff
+PERF_BRIDGE_LATENCY3_BRIDGE_LATENCY3_OFFSET = 0
+PERF_BRIDGE_LATENCY4_BRIDGE_LATENCY4_MASK = 0xffffffff
+PERF_BRIDGE_LATENCY4_BRIDGE_LATENCY4_OFFSET = 0
+PERF_BRIDGE_LATENCY5_BRIDGE_LATENCY5_MASK = 0xffffffff
+PERF_BRIDGE_LATENCY5_BRIDGE_LATENCY5_OFFSET = 0
+PERF_BRIDGE_LATENCY6_BRIDGE_LATENCY6_MASK = 0xffffffff
+PERF_BRIDGE_LATENCY6_BRIDGE_LATENCY6_OFFSET = 0
+PERF_BRIDGE_LATENCY7_BRIDGE_LATENCY7_MASK = 0xffffffff
+PERF_BRIDGE_LATENCY7_BRIDGE_LATENCY7_OFFSET = 0
+PERF_BRIDGE_RX_BYTES_BRIDGE_RX_BYTES_MASK = 0xffffffff
+PERF_BRIDGE_RX_BYTES_BRIDGE_RX_BYTES_OFFSET = 0
+PERF_BRIDGE_TX_BYTES_BRIDGE_TX_BYTES_MASK = 0xffffffff
+PERF_BRIDGE_TX_BYTES_BRIDGE_TX_BYTES_OFFSET = 0
+LA_ARM_ARM_MASK = 0x00000001
+LA_ARM_ARM_OFFSET = 0
+LA_STOP_STOP_MASK = 0x00000001
+LA_STOP_STOP_OFFSET = 0
+LA_TRIGGER_MASK_TRIGGER_MASK_MASK = 0x0000007f
+LA_TRIGGER_MASK_TRIGGER_MASK_OFFSET = 0
+LA_TRIGGER_VALUE_TRIGGER_VALUE_MASK = 0x0000007f
+LA_TRIGGER_VALUE_TRIGGER_VALUE_OFFSET = 0
+LA_POST_TRIGGER_POST_TRIGGER_MASK = 0x000007ff
+LA_POST_TRIGGER_POST_TRIGGER_OFFSET = 0
+LA_STATUS_STATUS_MASK = 0x00000007
+LA_STATUS_STATUS_OFFSET = 0
+LA_WRITE_PTR_WRITE_PTR_MASK = 0x000003ff
+LA_WRITE_PTR_WRITE_PTR_OFFSET = 0
+LA_COUNT_COUNT_MASK = 0x000007ff
+LA_COUNT_COUNT_OFFSET = 0
+LA_TRIGGER_ENTRY_TRIGGER_ENTRY_MASK = 0x000003ff
+LA_TRIGGER_ENTRY_TRIGGER_ENTRY_OFFSET = 0
+GPIO_OUT_OUT_MASK = 0x000000ff
+GPIO_OUT_OUT_OFFSET = 0
+GPIO_SET_SET_MASK = 0x000000ff
+GPIO_SET_SET_OFFSET = 0
+GPIO_CLR_CLR_MASK = 0x000000ff
+GPIO_CLR_CLR_OFFSET = 0
+GPIO_TOGGLE_TOGGLE_MASK = 0x000000ff
+GPIO_TOGGLE_TOGGLE_OFFSET = 0
+GPIO_MASKED_MASKED_MASK = 0x0000ffff
+GPIO_MASKED_MASKED_OFFSET = 0
+GPIO_IN_IN_MASK = 0x00000001
+GPIO_IN_IN_OFFSET = 0
+SEQ_LENGTH_LENGTH_MASK = 0x000001ff
+SEQ_LENGTH_LENGTH_OFFSET = 0
+SEQ_LOOPS_LOOPS_MASK = 0x0000ffff
+SEQ_LOOPS_LOOPS_OFFSET = 0
+SEQ_IDLE_IDLE_MASK = 0x000000ff
+SEQ_IDLE_IDLE_OFFSET = 0
+SEQ_START_START_MASK = 0x00000001
+SEQ_START_START_OFFSET = 0
+SEQ_STOP_STOP_MASK = 0x00000001
+SEQ_STOP_STOP_OFFSET = 0
+SEQ_STATUS_STATUS_MASK = 0x00000003
+SEQ_STATUS_STATUS_OFFSET = 0
+SEQ_ENTRY_ENTRY_MASK = 0x000000ff
+SEQ_ENTRY_ENTRY_OFFSET = 0
+SEQ_LOOP_COUNT_LOOP_COUNT_MASK = 0x0000ffff
+SEQ_LOOP_COUNT_LOOP_COUNT_OFFSET = 0
+EV_RISE_RISE_MASK = 0x00000001
+EV_RISE_RISE_OFFSET = 0
+EV_FALL_FALL_MASK = 0x00000001
+EV_FALL_FALL_OFFSET = 0
+EV_LEVEL_LEVEL_MASK = 0x000003ff
+EV_LEVEL_LEVEL_OFFSET = 0
+EV_MAX_LEVEL_MAX_LEVEL_MASK = 0x000003ff
+EV_MAX_LEVEL_MAX_LEVEL_OFFSET = 0
+EV_EVENTS_EVENTS_MASK = 0xffffffff
+EV_EVENTS_EVENTS_OFFSET = 0
+EV_OVERFLOW_OVERFLOW_MASK = 0xffffffff
+EV_OVERFLOW_OVERFLOW_OFFSET = 0
+EV_TIME_TIME_MASK = 0xffffffff
+EV_TIME_TIME_OFFSET = 0
+EV_CLEAR_CLEAR_MASK = 0x00000001
+EV_CLEAR_CLEAR_OFFSET = 0
+NOTIFY_ENABLE_ENABLE_MASK = 0x00000001
+NOTIFY_ENABLE_ENABLE_OFFSET = 0
+NOTIFY_MASK_MASK_MASK = 0x0000003f
+NOTIFY_MASK_MASK_OFFSET = 0
+NOTIFY_STATUS_STATUS_MASK = 0x0000003f
+NOTIFY_STATUS_STATUS_OFFSET = 0
+NOTIFY_FRAMES_FRAMES_MASK = 0xffffffff
+NOTIFY_FRAMES_FRAMES_OFFSET = 0
+
+
+class LedRegs(RegisterMap):
+    registers = (
+        Register('ctrl_reset', 0x40000000, size=1, access='rw',
+                 fields=(Field('soc_rst', 0, 1), Field('cpu_rst', 1, 1),)),
+        Register('ctrl_scratch', 0x40000004, size=1, access='rw', cacheable=True,
+                 fields=(Field('scratch', 0, 32),)),
+        Register('ctrl_bus_errors', 0x40000008, size=1, access='ro',
+                 fields=(Field('bus_errors', 0, 32),)),
+        Register('led_control', 0x40000400, size=1, access='rw', cacheable=True,
+                 fields=(Field('control', 0, 1),)),
+        Register('perf_control', 0x40000800, size=1, access='rw',
+                 fields=(Field('control', 0, 2),)),
+        Register('perf_cycles', 0x40000804, size=2, access='ro',
+                 fields=(Field('cycles', 0, 64),)),
+        Register('perf_bridge_reads', 0x4000080c, size=1, access='ro',
+                 fields=(Field('bridge_reads', 0, 32),)),
+        Register('perf_bridge_writes', 0x40000810, size=1, access='ro',
+                 fields=(Field('bridge_writes', 0, 32),)),
+        Register('perf_bridge_busy_cycles', 0x40000814, size=2, access='ro',
+                 fields=(Field('bridge_busy_cycles', 0, 64),)),
+        Register('perf_bridge_latency0', 0x4000081c, size=1, access='ro',
+                 fields=(Field('bridge_latency0', 0, 32),)),
+        Register('perf_bridge_latency1', 0x40000820, size=1, access='ro',
+                 fields=(Field('bridge_latency1', 0, 32),)),
+        Register('perf_bridge_latency2', 0x40000824, size=1, access='ro',
+                 fields=(Field('bridge_latency2', 0, 32),)),
+        Register('perf_bridge_latency3', 0x40000828, size=1, access='ro',
+                 fields=(Field('bridge_latency3', 0, 32),)),
+        Register('perf_bridge_latency4', 0x4000082c, size=1, access='ro',
+                 fields=(Field('bridge_latency4', 0, 32),)),
+        Register('perf_bridge_latency5', 0x40000830, size=1, access='ro',
+                 fields=(Field('bridge_latency5', 0, 32),)),
+        Register('perf_bridge_latency6', 0x40000834, size=1, access='ro',
+                 fields=(Field('bridge_latency6', 0, 32),)),
+        Register('perf_bridge_latency7', 0x40000838, size=1, access='ro',
+                 fields=(Field('bridge_latency7', 0, 32),)),
+        Register('perf_bridge_rx_bytes', 0x4000083c, size=1, access='ro',
+                 fields=(Field('bridge_rx_bytes', 0, 32),)),
+        Register('perf_bridge_tx_bytes', 0x40000840, size=1, access='ro',
+                 fields=(Field('bridge_tx_bytes', 0, 32),)),
+        Register('la_arm', 0x40000c00, size=1, access='rw',
+                 fields=(Field('arm', 0, 1),)),
+        Register('la_stop', 0x40000c04, size=1, access='rw',
+                 fields=(Field('stop', 0, 1),)),
+        Register('la_trigger_mask', 0x40000c08, size=1, access='rw', cacheable=True,
+                 fields=(Field('trigger_mask', 0, 7),)),
+        Register('la_trigger_value', 0x40000c0c, size=1, access='rw', cacheable=True,
+                 fields=(Field('trigger_value', 0, 7),)),
+        Register('la_post_trigger', 0x40000c10, size=1, access='rw', cacheable=True,
+                 fields=(Field('post_trigger', 0, 11),)),
+        Register('la_status', 0x40000c14, size=1, access='ro',
+                 fields=(Field('status', 0, 3),)),
+        Register('la_write_ptr', 0x40000c18, size=1, access='ro',
+                 fields=(Field('write_ptr', 0, 10),)),
+        Register('la_count', 0x40000c1c, size=1, access='ro',
+                 fields=(Field('count', 0, 11),)),
+        Register('la_trigger_entry', 0x40000c20, size=1, access='ro',
+                 fields=(Field('trigger_entry', 0, 10),)),
+        Register('gpio_out', 0x40001000, size=1, access='rw',
+                 fields=(Field('out', 0, 8),)),
+        Register('gpio_set', 0x40001004, size=1, access='rw',
+                 fields=(Field('set', 0, 8),)),
+        Register('gpio_clr', 0x40001008, size=1, access='rw',
+                 fields=(Field('clr', 0, 8),)),
+        Register('gpio_toggle', 0x4000100c, size=1, access='rw',
+                 fields=(Field('toggle', 0, 8),)),
+        Register('gpio_masked', 0x40001010, size=1, access='rw',
+                 fields=(Field('masked', 0, 16),)),
+        Register('gpio_in', 0x40001014, size=1, access='ro',
+                 fields=(Field('in', 0, 1),)),
+        Register('seq_length', 0x40001400, size=1, access='rw', cacheable=True,
+                 fields=(Field('length', 0, 9),)),
+        Register('seq_loops', 0x40001404, size=1, access='rw', cacheable=True,
+                 fields=(Field('loops', 0, 16),)),
+        Register('seq_idle', 0x40001408, size=1, access='rw', cacheable=True,
+                 fields=(Field('idle', 0, 8),)),
+        Register('seq_start', 0x4000140c, size=1, access='rw',
+                 fields=(Field('start', 0, 1),)),
+        Register('seq_stop', 0x40001410, size=1, access='rw',
+                 fields=(Field('stop', 0, 1),)),
+        Register('seq_status', 0x40001414, size=1, access='ro',
+                 fields=(Field('status', 0, 2),)),
+        Register('seq_entry', 0x40001418, size=1, access='ro',
+                 fields=(Field('entry', 0, 8),)),
+        Register('seq_loop_count', 0x4000141c, size=1, access='ro',
+                 fields=(Field('loop_count', 0, 16),)),
+        Register('ev_rise', 0x40001800, size=1, access='rw', cacheable=True,
+                 fields=(Field('rise', 0, 1),)),
+        Register('ev_fall', 0x40001804, size=1, access='rw', cacheable=True,
+                 fields=(Field('fall', 0, 1),)),
+        Register('ev_level', 0x40001808, size=1, access='ro',
+                 fields=(Field('level', 0, 10),)),
+        Register('ev_max_level', 0x4000180c, size=1, access='ro',
+                 fields=(Field('max_level', 0, 10),)),
+        Register('ev_events', 0x40001810, size=1, access='ro',
+                 fields=(Field('events', 0, 32),)),
+        Register('ev_overflow', 0x40001814, size=1, access='ro',
+                 fields=(Field('overflow', 0, 32),)),
+        Register('ev_time', 0x40001818, size=1, access='ro',
+                 fields=(Field('time', 0, 32),)),
+        Register('ev_clear', 0x4000181c, size=1, access='rw',
+                 fields=(Field('clear', 0, 1),)),
+        Register('notify_enable', 0x40001c00, size=1, access='rw', cacheable=True,
+                 fields=(Field('enable', 0, 1),)),
+        Register('notify_mask', 0x40001c04, size=1, access='rw', cacheable=True,
+                 fields=(Field('mask', 0, 6),)),
+        Register('notify_status', 0x40001c08, size=1, access='ro',
+                 fields=(Field('status', 0, 6),)),
+        Register('notify_frames', 0x40001c0c, size=1, access='ro',
+                 fields=(Field('frames', 0, 32),)),
+    )
+    groups = {
+        'ctrl': ('ctrl_reset', 'ctrl_scratch', 'ctrl_bus_errors'),
+        'led': ('led_control',),
+        'perf': ('perf_control', 'perf_cycles', 'perf_bridge_reads', 'perf_bridge_writes', 'perf_bridge_busy_cycles', 'perf_bridge_latency0', 'perf_bridge_latency1', 'perf_bridge_latency2', 'perf_bridge_latency3', 'perf_bridge_latency4', 'perf_bridge_latency5', 'perf_bridge_latency6', 'perf_bridge_latency7', 'perf_bridge_rx_bytes', 'perf_bridge_tx_bytes'),
+        'la': ('la_arm', 'la_stop', 'la_trigger_mask', 'la_trigger_value', 'la_post_trigger', 'la_status', 'la_write_ptr', 'la_count', 'la_trigger_entry'),
+        'gpio': ('gpio_out', 'gpio_set', 'gpio_clr', 'gpio_toggle', 'gpio_masked', 'gpio_in'),
+        'seq': ('seq_length', 'seq_loops', 'seq_idle', 'seq_start', 'seq_stop', 'seq_status', 'seq_entry', 'seq_loop_count'),
+        'ev': ('ev_rise', 'ev_fall', 'ev_level', 'ev_max_level', 'ev_events', 'ev_overflow', 'ev_time', 'ev_clear'),
+        'notify': ('notify_enable', 'notify_mask', 'notify_status', 'notify_frames'),
+    }
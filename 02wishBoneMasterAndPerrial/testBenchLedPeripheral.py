@@ -1,37 +1,118 @@
 #!/usr/bin/env python3
 """
-Simulation testbench to verify LedPeripheral from uartWishBoneCrsLed.py.
+Simulation testbench to verify LedPeripheral (ledPeripheral.py) of uartWishBoneCrsLed.py.
 
 Tests that:
-- LED peripheral only updates at 0x40000400 (led CSR control register)
-- Writes to other addresses (0x50000000, 0x20000000, 0x00000000) are ACKed
-  but do not affect the LED register
-- The bus never hangs on any address
+- LED peripheral only updates at 0x40000400 (led CSR control register,
+  LED_CONTROL_ADDR of ledRegs.py)
+- Accesses to unmapped addresses (0x50000000, 0x20000000, 0x00000000) are
+  answered with a bus error (ERR) within one cycle by WishboneErrDecoder
+  and do not affect the LED register
+- The bus never hangs on any address: WishboneWatchdog terminates accesses
+  that are never ACKed
+- LedPeripheral mapped as a Wishbone-native register file (WishboneCSRBank)
+  behaves the same, and its access latency is compared cycle by cycle with
+  the Wishbone2CSR path
+- Classic, back-to-back and CTI-burst transactions (commonLib/wishboneBfm.py)
+  reach the expected bus bandwidth on both paths
+- The address map, the peripheral and this testbench import without
+  SoCMini / Builder / the board platform (commonLib/importBench.py)
+- The reference register map (ledRegs.py) addresses the LED,
+  and batched accesses to adjacent registers go out as one burst
+- With the shadow cache (cache=True), the LED register read after a write and
+  a repeated write cost no bus transaction, and sampled verify readbacks
+  catch a register that does not hold its value
+- The reset sequencing of the PLL clock generator (commonLib/gatemateCrg.py)
+  holds sys in reset until lock and for a fixed count after lock or a reset
+  request
+- The GPIO bank (gpioPeripheral.py) applies set / clr / toggle / masked
+  writes in one bus write each, samples its inputs, and two masters updating
+  different bits at the same time do not lose each other's changes
+- The pattern sequencer (commonLib/patternSequencer.py) takes its table in
+  bursts and plays it with exact per-entry durations, loops and stops
+- The input event FIFO (commonLib/eventFifo.py) timestamps every enabled
+  edge, one-cycle pulses included, is drained in one burst sized by its
+  level, and counts what it drops when full
+- The notification channel (commonLib/notifyChannel.py) passes bridge
+  replies through unchanged when off; when on, it frames status changes
+  between reply bytes, and the host decoder / dispatcher / client
+  (commonLib/notifyHost.py) recover both exactly; frames and reply bytes
+  take turns, so a source toggling faster than the UART cannot starve replies
+
+Every test is an independent case with its own TestBench; cases run in
+parallel across a process pool (commonLib/testRunner.py: -j N, -k PATTERN,
+--list, --junit FILE, --json FILE).
+
+No waveform is written unless --vcd [FILE] is given (commonLib/simTrace.py:
+.vcd, .vcd.gz or .fst, --vcd-signals PATTERN... to narrow the signal set,
+--vcd-window PRE POST to keep only the cycles around a failing check).
 """
 
+import argparse
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
 from migen import *
 from litex.soc.interconnect import wishbone
 from litex.soc.interconnect import csr_bus
 from litex.soc.interconnect.wishbone import Wishbone2CSR
-from uartWishBoneCrsLed import LedPeripheral, Top
+from ledMap import ADDR_LED_WB, CSR_BASE, CSR_MAP, CSR_PAGING, EV_MAP, MEM_MAP, SEQ_MAP, SEQ_WIDTH
+from ledRegs import LED_CONTROL_ADDR, LED_CONTROL_CONTROL_MASK, LedRegs
+from ledPeripheral import LedPeripheral
+from gpioPeripheral import GpioPeripheral
+from commonLib.wishboneDecoder import (
+    WishboneErrDecoder, WishboneWatchdog, slot_regions, BUS_ERROR_DATA,
+)
+from commonLib.wishboneRegisters import WishboneCSRBank
+from commonLib.gatemateCrg import ResetSequencer
+from commonLib.wishboneBfm import WishboneBFM
+from commonLib.csrAccess import ShadowMismatch, run_batch
+from commonLib.patternSequencer import PatternSequencer
+from commonLib.patternPlay import DONE, RUNNING, pattern_cycles, pattern_words, upload_plan
+from commonLib.eventFifo import EventFifo
+from commonLib.eventDrain import decode as decode_events, read_plan as event_read_plan, unwrap
+from commonLib.notifyChannel import PAYLOAD, NotifyChannel
+from commonLib.notifyHost import Decoder, Dispatcher, NotifyClient
+from commonLib.simTrace import add_trace_arguments, run_traced, trace_from_args
+from commonLib.testRunner import TestSuite, add_runner_arguments
+from commonLib.importBench import SOC_MODULES, loaded, measure_import
+
+suite = TestSuite("led_peripheral")
+args  = None    # Command line, set by main()
+
+# LED register address of the default build (ledRegs.py, the reference map)
+ADDR_LED_CTRL = LED_CONTROL_ADDR     # 0x40000400
+
+
+def csr_addresses(peripheral):
+    """{register: byte address} of CSR region `peripheral` in the reference map (ledRegs.py)."""
+    regs = LedRegs()
+    return {name[len(peripheral) + 1:]: regs.register(name).addr for name in LedRegs.groups[peripheral]}
 
-# Replicate the CSR address map from uartWishBoneCrsLed.py Top class.
+# Address map shared with uartWishBoneCrsLed.py Top (ledMap.py); importing it
+# does not pull in SoCMini, Builder or the board platform.
 # Address = csr_base + csr_map[peripheral] × csr_paging
-CSR_PAGING    = 0x400                          # csr_paging from Top.__init__
-CSR_BASE      = Top.mem_map["csr"]             # 0x40000000
-ADDR_LED_CTRL = CSR_BASE + Top.csr_map["led"] * CSR_PAGING  # 0x40000400
 
 
 class TestBench(Module):
-    # Mirror the address maps from uartWishBoneCrsLed.py Top class
-    mem_map = Top.mem_map   # {"csr": 0x40000000, ...}
-    csr_map = Top.csr_map   # {"ctrl": 0, "led": 1}
+    # Same address maps as uartWishBoneCrsLed.py Top
+    mem_map = MEM_MAP   # {"csr": 0x40000000}
+    csr_map = CSR_MAP   # {"ctrl": 0, "led": 1}
 
     def __init__(self):
         self.led = Signal()
         self.master = wishbone.Interface(data_width=32, adr_width=30)
+        csr_wb = wishbone.Interface(data_width=32, adr_width=30)
 
-        # DUT: LedPeripheral from uartWishBoneCrsLed.py
+        # Address decoder: one 1 KB region per CSR slot in csr_map, all routed to
+        # the Wishbone → CSR bridge. Any other address is answered with ERR.
+        self.submodules.decoder = WishboneErrDecoder(self.master, [
+            (name, base, size, csr_wb)
+            for name, base, size in slot_regions(CSR_BASE, CSR_PAGING, self.csr_map)
+        ])
+
+        # DUT: LedPeripheral from ledPeripheral.py
         self.submodules.led_periph = LedPeripheral(self.led)
 
         # 32-bit CSR bus (matches default csr_data_width=32 in uartWishBoneCrsLed.py)
@@ -48,149 +129,989 @@ class TestBench(Module):
 
         # Wishbone → CSR bridge
         self.submodules.wb2csr = Wishbone2CSR(
-            bus_wishbone=self.master,
+            bus_wishbone=csr_wb,
             bus_csr=csr_if,
         )
 
 
-def wb_write(master, byte_addr, value):
-    """Perform a Wishbone write cycle. Returns True if ACKed within 10 cycles."""
-    yield master.adr.eq(byte_addr >> 2)
-    yield master.dat_w.eq(value)
-    yield master.we.eq(1)
-    yield master.sel.eq(0xF)
-    yield master.cyc.eq(1)
-    yield master.stb.eq(1)
-    yield
-    acked = False
-    for _ in range(10):
-        if (yield master.ack):
-            acked = True
-            break
-        yield
-    yield master.cyc.eq(0)
-    yield master.stb.eq(0)
-    yield master.we.eq(0)
-    yield
-    return acked
+class NativeTestBench(Module):
+    """LedPeripheral as a Wishbone-native register file (Top with wishbone_regs=True)."""
 
+    def __init__(self, registered=False):
+        self.led = Signal()
+        self.master = wishbone.Interface(data_width=32, adr_width=30)
 
-def wb_read(master, byte_addr):
-    """Perform a Wishbone read cycle. Returns (value, acked)."""
-    yield master.adr.eq(byte_addr >> 2)
-    yield master.we.eq(0)
-    yield master.sel.eq(0xF)
-    yield master.cyc.eq(1)
-    yield master.stb.eq(1)
-    yield
-    acked = False
-    for _ in range(10):
-        if (yield master.ack):
-            acked = True
-            break
-        yield
-    value = yield master.dat_r
-    yield master.cyc.eq(0)
-    yield master.stb.eq(0)
-    yield
-    return value, acked
+        self.submodules.regs = WishboneCSRBank(LedPeripheral(self.led), registered=registered)
+        self.submodules.decoder = WishboneErrDecoder(self.master, [
+            ("led", ADDR_LED_WB, self.regs.size, self.regs.bus),
+        ])
 
 
-def run_test(dut):
-    passed = 0
-    failed = 0
+class WatchdogTestBench(Module):
+    """Bridge-side watchdog in front of a slave that never answers."""
 
-    led_val = yield dut.led
-    print(f"Initial LED pin = {led_val} (expected 1, LED off)")
+    def __init__(self, cycles=16):
+        self.master = wishbone.Interface(data_width=32, adr_width=30)
+        self.slave  = wishbone.Interface(data_width=32, adr_width=30)   # ack/err stay 0
+        self.submodules.watchdog = WishboneWatchdog(self.master, self.slave, cycles=cycles)
 
-    # --- Test 1: Write 1 to correct address 0x40000400 ---
-    print(f"\n--- Test 1: Write 1 to 0x{ADDR_LED_CTRL:08x} (correct address) ---")
-    acked = yield from wb_write(dut.master, ADDR_LED_CTRL, 0x1)
-    yield
-    led_val = yield dut.led
-    read_val, _ = yield from wb_read(dut.master, ADDR_LED_CTRL)
-    ok = read_val == 1 and led_val == 0 and acked
-    print(f"  ACKed={acked}, Read back=0x{read_val:08x}, LED pin={led_val}")
-    print(f"  {'PASS' if ok else 'FAIL'}")
-    passed, failed = (passed + 1, failed) if ok else (passed, failed + 1)
 
-    # --- Test 2: Write 0 to correct address to reset ---
-    print(f"\n--- Test 2: Write 0 to 0x{ADDR_LED_CTRL:08x} (reset LED) ---")
-    acked = yield from wb_write(dut.master, ADDR_LED_CTRL, 0x0)
-    yield
-    led_val = yield dut.led
-    read_val, _ = yield from wb_read(dut.master, ADDR_LED_CTRL)
-    ok = read_val == 0 and led_val == 1 and acked
-    print(f"  ACKed={acked}, Read back=0x{read_val:08x}, LED pin={led_val}")
-    print(f"  {'PASS' if ok else 'FAIL'}")
-    passed, failed = (passed + 1, failed) if ok else (passed, failed + 1)
 
-    # --- Test 3: Write 1 to WRONG address 0x50000000 (must ACK, must NOT change LED) ---
-    print("\n--- Test 3: Write 1 to 0x50000000 (wrong addr, should ACK but not change LED) ---")
-    acked = yield from wb_write(dut.master, 0x50000000, 0x1)
-    yield
-    led_val = yield dut.led
-    read_val, _ = yield from wb_read(dut.master, ADDR_LED_CTRL)
-    ok = read_val == 0 and led_val == 1 and acked
-    print(f"  ACKed={acked}, Read back=0x{read_val:08x}, LED pin={led_val}")
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+def report(result, ok, label, trace=None):
+    """Print and record the verdict of a check; a failure also triggers the waveform window."""
     print(f"  {'PASS' if ok else 'FAIL'}")
-    passed, failed = (passed + 1, failed) if ok else (passed, failed + 1)
+    if not result.record(ok, label) and trace is not None:
+        trace.trigger()
 
-    # --- Test 4: Write 1 to WRONG address 0x20000000 (must ACK, must NOT change LED) ---
-    print("\n--- Test 4: Write 1 to 0x20000000 (wrong addr, should ACK but not change LED) ---")
-    acked = yield from wb_write(dut.master, 0x20000000, 0x1)
-    yield
-    led_val = yield dut.led
-    read_val, _ = yield from wb_read(dut.master, ADDR_LED_CTRL)
-    ok = read_val == 0 and led_val == 1 and acked
-    print(f"  ACKed={acked}, Read back=0x{read_val:08x}, LED pin={led_val}")
-    print(f"  {'PASS' if ok else 'FAIL'}")
-    passed, failed = (passed + 1, failed) if ok else (passed, failed + 1)
 
-    # --- Test 5: Write 1 to WRONG address 0x00000000 (must ACK, must NOT change LED) ---
-    print("\n--- Test 5: Write 1 to 0x00000000 (wrong addr, should ACK but not change LED) ---")
-    acked = yield from wb_write(dut.master, 0x00000000, 0x1)
-    yield
-    led_val = yield dut.led
-    read_val, _ = yield from wb_read(dut.master, ADDR_LED_CTRL)
-    ok = read_val == 0 and led_val == 1 and acked
-    print(f"  ACKed={acked}, Read back=0x{read_val:08x}, LED pin={led_val}")
-    print(f"  {'PASS' if ok else 'FAIL'}")
-    passed, failed = (passed + 1, failed) if ok else (passed, failed + 1)
+def simulate(result, tb, generator, signals=()):
+    """run_simulation() with the --vcd options; one waveform file per case."""
+    trace = trace_from_args(args, signals=signals, case=result.name)
+    run_traced(tb, generator(trace), trace)
 
-    # --- Test 6: Confirm correct address still works after wrong writes ---
-    print(f"\n--- Test 6: Write 1 to 0x{ADDR_LED_CTRL:08x} again (should still work) ---")
-    acked = yield from wb_write(dut.master, ADDR_LED_CTRL, 0x1)
+
+def write_and_check(dut, result, trace, addr, value, expect_reg, expect_led, label):
+    """Write `value` to `addr`, then read the LED register and pin back."""
+    bfm = WishboneBFM(dut.master)
+    acked = (yield from bfm.write(addr, value)).ack
     yield
     led_val = yield dut.led
-    read_val, _ = yield from wb_read(dut.master, ADDR_LED_CTRL)
-    ok = read_val == 1 and led_val == 0 and acked
+    read_val = (yield from bfm.read(ADDR_LED_CTRL)).value
+    ok = read_val == expect_reg and led_val == expect_led and acked
     print(f"  ACKed={acked}, Read back=0x{read_val:08x}, LED pin={led_val}")
-    print(f"  {'PASS' if ok else 'FAIL'}")
-    passed, failed = (passed + 1, failed) if ok else (passed, failed + 1)
+    report(result, ok, label, trace)
+
+
+# ---------------------------------------------------------------------------
+# Test cases — Tests 1-8: address decode through Wishbone2CSR
+# ---------------------------------------------------------------------------
+@suite.case("test01_write_led_on")
+def case_write_led_on(result):
+    print(f"\n--- Test 1: Write 1 to 0x{ADDR_LED_CTRL:08x} (correct address) ---")
+    dut = TestBench()
+
+    def gen(trace):
+        led_val = yield dut.led
+        print(f"Initial LED pin = {led_val} (expected 1, LED off)")
+        yield from write_and_check(dut, result, trace, ADDR_LED_CTRL, 0x1, 1, 0, "write 1 to LED")
+
+    simulate(result, dut, gen, [dut.master, dut.led])
+
+
+@suite.case("test02_write_led_off")
+def case_write_led_off(result):
+    print(f"\n--- Test 2: Write 0 to 0x{ADDR_LED_CTRL:08x} (reset LED) ---")
+    dut = TestBench()
+
+    def gen(trace):
+        yield from WishboneBFM(dut.master).write(ADDR_LED_CTRL, 0x1)   # LED on first
+        yield from write_and_check(dut, result, trace, ADDR_LED_CTRL, 0x0, 0, 1, "write 0 to LED")
+
+    simulate(result, dut, gen, [dut.master, dut.led])
+
+
+def unmapped_write_case(test_no, wrong_addr):
+    @suite.case(f"test{test_no:02d}_unmapped_write_{wrong_addr:08x}")
+    def case_unmapped_write(result):
+        print(f"\n--- Test {test_no}: Write 1 to 0x{wrong_addr:08x} (wrong addr, should ERR and not change LED) ---")
+        dut = TestBench()
+
+        def gen(trace):
+            bfm = WishboneBFM(dut.master)
+            res = yield from bfm.write(wrong_addr, 0x1)
+            yield
+            led_val = yield dut.led
+            read_val = (yield from bfm.read(ADDR_LED_CTRL)).value
+            ok = read_val == 0 and led_val == 1 and res.err and not res.ack and res.cycles <= 2
+            print(f"  ACKed={res.ack}, ERR={res.err} after {res.cycles} cycle(s), "
+                  f"Read back=0x{read_val:08x}, LED pin={led_val}")
+            report(result, ok, f"write to 0x{wrong_addr:08x}", trace)
+
+        simulate(result, dut, gen, [dut.master, dut.led])
 
-    # --- Test 7: Read from WRONG address (should ACK with data=0) ---
-    print("\n--- Test 7: Read from 0x20000000 (wrong addr, should ACK with 0) ---")
-    read_val, acked = yield from wb_read(dut.master, 0x20000000)
-    ok = read_val == 0 and acked
-    print(f"  ACKed={acked}, Read back=0x{read_val:08x}")
-    print(f"  {'PASS' if ok else 'FAIL'}")
-    passed, failed = (passed + 1, failed) if ok else (passed, failed + 1)
 
-    # --- Test 8: Write/read adjacent address 0x40000404 (next word, should not match) ---
+# Tests 3-5: writes to unmapped addresses must ERR within one cycle and not change the LED
+for test_no, wrong_addr in ((3, 0x50000000), (4, 0x20000000), (5, 0x00000000)):
+    unmapped_write_case(test_no, wrong_addr)
+
+
+@suite.case("test06_write_after_errors")
+def case_write_after_errors(result):
+    print(f"\n--- Test 6: Write 1 to 0x{ADDR_LED_CTRL:08x} after bus errors (should still work) ---")
+    dut = TestBench()
+
+    def gen(trace):
+        bfm = WishboneBFM(dut.master)
+        for wrong_addr in (0x50000000, 0x20000000, 0x00000000):
+            yield from bfm.write(wrong_addr, 0x1)
+        yield from write_and_check(dut, result, trace, ADDR_LED_CTRL, 0x1, 1, 0, "write 1 after errors")
+
+    simulate(result, dut, gen, [dut.master, dut.led])
+
+
+@suite.case("test07_unmapped_read")
+def case_unmapped_read(result):
+    print("\n--- Test 7: Read from 0x20000000 (wrong addr, should ERR) ---")
+    dut = TestBench()
+
+    def gen(trace):
+        res = yield from WishboneBFM(dut.master).read(0x20000000)
+        print(f"  ACKed={res.ack}, ERR={res.err}")
+        report(result, res.err and not res.ack, "read from 0x20000000", trace)
+
+    simulate(result, dut, gen, [dut.master, dut.led])
+
+
+@suite.case("test08_adjacent_word")
+def case_adjacent_word(result):
     print(f"\n--- Test 8: Read from 0x{ADDR_LED_CTRL+4:08x} (adjacent word, should return 0) ---")
-    acked = yield from wb_write(dut.master, ADDR_LED_CTRL + 4, 0x1)
-    yield
-    led_val = yield dut.led
-    read_val, _ = yield from wb_read(dut.master, ADDR_LED_CTRL + 4)
-    ok = read_val == 0 and acked
-    print(f"  ACKed={acked}, Read back=0x{read_val:08x}, LED pin={led_val}")
-    print(f"  {'PASS' if ok else 'FAIL'}")
-    passed, failed = (passed + 1, failed) if ok else (passed, failed + 1)
+    dut = TestBench()
+
+    def gen(trace):
+        bfm = WishboneBFM(dut.master)
+        acked = (yield from bfm.write(ADDR_LED_CTRL + 4, 0x1)).ack
+        yield
+        led_val = yield dut.led
+        read_val = (yield from bfm.read(ADDR_LED_CTRL + 4)).value
+        print(f"  ACKed={acked}, Read back=0x{read_val:08x}, LED pin={led_val}")
+        report(result, read_val == 0 and acked, "adjacent word reads 0", trace)
+
+    simulate(result, dut, gen, [dut.master, dut.led])
+
+
+# ---------------------------------------------------------------------------
+# Test 9: watchdog
+# ---------------------------------------------------------------------------
+@suite.case("test09_watchdog")
+def case_watchdog(result):
+    """A slave that never ACKs must not hang the bridge: the watchdog ACKs with BUS_ERROR_DATA."""
+    print("\n--- Test 9: Read from a slave that never ACKs (watchdog, 16 cycles) ---")
+    dut = WatchdogTestBench()
+
+    def gen(trace):
+        bfm = WishboneBFM(dut.master, timeout=100)
+        res = yield from bfm.read(ADDR_LED_CTRL)
+        errors = yield dut.watchdog.error_count
+        ok = res.ack and res.cycles <= 18 and res.value == BUS_ERROR_DATA and errors == 1
+        print(f"  ACKed after {res.cycles} cycles, Read back=0x{res.value:08x}, error_count={errors}")
+        report(result, ok, "watchdog terminates the access", trace)
+
+    simulate(result, dut, gen, [dut.master])
+
+
+# ---------------------------------------------------------------------------
+# Tests 10-11: latency and bandwidth, CSR path vs Wishbone-native register file
+# ---------------------------------------------------------------------------
+PATHS = (
+    ("csr",            "Wishbone2CSR + CSRBank",     TestBench,                              ADDR_LED_CTRL),
+    ("wb_registered",  "WishboneCSRBank registered", lambda: NativeTestBench(registered=True),  ADDR_LED_WB),
+    ("wb_zero_wait",   "WishboneCSRBank zero-wait",  lambda: NativeTestBench(registered=False), ADDR_LED_WB),
+)
+
+
+def latency_case(key, label, make_tb, addr):
+    @suite.case(f"test10_latency_{key}")
+    def case_latency(result):
+        """Check the LED register through `label` and report stb→ack cycles for write and read."""
+        print(f"\n--- Test 10: Access latency, {label} ---")
+        dut = make_tb()
+
+        def gen(trace):
+            bfm = WishboneBFM(dut.master)
+            w = yield from bfm.write(addr, 0x1)
+            led_val = yield dut.led
+            r = yield from bfm.read(addr)
+            ok = w.ack and r.value == 1 and led_val == 0
+            print(f"  {label:<28} write {w.cycles} cycle(s), read {r.cycles} cycle(s) (STB to ACK), "
+                  f"Read back=0x{r.value:08x}, LED pin={led_val}")
+            report(result, ok, f"{label} access", trace)
+
+        simulate(result, dut, gen, [dut.master, dut.led])
+
+
+def bandwidth_case(key, label, make_tb, addr, n=64):
+    @suite.case(f"test11_bandwidth_{key}")
+    def case_bandwidth(result):
+        """Toggle the LED `n` times with classic, back-to-back and burst accesses; report accesses/cycle."""
+        print(f"\n--- Test 11: Bus bandwidth, {label} ---")
+        dut = make_tb()
+        values = [i & 1 for i in range(1, n + 1)]      # Ends with 0 (LED off)
+
+        def gen(trace):
+            for style in ("classic", "back-to-back", "burst"):
+                bfm = WishboneBFM(dut.master)
+                if style == "classic":
+                    for v in values:
+                        yield from bfm.write(addr, v)
+                elif style == "back-to-back":
+                    yield from bfm.transfer([("w", addr, v) for v in values])
+                else:
+                    yield from bfm.burst_write(addr, values, incrementing=False)
+                led_val = yield dut.led
+                s = bfm.stats.summary()
+                ok = s["accesses"] == n and s["errors"] == 0 and s["timeouts"] == 0 and led_val == 1
+                print(f"  [{'PASS' if ok else 'FAIL'}] {label:<28} {style:<13} {n} writes in {s['cycles']:>3} cycles "
+                      f"({s['per_cycle']:.2f} accesses/cycle)")
+                if not result.record(ok, f"{label} {style}") and trace is not None:
+                    trace.trigger()
+
+        simulate(result, dut, gen, [dut.master, dut.led])
+
+
+for key, label, make_tb, addr in PATHS:
+    latency_case(key, label, make_tb, addr)
+for key, label, make_tb, addr in (PATHS[0], PATHS[2]):
+    bandwidth_case(key, label, make_tb, addr)
+
+
+# Start-up of the modules host scripts, testbenches and the build import
+# (module, module prefixes it must not load; time budgets: commonLib/importBench.py --budgets)
+IMPORT_GUARDS = [
+    ("ledMap",                 ("migen", "litex")),
+    ("ledRegs",                ("migen", "litex")),
+    ("ledPeripheral",          SOC_MODULES),
+    ("testBenchLedPeripheral", SOC_MODULES),
+    ("uartWishBoneCrsLed",     ("litex_boards", "litex.build.colognechip")),
+]
+
+
+@suite.case("test12_import_modules")
+def case_import_modules(result):
+    """Import each module in a fresh interpreter: without the SoC build stack."""
+    print("\n--- Test 12: Imports (commonLib/importBench.py) ---")
+    here = os.path.dirname(os.path.abspath(__file__))
+    for module, forbidden in IMPORT_GUARDS:
+        timing   = measure_import(module, here, repeat=1)
+        unwanted = loaded(timing.modules, forbidden)
+        ok = not unwanted
+        print(f"  [{'PASS' if ok else 'FAIL'}] {module:<24} {timing.seconds*1e3:6.1f} ms, "
+              f"loads {', '.join(unwanted[:3]) or 'none of ' + forbidden[0] + ', ...'}")
+        result.record(ok, f"{module}: loads {unwanted[:3]}")
+
+
+# ---------------------------------------------------------------------------
+# Test 13: generated register map (ledRegs.py) with batched accesses
+# ---------------------------------------------------------------------------
+@suite.case("test13_register_batch")
+def case_register_batch(result):
+    print("\n--- Test 13: Generated register map, batched accesses ---")
+    dut  = TestBench()
+    regs = LedRegs()
+
+    def gen(trace):
+        bfm = WishboneBFM(dut.master)
+
+        # LED on through the typed accessor, read back in the same batch
+        b = regs.batch()
+        b.led_control.write(regs.register("led_control").fields["control"].insert(0, 1))
+        readback = b.led_control.read()
+        yield from run_batch(bfm, b)
+        yield
+        led_val = yield dut.led
+        print(f"  led_control=0x{readback.value:08x}, LED pin={led_val}")
+        report(result, readback.value == 1 and led_val == 0, "batched LED on", trace)
+
+        # Read, write, read of one register: three transactions in queue order
+        b = regs.batch()
+        before = b.led_control.read()
+        b.led_control.write(0)
+        after = b.led_control.read()
+        kinds = [t[0] for t in b.transactions()]
+        yield from run_batch(bfm, b)
+        print(f"  mixed batch {kinds}: led_control 0x{before.value:08x} -> 0x{after.value:08x}")
+        report(result, kinds == ["r", "w", "r"] and (before.value, after.value) == (1, 0),
+               "mixed read/write batch", trace)
+
+        # The three ctrl registers are adjacent: one 3-beat read burst
+        b = regs.batch()
+        b.read_group("ctrl")
+        trans = b.transactions()
+        beats = yield from run_batch(bfm, b)
+        ok = trans == [("r", regs.register("ctrl_reset").addr, 3)] and all(r.ack for r in beats)
+        print(f"  read_group('ctrl'): {len(trans)} burst(s) of {trans[0][2]} words, all ACKed={all(r.ack for r in beats)}")
+        report(result, ok, "read_group('ctrl') as one burst", trace)
+
+        # Field mask from csr.svd: LedPeripheral.control is 1 bit wide
+        print(f"  LED_CONTROL_CONTROL_MASK=0x{LED_CONTROL_CONTROL_MASK:08x}")
+        report(result, LED_CONTROL_CONTROL_MASK == 0x1, "control field mask", trace)
+
+    simulate(result, dut, gen, signals=[dut.master, dut.led])
+
+
+# ---------------------------------------------------------------------------
+# Test 14: reset sequencing of the PLL clock generator (commonLib/gatemateCrg.py)
+# ---------------------------------------------------------------------------
+class ResetTestBench(Module):
+    """ResetSequencer driven by a simulated PLL lock and reset request."""
+
+    def __init__(self, cycles):
+        self.locked  = Signal()
+        self.request = Signal()
+        self.submodules.sequencer = ResetSequencer(self.locked, self.request, cycles, domain="sys")
+
+
+@suite.case("test14_reset_sequencer")
+def case_reset_sequencer(result):
+    """sys reset: held until lock, then exactly N cycles; a request restarts the count."""
+    print("\n--- Test 14: Reset sequencing (commonLib/gatemateCrg.py) ---")
+    cycles = 8
+    dut    = ResetTestBench(cycles)
+
+    def held(n_max):
+        # Cycles until reset drops (n_max + 1 if it never does)
+        for n in range(n_max + 1):
+            if not (yield dut.sequencer.reset):
+                return n
+            yield
+        return n_max + 1
+
+    def gen(trace):
+        for _ in range(20):                 # PLL not locked yet
+            yield
+        still = yield dut.sequencer.reset
+        print(f"  before lock: reset={still}")
+        report(result, still == 1, "reset held until the PLL locks", trace)
+
+        yield dut.locked.eq(1)
+        yield
+        n = yield from held(4 * cycles)
+        print(f"  after lock: reset held {n} cycles (expected {cycles})")
+        report(result, n == cycles, "reset length after lock", trace)
+
+        yield dut.request.eq(1)             # soc_rst pulse
+        yield
+        yield dut.request.eq(0)
+        yield
+        n = yield from held(4 * cycles)
+        print(f"  after a reset request: reset held {n} cycles (expected {cycles})")
+        report(result, n == cycles, "reset length after a request", trace)
+
+        yield dut.locked.eq(0)              # Lock lost: reset at once
+        yield
+        yield
+        lost = yield dut.sequencer.reset
+        print(f"  lock lost: reset={lost}")
+        report(result, lost == 1, "reset on loss of lock", trace)
+
+    simulate(result, dut, gen, signals=[dut.locked, dut.request, dut.sequencer.reset])
+
+
+# ---------------------------------------------------------------------------
+# Test 15: shadow cache of the cacheable registers (CSRStorage)
+# ---------------------------------------------------------------------------
+@suite.case("test15_shadow_cache")
+def case_shadow_cache(result):
+    """Cached readback and coalesced writes send nothing; verify readbacks catch a mismatch."""
+    print("\n--- Test 15: Register shadow cache ---")
+    dut  = TestBench()
+    regs = LedRegs(cache=True, verify_every=2)
+    led  = regs.register("led_control")
+
+    def gen(trace):
+        bfm = WishboneBFM(dut.master)
+
+        # Write, then read back: the read is served by the shadow
+        b = regs.batch()
+        b.led_control.write(1)
+        readback = b.led_control.read()
+        trans = b.transactions()
+        yield from run_batch(bfm, b)
+        yield
+        led_val = yield dut.led
+        print(f"  write + read: {trans}, led_control=0x{readback.value:08x}, LED pin={led_val}")
+        report(result, trans == [("w", led.addr, [1])] and readback.value == 1 and led_val == 0,
+               "readback from the shadow", trace)
+
+        # Same value again: coalesced, nothing sent
+        b = regs.batch()
+        b.led_control.write(1)
+        print(f"  repeated write: {b.transactions()}, writes_coalesced={regs.writes_coalesced}")
+        report(result, b.transactions() == [] and regs.writes_coalesced == 1, "repeated write coalesced", trace)
+
+        # Second cacheable write: sampled readback from the bus, which agrees
+        b = regs.batch()
+        b.led_control.write(0)
+        trans = b.transactions()
+        yield from run_batch(bfm, b)
+        print(f"  verified write: {trans}, verified={regs.verified}")
+        report(result, trans == [("w", led.addr, [0]), ("r", led.addr, 1)] and regs.verified == 1,
+               "sampled verify readback", trace)
+
+        # ctrl_scratch has no CSR bank here, so it does not hold what is written
+        raised = None
+        for value in (0x1234, 0x5678):
+            b = regs.batch()
+            b.ctrl_scratch.write(value)
+            try:
+                yield from run_batch(bfm, b)
+            except ShadowMismatch as e:
+                raised = e
+        print(f"  ctrl_scratch without a bank: {raised}")
+        report(result, raised is not None and regs.verified == 2, "verify readback mismatch raised", trace)
+
+        print(f"  {regs.cache_hits} cache hit(s), {regs.writes_coalesced} write(s) coalesced, "
+              f"{regs.verified} readback(s) verified")
+
+        # Every write verified: each readback is queued behind its write in the batch
+        vregs = LedRegs(cache=True, verify_every=1)
+        seq   = [vregs.register(f"seq_{name}").addr for name in ("length", "loops")]
+        b = vregs.batch()
+        b.write_group("seq", length=4, loops=2)
+        trans = b.transactions()
+        print(f"  write_group('seq') verified: {trans}")
+        report(result, trans == [("w", seq[0], [4]), ("r", seq[0], 1), ("w", seq[1], [2]), ("r", seq[1], 1)],
+               "verify readbacks between batched writes", trace)
+
+        # That batch was never flushed: the shadow does not hold its writes
+        b = vregs.batch()
+        b.seq_length.read()
+        print(f"  after an abandoned batch: {b.transactions()}")
+        report(result, b.transactions() == [("r", seq[0], 1)], "abandoned batch leaves the shadow", trace)
+
+        # Flushed: the batch serves its own write, the shadow takes it once on the bus
+        b = vregs.batch()
+        b.led_control.write(1)
+        readback = b.led_control.read()
+        trans = b.transactions()
+        yield from run_batch(bfm, b)
+        b = vregs.batch()
+        cached = b.led_control.read()
+        print(f"  verified batch: {trans}, readback=0x{readback.value:08x}, then {b.transactions()}")
+        report(result, trans == [("w", led.addr, [1]), ("r", led.addr, 1)] and vregs.verified == 1
+               and readback.value == 1 and cached.value == 1 and b.transactions() == [],
+               "shadow updated on flush", trace)
+
+    simulate(result, dut, gen, signals=[dut.master, dut.led])
+
+
+# ---------------------------------------------------------------------------
+# Test 16: GPIO bank with atomic set / clr / toggle / masked writes
+# ---------------------------------------------------------------------------
+class GpioTestBench(Module):
+    """GpioPeripheral at csr_map["gpio"], behind an arbiter for two bus masters."""
+
+    def __init__(self, width=8):
+        self.button  = Signal()
+        self.masters = [wishbone.Interface(data_width=32, adr_width=30) for _ in range(2)]
+        self.master  = wishbone.Interface(data_width=32, adr_width=30)
+        csr_wb = wishbone.Interface(data_width=32, adr_width=30)
+
+        self.submodules.arbiter = wishbone.Arbiter(self.masters, self.master)
+        self.submodules.decoder = WishboneErrDecoder(self.master, [
+            (name, base, size, csr_wb)
+            for name, base, size in slot_regions(CSR_BASE, CSR_PAGING, CSR_MAP)
+        ])
+        self.submodules.gpio = GpioPeripheral(width, inputs=self.button)
+
+        csr_if = csr_bus.Interface(data_width=32)
+        self.submodules.csr_bank = csr_bus.CSRBank(
+            self.gpio.get_csrs(),
+            address=CSR_MAP["gpio"],
+            paging=CSR_PAGING,
+            bus=csr_if,
+        )
+        self.submodules.wb2csr = Wishbone2CSR(bus_wishbone=csr_wb, bus_csr=csr_if)
+
+
+@suite.case("test16_gpio")
+def case_gpio(result):
+    """Each update is one bus write; concurrent set / clr of different bits from two masters."""
+    print("\n--- Test 16: GPIO set / clr / toggle / masked writes ---")
+    width = 8
+    dut   = GpioTestBench(width)
+    addr  = csr_addresses("gpio")
+    rounds = 8
+    done   = []
+
+    def host(trace):
+        bfm = WishboneBFM(dut.masters[0])
+        steps = [
+            ("out",    0x0F,             0x0F),
+            ("set",    0x30,             0x3F),
+            ("clr",    0x05,             0x3A),
+            ("toggle", 0xFF,             0xC5),
+            ("masked", 0x0F << width | 0x0A, 0xCA),     # Low nibble ← 0xA, high nibble kept
+        ]
+        for name, value, expect in steps:
+            acked = (yield from bfm.write(addr[name], value)).ack
+            yield
+            out  = yield dut.gpio.out
+            back = (yield from bfm.read(addr["out"])).value
+            print(f"  {name:<6} 0x{value:04x}: out=0x{out:02x}, read back 0x{back:02x} (expected 0x{expect:02x})")
+            report(result, acked and out == expect and back == expect, f"{name} write", trace)
+
+        # Button (input 0) through the two-flop synchroniser
+        samples = []
+        for level in (0, 1):
+            yield dut.button.eq(level)
+            for _ in range(3):
+                yield
+            samples.append((yield from bfm.read(addr["in"])).value)
+        print(f"  gpio_in after button 0 / 1: {samples}")
+        report(result, samples == [0, 1], "input sampled", trace)
+
+        # Race: master 0 flips bit 0 and sets bit 3 while master 1 flips bit 7, with
+        # set / clr only; a read-modify-write on either side would clobber the other
+        yield from bfm.write(addr["out"], 0)
+        done.append("ready")
+        for n in range(rounds):
+            yield from bfm.write(addr["set" if n % 2 == 0 else "clr"], 1 << 0)
+            yield from bfm.write(addr["set"], 1 << 3)
+        while len(done) < 2:
+            yield
+        out = yield dut.gpio.out
+        # Last round (odd): bit 0 cleared, bit 7 set; bit 3 set throughout
+        print(f"  two masters, {rounds} rounds each: out=0x{out:02x} (expected 0x88)")
+        report(result, out == 0x88, "concurrent updates from two masters", trace)
+
+    def cpu(trace):
+        bfm = WishboneBFM(dut.masters[1])
+        while not done:
+            yield
+        for n in range(rounds):
+            yield from bfm.write(addr["clr" if n % 2 == 0 else "set"], 1 << 7)
+        done.append("cpu")
+
+    def gen(trace):
+        return [host(trace), cpu(trace)]
+
+    simulate(result, dut, gen, signals=[*dut.masters, dut.gpio.out, dut.button])
+
+
+# ---------------------------------------------------------------------------
+# Test 17: pattern sequencer, table uploaded in bursts, played at clock rate
+# ---------------------------------------------------------------------------
+class SequencerTestBench(Module):
+    """PatternSequencer of the --sequencer build: CSRs at csr_map["seq"], table at SEQ_MAP["seq"]."""
+
+    def __init__(self, depth=16):
+        self.master = wishbone.Interface(data_width=32, adr_width=30)
+        self.submodules.seq = PatternSequencer(SEQ_WIDTH, depth)
+
+        csr_wb = wishbone.Interface(data_width=32, adr_width=30)
+        self.submodules.decoder = WishboneErrDecoder(self.master, [
+            *[(name, base, size, csr_wb) for name, base, size in slot_regions(CSR_BASE, CSR_PAGING, CSR_MAP)],
+            ("seq", SEQ_MAP["seq"], self.seq.size, self.seq.bus),
+        ])
+        csr_if = csr_bus.Interface(data_width=32)
+        self.submodules.csr_bank = csr_bus.CSRBank(
+            self.seq.get_csrs(),
+            address=CSR_MAP["seq"],
+            paging=CSR_PAGING,
+            bus=csr_if,
+        )
+        self.submodules.wb2csr = Wishbone2CSR(bus_wishbone=csr_wb, bus_csr=csr_if)
+
+
+def runs_of(samples):
+    """[(value, cycles)] of consecutive equal samples."""
+    runs = []
+    for v in samples:
+        if runs and runs[-1][0] == v:
+            runs[-1][1] += 1
+        else:
+            runs.append([v, 1])
+    return [tuple(r) for r in runs]
+
+
+@suite.case("test17_pattern_sequencer")
+def case_pattern_sequencer(result):
+    """Burst upload and readback; exact durations (down to one cycle), loops, stop."""
+    print("\n--- Test 17: Pattern sequencer (commonLib/patternSequencer.py) ---")
+    dut     = SequencerTestBench()
+    addr    = csr_addresses("seq")
+    pattern = [(0x01, 3), (0x00, 1), (0x05, 2), (0x02, 4)]
+    idle    = 0x80
+    loops   = 2
+    samples = []            # seq.out every cycle while recording
+    state   = {"record": False, "stop": False}
+
+    def monitor():
+        while not state["stop"]:
+            if state["record"]:
+                samples.append((yield dut.seq.out))
+            yield
+
+    def host(trace):
+        bfm   = WishboneBFM(dut.master)
+        words = pattern_words(pattern)
+        for a, data in upload_plan(SEQ_MAP["seq"], words):
+            yield from bfm.burst_write(a, data)
+        back = [r.value for r in (yield from bfm.burst_read(SEQ_MAP["seq"], len(words)))]
+        print(f"  table upload ({len(words)} words in one burst), readback {'matches' if back == words else back}")
+        report(result, back == words, "table burst upload and readback", trace)
+
+        yield from bfm.write(addr["idle"], idle)
+        yield from bfm.write(addr["length"], len(pattern))
+        yield from bfm.write(addr["loops"], loops)
+        state["record"] = True
+        yield from bfm.write(addr["start"], 1)
+        for _ in range(pattern_cycles(pattern, loops) + 10):
+            yield
+        state["record"] = False
+        status = (yield from bfm.read(addr["status"])).value
+        passes = (yield from bfm.read(addr["loop_count"])).value
+        played = runs_of(samples)
+        print(f"  played: {played}")
+        ok = (played[0][0] == idle and played[-1][0] == idle and played[1:-1] == pattern * loops)
+        report(result, ok, "entries held for exactly their durations, back to back", trace)
+        print(f"  status=0x{status:x}, loop_count={passes}")
+        report(result, status == DONE and passes == loops, "stops with done after the loops", trace)
+
+        # loops = 0 plays until stop; stop returns to idle at once
+        yield from bfm.write(addr["loops"], 0)
+        yield from bfm.write(addr["start"], 1)
+        for _ in range(4 * pattern_cycles(pattern)):
+            yield
+        running = (yield from bfm.read(addr["status"])).value
+        passes  = (yield from bfm.read(addr["loop_count"])).value
+        yield from bfm.write(addr["stop"], 1)
+        out     = yield dut.seq.out
+        stopped = (yield from bfm.read(addr["status"])).value
+        print(f"  endless: status=0x{running:x} after {passes} passes; after stop status=0x{stopped:x}, out=0x{out:02x}")
+        report(result, running & RUNNING and passes >= 3 and not stopped & RUNNING and out == idle,
+               "endless loop and stop", trace)
+        state["stop"] = True
+
+    def gen(trace):
+        return [host(trace), monitor()]
+
+    simulate(result, dut, gen, signals=[dut.master, dut.seq.out])
+
+
+# ---------------------------------------------------------------------------
+# Test 18: input event FIFO, drained in bursts instead of polled
+# ---------------------------------------------------------------------------
+class EventTestBench(Module):
+    """EventFifo of the --events build on two inputs: CSRs at csr_map["ev"], window at EV_MAP["ev"]."""
+
+    def __init__(self, depth=8):
+        self.inputs = Signal(2)
+        self.cycle  = Signal(32)
+        self.sync  += self.cycle.eq(self.cycle + 1)
+        self.master = wishbone.Interface(data_width=32, adr_width=30)
+        self.submodules.ev = EventFifo(self.inputs, depth)
+
+        csr_wb = wishbone.Interface(data_width=32, adr_width=30)
+        self.submodules.decoder = WishboneErrDecoder(self.master, [
+            *[(name, base, size, csr_wb) for name, base, size in slot_regions(CSR_BASE, CSR_PAGING, CSR_MAP)],
+            ("ev", EV_MAP["ev"], self.ev.size, self.ev.bus),
+        ])
+        csr_if = csr_bus.Interface(data_width=32)
+        self.submodules.csr_bank = csr_bus.CSRBank(
+            self.ev.get_csrs(),
+            address=CSR_MAP["ev"],
+            paging=CSR_PAGING,
+            bus=csr_if,
+        )
+        self.submodules.wb2csr = Wishbone2CSR(bus_wishbone=csr_wb, bus_csr=csr_if)
+
+
+@suite.case("test18_event_fifo")
+def case_event_fifo(result):
+    """Exact timestamps, one-cycle pulses, edge masks, burst drain by level, overflow and clear."""
+    print("\n--- Test 18: Input event FIFO (commonLib/eventFifo.py) ---")
+    depth = 8
+    dut   = EventTestBench(depth)
+    addr  = csr_addresses("ev")
+
+    def drive(bfm, steps):
+        # (inputs, cycles held) in turn; returns the cycle of each change
+        changes = []
+        for value, hold in steps:
+            yield dut.inputs.eq(value)
+            changes.append((yield dut.cycle))
+            for _ in range(hold):
+                yield
+        for _ in range(4):                  # Through the synchroniser
+            yield
+        return changes
+
+    def drain(bfm):
+        level = (yield from bfm.read(addr["level"])).value
+        words = []
+        for a, n in event_read_plan(EV_MAP["ev"], level):
+            words += [r.value for r in (yield from bfm.burst_read(a, n))]
+        return level, words
+
+    def gen(trace):
+        bfm = WishboneBFM(dut.master)
+        # One-cycle pulse on input 0, input 1 up, both changing in one cycle, input 1 down
+        steps   = [(0b01, 1), (0b00, 7), (0b10, 5), (0b01, 12), (0b00, 3)]
+        changes = yield from drive(bfm, steps)
+        level, words = yield from drain(bfm)
+        events  = unwrap(decode_events(words))
+        states  = [v for v, _ in steps]
+        olds    = [0] + states[:-1]
+        ok = (level == len(steps) and [e.state for e in events] == states
+              and [e.changed for e in events] == [o ^ v for o, v in zip(olds, states)]
+              and [e.time - events[0].time for e in events] == [c - changes[0] for c in changes])
+        print(f"  level {level}, {len(words)} words in one burst")
+        print(f"  events (time from first, state, changed): "
+              f"{[(e.time - events[0].time, e.state, e.changed) for e in events]}")
+        print(f"  input changes at cycles (from first): {[c - changes[0] for c in changes]}")
+        report(result, ok, "every edge with its exact cycle, one-cycle pulse included", trace)
+
+        # An empty FIFO reads 0 (no valid bit): nothing decodes
+        empty = (yield from bfm.burst_read(EV_MAP["ev"], 4))
+        report(result, decode_events([r.value for r in empty]) == [], "empty reads decode to no events", trace)
+
+        # Falling edges of input 1 masked off
+        yield from bfm.write(addr["fall"], 0b01)
+        yield from drive(bfm, [(0b10, 3), (0b00, 3)])
+        level, words = yield from drain(bfm)
+        events = decode_events(words)
+        print(f"  fall masked for input 1: {[(e.state, e.changed) for e in events]}")
+        report(result, level == 1 and [(e.state, e.changed) for e in events] == [(0b10, 0b10)],
+               "edge masks", trace)
+
+        # More edges than the FIFO holds: the rest are counted as overflow
+        toggles = 3 * depth
+        before  = (yield from bfm.read(addr["events"])).value
+        yield from drive(bfm, [(n % 2, 2) for n in range(1, toggles + 1)])
+        level    = (yield from bfm.read(addr["level"])).value
+        recorded = (yield from bfm.read(addr["events"])).value
+        dropped  = (yield from bfm.read(addr["overflow"])).value
+        high     = (yield from bfm.read(addr["max_level"])).value
+        print(f"  {toggles} edges into {depth} entries: level {level}, events {recorded} "
+              f"({before} before), overflow {dropped}, max_level {high}")
+        report(result, recorded - before + dropped == toggles and level == recorded - before and high == level
+               and dropped > 0, "overflow counted", trace)
+
+        yield from bfm.write(addr["clear"], 1)
+        level   = (yield from bfm.read(addr["level"])).value
+        dropped = (yield from bfm.read(addr["overflow"])).value
+        print(f"  after clear: level {level}, overflow {dropped}")
+        report(result, level == 0 and dropped == 0, "clear", trace)
+
+    simulate(result, dut, gen, signals=[dut.master, dut.inputs])
+
+
+# ---------------------------------------------------------------------------
+# Test 19: notification frames merged into the bridge transmit stream
+# ---------------------------------------------------------------------------
+class NotifyTestBench(Module):
+    """NotifyChannel between a reply byte source and a UART that takes a byte every `period` cycles."""
+
+    def __init__(self):
+        self.button = Signal()
+        self.level  = Signal(2)
+        self.submodules.notify = NotifyChannel([("button_n", self.button), ("level", self.level)])
+
+
+class FakeSerial:
+    """Serial port double: returns the recorded transmit bytes, records what the client writes."""
+
+    def __init__(self, received):
+        self.received = bytearray(received)
+        self.written  = bytearray()
+
+    def write(self, data):
+        self.written += data
+
+    def read(self, n):
+        data, self.received = bytes(self.received[:n]), self.received[n:]
+        return data
+
+
+@suite.case("test19_notify_channel")
+def case_notify_channel(result):
+    """Replies unchanged when off; frames between reply bytes when on, decoded and dispatched."""
+    print("\n--- Test 19: Notification channel (commonLib/notifyChannel.py, notifyHost.py) ---")
+    dut    = NotifyTestBench()
+    ch     = dut.notify
+    period = 4                              # UART: one byte every 4 cycles
+    # Reply of a 4-word read, with bytes that need escaping
+    reply  = bytes([0x12, 0xC0, 0x34, 0xDB, 0xDB, 0xC0, 0x00, 0xFF, 0xC0, 0xC0, 0x55, 0xAA, 0x01, 0x02, 0xDB, 0x03])
+    sent   = {"off": bytearray(), "on": bytearray()}
+    phase  = {"name": "off"}
+
+    @passive
+    def uart():
+        n = 0
+        while True:
+            yield ch.source.ready.eq(n % period == 0)
+            yield
+            if (yield ch.source.valid) and (yield ch.source.ready):
+                sent[phase["name"]].append((yield ch.source.data))
+            n += 1
+
+    def feed(data):
+        for b in data:
+            yield ch.sink.valid.eq(1)
+            yield ch.sink.data.eq(b)
+            yield
+            while not (yield ch.sink.ready):
+                yield
+        yield ch.sink.valid.eq(0)
+
+    def host(trace):
+        # Off: a button change sends nothing, the reply passes through as is
+        yield dut.button.eq(1)
+        yield from feed(reply)
+        for _ in range(20 * period):
+            yield
+        print(f"  off: {len(sent['off'])} bytes, {'identical to' if bytes(sent['off']) == reply else 'differ from'} the reply")
+        report(result, bytes(sent["off"]) == reply, "channel off: replies unchanged, no frames", trace)
+
+        # On: status changes during the reply, one while a frame is on the wire
+        phase["name"] = "on"
+        yield ch.enable.storage.eq(1)
+        yield
+        for i, b in enumerate(reply):
+            if i == 2:
+                yield dut.button.eq(0)
+            if i == 3:
+                yield dut.level.eq(0b10)    # While the first frame is being sent: merged into the next
+            if i == 10:
+                yield dut.level.eq(0b11)
+            yield from feed([b])
+        for _ in range(80 * period):
+            yield
+        frames = yield ch.frames.status
+        print(f"  on: {len(sent['on'])} bytes for {len(reply)} reply bytes, {frames} frames")
+
+        data, notes = Decoder().feed(bytes(sent["on"]))
+        print(f"  decoded: reply {'intact' if data == reply else data.hex()}, "
+              f"frames {[(n.seq, hex(n.status), hex(n.changed)) for n in notes]}")
+        report(result, data == reply, "reply bytes recovered around the frames", trace)
+        changed = 0
+        for n in notes:
+            changed |= n.changed
+        report(result, len(notes) == frames and 1 <= frames <= 3 and changed == 0b111
+               and notes[-1].status == 0b110 and [n.seq for n in notes] == list(range(1, frames + 1)),
+               "every change reported, merged, final status", trace)
+
+        # Dispatcher: per-source callbacks with the new values
+        calls = []
+        d = Dispatcher(ch.description())
+        d.on("button_n", lambda name, value: calls.append((name, value)))
+        d.on("level",    lambda name, value: calls.append((name, value)))
+        for n in notes:
+            d.dispatch(n)
+        print(f"  callbacks: {calls}")
+        report(result, ("button_n", 0) in calls and calls[-1] == ("level", 3) and d.missed == 0,
+               "dispatcher callbacks", trace)
+
+        # Client: a 4-word read whose reply carries the frames, callbacks after the read
+        port   = FakeSerial(sent["on"])
+        client = NotifyClient(port, ch.description())
+        client.open()
+        got = []
+        client.on("level", lambda name, value: got.append(value))
+        words = client.read(0x40000400, 4)
+        expect = [int.from_bytes(reply[4 * i:4 * i + 4], "big") for i in range(4)]
+        print(f"  client read: {[hex(w) for w in words]}, level callbacks {got}")
+        report(result, words == expect and got and got[-1] == 3
+               and port.written == bytes([0x02, 4]) + (0x40000400 // 4).to_bytes(4, "big"),
+               "client read with frames in the reply", trace)
+
+    def gen(trace):
+        return [host(trace), uart()]
+
+    simulate(result, dut, gen, signals=[ch.sink, ch.source, dut.button, dut.level])
+
+
+# ---------------------------------------------------------------------------
+# Test 20: a source toggling faster than a frame takes to send does not starve replies
+# ---------------------------------------------------------------------------
+class FastNotifyTestBench(Module):
+    """NotifyChannel with a status bit that toggles every `toggle` cycles (e.g. the LED driven by the sequencer)."""
+
+    def __init__(self, toggle=16):
+        self.fast  = Signal()
+        self.count = Signal(max=toggle)
+        self.sync += If(self.count == toggle - 1,
+            self.count.eq(0),
+            self.fast.eq(~self.fast),
+        ).Else(
+            self.count.eq(self.count + 1),
+        )
+        self.submodules.notify = NotifyChannel([("fast", self.fast)])
+
+
+@suite.case("test20_notify_fast_source")
+def case_notify_fast_source(result):
+    """Frames and reply bytes take turns: a reply gets through however fast a source toggles."""
+    print("\n--- Test 20: Notification channel, source faster than the UART ---")
+    toggle = 16
+    dut    = FastNotifyTestBench(toggle)
+    ch     = dut.notify
+    period = 40                             # UART: one byte every 40 cycles
+    reply  = bytes([0x12, 0xC0, 0x34, 0xDB, 0x00, 0xFF, 0xC0, 0x55, 0xAA, 0x01, 0x02, 0xDB, 0x03, 0x04, 0x05, 0x06])
+    # Each reply byte waits for one frame at most: FRAME + payload, escapes included
+    limit  = len(reply) * (2 + 2 * PAYLOAD + 2) * period
+    sent   = bytearray()
+    state  = {"cycles": 0}
+
+    @passive
+    def uart():
+        n = 0
+        while True:
+            yield ch.source.ready.eq(n % period == 0)
+            yield
+            if (yield ch.source.valid) and (yield ch.source.ready):
+                sent.append((yield ch.source.data))
+            n += 1
+
+    def gen(trace):
+        yield ch.enable.storage.eq(1)
+        yield
+        for b in reply:
+            yield ch.sink.valid.eq(1)
+            yield ch.sink.data.eq(b)
+            yield
+            state["cycles"] += 1
+            while not (yield ch.sink.ready) and state["cycles"] < limit:
+                yield
+                state["cycles"] += 1
+        yield ch.sink.valid.eq(0)
+        for _ in range((2 * PAYLOAD + 2) * period):
+            yield
+        frames = yield ch.frames.status
+
+        # Stream as a sequence of reply bytes ("R") and frames ("F")
+        decoder, order = Decoder(), []
+        for b in sent:
+            data, notes = decoder.feed(bytes([b]))
+            order += ["R"] * len(data) + ["F"] * len(notes)
+        data, _ = Decoder().feed(bytes(sent))
+        runs = "".join(order).strip("F").split("R")
+        print(f"  {len(reply)} reply bytes in {state['cycles']} cycles (bound {limit}), "
+              f"{frames} frames, {len(sent)} bytes sent")
+        print(f"  order: {''.join(order)}")
+        report(result, data == reply and state["cycles"] < limit, "reply not starved by the frames", trace)
+        report(result, max(len(r) for r in runs) <= 1 and order.count("F") >= len(reply) - 1,
+               "one frame at most between reply bytes, frames still sent", trace)
+
+        # The host client gets its read reply instead of a TimeoutError
+        client = NotifyClient(FakeSerial(sent), ch.description())
+        client.open()
+        try:
+            words = client.read(0x40000400, 4)
+        except TimeoutError as e:
+            words = str(e)
+        expect = [int.from_bytes(reply[4 * i:4 * i + 4], "big") for i in range(4)]
+        print(f"  client read: {words if isinstance(words, str) else [hex(w) for w in words]}")
+        report(result, words == expect, "client read completes", trace)
+
+    def gen_all(trace):
+        return [gen(trace), uart()]
+
+    simulate(result, dut, gen_all, signals=[ch.sink, ch.source, dut.fast])
+
 
-    print(f"\n{'='*50}")
-    print(f"Results: {passed} passed, {failed} failed")
+def main():
+    global args
+    parser = argparse.ArgumentParser(description="LedPeripheral address decode testbench")
+    add_trace_arguments(parser, "test_address_decode.vcd")
+    add_runner_arguments(parser)
+    args = parser.parse_args()
+    raise SystemExit(suite.run(args))
 
 
-dut = TestBench()
-run_simulation(dut, run_test(dut), vcd_name="test_address_decode.vcd")
+if __name__ == "__main__":
+    main()
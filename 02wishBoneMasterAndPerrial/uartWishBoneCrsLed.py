@@ -13,37 +13,79 @@ Register map:
   ctrl        : location 0 → 0x40000000
   led_control : location 1 → 0x40000400
 
-"""
+  With --wishbone-regs the LED register bypasses the CSR bus and is mapped
+  as a zero-wait-state Wishbone register file (regs_map):
+  led_control : 0x40010000
 
-import os
+  With --perf-counters a PerfCounters peripheral (commonLib/perfCounters.py)
+  at location 2 → 0x40000800 counts cycles, bridge accesses and ACK latencies
+  and bridge bytes in / out; read it with commonLib/perfReport.py.
 
-from migen import *
-from litex.soc.integration.soc_core import SoCMini
-from litex.soc.integration.builder import Builder
-from litex.soc.interconnect.csr import AutoCSR, CSRStorage
-from litex_boards.platforms import olimex_gatemate_a1_evb
+  With --analyzer a logic analyzer (commonLib/logicAnalyzer.py) samples the
+  bridge bus strobes, the LED pin and the serial lines: la_* at location 3
+  → 0x40000C00, capture buffer at 0x40020000. Capture with
+  commonLib/laCapture.py and build/la.json.
 
-CLK_FREQ = int(10e6)
-BAUDRATE = 115200
+  With --sram-size BYTES block RAM is mapped at 0x40040000 (mem_map "sram");
+  commonLib/sramBench.py measures fill / readback throughput through the bridge.
 
+  With --sys-clk-freq HZ the sys clock comes from the CCGM1A1 PLL instead of
+  the 10 MHz oscillator (commonLib/gatemateCrg.py); the UART bridge divider,
+  CONFIG_CLOCK_FREQUENCY in csr.json and the nextpnr timing target follow it.
 
-# Create:
-#+--------------------------------------------+
-#|   LedPeripheral (AutoCSR peripheral)       |
-#|     - 1-bit CSR storage register           |
-#|     - "control" register at 0x40000400     |
-#|     - bit 0 -> LED (active low)            |
-#+--------------------------------------------+
-class LedPeripheral(Module, AutoCSR):
-    """CSR-mapped LED peripheral. Bit 0 of the control register drives the LED."""
+  With --gpio WIDTH a GpioPeripheral (gpioPeripheral.py) at location 4 →
+  0x40001000 adds a WIDTH-bit output bank with atomic set / clr / toggle /
+  masked writes and samples user_btn_n into gpio_in. The board has one LED
+  and one button: gpio_out bit 0 lights the LED too (or-ed with led_control),
+  the other outputs stay internal.
+
+  With --sequencer DEPTH a PatternSequencer (commonLib/patternSequencer.py)
+  plays a table of DEPTH (value, duration) entries from block RAM at clock
+  rate: seq_* at location 5 → 0x40001400, table at 0x40030000. Bit 0 lights
+  the LED too; upload and start with commonLib/patternPlay.py.
 
-    def __init__(self, led):
-        # 1-bit CSR register, directly accessible from the host via litex_server
-        self.control = CSRStorage(1, name="control", description="LED control (bit 0: 1=on, 0=off)")
+  With --events DEPTH an EventFifo (commonLib/eventFifo.py) records the
+  edges of user_btn_n with a cycle timestamp in a DEPTH-entry FIFO: ev_* at
+  location 6 → 0x40001800, read window at 0x40038000. Drain it with
+  commonLib/eventDrain.py instead of polling the button.
 
-        # Active-low LED: reg=1 → pin driven low → LED on
-        self.comb += led.eq(~self.control.storage)
+  With --notify a NotifyChannel (commonLib/notifyChannel.py) on the bridge's
+  transmit stream sends an event frame whenever the button, the LED or the
+  event FIFO / sequencer status changes: notify_* at location 7 →
+  0x40001C00, bit layout in build/notify.json. Off until the host sets
+  notify_enable; commonLib/notifyHost.py then owns the serial port and
+  calls back on each change instead of polling.
+
+"""
+
+import argparse
+import os
+import sys
+from functools import reduce
+from operator import or_
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from migen import *
+from litex.soc.integration.soc_core import SoCMini
+from commonLib.wishboneDecoder import add_guarded_master
+from commonLib.wishboneRegisters import add_wishbone_csr_peripheral
+from commonLib.elabCache import add_cache_arguments, build_cached
+from commonLib.csrGen import write_register_map
+from commonLib.perfCounters import add_perf_counters
+from commonLib.logicAnalyzer import add_logic_analyzer, write_description
+from commonLib.patternSequencer import add_pattern_sequencer
+from commonLib.eventFifo import add_event_fifo
+from commonLib.notifyChannel import NotifyChannel, write_description as write_notify_description
+from commonLib.gatemateCrg import GateMateCRG, check_sys_clk_freq
+from ledMap import (
+    BAUDRATE, CLK_FREQ, CSR_MAP, CSR_PAGING, EV_MAP, EV_MAX_DEPTH, LA_DEPTH, LA_MAP, MEM_MAP, REGS_MAP,
+    SEQ_MAP, SEQ_MAX_DEPTH, SEQ_WIDTH, SRAM_MAX_SIZE,
+)
+from ledPeripheral import LedPeripheral
+from gpioPeripheral import MAX_WIDTH as GPIO_MAX_WIDTH, GpioPeripheral
 
+# Builder, UARTWishboneBridge and the board platform are imported where they
+# are used: importing this module only costs SoCMini.
 
 
 # Create:
@@ -61,58 +103,197 @@ class LedPeripheral(Module, AutoCSR):
 #|    @ 0x40000400                    |
 #+------------------------------------+
 class Top(SoCMini):
-    # Set CSR region base address to 0x40000000
-    mem_map = {
-        **SoCMini.mem_map,
-        "csr": 0x40000000,
-    }
-
-    # Explicitly assign CSR location slots per peripheral
-    # Address = 0x40000000 + location × 0x400
-    csr_map = {
-        "ctrl": 0,   # 0x40000000
-        "led":  1,   # 0x40000400
-    }
-
-    def __init__(self, platform):
+    # Address maps live in ledMap.py: CSR region at 0x40000000, one
+    # 0x400 location slot per peripheral, register files above the CSR window
+    mem_map  = {**SoCMini.mem_map, **MEM_MAP}
+    csr_map  = CSR_MAP
+    regs_map = REGS_MAP
+    la_map   = LA_MAP
+    seq_map  = SEQ_MAP
+    ev_map   = EV_MAP
+
+    def __init__(self, platform, wishbone_regs=False, perf_counters=False, analyzer=False,
+                 sram_size=0, sys_clk_freq=CLK_FREQ, gpio=0, sequencer=0, events=0, notify=False):
+        # sys clock from the 10 MHz oscillator, through the PLL for any other frequency
+        self.submodules.crg = GateMateCRG(platform, sys_clk_freq)
+
         # Initialize SoCMini with UART Wishbone bridge as the bus master.
         SoCMini.__init__(
             self,
             platform,
-            clk_freq=CLK_FREQ,
+            clk_freq=self.crg.sys_clk_freq,
             uart_name="crossover",
             csr_address_width=14,
-            csr_paging=0x400,
+            csr_paging=CSR_PAGING,
         )
 
         # UART-to-Wishbone bridge — host PC becomes bus master
-        from litex.soc.cores.uart import UARTWishboneBridge
+        from litex.soc.cores.uart import RS232PHY, Stream2Wishbone, UARTWishboneBridge
         serial = platform.request("serial")
-        self.submodules.bridge = UARTWishboneBridge(
-            pads=serial, clk_freq=CLK_FREQ, baudrate=BAUDRATE,
-        )
-        self.bus.add_master(name="bridge", master=self.bridge.wishbone)
+        if notify:
+            # Same bridge, its transmit stream through the notification channel (wired below)
+            self.submodules.bridge_phy = RS232PHY(serial, self.sys_clk_freq, BAUDRATE)
+            self.submodules.bridge     = Stream2Wishbone(clk_freq=self.sys_clk_freq)
+            self.comb += self.bridge_phy.source.connect(self.bridge.sink)
+        else:
+            self.submodules.bridge = UARTWishboneBridge(
+                pads=serial, clk_freq=self.sys_clk_freq, baudrate=BAUDRATE,
+            )
 
-        # LED peripheral — auto-registered as CSR peripheral via AutoCSR
         led_pin = platform.request("user_led_n", 0)
-        self.submodules.led = LedPeripheral(led_pin)
+        led_n   = Signal()
+        if wishbone_regs:
+            # LED peripheral — Wishbone-native register file, no Wishbone2CSR wait states
+            add_wishbone_csr_peripheral(self, "led", LedPeripheral(led_n), self.regs_map["led"])
+        else:
+            # LED peripheral — auto-registered as CSR peripheral via AutoCSR
+            self.submodules.led = LedPeripheral(led_n)
+
+        # Active-low LED, on while any of its sources is: led_control, and bit 0
+        # of the GPIO bank and of the pattern sequencer when present
+        led_on = [~led_n]
+        button = platform.request("user_btn_n", 0) if gpio or events or notify else None
+        if gpio:
+            # GPIO bank, the button is input 0
+            self.submodules.gpio = GpioPeripheral(gpio, inputs=button)
+            led_on.append(self.gpio.out[0])
+        if sequencer:
+            # Pattern table in block RAM, played at clock rate; uploaded with bridge bursts
+            if sequencer > SEQ_MAX_DEPTH or sequencer & (sequencer - 1):
+                raise ValueError(f"sequencer depth {sequencer}: a power of two up to {SEQ_MAX_DEPTH}")
+            add_pattern_sequencer(self, "seq", self.seq_map["seq"], width=SEQ_WIDTH, depth=sequencer)
+            led_on.append(self.seq.out[0])
+        led_lit = Signal()
+        self.comb += [
+            led_lit.eq(reduce(or_, led_on)),
+            led_pin.eq(~led_lit),
+        ]
+
+        if events:
+            # Timestamped button edges, drained by the host in bursts instead of polled
+            if events > EV_MAX_DEPTH or events & (events - 1):
+                raise ValueError(f"events depth {events}: a power of two up to {EV_MAX_DEPTH}")
+            add_event_fifo(self, "ev", button, self.ev_map["ev"], depth=events)
+
+        if notify:
+            # Status bits whose changes are pushed to the host (bit layout: notify.json)
+            sources = [("button_n", button), ("led", led_lit)]
+            if events:
+                sources += [("ev_pending", self.ev.level.status != 0), ("ev_overflow", self.ev.overflow.status != 0)]
+            if sequencer:
+                sources += [("seq_running", self.seq.status.status[0]), ("seq_done", self.seq.status.status[1])]
+            self.submodules.notify = NotifyChannel(sources)
+            self.comb += [
+                self.bridge.source.connect(self.notify.sink),
+                self.notify.source.connect(self.bridge_phy.sink),
+            ]
+
+        if sram_size:
+            # Block RAM on the SoC bus: the host fills / reads it with bridge bursts
+            # (commonLib/sramBench.py), other bus masters read it at bus speed
+            if sram_size > SRAM_MAX_SIZE:
+                raise ValueError(f"sram_size 0x{sram_size:x} exceeds 0x{SRAM_MAX_SIZE:x}")
+            self.add_ram("sram", self.mem_map["sram"], sram_size)
+
+        if analyzer:
+            # Bridge side of the bus, the LED pin and the UART lines, one sample per sys_clk cycle
+            bus = self.bridge.wishbone
+            add_logic_analyzer(self, "la", [
+                ("bridge_cyc", bus.cyc), ("bridge_stb", bus.stb),
+                ("bridge_we",  bus.we),  ("bridge_ack", bus.ack),
+                ("led_n",      led_pin),
+                ("uart_rx",    serial.rx), ("uart_tx", serial.tx),
+            ], self.la_map["la"], depth=LA_DEPTH)
+
+        # Bridge enters the SoC bus through a watchdog + error decoder: addresses
+        # outside the SoC regions ("csr", plus "led" with wishbone_regs, "la"
+        # with analyzer, "sram" with sram_size, "seq" with sequencer, "ev" with
+        # events) answer 0xDEADC0DE at once instead of being ACKed by the CSR bridge
+        add_guarded_master(self, "bridge", self.bridge.wishbone)
+
+        if perf_counters:
+            # Host-side view of the bridge, before the watchdog
+            add_perf_counters(self,
+                buses   = [("bridge", self.bridge.wishbone)],
+                streams = [("bridge_rx_bytes", self.bridge.sink), ("bridge_tx_bytes", self.bridge.source)],
+            )
 
 
 # ------------------
 # Build  The System 
 # ------------------
 def main():
+	from litex.soc.integration.builder import Builder
+	from litex_boards.platforms import olimex_gatemate_a1_evb
+
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--wishbone-regs", action="store_true",
+		help="Map the LED register as a Wishbone-native register file instead of a CSR")
+	parser.add_argument("--perf-counters", action="store_true",
+		help="Add the PerfCounters peripheral (cycles, bridge accesses / latency / bytes)")
+	parser.add_argument("--analyzer", action="store_true",
+		help="Add the logic analyzer (capture with commonLib/laCapture.py)")
+	parser.add_argument("--sys-clk-freq", type=float, default=CLK_FREQ,
+		help="sys clock in Hz; anything but the 10 MHz oscillator uses the PLL")
+	parser.add_argument("--sram-size", type=lambda x: int(x, 0), default=0,
+		help=f"Add this many bytes of block-RAM SRAM at 0x40040000 (max 0x{SRAM_MAX_SIZE:x})")
+	parser.add_argument("--gpio", type=int, default=0, metavar="WIDTH",
+		help=f"Add a WIDTH-bit GPIO bank with set / clr / toggle / masked writes at 0x40001000 (1..{GPIO_MAX_WIDTH})")
+	parser.add_argument("--sequencer", type=int, default=0, metavar="DEPTH",
+		help=f"Add a pattern sequencer with a DEPTH-entry table at 0x40030000 (power of two, max {SEQ_MAX_DEPTH})")
+	parser.add_argument("--events", type=int, default=0, metavar="DEPTH",
+		help=f"Add a DEPTH-entry timestamped event FIFO on the button, window at 0x40038000 (power of two, max {EV_MAX_DEPTH})")
+	parser.add_argument("--notify", action="store_true",
+		help="Push event frames on status changes over the bridge (host side: commonLib/notifyHost.py)")
+	parser.add_argument("--reference-map", action="store_true",
+		help="Also rewrite the committed reference map ledRegs.py that the testbenches import (forces a rebuild)")
+	add_cache_arguments(parser)
+	args = parser.parse_args()
+	if args.sram_size > SRAM_MAX_SIZE:
+		parser.error(f"--sram-size: at most 0x{SRAM_MAX_SIZE:x} bytes")
+	if args.gpio and not 1 <= args.gpio <= GPIO_MAX_WIDTH:
+		parser.error(f"--gpio: 1..{GPIO_MAX_WIDTH} bits")
+	if args.sequencer and (args.sequencer > SEQ_MAX_DEPTH or args.sequencer & (args.sequencer - 1)):
+		parser.error(f"--sequencer: a power of two up to {SEQ_MAX_DEPTH}")
+	if args.events and (args.events > EV_MAX_DEPTH or args.events & (args.events - 1)):
+		parser.error(f"--events: a power of two up to {EV_MAX_DEPTH}")
+	try:
+		check_sys_clk_freq(args.sys_clk_freq)
+	except ValueError as e:
+		parser.error(f"--sys-clk-freq: {e}")
 
 	#Select dev-board to run the example
 	platform = olimex_gatemate_a1_evb.Platform()
-	soc = Top(platform)
+	bitstream = "build/gateware/olimex_gatemate_a1_evb_00.cfg"
 
-	# Use Builder to generate csr.csv and other exports
-	builder = Builder(soc, output_dir="build", compile_gateware=True, compile_software=False)
-	builder.build()
+	# Use Builder to generate csr.csv / csr.json / csr.svd and the register map.
+	# Skipped, elaboration included, when sources and options are unchanged since the last build
+	def build():
+		soc = Top(platform, wishbone_regs=args.wishbone_regs, perf_counters=args.perf_counters,
+			analyzer=args.analyzer, sram_size=args.sram_size,
+			sys_clk_freq=int(args.sys_clk_freq), gpio=args.gpio,
+			sequencer=args.sequencer, events=args.events, notify=args.notify)
+		builder = Builder(soc, output_dir="build", compile_gateware=True, compile_software=False,
+			csr_csv="build/csr.csv", csr_json="build/csr.json", csr_svd="build/csr.svd")
+		builder.build()
+		if args.analyzer:
+			# Probe list for commonLib/laCapture.py
+			write_description(soc.la, "build/la.json")
+		if args.notify:
+			# Status bit layout for commonLib/notifyHost.py
+			write_notify_description(soc.notify, "build/notify.json")
+		# Typed register map of this build for host scripts (commonLib/csrAccess.py)
+		write_register_map("build/csr.json", "build/ledRegs.py", "LedRegs", svd_path="build/csr.svd", soc=soc)
+		if args.reference_map:
+			write_register_map("build/csr.json", "ledRegs.py", "LedRegs", svd_path="build/csr.svd", soc=soc)
+	build_cached("build", build, params={"wishbone_regs": args.wishbone_regs, "perf_counters": args.perf_counters,
+		"analyzer": args.analyzer, "sram_size": args.sram_size, "sys_clk_freq": int(args.sys_clk_freq),
+		"gpio": args.gpio, "sequencer": args.sequencer,
+		"events": args.events, "notify": args.notify}, outputs=[bitstream],
+		force=args.rebuild or args.reference_map)
 
 	# Program the chip
-	platform.create_programmer().load_bitstream("build/gateware/olimex_gatemate_a1_evb_00.cfg")
+	platform.create_programmer().load_bitstream(bitstream)
 
 if __name__ == "__main__":
     main()
@@ -5,9 +5,11 @@ Wishbone LED blink — UART bridge with address-decoded LED peripheral.
 The host PC acts as bus master via UART Wishbone bridge.
 LED peripheral is mapped at 0x40000400 (bit 0 controls the LED).
 
-Address decoding is handled inside the slave: every transaction gets an ACK
-(preventing bus hangs per https://github.com/enjoy-digital/litex/issues/82),
-but only writes to the 0x40000400 region update the LED register.
+Address decoding is done by a table-driven WishboneErrDecoder in front of the
+slave: only 0x40000400 reaches WishboneLed, every other address is answered
+with a bus error within one cycle. A WishboneWatchdog turns errors (and
+accesses that are never ACKed) into an immediate ACK returning 0xDEADC0DE, so
+the UART bridge never hangs (see https://github.com/enjoy-digital/litex/issues/82).
 
 Build:  python wishBoneBlink.py
 Server: litex_server --uart --uart-port=/dev/ttyUSBx
@@ -15,11 +17,13 @@ Control: python ledControl.py
 """
 
 import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 
 from migen import *
 from litex.soc.interconnect import wishbone
-from litex.soc.cores.uart import UARTWishboneBridge
-from litex_boards.platforms import olimex_gatemate_a1_evb
+from commonLib.wishboneDecoder import WishboneErrDecoder, WishboneWatchdog
+from commonLib.elabCache import build_cached
 
 CLK_FREQ = int(10e6)
 BAUDRATE = 115200
@@ -27,6 +31,9 @@ BAUDRATE = 115200
 # Word address for 0x40000000 region: top 4 bits of 30-bit word address
 ADDR_LED_REGION = 0b0100
 
+# LED register byte address — the only entry in the Top decoder table
+ADDR_LED = 0x40000400
+
 
 #Create:
 #+-------------------------------------+
@@ -38,7 +45,9 @@ ADDR_LED_REGION = 0b0100
 class WishboneLed(Module):
     """Wishbone slave with built-in address decoding.
 
-    Always ACKs every transaction to prevent bus hangs on unmapped addresses.
+    Always ACKs every transaction it receives. In Top it sits behind a
+    WishboneErrDecoder, so it only sees accesses to its own address; used
+    standalone, this still prevents bus hangs on unmapped addresses.
     Only updates the LED register for writes to the 0x40000400 address.
     """
 
@@ -71,6 +80,7 @@ class WishboneLed(Module):
                 # :: Warning ::
                 # Unmatched address → is ACK and so bus would hang  not hang if user acces wrong address region
                 #   Problem We ACK addresses that does not belog to us (might cause timing issues)
+                #   Top avoids this by placing a WishboneErrDecoder in front of this slave
 
                 # If this is a write transaction (WE asserted) and the bus-address matches 0x40000400
                 If(self.bus.we & addr_match,                  
@@ -96,9 +106,16 @@ class WishboneLed(Module):
 #| UARTWishboneBridge                 |
 #|   (Wishbone master)                |
 #|        |                           |
-#|        | Wishbone bus (direct)     |
 #|        v                           |
-#|   WishboneLed (slave)              |
+#|   WishboneWatchdog                 |
+#|     err/timeout -> ack 0xDEADC0DE  |
+#|        |                           |
+#|        v                           |
+#|   WishboneErrDecoder               |
+#|     unmapped address -> err        |
+#|        |                           |
+#|        v                           |
+#|   WishboneLed (slave) @ 0x40000400 |
 #+------------------------------------+
 class Top(Module):
     def __init__(self, platform):
@@ -111,32 +128,45 @@ class Top(Module):
 
         # Create a USRT that is connected to the WishBoneBus
         # UART Wishbone bridge — host PC becomes bus master
+        from litex.soc.cores.uart import UARTWishboneBridge
         self.submodules.bridge = bridge = UARTWishboneBridge(
             pads=serial, clk_freq=CLK_FREQ, baudrate=BAUDRATE,
         )
 
         # Connect the module led
-        # LED peripheral — direct connection, address decoding is internal
         # Create the WishboneLed module led_priph and add it to the submodules
         self.submodules.led = led_periph = WishboneLed(led)
-        #connect the WishboneLed module to the WishBoneBus
-        self.comb += bridge.wishbone.connect(led_periph.bus)
+
+        # Watchdog between the bridge and the bus: the bridge only understands ACK,
+        # so bus errors and missing ACKs are turned into an ACK with 0xDEADC0DE
+        bus = wishbone.Interface(data_width=32, adr_width=30)
+        self.submodules.watchdog = WishboneWatchdog(bridge.wishbone, bus)
+
+        # Address decoder: only the 4-byte LED register is mapped, all other
+        # addresses get a bus error instead of being ACKed by WishboneLed
+        self.submodules.decoder = WishboneErrDecoder(bus, [
+            ("led", ADDR_LED, 4, led_periph.bus),
+        ])
 
 # ------------------
 # Build  The System 
 # ------------------
 def main():
+    from litex_boards.platforms import olimex_gatemate_a1_evb
 
     platform = olimex_gatemate_a1_evb.Platform()
 
     # get the build directory
     build_dir = os.getcwd() + "/build"
 
-    # build the design
-    platform.build(Top(platform), build_dir)
+    bitstream = build_dir + "/top_00.cfg"
+
+    # build the design; skipped, elaboration included, when the sources are
+    # unchanged since the last build (delete build/.elab_key to force it)
+    build_cached(build_dir, lambda: platform.build(Top(platform), build_dir), outputs=[bitstream])
 
     # program the chip
-    platform.create_programmer().load_bitstream(build_dir + "/top_00.cfg")
+    platform.create_programmer().load_bitstream(bitstream)
     
 if __name__ == "__main__":
     main()
@@ -7,51 +7,90 @@ Usage:
   2. Start the LiteX server:       litex_server --uart --uart-port=/dev/ttyUSBX
   3. Run this script:               python ledControl.py
 
+Registers go through the map of the last build (build/ledRegs.py, else the
+reference map ledRegs.py) with the shadow cache (commonLib/csrAccess.py):
+led_control and ctrl_scratch are CSRStorage, so a read of a known value is
+answered from the cache. This script checks the hardware, so verify_every=1
+reads every write back over the bridge and compares it with the value
+written; a mismatch raises ShadowMismatch. The value printed after each
+write is that verified readback.
+
+With --trace FILE / --chrome-trace FILE every bridge transaction is timed
+(commonLib/bridgeTrace.py); the summary is printed and the files rewritten
+after each round of the loop.
+
 NB !
-If you tries to access an andress that is not mapped to any periprihals, the WishBoneBus would hang waiting for an ack
+Accesses to addresses that are not mapped to any peripheral get a bus error from
+the address decoder; the bridge watchdog turns it into an ACK and reads return 0xDEADC0DE.
 
 """
+import argparse
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+# Register map of the last build (build/ledRegs.py) if there is one, else the reference map
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "build"))
+
 from litex import RemoteClient
+from ledRegs import LedRegs
+from commonLib.bridgeTrace import TracingClient
+
+parser = argparse.ArgumentParser(description="LED peripheral check over the UART bridge")
+parser.add_argument("--trace", metavar="FILE", help="Write the timed bridge transactions as JSON")
+parser.add_argument("--chrome-trace", metavar="FILE", help="Write them as a Chrome trace (chrome://tracing)")
+args = parser.parse_args()
 
 wb = RemoteClient()
+if args.trace or args.chrome_trace:
+    wb = TracingClient(wb, names=LedRegs)
 wb.open()
+regs = LedRegs(wb, cache=True, verify_every=1)
 
 while(True):
-   addr=0x40000400
+   reg=regs.led_control
+   addr=reg.addr
    print(f" Write 0x01 to address 0x{addr:08x}  — turns the LED on - please verify")
-   wb.write(addr, 0x1)
+   reg.write(0x1)
 
-   # Read back to verify
-   value = wb.read(addr)
+   # Read back to verify: the write was read back from the hardware (verify_every=1)
+   value = reg.read()
    print(f"LED register = 0x{value:08x} (bit0={'ON' if value & 1 else 'OFF'})")
 
    input("Press Enter to continue...")
    print("Turn led off -- please verify")
-   wb.write(addr, 0x0)
+   reg.write(0x0)
 
-   # Read back to verify
-   value = wb.read(addr)
+   # Read back to verify: the write was read back from the hardware (verify_every=1)
+   value = reg.read()
    print(f"LED register = 0x{value:08x} (bit0={'ON' if value & 1 else 'OFF'})")
 
    input("Press Enter to continue...")
 
    ####
 
-   addr=0x40000004
+   reg=regs.ctrl_scratch
+   addr=reg.addr
    print(f" Write 0x01 to address 0x{addr:08x}  — No I/O is connected (Led shoudl not change state - please verify")
-   wb.write(addr, 0x1)
+   reg.write(0x1)
 
-   # Read back to verify
-   value = wb.read(addr)
+   # Read back to verify: the write was read back from the hardware (verify_every=1)
+   value = reg.read()
    print(f"Readback the  register = 0x{value:08x} (bit0={'ON' if value & 1 else 'OFF'})")
 
    input("Press Enter to continue...")
    print(f" Write 0x00 to address 0x{addr:08x}  — No I/O is connected (Led shoudl not change state - please verify")
-   wb.write(addr, 0x0)
+   reg.write(0x0)
 
-   # Read back to verify
-   value = wb.read(addr)
+   # Read back to verify: the write was read back from the hardware (verify_every=1)
+   value = reg.read()
    print(f"Readback the  register = 0x{value:08x} (bit0={'ON' if value & 1 else 'OFF'})")
    input("Press Enter to continue...")
+   print(f"Bridge round trips: {regs.round_trips}, served by the cache: {regs.cache_hits}")
+   if isinstance(wb, TracingClient):
+      print(wb.format_summary())
+      if args.trace:
+         wb.write_json(args.trace)
+      if args.chrome_trace:
+         wb.write_chrome_trace(args.chrome_trace)
 
 wb.close()
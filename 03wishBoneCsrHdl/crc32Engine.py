@@ -0,0 +1,200 @@
+"""
+CRC32 accumulators taking several bytes per cycle, for wide datapaths.
+
+Two engines with the same interface, picked at elaboration time:
+
+  "xor"   next accumulator value from an XOR network over the accumulator
+          and the data bits (what hdl/crc.v does for one byte, generated
+          here for any width). Grows with the width: the widest output bit
+          XORs 14 inputs at 1 byte, 34 at 4 bytes, 52 at 8 bytes, and every
+          byte count up to the width needs its own network.
+  "bram"  slice-by-N: one 256 × 32 lookup table per byte lane in block RAM,
+          the lane outputs XORed together. Logic stays at an N-input XOR per
+          output bit; the block RAM read sits in the accumulator loop.
+
+    engine = CRC32Engine(width=4, engine="bram")
+    # engine.data (8 × width), engine.nbytes (1..width), engine.we, engine.clear
+    # engine.crc: accumulator (not inverted), updated the cycle after `we`
+
+Bytes go in little-endian order (data[0:8] first), as zlib.crc32 reads them
+from memory. CRC32StepEngine puts the same interface around a one-byte
+combinatorial step such as the `crc` black box.
+
+The table and XOR-term helpers are plain Python (shared with the testbench
+and crcEngineReport.py).
+"""
+
+from functools import reduce
+from operator import xor
+
+from migen import *
+
+ENGINES = ("xor", "bram")
+WIDTHS  = (1, 2, 4, 8)          # Bytes per cycle
+
+POLY = 0xEDB88320               # Reflected CRC32 polynomial (zlib)
+
+
+def crc32_tables(n):
+    """Slice-by-n tables: tables[k][i] advances byte i through k more zero bytes."""
+    t0 = []
+    for i in range(256):
+        c = i
+        for _ in range(8):
+            c = (c >> 1) ^ (POLY if c & 1 else 0)
+        t0.append(c)
+    tables = [t0]
+    for _ in range(1, n):
+        tables.append([(c >> 8) ^ t0[c & 0xFF] for c in tables[-1]])
+    return tables
+
+
+def crc32_update(crc, data, nbytes, tables=None):
+    """Accumulator after the low `nbytes` bytes of `data` (no initial / final XOR)."""
+    tables = tables or crc32_tables(nbytes)
+    x      = crc ^ (data & ((1 << 8 * nbytes) - 1))
+    crc    = crc >> 8 * nbytes if nbytes < 4 else 0
+    for k in range(nbytes):
+        crc ^= tables[nbytes - 1 - k][(x >> 8 * k) & 0xFF]
+    return crc
+
+
+def xor_terms(nbytes):
+    """Per accumulator bit: (mask of accumulator bits, mask of data bits) XORed into it."""
+    tables = crc32_tables(nbytes)
+    crc_cols  = [crc32_update(1 << i, 0, nbytes, tables) for i in range(32)]
+    data_cols = [crc32_update(0, 1 << i, nbytes, tables) for i in range(8 * nbytes)]
+    return [(sum(1 << i for i, col in enumerate(crc_cols) if col >> bit & 1),
+             sum(1 << i for i, col in enumerate(data_cols) if col >> bit & 1)) for bit in range(32)]
+
+
+def engine_resources(engine, width):
+    """Structural size of an engine before synthesis.
+
+    xor_inputs : inputs of the widest XOR (logic depth of the accumulator loop)
+    xor_gates  : two-input XORs in total, without sharing between bits
+    bram_bits  : lookup table bits
+    """
+    if engine == "xor":
+        terms = [bin(c).count("1") + bin(d).count("1")
+                 for m in range(1, width + 1) for c, d in xor_terms(m)]
+        return {"xor_inputs": max(terms), "xor_gates": sum(t - 1 for t in terms), "bram_bits": 0}
+    inputs = width + (1 if width < 4 else 0)       # Lanes, plus the shifted accumulator
+    return {"xor_inputs": inputs, "xor_gates": 32 * (inputs - 1) + 8 * width, "bram_bits": width * 256 * 32}
+
+
+# Create:
+#+----------------------------------------------+
+#|   CRC32Engine                                |
+#|     data (8 × width), nbytes, we, clear      |
+#|     "xor" : XOR network → accumulator        |
+#|     "bram": crc ^ data → N table lookups     |
+#|             (block RAM) → XOR → accumulator  |
+#+----------------------------------------------+
+class CRC32Engine(Module):
+    """CRC32 accumulator consuming 1..`width` bytes per cycle.
+
+    data   : 8 × width bits, first byte in the LSBs
+    nbytes : bytes of `data` to consume with `we` (1..width; fixed at 1 for width 1)
+    we     : consume `data` this cycle
+    clear  : restore 0xFFFFFFFF (takes priority over `we`)
+    crc    : accumulator, valid the cycle after `we` / `clear`
+    """
+
+    def __init__(self, width=1, engine="xor"):
+        if engine not in ENGINES:
+            raise ValueError(f"CRC32 engine '{engine}': use one of {', '.join(ENGINES)}")
+        if width not in WIDTHS:
+            raise ValueError(f"CRC32 engine width {width}: use one of {', '.join(map(str, WIDTHS))} bytes")
+        self.width  = width
+        self.engine = engine
+        self.data   = Signal(8 * width)
+        self.nbytes = Signal(max=width + 1, reset=width)
+        self.we     = Signal()
+        self.clear  = Signal()
+        self.crc    = Signal(32)
+
+        # # #
+
+        nbytes = self.nbytes if width > 1 else 1
+        if engine == "xor":
+            acc = Signal(32, reset=0xFFFFFFFF)
+            # One XOR network per byte count, selected by nbytes
+            steps = []
+            for m in range(1, width + 1):
+                step = Signal(32)
+                self.comb += [step[bit].eq(reduce(xor,
+                    [acc[i] for i in range(32) if c >> i & 1] + [self.data[i] for i in range(8 * m) if d >> i & 1]))
+                    for bit, (c, d) in enumerate(xor_terms(m))]
+                steps.append(step)
+            self.sync += If(self.clear,
+                acc.eq(0xFFFFFFFF),
+            ).Elif(self.we,
+                acc.eq(Array(steps)[nbytes - 1] if width > 1 else steps[0]),
+            )
+            self.comb += self.crc.eq(acc)
+            return
+
+        # "bram": the table reads are synchronous, so the accumulator of the cycle
+        # after `we` is the XOR of the read ports; it is registered (`acc`) when idle
+        acc    = Signal(32, reset=0xFFFFFFFF)
+        looked = Signal()                       # Read ports hold a lookup of last cycle
+        rest   = Signal(32)                     # Accumulator bits shifted past the data (< 4 bytes)
+        lanes  = Signal(width)                  # Tables used by that lookup
+        x      = Signal(8 * width)
+        self.comb += x.eq(self.data ^ self.crc)
+        x_bytes = [x[8 * k:8 * (k + 1)] for k in range(width)]
+
+        lookups = []
+        for j, table in enumerate(crc32_tables(width)):
+            mem  = Memory(32, 256, init=table, name=f"crc32_table{j}")
+            port = mem.get_port()               # Synchronous read
+            self.specials += mem, port
+            # With m bytes, byte k is advanced through m - 1 - k more bytes: table m - 1 - k
+            self.comb += port.adr.eq(Array(x_bytes[m - 1 - j] if j < m else 0
+                                           for m in range(1, width + 1))[nbytes - 1]
+                                     if width > 1 else x_bytes[0])
+            lookups.append(Mux(lanes[j], port.dat_r, 0))
+
+        shifted = [self.crc >> 8 * m if m < 4 else 0 for m in range(1, width + 1)]
+        self.comb += self.crc.eq(Mux(looked, reduce(xor, lookups, rest), acc))
+        self.sync += [
+            acc.eq(self.crc),
+            If(self.clear,
+                acc.eq(0xFFFFFFFF),
+                looked.eq(0),
+            ).Else(
+                looked.eq(self.we),
+                rest.eq(Array(shifted)[nbytes - 1] if width > 1 else shifted[0]),
+                lanes.eq(Array((1 << m) - 1 for m in range(1, width + 1))[nbytes - 1] if width > 1 else 1),
+            ),
+        ]
+
+
+# Create:
+#+----------------------------------------------+
+#|   CRC32StepEngine                            |
+#|     CRC32Engine interface, one byte,         |
+#|     around a combinatorial step              |
+#|     (crc black box / MigenCRC32Step)         |
+#+----------------------------------------------+
+class CRC32StepEngine(Module):
+    """One byte per cycle through an external step: wire crc → crcIn, data → data, crcOut → crc_out."""
+
+    def __init__(self):
+        self.width   = 1
+        self.engine  = "hdl"
+        self.data    = Signal(8)
+        self.nbytes  = Signal(reset=1)
+        self.we      = Signal()
+        self.clear   = Signal()
+        self.crc     = Signal(32, reset=0xFFFFFFFF)
+        self.crc_out = Signal(32)
+
+        # # #
+
+        self.sync += If(self.clear,
+            self.crc.eq(0xFFFFFFFF),
+        ).Elif(self.we,
+            self.crc.eq(self.crc_out),
+        )
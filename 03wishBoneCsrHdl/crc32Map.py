@@ -0,0 +1,68 @@
+"""
+Address map of the CRC32 SoC (wishBoneCrsCrc32Verilog.py / wishBoneCrsCrc32Vhdl.py).
+
+Plain constants with no Migen / LiteX imports, so testbenches and host
+scripts can use the register addresses without elaborating (or importing)
+the SoC.
+
+  Address = CSR_BASE + CSR_MAP[peripheral] × CSR_PAGING
+  ctrl            : location 0 → 0x40000000
+  crc32_data      : location 2 → 0x40000800  (32-bit rw)
+  crc32_reset_ctrl: location 2 → 0x40000804  (32-bit w)
+  perf_*          : location 3 → 0x40000C00  (--perf-counters)
+  la_*            : location 4 → 0x40001000  (--analyzer, buffer at LA_MAP["la"])
+  uart_crc_*      : location 5 → 0x40001400  (--uart-crc)
+  sram            : 0x40040000, --sram-size bytes of block RAM
+
+  With --wishbone-regs the CRC32 registers are a Wishbone-native register file:
+  crc32_data      : REGS_MAP["crc32"]     → 0x40010000
+  crc32_reset_ctrl: REGS_MAP["crc32"] + 4 → 0x40010004
+"""
+
+# Default sys clock: the 10 MHz oscillator. Builds with --sys-clk-freq run sys
+# from the PLL instead (commonLib/gatemateCrg.py); csr.json then reports the
+# actual value as constant config_clock_frequency
+CLK_FREQ = int(10e6)
+BAUDRATE = 115200
+
+# CSR region base address and size of one CSR location slot
+CSR_BASE   = 0x40000000
+CSR_PAGING = 0x400
+
+# Optional on-chip SRAM (sram_size > 0), block RAM on the SoC bus. The region
+# is aligned to SRAM_MAX_SIZE, so any power-of-two size up to it decodes
+SRAM_BASE     = 0x40040000
+SRAM_MAX_SIZE = 0x20000
+
+# Merged over SoCMini.mem_map by Top
+MEM_MAP = {
+    "csr":  CSR_BASE,
+    "sram": SRAM_BASE,
+}
+
+# CSR location slot per peripheral: address = CSR_BASE + location × CSR_PAGING
+CSR_MAP = {
+    "ctrl":  0,  # 0x40000000
+    "crc32": 2,  # 0x40000800
+    "perf":  3,  # 0x40000C00, only with perf_counters=True
+    "la":    4,  # 0x40001000, only with analyzer=True
+    "uart_crc": 5,  # 0x40001400, only with uart_crc=True
+}
+
+# Wishbone-native register files (wishbone_regs=True), placed just above
+# the 64 KB CSR window. Each region is only as large as its registers.
+REGS_MAP = {
+    "crc32": 0x40010000,
+}
+
+# Logic analyzer capture buffer (analyzer=True, commonLib/logicAnalyzer.py),
+# read-only, LA_DEPTH entries of one or more 32-bit words
+LA_MAP = {
+    "la": 0x40020000,
+}
+LA_DEPTH = 1024
+
+# Register addresses of the default (CSR) build: crc32Regs.py, the reference map.
+# The --wishbone-regs layout, for testbenches that model both:
+ADDR_DATA_WB  = REGS_MAP["crc32"]       # 0x40010000
+ADDR_RESET_WB = ADDR_DATA_WB + 4        # 0x40010004
@@ -0,0 +1,245 @@
+"""
+CRC32 peripheral, shared by both SoC builds (wishBoneCrsCrc32Verilog.py,
+wishBoneCrsCrc32Vhdl.py) and the testbench (testBenchCrc32Peripheral.py).
+
+The two builds only differ in the HDL source of the `crc` black box, picked
+with `language`. `engine` swaps the black box for one of the CRC32Engine
+variants (crc32Engine.py: XOR network or block-RAM lookup tables), which
+with width=4 also take a whole 32-bit word per write. With `crc_domain` the
+CRC32 datapath runs in its own clock domain (CRC32Crossing): writes cross
+over on an AsyncFIFO, the checksum comes back through a BusSynchronizer, and
+a status register reports whether it is up to date. Kept apart from the SoC so users of the peripheral only
+import Migen and the LiteX CSR classes, not SoCMini / Builder / the board
+platform / the toolchain.
+"""
+
+import os
+
+from migen import *
+from migen.genlib.cdc import BusSynchronizer
+from migen.genlib.fifo import AsyncFIFO
+from litex.soc.interconnect.csr import AutoCSR, CSR, CSRStatus
+
+from crc32Engine import ENGINES, CRC32Engine, CRC32StepEngine
+
+# CRC32 step entity `crc` (crcIn, data → crcOut) per HDL language
+HDL_SOURCES = {
+    "verilog": os.path.join(os.path.dirname(os.path.abspath(__file__)), "hdl", "crc.v"),
+    "vhdl":    os.path.join(os.path.dirname(os.path.abspath(__file__)), "hdl", "crc.vhdl"),
+}
+
+# engine: the `crc` black box, or a CRC32Engine
+PERIPHERAL_ENGINES = ("hdl",) + ENGINES
+# Bytes per crc32_word write (width 1: no crc32_word)
+PERIPHERAL_WIDTHS  = (1, 4)
+
+# crc32_status bits (crc_domain builds only)
+STATUS_BUSY     = 0x1   # Bytes written that the checksum read does not include yet
+STATUS_OVERFLOW = 0x2   # A write was dropped on a full FIFO; cleared by reset_ctrl
+
+
+# Create:
+#+--------------------------------------------+
+#|   CRC32Crossing                            |
+#|     sys: we/data/nbytes/clear → AsyncFIFO  |
+#|     domain: CRC32 engine (accumulator)     |
+#|     domain → sys: BusSynchronizer          |
+#|       (checksum, commands done)            |
+#+--------------------------------------------+
+class CRC32Crossing(Module):
+    """CRC32 engine (crc32Engine.py interface) in clock domain `domain`, driven from sys.
+
+    sys side:
+      we, data, nbytes, clear : one command per cycle with `we`
+                                (clear restores 0xFFFFFFFF, data / nbytes as for the engine)
+      checksum                : inverted accumulator, as last reported by `domain`
+      busy                    : commands accepted that `checksum` does not include yet
+      overflow                : a command was dropped on a full FIFO (sticky until a clear)
+
+    The engine takes one command per `domain` cycle. The result travels
+    together with the count of commands done, so `checksum` is always the
+    value after a whole number of commands and `busy` drops exactly when it
+    covers the last one. `domain` must be reset together with sys
+    (GateMateCRG.add_domain()).
+    """
+
+    def __init__(self, engine, domain, fifo_depth=16):
+        self.we       = Signal()
+        self.data     = Signal(8 * engine.width)
+        self.nbytes   = Signal(max=engine.width + 1, reset=engine.width)
+        self.clear    = Signal()
+        self.checksum = Signal(32)
+        self.busy     = Signal()
+        self.overflow = Signal()
+
+        # # #
+
+        # sys → domain: {data, nbytes, clear} commands
+        command = Cat(self.data, self.nbytes, self.clear)
+        self.submodules.fifo = fifo = ClockDomainsRenamer({"write": "sys", "read": domain})(
+            AsyncFIFO(len(command), fifo_depth))
+        issued = Signal(8)
+        self.comb += [
+            fifo.din.eq(command),
+            fifo.we.eq(self.we),
+        ]
+        self.sync += If(self.we,
+            If(fifo.writable,
+                issued.eq(issued + 1),
+                If(self.clear, self.overflow.eq(0)),
+            ).Else(
+                self.overflow.eq(1),
+            )
+        )
+
+        # domain: one command per cycle
+        self.submodules.engine = engine = ClockDomainsRenamer(domain)(engine)
+        data, nbytes, clear = Signal(len(self.data)), Signal(len(self.nbytes)), Signal()
+        done = Signal(8)
+        sync = getattr(self.sync, domain)
+        self.comb += [
+            Cat(data, nbytes, clear).eq(fifo.dout),
+            fifo.re.eq(fifo.readable),
+            engine.data.eq(data),
+            engine.nbytes.eq(nbytes),
+            engine.we.eq(fifo.readable & ~clear),
+            engine.clear.eq(fifo.readable & clear),
+        ]
+        sync += If(fifo.readable, done.eq(done + 1))
+
+        # domain → sys: checksum and commands done as one word. Inverted, so the
+        # synchroniser's all-zero power-on output reads as the reset checksum
+        self.submodules.result = result = BusSynchronizer(40, domain, "sys")
+        self.comb += [
+            result.i.eq(Cat(~engine.crc, done)),
+            self.checksum.eq(result.o[:32]),
+            self.busy.eq(result.o[32:] != issued),
+        ]
+
+
+# Create:
+#+--------------------------------------------+
+#|   CRC32Peripheral (AutoCSR peripheral)     |
+#|     @ 0x40000800                           |
+#|     Single 32-bit CSR register:            |
+#|       write [7:0] → feed byte into CRC32   |
+#|       read  [31:0] → running CRC32 checksum|
+#|     Accumulator resets on system reset     |
+#+--------------------------------------------+
+class CRC32Peripheral(Module, AutoCSR):
+    """CSR-mapped CRC32 peripheral.
+
+    Two registers within location slot 2:
+      crc32_data       @ 0x40000800 (32-bit rw)
+        write : lower 8 bits are fed into the CRC32 accumulator
+        read  : 32-bit running CRC32 checksum (final XOR / bit-inverted accumulator)
+      crc32_reset_ctrl @ 0x40000804 (32-bit w)
+        write : any value → resets the accumulator to 0xFFFFFFFF
+
+    The accumulator initialises to 0xFFFFFFFF on system reset.
+    The CRC32 step is computed by the `crc` black box in hdl/crc.v
+    (language="verilog") or hdl/crc.vhdl (language="vhdl").
+
+    engine "xor" / "bram" computes the CRC32 with a CRC32Engine instead of the
+    black box; width=4 (those engines only) adds
+      crc32_word       @ 0x40000808, 0x4000080C with crc_domain (32-bit w)
+        write : all 4 bytes, LSB first (a little-endian word from memory)
+
+    crc_domain != "sys" runs the accumulator in that clock domain
+    (CRC32Crossing, `fifo_depth` commands buffered) and adds
+      crc32_status     @ 0x40000808 (32-bit r)
+        bit 0 : busy, crc32_data does not include every byte written yet
+        bit 1 : overflow, a write was dropped on a full FIFO
+    """
+
+    def __init__(self, platform, language="verilog", crc_domain="sys", fifo_depth=16,
+                 engine="hdl", width=1):
+        if engine not in PERIPHERAL_ENGINES:
+            raise ValueError(f"CRC32 engine '{engine}': use one of {', '.join(PERIPHERAL_ENGINES)}")
+        if width not in PERIPHERAL_WIDTHS or (engine == "hdl" and width != 1):
+            raise ValueError(f"CRC32 width {width}: 1, or 4 with the 'xor' / 'bram' engines")
+
+        # data : CRS Address CRS_MAP + Offset = 0x40000800 + 0 (first registered CRS)
+        # data : CSR write[7:0] = data byte in, read[31:0] = checksum out
+        # if the bus writes data to the address 0x40000800 self.data is automaticaly updated
+        self.data = CSR(32, name="data")
+        # reset_ctrl CRS :Address CRS_MAP + Offset = 0x40000800 + 4 (second registered CRS)     
+        # reset_ctrl CSR: writing any value resets the CRC accumulator to 0xFFFFFFFF
+        # if the bus writes data to the address 0x40000804 self.reset_ctrl is automaticaly updated
+        # Plain CSR (not CSRStorage): its write strobe fires in the bus write cycle itself.
+        # CSRStorage.re lags one cycle, so a data write right behind a reset_ctrl write
+        # (back-to-back on a zero-wait WishboneCSRBank) would be swallowed by the reset.
+        self.reset_ctrl = CSR(32, name="reset_ctrl")
+
+        if crc_domain != "sys":
+            # status CSR: whether the checksum read covers every write (CRC32Crossing)
+            self.status = CSRStatus(2, name="status", description="bit 0 busy, bit 1 overflow")
+        if width > 1:
+            # word CSR: write = `width` bytes in one bus access
+            self.word = CSR(32, name="word")
+
+        if engine == "hdl":
+            # Instantiate the crc black box (hdl/crc.v or hdl/crc.vhdl)
+            platform.add_source(HDL_SOURCES[language])
+
+        if engine != "hdl" or crc_domain != "sys":
+            if engine == "hdl":
+                core = CRC32StepEngine()
+                self.specials += Instance("crc",
+                    i_crcIn  = core.crc,
+                    i_data   = core.data,
+                    o_crcOut = core.crc_out,
+                )
+            else:
+                core = CRC32Engine(width, engine)
+
+            # One command per write: a byte (data), a word (word) or a reset (reset_ctrl)
+            we     = self.data.re | (self.word.re if width > 1 else 0)
+            data   = Mux(self.word.re, self.word.r, self.data.r[0:8]) if width > 1 else self.data.r[0:8]
+            nbytes = Mux(self.word.re, width, 1) if width > 1 else 1
+            if crc_domain == "sys":
+                self.submodules.core = core
+                port = core
+                self.comb += self.data.w.eq(~core.crc)
+            else:
+                self.submodules.crossing = port = CRC32Crossing(core, crc_domain, fifo_depth)
+                # Resets become FIFO commands too, so a reset stays ordered with the bytes
+                we = we | self.reset_ctrl.re
+                self.comb += [
+                    self.data.w.eq(port.checksum),
+                    self.status.status.eq(Cat(port.busy, port.overflow)),
+                ]
+            self.comb += [
+                port.we.eq(we),
+                port.data.eq(data),
+                port.nbytes.eq(nbytes),
+                port.clear.eq(self.reset_ctrl.re),
+            ]
+            return
+
+        # Internal signals — reset values applied automatically on system reset
+        crc_in  = Signal(32, reset=0xFFFFFFFF)   # Accumulated CRC; CRC32 init = 0xFFFFFFFF
+        crc_out = Signal(32)                     # Combinatorial output from the crc black box
+        out_buf = Signal(32, reset=0xFFFFFFFF)   # Registered checksum; reset matches crc_in
+
+        # Connect the HDL signals to this
+        self.specials += Instance("crc",
+            i_crcIn  = crc_in,
+            i_data   = self.data.r[0:8],   # lower 8 bits written by host (c.r = bus dat_w)
+            o_crcOut = crc_out,
+        )
+
+        # Reset takes priority: writing reset_ctrl restores accumulator to 0xFFFFFFFF.
+        # On each host data write (data.re fires): feed crcOut back as next crcIn (accumulation).
+        self.sync += [
+            If(self.reset_ctrl.re,    # Writing to 0x40000804 triggers "register enable" (write strobe) for reset_ctrl.re
+                crc_in.eq(0xFFFFFFFF),
+                out_buf.eq(0xFFFFFFFF),
+            ).Elif(self.data.re,      # Writing to 0x400008040 triggers "register enable" (write strobe) for data.re
+                crc_in.eq(crc_out),
+                out_buf.eq(crc_out),
+            )
+        ]
+
+        # Read path: c.w is what the host reads — invert out_buf for CRC32 final XOR step
+        self.comb += self.data.w.eq(~out_buf)
@@ -0,0 +1,207 @@
+"""
+Register map generated by commonLib/csrGen.py from csr.json; do not edit.
+
+Every build writes its map to build/; the copy beside the build script
+is the reference map, rewritten only with --reference-map. See
+commonLib/csrAccess.py for the API.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from commonLib.csrAccess import Field, Register, RegisterMap
+
+# Memory regions
+CSR_BASE = 0x40000000
+CSR_SIZE = 0x10000
+LA_BASE = 0x40020000
+LA_SIZE = 0x1000
+
+# Register addresses
+CTRL_RESET_ADDR              = 0x40000000
+CTRL_SCRATCH_ADDR            = 0x40000004
+CTRL_BUS_ERRORS_ADDR         = 0x40000008
+CRC32_DATA_ADDR              = 0x40000800
+CRC32_RESET_CTRL_ADDR        = 0x40000804
+CRC32_STATUS_ADDR            = 0x40000808
+PERF_CONTROL_ADDR            = 0x40000c00
+PERF_CYCLES_ADDR             = 0x40000c04
+PERF_BRIDGE_READS_ADDR       = 0x40000c0c
+PERF_BRIDGE_WRITES_ADDR      = 0x40000c10
+PERF_BRIDGE_BUSY_CYCLES_ADDR = 0x40000c14
+PERF_BRIDGE_LATENCY0_ADDR    = 0x40000c1c
+PERF_BRIDGE_LATENCY1_ADDR    = 0x40000c20
+PERF_BRIDGE_LATENCY2_ADDR    = 0x40000c24
+PERF_BRIDGE_LATENCY3_ADDR    = 0x40000c28
+PERF_BRIDGE_LATENCY4_ADDR    = 0x40000c2c
+PERF_BRIDGE_LATENCY5_ADDR    = 0x40000c30
+PERF_BRIDGE_LATENCY6_ADDR    = 0x40000c34
+PERF_BRIDGE_LATENCY7_ADDR    = 0x40000c38
+PERF_BRIDGE_RX_BYTES_ADDR    = 0x40000c3c
+PERF_BRIDGE_TX_BYTES_ADDR    = 0x40000c40
+PERF_CRC_BYTES_ADDR          = 0x40000c44
+LA_ARM_ADDR                  = 0x40001000
+LA_STOP_ADDR                 = 0x40001004
+LA_TRIGGER_MASK_ADDR         = 0x40001008
+LA_TRIGGER_VALUE_ADDR        = 0x4000100c
+LA_POST_TRIGGER_ADDR         = 0x40001010
+LA_STATUS_ADDR               = 0x40001014
+LA_WRITE_PTR_ADDR            = 0x40001018
+LA_COUNT_ADDR                = 0x4000101c
+LA_TRIGGER_ENTRY_ADDR        = 0x40001020
+UART_CRC_CRC_ADDR            = 0x40001400
+UART_CRC_BYTES_ADDR          = 0x40001404
+UART_CRC_RESET_CTRL_ADDR     = 0x40001408
+
+# Field masks and offsets
+CTRL_RESET_SOC_RST_MASK = 0x00000001
+CTRL_RESET_SOC_RST_OFFSET = 0
+CTRL_RESET_CPU_RST_MASK = 0x00000002
+CTRL_RESET_CPU_RST_OFFSET = 1
+CTRL_SCRATCH_SCRATCH_MASK = 0xffffffff
+CTRL_SCRATCH_SCRATCH_OFFSET = 0
+CTRL_BUS_ERRORS_BUS_ERRORS_MASK = 0xffffffff
+CTRL_BUS_ERRORS_BUS_ERRORS_OFFSET = 0
+CRC32_DATA_DATA_MASK = 0xffffffff
+CRC32_DATA_DATA_OFFSET = 0
+CRC32_RESET_CTRL_RESET_CTRL_MASK = 0xffffffff
+CRC32_RESET_CTRL_RESET_CTRL_OFFSET = 0
+CRC32_STATUS_STATUS_MASK = 0x00000003
+CRC32_STATUS_STATUS_OFFSET = 0
+PERF_CONTROL_CONTROL_MASK = 0x00000003
+PERF_CONTROL_CONTROL_OFFSET = 0
+PERF_CYCLES_CYCLES_MASK = 0xffffffffffffffff
+PERF_CYCLES_CYCLES_OFFSET = 0
+PERF_BRIDGE_READS_BRIDGE_READS_MASK = 0xffffffff
+PERF_BRIDGE_READS_BRIDGE_READS_OFFSET = 0
+PERF_BRIDGE_WRITES_BRIDGE_WRITES_MASK = 0xffffffff
+PERF_BRIDGE_WRITES_BRIDGE_WRITES_OFFSET = 0
+PERF_BRIDGE_BUSY_CYCLES_BRIDGE_BUSY_CYCLES_MASK = 0xffffffffffffffff
+PERF_BRIDGE_BUSY_CYCLES_BRIDGE_BUSY_CYCLES_OFFSET = 0
+PERF_BRIDGE_LATENCY0_BRIDGE_LATENCY0_MASK = 0xffffffff
+PERF_BRIDGE_LATENCY0_BRIDGE_LATENCY0_OFFSET = 0
+PERF_BRIDGE_LATENCY1_BRIDGE_LATENCY1_MASK = 0xffffffff
+PERF_BRIDGE_LATENCY1_BRIDGE_LATENCY1_OFFSET = 0
+PERF_BRIDGE_LATENCY2_BRIDGE_LATENCY2_MASK = 0xffffffff
+PERF_BRIDGE_LATENCY2_BRIDGE_LATENCY2_OFFSET = 0
+PERF_BRIDGE_LATENCY3_BRIDGE_LATENCY3_MASK = 0xffffffff
+PERF_BRIDGE_LATENCY3_BRIDGE_LATENCY3_OFFSET = 0
+PERF_BRIDGE_LATENCY4_BRIDGE_LATENCY4_MASK = 0xffffffff
+PERF_BRIDGE_LATENCY4_BRIDGE_LATENCY4_OFFSET = 0
+PERF_BRIDGE_LATENCY5_BRIDGE_LATENCY5_MASK = 0xffffffff
+PERF_BRIDGE_LATENCY5_BRIDGE_LATENCY5_OFFSET = 0
+PERF_BRIDGE_LATENCY6_BRIDGE_LATENCY6_MASK = 0xffffffff
+PERF_BRIDGE_LATENCY6_BRIDGE_LATENCY6_OFFSET = 0
+PERF_BRIDGE_LATENCY7_BRIDGE_LATENCY7_MASK = 0xffffffff
+PERF_BRIDGE_LATENCY7_BRIDGE_LATENCY7_OFFSET = 0
+PERF_BRIDGE_RX_BYTES_BRIDGE_RX_BYTES_MASK = 0xffffffff
+PERF_BRIDGE_RX_BYTES_BRIDGE_RX_BYTES_OFFSET = 0
+PERF_BRIDGE_TX_BYTES_BRIDGE_TX_BYTES_MASK = 0xffffffff
+PERF_BRIDGE_TX_BYTES_BRIDGE_TX_BYTES_OFFSET = 0
+PERF_CRC_BYTES_CRC_BYTES_MASK = 0xffffffff
+PERF_CRC_BYTES_CRC_BYTES_OFFSET = 0
+LA_ARM_ARM_MASK = 0x00000001
+LA_ARM_ARM_OFFSET = 0
+LA_STOP_STOP_MASK = 0x00000001
+LA_STOP_STOP_OFFSET = 0
+LA_TRIGGER_MASK_TRIGGER_MASK_MASK = 0x00003fff
+LA_TRIGGER_MASK_TRIGGER_MASK_OFFSET = 0
+LA_TRIGGER_VALUE_TRIGGER_VALUE_MASK = 0x00003fff
+LA_TRIGGER_VALUE_TRIGGER_VALUE_OFFSET = 0
+LA_POST_TRIGGER_POST_TRIGGER_MASK = 0x000007ff
+LA_POST_TRIGGER_POST_TRIGGER_OFFSET = 0
+LA_STATUS_STATUS_MASK = 0x00000007
+LA_STATUS_STATUS_OFFSET = 0
+LA_WRITE_PTR_WRITE_PTR_MASK = 0x000003ff
+LA_WRITE_PTR_WRITE_PTR_OFFSET = 0
+LA_COUNT_COUNT_MASK = 0x000007ff
+LA_COUNT_COUNT_OFFSET = 0
+LA_TRIGGER_ENTRY_TRIGGER_ENTRY_MASK = 0x000003ff
+LA_TRIGGER_ENTRY_TRIGGER_ENTRY_OFFSET = 0
+UART_CRC_CRC_CRC_MASK = 0xffffffff
+UART_CRC_CRC_CRC_OFFSET = 0
+UART_CRC_BYTES_BYTES_MASK = 0xffffffff
+UART_CRC_BYTES_BYTES_OFFSET = 0
+UART_CRC_RESET_CTRL_RESET_CTRL_MASK = 0xffffffff
+UART_CRC_RESET_CTRL_RESET_CTRL_OFFSET = 0
+
+
+class Crc32Regs(RegisterMap):
+    registers = (
+        Register('ctrl_reset', 0x40000000, size=1, access='rw',
+                 fields=(Field('soc_rst', 0, 1), Field('cpu_rst', 1, 1),)),
+        Register('ctrl_scratch', 0x40000004, size=1, access='rw', cacheable=True,
+                 fields=(Field('scratch', 0, 32),)),
+        Register('ctrl_bus_errors', 0x40000008, size=1, access='ro',
+                 fields=(Field('bus_errors', 0, 32),)),
+        Register('crc32_data', 0x40000800, size=1, access='rw',
+                 fields=(Field('data', 0, 32),)),
+        Register('crc32_reset_ctrl', 0x40000804, size=1, access='rw',
+                 fields=(Field('reset_ctrl', 0, 32),)),
+        Register('crc32_status', 0x40000808, size=1, access='ro',
+                 fields=(Field('status', 0, 2),)),
+        Register('perf_control', 0x40000c00, size=1, access='rw',
+                 fields=(Field('control', 0, 2),)),
+        Register('perf_cycles', 0x40000c04, size=2, access='ro',
+                 fields=(Field('cycles', 0, 64),)),
+        Register('perf_bridge_reads', 0x40000c0c, size=1, access='ro',
+                 fields=(Field('bridge_reads', 0, 32),)),
+        Register('perf_bridge_writes', 0x40000c10, size=1, access='ro',
+                 fields=(Field('bridge_writes', 0, 32),)),
+        Register('perf_bridge_busy_cycles', 0x40000c14, size=2, access='ro',
+                 fields=(Field('bridge_busy_cycles', 0, 64),)),
+        Register('perf_bridge_latency0', 0x40000c1c, size=1, access='ro',
+                 fields=(Field('bridge_latency0', 0, 32),)),
+        Register('perf_bridge_latency1', 0x40000c20, size=1, access='ro',
+                 fields=(Field('bridge_latency1', 0, 32),)),
+        Register('perf_bridge_latency2', 0x40000c24, size=1, access='ro',
+                 fields=(Field('bridge_latency2', 0, 32),)),
+        Register('perf_bridge_latency3', 0x40000c28, size=1, access='ro',
+                 fields=(Field('bridge_latency3', 0, 32),)),
+        Register('perf_bridge_latency4', 0x40000c2c, size=1, access='ro',
+                 fields=(Field('bridge_latency4', 0, 32),)),
+        Register('perf_bridge_latency5', 0x40000c30, size=1, access='ro',
+                 fields=(Field('bridge_latency5', 0, 32),)),
+        Register('perf_bridge_latency6', 0x40000c34, size=1, access='ro',
+                 fields=(Field('bridge_latency6', 0, 32),)),
+        Register('perf_bridge_latency7', 0x40000c38, size=1, access='ro',
+                 fields=(Field('bridge_latency7', 0, 32),)),
+        Register('perf_bridge_rx_bytes', 0x40000c3c, size=1, access='ro',
+                 fields=(Field('bridge_rx_bytes', 0, 32),)),
+        Register('perf_bridge_tx_bytes', 0x40000c40, size=1, access='ro',
+                 fields=(Field('bridge_tx_bytes', 0, 32),)),
+        Register('perf_crc_bytes', 0x40000c44, size=1, access='ro',
+                 fields=(Field('crc_bytes', 0, 32),)),
+        Register('la_arm', 0x40001000, size=1, access='rw',
+                 fields=(Field('arm', 0, 1),)),
+        Register('la_stop', 0x40001004, size=1, access='rw',
+                 fields=(Field('stop', 0, 1),)),
+        Register('la_trigger_mask', 0x40001008, size=1, access='rw', cacheable=True,
+                 fields=(Field('trigger_mask', 0, 14),)),
+        Register('la_trigger_value', 0x4000100c, size=1, access='rw', cacheable=True,
+                 fields=(Field('trigger_value', 0, 14),)),
+        Register('la_post_trigger', 0x40001010, size=1, access='rw', cacheable=True,
+                 fields=(Field('post_trigger', 0, 11),)),
+        Register('la_status', 0x40001014, size=1, access='ro',
+                 fields=(Field('status', 0, 3),)),
+        Register('la_write_ptr', 0x40001018, size=1, access='ro',
+                 fields=(Field('write_ptr', 0, 10),)),
+        Register('la_count', 0x4000101c, size=1, access='ro',
+                 fields=(Field('count', 0, 11),)),
+        Register('la_trigger_entry', 0x40001020, size=1, access='ro',
+                 fields=(Field('trigger_entry', 0, 10),)),
+        Register('uart_crc_crc', 0x40001400, size=1, access='ro',
+                 fields=(Field('crc', 0, 32),)),
+        Register('uart_crc_bytes', 0x40001404, size=1, access='ro',
+                 fields=(Field('bytes', 0, 32),)),
+        Register('uart_crc_reset_ctrl', 0x40001408, size=1, access='rw',
+                 fields=(Field('reset_ctrl', 0, 32),)),
+    )
+    groups = {
+        'ctrl': ('ctrl_reset', 'ctrl_scratch', 'ctrl_bus_errors'),
+        'crc32': ('crc32_data', 'crc32_reset_ctrl', 'crc32_status'),
+        'perf': ('perf_control', 'perf_cycles', 'perf_bridge_reads', 'perf_bridge_writes', 'perf_bridge_busy_cycles', 'perf_bridge_latency0', 'perf_bridge_latency1', 'perf_bridge_latency2', 'perf_bridge_latency3', 'perf_bridge_latency4', 'perf_bridge_latency5', 'perf_bridge_latency6', 'perf_bridge_latency7', 'perf_bridge_rx_bytes', 'perf_bridge_tx_bytes', 'perf_crc_bytes'),
+        'la': ('la_arm', 'la_stop', 'la_trigger_mask', 'la_trigger_value', 'la_post_trigger', 'la_status', 'la_write_ptr', 'la_count', 'la_trigger_entry'),
+        'uart_crc': ('uart_crc_crc', 'uart_crc_bytes', 'uart_crc_reset_ctrl'),
+    }
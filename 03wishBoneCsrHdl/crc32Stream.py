@@ -0,0 +1,98 @@
+"""
+In-line CRC32 on a LiteX stream: a pass-through tap that checksums the data
+flowing from its sink to its source, for example the UART bytes in front of
+the bridge (--uart-crc) or a DMA stream.
+
+    self.submodules.rx_crc = CRC32Stream(data_width=8)
+    self.comb += [phy.source.connect(rx_crc.sink), rx_crc.source.connect(bridge.sink)]
+
+The tap adds no latency and no back-pressure: valid, ready, data and
+first / last are wired straight through, and every beat that transfers
+(valid & ready) is fed to a CRC32Engine (crc32Engine.py), all of its bytes,
+first byte in the LSBs. The results are CSRs, so checking a transfer costs
+no bus accesses beyond reading them:
+
+  crc        : CRC32 (zlib.crc32) of the bytes since the last reset_ctrl write
+  bytes      : how many bytes that is
+  reset_ctrl : any write restarts both (a beat in that very cycle is dropped)
+
+crc and bytes are adjacent, so one burst read returns a consistent pair.
+On the UART bridge RX stream the tap also sees the host's own commands,
+including the read of crc / bytes, which the bridge has received in full
+before it reads them: bridge_commands() lists the bytes of each host access
+(litex.tools.remote.comm_uart), so the host can compute the value to expect.
+"""
+
+from migen import *
+from litex.soc.interconnect import stream
+from litex.soc.interconnect.csr import AutoCSR, CSR, CSRStatus
+
+from crc32Engine import ENGINES, WIDTHS, CRC32Engine
+
+# Stream2Wishbone commands (litex.soc.cores.uart)
+CMD_WRITE_BURST_INCR = 0x01
+CMD_READ_BURST_INCR  = 0x02
+WRITE_CHUNK          = 8        # comm_uart splits writes into commands of 8 words
+
+
+def bridge_commands(addr, data=None, length=1):
+    """Bytes comm_uart sends to the bridge to write `data` (words) at `addr`, or read `length` words."""
+    if data is None:
+        return bytes([CMD_READ_BURST_INCR, length]) + (addr // 4).to_bytes(4, "big")
+    out = b""
+    for offset in range(0, len(data), WRITE_CHUNK):
+        chunk = data[offset:offset + WRITE_CHUNK]
+        out  += bytes([CMD_WRITE_BURST_INCR, len(chunk)]) + (addr // 4 + offset).to_bytes(4, "big")
+        out  += b"".join(value.to_bytes(4, "big") for value in chunk)
+    return out
+
+
+# Create:
+#+----------------------------------------------+
+#|   CRC32Stream (AutoCSR peripheral)           |
+#|     sink ───────────────────────► source     |
+#|              │ valid & ready                 |
+#|              v                               |
+#|     CRC32Engine → crc, bytes (CSRs)          |
+#+----------------------------------------------+
+class CRC32Stream(Module, AutoCSR):
+    """Pass-through stream tap with a running CRC32 and byte count.
+
+    data_width : bits per beat, 8 × 1 / 2 / 4 / 8 bytes (all bytes of a beat count)
+    engine     : CRC32Engine variant, "xor" or "bram"
+    """
+
+    def __init__(self, data_width=8, engine="xor"):
+        width = data_width // 8
+        if data_width % 8 or width not in WIDTHS:
+            raise ValueError(f"CRC32Stream data_width {data_width}: use one of "
+                             f"{', '.join(str(8 * w) for w in WIDTHS)} bits")
+        if engine not in ENGINES:
+            raise ValueError(f"CRC32Stream engine '{engine}': use one of {', '.join(ENGINES)}")
+        self.sink   = sink   = stream.Endpoint([("data", data_width)])
+        self.source = source = stream.Endpoint([("data", data_width)])
+
+        self.crc        = CSRStatus(32, name="crc", description="CRC32 of the bytes since the last reset_ctrl write")
+        self.bytes      = CSRStatus(32, name="bytes", description="Bytes since the last reset_ctrl write")
+        # Plain CSR: restarts in the write cycle itself, as crc32_reset_ctrl
+        self.reset_ctrl = CSR(32, name="reset_ctrl")
+
+        # # #
+
+        self.submodules.engine = core = CRC32Engine(width, engine)
+        fire  = Signal()
+        count = Signal(32)
+        self.comb += [
+            sink.connect(source),
+            fire.eq(sink.valid & sink.ready),
+            core.data.eq(sink.data),
+            core.we.eq(fire),
+            core.clear.eq(self.reset_ctrl.re),
+            self.crc.status.eq(~core.crc),
+            self.bytes.status.eq(count),
+        ]
+        self.sync += If(self.reset_ctrl.re,
+            count.eq(0),
+        ).Elif(fire,
+            count.eq(count + width),
+        )
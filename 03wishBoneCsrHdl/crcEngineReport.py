@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Utilization and Fmax of the CRC32 engines (crc32Engine.py), to pick one per design.
+
+Every engine × width is synthesised on its own (Yosys synth_gatemate), placed
+and routed for the CCGM1A1 (nextpnr-himbaechel) with registered inputs and
+output around it, so the reported Fmax is that of the accumulator loop:
+
+    python crcEngineReport.py                           # all engines, 1 / 4 / 8 bytes
+    python crcEngineReport.py --widths 4 --engines bram --target 150e6
+    python crcEngineReport.py --no-pnr                  # structure only (no tools needed)
+
+The table also lists the structural size from engine_resources() (widest XOR,
+two-input XORs before sharing, lookup-table bits) and the throughput at Fmax,
+width × Fmax bytes per second. Build products and logs go to build/engines/.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from shutil import which
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from migen import *
+from migen.fhdl.verilog import convert
+
+from crc32Engine import ENGINES, WIDTHS, CRC32Engine, engine_resources
+
+BUILD_DIR = os.path.join("build", "engines")
+
+# nextpnr: "Info:        CPE:   1234/ 20480     6%" and "Max frequency for clock 'sys_clk': 123.45 MHz"
+_UTILIZATION = re.compile(r"^Info:\s+([A-Za-z_]\w*):\s+(\d+)\s*/\s*(\d+)", re.MULTILINE)
+_FMAX        = re.compile(r"Max frequency for clock\s+'([^']+)':\s+([\d.]+) MHz")
+
+
+# Create:
+#+----------------------------------------------+
+#|   EngineHarness                              |
+#|     pins → regs → CRC32Engine → reg → pins   |
+#+----------------------------------------------+
+class EngineHarness(Module):
+    """CRC32Engine between input and output registers, so every timed path is reg to reg."""
+
+    def __init__(self, width, engine):
+        self.submodules.engine = core = CRC32Engine(width, engine)
+        self.data   = Signal(8 * width)
+        self.nbytes = Signal(len(core.nbytes))
+        self.we     = Signal()
+        self.clear  = Signal()
+        self.crc    = Signal(32)
+        self.sync += [
+            core.data.eq(self.data),
+            core.nbytes.eq(self.nbytes),
+            core.we.eq(self.we),
+            core.clear.eq(self.clear),
+            self.crc.eq(core.crc),
+        ]
+
+    def ios(self):
+        return {self.data, self.nbytes, self.we, self.clear, self.crc}
+
+
+def parse_pnr(text):
+    """({resource: (used, available)}, Fmax in MHz or None) from the nextpnr log."""
+    utilization = {name: (int(used), int(avail)) for name, used, avail in _UTILIZATION.findall(text)}
+    fmax = [float(f) for clk, f in _FMAX.findall(text) if clk.startswith("sys_clk")]
+    return utilization, (fmax[-1] if fmax else None)
+
+
+def build(engine, width, target):
+    """Synthesise, place and route one engine; returns (utilization, Fmax MHz)."""
+    name      = f"{engine}{width}"
+    build_dir = os.path.join(BUILD_DIR, name)
+    os.makedirs(build_dir, exist_ok=True)
+    harness = EngineHarness(width, engine)
+    verilog = convert(harness, ios=harness.ios(), name="crc_engine")
+    # Table contents ($readmemh files) next to the Verilog, where Yosys runs
+    for filename, contents in {"crc_engine.v": verilog.main_source, **verilog.data_files}.items():
+        with open(os.path.join(build_dir, filename), "w") as f:
+            f.write(contents)
+    with open(os.path.join(build_dir, "clocks.py"), "w") as f:
+        f.write(f'ctx.addClock("sys_clk", {target / 1e6})\n')
+
+    steps = [
+        ["yosys", "-l", "yosys.log", "-q", "-p",
+         "read_verilog crc_engine.v; synth_gatemate -top crc_engine -nomx8 -json crc_engine.json"],
+        ["nextpnr-himbaechel", "--device", "CCGM1A1", "--json", "crc_engine.json",
+         "--vopt", "out=crc_engine_pnr.config", "--pre-pack", "clocks.py", "-l", "nextpnr.log"],
+    ]
+    for cmd in steps:
+        proc = subprocess.run(cmd, cwd=build_dir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        if proc.returncode:
+            sys.stdout.write(proc.stdout[-4000:])
+            raise RuntimeError(f"{name}: {cmd[0]} failed, see {build_dir}")
+    with open(os.path.join(build_dir, "nextpnr.log")) as f:
+        return parse_pnr(f.read())
+
+
+def _resource(utilization, prefix):
+    # First resource whose name starts with prefix ("CPE", "RAM"), formatted as used/available
+    for name, (used, avail) in utilization.items():
+        if name.upper().startswith(prefix):
+            return f"{used}/{avail}"
+    return "-"
+
+
+def format_report(results):
+    """Table of one row per engine × width."""
+    lines = [f"{'engine':<6} {'bytes':>5} {'widest XOR':>10} {'XOR2':>6} {'table bits':>10} "
+             f"{'CPEs':>11} {'block RAM':>9} {'Fmax MHz':>9} {'MB/s':>7}"]
+    for r in results:
+        utilization = r.get("utilization", {})
+        fmax = f"{r['fmax']:.1f}" if r.get("fmax") else "-"
+        rate = f"{r['width'] * r['fmax']:.0f}" if r.get("fmax") else "-"
+        lines.append(f"{r['engine']:<6} {r['width']:>5} {r['xor_inputs']:>10} {r['xor_gates']:>6} "
+                     f"{r['bram_bits']:>10} {_resource(utilization, 'CPE'):>11} "
+                     f"{_resource(utilization, 'RAM'):>9} {fmax:>9} {rate:>7}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Utilization / Fmax of the CRC32 engines")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--widths",  nargs="+", type=int, choices=WIDTHS, default=[1, 4, 8],
+                        help="Bytes per cycle")
+    parser.add_argument("--target",  type=float, default=100e6, help="Clock target for place and route (Hz)")
+    parser.add_argument("--no-pnr",  action="store_true", help="Structural size only, no Yosys / nextpnr")
+    parser.add_argument("--json",    help="Write the results to this file")
+    args = parser.parse_args()
+
+    if not args.no_pnr and not (which("yosys") and which("nextpnr-himbaechel")):
+        parser.error("yosys / nextpnr-himbaechel not found on PATH (use --no-pnr for the structural size)")
+
+    results = []
+    for engine in args.engines:
+        for width in args.widths:
+            result = {"engine": engine, "width": width, **engine_resources(engine, width)}
+            if not args.no_pnr:
+                result["utilization"], result["fmax"] = build(engine, width, args.target)
+            results.append(result)
+
+    print(format_report(results))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
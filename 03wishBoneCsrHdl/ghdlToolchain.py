@@ -0,0 +1,65 @@
+"""
+Yosys/GHDL flavour of the LiteX CologneChip toolchain for VHDL black boxes.
+
+Only imported by wishBoneCrsCrc32Vhdl.py when it builds: the LiteX build
+modules are not needed to elaborate or simulate the design.
+"""
+
+import os
+import subprocess
+from shutil import which
+
+from litex.build.colognechip.colognechip import CologneChipToolchain
+
+# Paths to the user-local GHDL Yosys plugin built without system-wide install.
+# Build once with:  (see README / build notes)
+_GHDL_PLUGIN = os.path.expanduser("~/.local/share/yosys/plugins/ghdl.so")
+_GHDL_LIB    = os.path.expanduser("~/.local/lib")
+
+
+# Create:
+#+----------------------------------------------+
+#|   GhdlCologneChipToolchain                   |
+#|     - read_vhdl → ghdl ... -e <entity>       |
+#|     - loads the user-local GHDL plugin       |
+#+----------------------------------------------+
+class GhdlCologneChipToolchain(CologneChipToolchain):
+    """CologneChip toolchain extended with GHDL plugin support for VHDL sources.
+
+    After the Yosys script (.ys) is generated by LiteX, every ``read_vhdl``
+    line is replaced by a ``ghdl`` command, and the GHDL plugin is loaded at
+    the top of the script.  ``LD_LIBRARY_PATH`` is set so the dynamic linker
+    finds libghdl / libgnat without a system-wide install.
+    """
+
+    def build_project(self):
+        super().build_project()
+        ys_file = f"{self._build_name}.ys"
+        with open(ys_file) as f:
+            content = f.read()
+
+        vhdl_cmds, other_lines = [], []
+        for line in content.splitlines():
+            stripped = line.strip()
+            if stripped.startswith("read_vhdl"):
+                vhdl_file = stripped[len("read_vhdl"):].strip()
+                # ghdl requires explicit "-e <entity>" to enter analyse+elaborate mode
+                entity = os.path.splitext(os.path.basename(vhdl_file))[0]
+                vhdl_cmds.append(f"ghdl {vhdl_file} -e {entity}")
+            else:
+                other_lines.append(line)
+
+        if vhdl_cmds:
+            header = [f"plugin -i {_GHDL_PLUGIN}"] + vhdl_cmds
+            patched = "\n".join(header) + "\n" + "\n".join(other_lines)
+            with open(ys_file, "w") as f:
+                f.write(patched)
+
+    def run_script(self, script):
+        if which("yosys") is None or which("p_r") is None:
+            raise OSError("Unable to find CologneChip toolchain (yosys / p_r).")
+        env = os.environ.copy()
+        ld = env.get("LD_LIBRARY_PATH", "")
+        env["LD_LIBRARY_PATH"] = f"{_GHDL_LIB}:{ld}" if ld else _GHDL_LIB
+        if subprocess.call(["bash", script], env=env) != 0:
+            raise OSError("Error occured during Yosys/p_r's script execution.")
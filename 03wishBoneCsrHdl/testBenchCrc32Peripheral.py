@@ -13,26 +13,124 @@ Single register (crc32_data @ 0x40000800):
 Accumulator resets to 0xFFFFFFFF on system reset.
 
 Results are validated against the generated-Python reference in tbLib/crcLib.py.
+
+The same peripheral is also run as a Wishbone-native register file
+(WishboneCSRBank, Top with --wishbone-regs) and the cycles needed to checksum
+"123456789" are compared with the Wishbone2CSR path. A 256-byte stream is then
+pushed with classic, back-to-back, CTI-burst and pipelined transactions from
+commonLib/wishboneBfm.py to measure the bytes per cycle each path sustains.
+
+Test 11 guards start-up: the address map (crc32Map.py), the peripheral
+(crc32Peripheral.py) and this testbench import in a fresh interpreter without
+SoCMini, Builder, the board platform or the toolchain (commonLib/importBench.py;
+the time budgets are checked there with --budgets, outside the parallel suite).
+
+Test 12 drives the generated register map (crc32Regs.py, commonLib/csrAccess.py):
+accesses queued on a batch are replayed with the BFM, and adjacent registers
+must share one burst.
+
+Test 13 adds the PerfCounters of --perf-counters builds (commonLib/perfCounters.py)
+on a second CSR bank, laid out and addressed as the perf_* registers of the
+reference map: CRC32 bytes, bus accesses and their ACK latency histogram are
+checked against the accesses the test makes, and snapshot / clear behaviour.
+
+Test 14 adds the logic analyzer of --analyzer builds (commonLib/logicAnalyzer.py):
+a capture triggered by the CRC32 write of '5' wraps a 16-entry ring, is read
+back in bursts and decoded with commonLib/laCapture.py, and must equal the
+probes recorded by the simulation cycle for cycle.
+
+Test 15 maps the block-RAM SRAM of --sram-size builds next to the CSRs: burst
+fill and readback, ERR just past its end, and a bus-side memcpy of SRAM bytes
+into the CRC32; the bridge cost model of commonLib/sramBench.py is checked too.
+
+Test 16 runs the CRC32 accumulator of --crc-clk-freq builds in a "crc" clock
+domain (CRC32Crossing) faster and slower than sys: checksums after
+back-to-back writes once crc32_status reports idle, and a FIFO overflow that
+is flagged and cleared by reset_ctrl. It always uses the Migen simulator.
+
+Test 17 checks the CRC32Engine variants of --crc-engine builds (crc32Engine.py):
+the XOR network and the block-RAM slice-by-N tables at 1, 2, 4 and 8 bytes per
+cycle against zlib.crc32, then CRC32Peripheral with crc32_word (--crc-width 4),
+also behind the clock-domain crossing. Migen simulator only as well.
+
+Test 18 puts the CRC32Stream tap of --uart-crc builds (crc32Stream.py) in
+front of the UART bridge core (Stream2Wishbone), driven byte by byte as the
+host would: the bytes still reach the bridge, and uart_crc_crc / uart_crc_bytes,
+read in one burst, cover every command byte since reset_ctrl (bridge_commands()).
+A 32-bit stream with random valid / ready gaps must come out unchanged with
+the zlib checksum of the bytes that transferred.
+
+Test 19 runs the host-side tracing client (commonLib/bridgeTrace.py) over a
+model of the bridge with a simulated clock: per-register counts, p50 / p99,
+the UART share of each round trip and the JSON / Chrome trace exports.
+
+Options:
+  --verilator    build the same testbenches with Verilator (commonLib/verilatorSim.py)
+                 using the real CRC32Peripheral and hdl/crc.v instead of MigenCRC32Step
+  --soak BYTES   stream BYTES bytes through the zero-wait register file and report
+                 the simulator speed (Test 9)
+  --seed S, --random-packets N
+                 seeded random packets with upper-bit junk and interleaved reset_ctrl
+                 writes, checked against zlib.crc32 after every byte (Test 10);
+                 10 packets per path by default, 2000 with --soak
+  --vcd [FILE]   write one waveform per test case (off by default; .vcd, .vcd.gz
+                 or .fst), narrowed with --vcd-signals PATTERN... and --vcd-window PRE POST
+  -j N, -k PATTERN, --list, --junit FILE, --json FILE
+                 every test is an independent case with its own TestBench; cases
+                 run in parallel across N processes (commonLib/testRunner.py)
 """
 
+import argparse
+import json
+import random
 import sys
+import tempfile
 import os
+import time
+import zlib
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 
 from migen import *
-from litex.soc.interconnect import wishbone, csr_bus
+from litex.soc.interconnect import wishbone, csr_bus, stream
 from litex.soc.interconnect.wishbone import Wishbone2CSR
-from litex.soc.interconnect.csr import AutoCSR, CSR
+from litex.soc.interconnect.csr import AutoCSR, CSR, CSRStatus
 from tbLib.crcLib import crc32 as crc32_ref
-from wishBoneCrsCrc32Vhdl import Top
+from crc32Map import (
+    ADDR_DATA_WB, ADDR_RESET_WB, CSR_MAP, CSR_PAGING, SRAM_BASE,
+)
+from crc32Regs import CRC32_DATA_ADDR, CRC32_RESET_CTRL_ADDR, CRC32_STATUS_ADDR, LA_BASE, Crc32Regs
+from crc32Peripheral import STATUS_BUSY, STATUS_OVERFLOW, CRC32Crossing, CRC32Peripheral
+from crc32Engine import ENGINES, WIDTHS, CRC32Engine, CRC32StepEngine, engine_resources
+from crc32Stream import CRC32Stream, bridge_commands
+from commonLib.wishboneRegisters import WishboneCSRBank
+from commonLib.wishboneBfm import WishboneBFM
+from commonLib.csrAccess import Register, RegisterMap, run_batch
+from commonLib.perfCounters import CLEAR, LATENCY_BINS, SNAPSHOT, PerfCounters, latency_bins
+from commonLib.logicAnalyzer import LogicAnalyzer
+from commonLib.laCapture import (DONE, MAX_BURST, TRIGGERED, decode, expand, probe_values,
+                                 read_plan, transfer_stats, trigger_bits, write_vcd)
+from commonLib.wishboneDecoder import WishboneErrDecoder
+from commonLib.sramBench import pattern, uart_bytes, uart_limit
+from commonLib.bridgeTrace import TracingClient, uart_seconds
+from commonLib.verilatorSim import SourceCollector, run_verilator, verilator_available
+from commonLib.simTrace import add_trace_arguments, run_traced, trace_from_args
+
+from commonLib.testRunner import TestSuite, add_runner_arguments
+from commonLib.importBench import SOC_MODULES, loaded, measure_import
+
+suite = TestSuite("crc32_peripheral")
+args  = None    # Command line, set by main()
 
 # ---------------------------------------------------------------------------
-# Address constants
+# Address constants — the CSR slot is shared with the SoC Top (crc32Map.py),
+# the register addresses come from the reference map generated from csr.json
+# (crc32Regs.py); neither pulls in SoCMini, Builder, the platform or the toolchain
 # ---------------------------------------------------------------------------
-CSR_PAGING = 0x400
-CSR_BASE   = Top.mem_map["csr"]                      # 0x40000000
-CRC32_SLOT = Top.csr_map["crc32"]                    # 2
-ADDR_DATA  = CSR_BASE + CRC32_SLOT * CSR_PAGING      # 0x40000800
+CRC32_SLOT = CSR_MAP["crc32"]                        # 2
+ADDR_DATA  = CRC32_DATA_ADDR                         # 0x40000800 crc32_data
+ADDR_RESET = CRC32_RESET_CTRL_ADDR                   # 0x40000804 crc32_reset_ctrl
+ADDR_STATUS = CRC32_STATUS_ADDR                      # 0x40000808 crc32_status (--crc-clk-freq builds)
 
 
 # ---------------------------------------------------------------------------
@@ -91,10 +189,29 @@ class SimCRC32Peripheral(Module, AutoCSR):
       c.w  = data TO host   (c.w → bus dat_r)   — checksum output
       c.re = fires when host WRITES
       c.we = fires when host READS
+
+    crc_domain != "sys" mirrors the CRC32Crossing variant; there `sim_reset`
+    is queued as a reset_ctrl write (same checksum as after system reset).
     """
-    def __init__(self):
-        self.data      = CSR(32, name="data")
-        self.sim_reset = Signal()  # simulation-only reset (mirrors system reset behaviour)
+    def __init__(self, crc_domain="sys", fifo_depth=16):
+        self.data       = CSR(32, name="data")
+        self.reset_ctrl = CSR(32, name="reset_ctrl")   # Plain CSR, as in CRC32Peripheral
+        self.sim_reset  = Signal()  # simulation-only reset (mirrors system reset behaviour)
+
+        if crc_domain != "sys":
+            self.status = CSRStatus(2, name="status")
+            core = CRC32StepEngine()
+            self.submodules.crc_step = MigenCRC32Step(core.crc, core.data, core.crc_out)
+            self.submodules.crossing = crossing = CRC32Crossing(core, crc_domain, fifo_depth)
+            clear = self.reset_ctrl.re | self.sim_reset
+            self.comb += [
+                crossing.we.eq(self.data.re | clear),
+                crossing.data.eq(self.data.r[0:8]),
+                crossing.clear.eq(clear),
+                self.data.w.eq(crossing.checksum),
+                self.status.status.eq(Cat(crossing.busy, crossing.overflow)),
+            ]
+            return
 
         crc_in  = Signal(32, reset=0xFFFFFFFF)
         crc_out = Signal(32)
@@ -103,7 +220,7 @@ class SimCRC32Peripheral(Module, AutoCSR):
         self.submodules.crc_step = MigenCRC32Step(crc_in, self.data.r[0:8], crc_out)
 
         self.sync += [
-            If(self.sim_reset,
+            If(self.sim_reset | self.reset_ctrl.re,   # system reset or reset_ctrl write
                 crc_in.eq(0xFFFFFFFF),
                 out_buf.eq(0xFFFFFFFF),
             ).Elif(self.data.re,        # c.re fires when host writes
@@ -116,14 +233,38 @@ class SimCRC32Peripheral(Module, AutoCSR):
         self.comb += self.data.w.eq(~out_buf)
 
 
+# ---------------------------------------------------------------------------
+# Peripheral under test — Migen mirror, or the real HDL under Verilator
+# ---------------------------------------------------------------------------
+VERILOG_SOURCES = SourceCollector()
+
+
+def new_peripheral(hdl):
+    """SimCRC32Peripheral, or CRC32Peripheral with hdl/crc.v when `hdl` is set.
+
+    The HDL variant gets a ResetInserter so `sim_reset` resets it the same
+    way system reset does on hardware.
+    """
+    if not hdl:
+        return SimCRC32Peripheral()
+    periph = ResetInserter()(CRC32Peripheral(VERILOG_SOURCES))
+    periph.sim_reset = periph.reset
+    return periph
+
+
 # ---------------------------------------------------------------------------
 # TestBench — wires up: SimCRC32Peripheral → CSRBank → Wishbone2CSR → master
 # ---------------------------------------------------------------------------
 class TestBench(Module):
-    def __init__(self):
+    def __init__(self, hdl=False):
+        self.params = {"hdl": hdl}      # Identifies the design for the Verilator model cache
         self.master = wishbone.Interface(data_width=32, adr_width=30)
 
-        self.submodules.dut = SimCRC32Peripheral()
+        # Free-running cycle counter, used to time bus sequences
+        self.cycle = Signal(32)
+        self.sync += self.cycle.eq(self.cycle + 1)
+
+        self.submodules.dut = new_peripheral(hdl)
 
         csr_if = csr_bus.Interface(data_width=32)
 
@@ -139,46 +280,46 @@ class TestBench(Module):
             bus_csr=csr_if,
         )
 
+    def sim_ios(self):
+        """Signals the test generators touch (the ports under Verilator)."""
+        return set(self.master.flatten()) | {self.cycle, self.dut.sim_reset}
+
 
 # ---------------------------------------------------------------------------
-# Wishbone helpers
+# NativeTestBench — SimCRC32Peripheral as a Wishbone-native register file
 # ---------------------------------------------------------------------------
-def wb_write(master, byte_addr, value):
-    yield master.adr.eq(byte_addr >> 2)
-    yield master.dat_w.eq(value)
-    yield master.we.eq(1)
-    yield master.sel.eq(0xF)
-    yield master.cyc.eq(1)
-    yield master.stb.eq(1)
-    yield
-    for _ in range(10):
-        if (yield master.ack):
-            break
-        yield
-    yield master.cyc.eq(0)
-    yield master.stb.eq(0)
-    yield master.we.eq(0)
-    yield
+class NativeTestBench(Module):
+    def __init__(self, registered=False, hdl=False):
+        self.params = {"registered": registered, "hdl": hdl}
+        self.cycle = Signal(32)
+        self.sync += self.cycle.eq(self.cycle + 1)
 
+        self.dut = new_peripheral(hdl)
+        self.submodules.regs = WishboneCSRBank(self.dut, registered=registered)
+        self.master = self.regs.bus     # Upper address bits are not decoded here
 
-def wb_read(master, byte_addr):
-    yield master.adr.eq(byte_addr >> 2)
-    yield master.we.eq(0)
-    yield master.sel.eq(0xF)
-    yield master.cyc.eq(1)
-    yield master.stb.eq(1)
-    yield
-    for _ in range(10):
-        if (yield master.ack):
-            break
-        yield
-    value = yield master.dat_r
-    yield master.cyc.eq(0)
-    yield master.stb.eq(0)
-    yield
-    return value
+    def sim_ios(self):
+        return set(self.master.flatten()) | {self.cycle, self.dut.sim_reset}
 
 
+def simulate(result, tb, generator):
+    """Run `generator(trace)` on `tb` with run_traced(), or run_verilator() with --verilator.
+
+    One waveform per case when --vcd is given. Verilator traces every signal:
+    the --vcd-signals / --vcd-window filters only apply to the Migen simulator.
+    """
+    trace = trace_from_args(args, signals=[tb.master], case=result.name)
+    if args.verilator:
+        run_verilator(tb, generator(trace), ios=tb.sim_ios(), sources=VERILOG_SOURCES,
+                      vcd_name=trace.filename if trace is not None else None,
+                      params=(type(tb).__name__, tb.params))
+    else:
+        run_traced(tb, generator(trace), trace)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
 def sys_reset(dut, cycles=2):
     """Drive sim_reset for `cycles` clock cycles, mirroring system reset."""
     yield dut.dut.sim_reset.eq(1)
@@ -188,6 +329,43 @@ def sys_reset(dut, cycles=2):
     yield
 
 
+def check(result, trace, label, got, expected):
+    """Print and record one checksum comparison; a failure triggers the waveform window."""
+    ok = got == expected
+    print(f"  [{'PASS' if ok else 'FAIL'}] {label}: got 0x{got:08x}, expected 0x{expected:08x}")
+    if not result.record(ok, f"{label}: got 0x{got:08x}, expected 0x{expected:08x}") and trace is not None:
+        trace.trigger()
+
+
+def feed(bfm, addr, data):
+    """Write each byte of `data`, leaving a cycle for out_buf to latch."""
+    for byte in data:
+        yield from bfm.write(addr, byte & 0xFF)
+        yield
+
+
+def check_bank_layout(result, peripheral, module):
+    """`module`'s CSRs must be the `peripheral`_* registers of the reference map, in order."""
+    names = [c.name for c in module.get_csrs()]
+    ok    = names == [name[len(peripheral) + 1:] for name in Crc32Regs.groups[peripheral]]
+    print(f"  [{'PASS' if ok else 'FAIL'}] {len(names)} bank registers laid out as {peripheral}_* in crc32Regs.py")
+    result.record(ok, f"{peripheral} bank registers {names}")
+
+
+def bank_register_map(class_name, name, module, base):
+    """RegisterMap of `module`'s CSRs at `base`, laid out as the CSRBank does (one word per 32 bits)."""
+    registers, addr = [], base
+    for c in module.get_csrs():
+        words = (c.size + 31) // 32
+        registers.append(Register(f"{name}_{c.name}", addr, size=words,
+                                  access="ro" if isinstance(c, CSRStatus) else "rw"))
+        addr += 4 * words
+    return type(class_name, (RegisterMap,), {
+        "registers": tuple(registers),
+        "groups":    {name: tuple(r.name for r in registers)},
+    })()
+
+
 # ---------------------------------------------------------------------------
 # Reference helper
 # ---------------------------------------------------------------------------
@@ -199,86 +377,1160 @@ def ref_checksum(data_bytes):
 
 
 # ---------------------------------------------------------------------------
-# Test sequence
+# Tests 1-6: register behaviour through Wishbone2CSR
 # ---------------------------------------------------------------------------
-def run_test(dut):
-    passed = 0
-    failed = 0
-
-    def check(label, got, expected):
-        nonlocal passed, failed
-        ok = got == expected
-        print(f"  [{'PASS' if ok else 'FAIL'}] {label}: got 0x{got:08x}, expected 0x{expected:08x}")
-        passed, failed = (passed + 1, failed) if ok else (passed, failed + 1)
-
-    # ------------------------------------------------------------------
-    # Test 1: Initial checksum at power-on
+@suite.case("test01_power_on")
+def case_power_on(result):
     # out_buf resets to 0xFFFFFFFF → checksum = ~0xFFFFFFFF = 0x00000000
-    # ------------------------------------------------------------------
     print("\n--- Test 1: Initial checksum (power-on, no writes) ---")
-    val = yield from wb_read(dut.master, ADDR_DATA)
-    check("checksum at power-on", val, 0x00000000)
+    dut = TestBench(hdl=args.verilator)
+
+    def gen(trace):
+        val = (yield from WishboneBFM(dut.master).read(ADDR_DATA)).value
+        check(result, trace, "checksum at power-on", val, 0x00000000)
+
+    simulate(result, dut, gen)
+
 
-    # ------------------------------------------------------------------
-    # Test 2: Single byte 0x31 ('1') — read and write share same address
-    # ------------------------------------------------------------------
+@suite.case("test02_single_byte")
+def case_single_byte(result):
+    # Read and write share the same address
     print("\n--- Test 2: Single byte 0x31 at 0x40000800 ---")
-    yield from wb_write(dut.master, ADDR_DATA, 0x31 & 0xFF)
-    yield                                          # let sync latch out_buf
-    val = yield from wb_read(dut.master, ADDR_DATA)
-    check("checksum after 0x31", val, ref_checksum([0x31]))
-
-    # ------------------------------------------------------------------
-    # Test 3: Known CRC32 vector — "123456789" = 0xCBF43926
-    # Reset accumulator via system reset, then feed all 9 bytes.
-    # Each byte is masked to 8 bits before writing.
-    # ------------------------------------------------------------------    
-    print("\n--- Test 3: add Single byte 0x26 at 0x40000800 ---")
-    yield from wb_write(dut.master, ADDR_DATA, 0x26)
-    yield                                          # let sync latch out_buf
-    val = yield from wb_read(dut.master, ADDR_DATA)
-    check("checksum after 0x26", val, 0x558990b0)
-
-    # ------------------------------------------------------------------
-    # Test 4: System reset clears accumulator back to initial state
-    # ------------------------------------------------------------------
+    dut = TestBench(hdl=args.verilator)
+
+    def gen(trace):
+        bfm = WishboneBFM(dut.master)
+        yield from feed(bfm, ADDR_DATA, [0x31])
+        val = (yield from bfm.read(ADDR_DATA)).value
+        check(result, trace, "checksum after 0x31", val, ref_checksum([0x31]))
+
+    simulate(result, dut, gen)
+
+
+@suite.case("test03_accumulate")
+def case_accumulate(result):
+    # The accumulator carries on from the previous byte: 0x31 then 0x26
+    print("\n--- Test 3: add Single byte 0x26 at 0x40000800 (after 0x31) ---")
+    dut = TestBench(hdl=args.verilator)
+
+    def gen(trace):
+        bfm = WishboneBFM(dut.master)
+        yield from feed(bfm, ADDR_DATA, [0x31, 0x26])
+        val = (yield from bfm.read(ADDR_DATA)).value
+        check(result, trace, "checksum after 0x26", val, 0x558990b0)
+
+    simulate(result, dut, gen)
+
+
+@suite.case("test04_system_reset")
+def case_system_reset(result):
     print("\n--- Test 4: System reset clears accumulator ---")
-    yield from sys_reset(dut)
-    val = yield from wb_read(dut.master, ADDR_DATA)
-    check("checksum after system reset", val, 0x00000000)
+    dut = TestBench(hdl=args.verilator)
 
-    # ------------------------------------------------------------------
-    # Test 5: Byte-by-byte accumulation matches crcLib.py at every step
-    # ------------------------------------------------------------------
+    def gen(trace):
+        bfm = WishboneBFM(dut.master)
+        yield from feed(bfm, ADDR_DATA, [0x31, 0x26])
+        yield from sys_reset(dut)
+        val = (yield from bfm.read(ADDR_DATA)).value
+        check(result, trace, "checksum after system reset", val, 0x00000000)
+
+    simulate(result, dut, gen)
+
+
+@suite.case("test05_byte_by_byte")
+def case_byte_by_byte(result):
     print("\n--- Test 5: Byte-by-byte match against crcLib.py (0xDEADBEEF) ---")
-    yield from sys_reset(dut)
-    ref_crc = 0xFFFFFFFF
-    for byte in b"\xDE\xAD\xBE\xEF":
-        yield from wb_write(dut.master, ADDR_DATA, byte & 0xFF)
-        yield
-        ref_crc = crc32_ref(ref_crc, byte)
-        val = yield from wb_read(dut.master, ADDR_DATA)
-        check(f"  after byte 0x{byte:02x}", val, (~ref_crc) & 0xFFFFFFFF)
-
-    # ------------------------------------------------------------------
-    # Test 6: Upper bits [31:8] in a write must not affect the CRC.
-    # Write 0xDEADBE31 and verify the result equals writing 0x31 alone.
-    # ------------------------------------------------------------------
+    dut = TestBench(hdl=args.verilator)
+
+    def gen(trace):
+        bfm = WishboneBFM(dut.master)
+        ref_crc = 0xFFFFFFFF
+        for byte in b"\xDE\xAD\xBE\xEF":
+            yield from feed(bfm, ADDR_DATA, [byte])
+            ref_crc = crc32_ref(ref_crc, byte)
+            val = (yield from bfm.read(ADDR_DATA)).value
+            check(result, trace, f"  after byte 0x{byte:02x}", val, (~ref_crc) & 0xFFFFFFFF)
+
+    simulate(result, dut, gen)
+
+
+@suite.case("test06_upper_bits_ignored")
+def case_upper_bits_ignored(result):
+    # Upper bits [31:8] in a write must not affect the CRC:
+    # 0xDEADBE31 must give the same result as writing 0x31 alone.
     print("\n--- Test 6: Upper bits [31:8] ignored — 0xDEADBE31 treated as 0x31 ---")
+    dut = TestBench(hdl=args.verilator)
+
+    def gen(trace):
+        bfm = WishboneBFM(dut.master)
+        yield from bfm.write(ADDR_DATA, 0xDEADBE31)   # upper 24 bits set
+        yield
+        val = (yield from bfm.read(ADDR_DATA)).value
+        check(result, trace, "0xDEADBE31 masked to 0x31", val, ref_checksum([0x31]))
+
+    simulate(result, dut, gen)
+
+
+# ---------------------------------------------------------------------------
+# Tests 7-8: latency and bandwidth, CSR path vs Wishbone-native register file
+# ---------------------------------------------------------------------------
+PATHS = {
+    "csr":           ("Wishbone2CSR + CSRBank",     lambda: TestBench(hdl=args.verilator),                         ADDR_DATA),
+    "wb_registered": ("WishboneCSRBank registered", lambda: NativeTestBench(registered=True,  hdl=args.verilator), ADDR_DATA_WB),
+    "wb_zero_wait":  ("WishboneCSRBank zero-wait",  lambda: NativeTestBench(registered=False, hdl=args.verilator), ADDR_DATA_WB),
+}
+
+
+def latency_case(key):
+    label, make_tb, addr = PATHS[key]
+
+    @suite.case(f"test07_latency_{key}")
+    def case_latency(result):
+        """Checksum "123456789" (9 writes + 1 read) and report the bus cycles it took."""
+        print(f"\n--- Test 7: \"123456789\" (9 writes + 1 read), {label} ---")
+        dut = make_tb()
+
+        def gen(trace):
+            bfm = WishboneBFM(dut.master)
+            start = yield dut.cycle
+            for byte in b"123456789":
+                yield from bfm.write(addr, byte)
+            val = (yield from bfm.read(addr)).value
+            cycles = (yield dut.cycle) - start
+            print(f"  {label:<28} {cycles:>4} cycles ({cycles / 10:.1f} per access)")
+            check(result, trace, "checksum of \"123456789\"", val, 0xCBF43926)
+
+        simulate(result, dut, gen)
+
+
+def run_bandwidth_test(dut, result, trace, addr, label, styles, n=256):
+    """Stream `n` bytes with each transaction style; returns the bus cycles of the last one."""
+    stream = bytes((i * 37 + 11) & 0xFF for i in range(n))
+    expected = ref_checksum(stream)
+    cycles = 0
+    for style in styles:
+        yield from sys_reset(dut)
+        bfm = WishboneBFM(dut.master)
+        if style == "classic":
+            for b in stream:
+                yield from bfm.write(addr, b)
+        elif style == "back-to-back":
+            yield from bfm.transfer([("w", addr, b) for b in stream])
+        else:
+            yield from bfm.burst_write(addr, stream, incrementing=False, pipelined=(style == "pipelined"))
+        s = bfm.stats.summary()
+        cycles = s["cycles"]
+        val = (yield from bfm.read(addr)).value
+        ok = val == expected and s["errors"] == 0 and s["timeouts"] == 0
+        print(f"  [{'PASS' if ok else 'FAIL'}] {label:<28} {style:<13} {n} bytes in {cycles:>4} cycles "
+              f"({n / cycles:.2f} bytes/cycle), checksum 0x{val:08x}")
+        if not result.record(ok, f"{label} {style}: checksum 0x{val:08x}, expected 0x{expected:08x}") \
+                and trace is not None:
+            trace.trigger()
+    return cycles
+
+
+def bandwidth_case(key, styles):
+    label, make_tb, addr = PATHS[key]
+
+    @suite.case(f"test08_bandwidth_{key}")
+    def case_bandwidth(result):
+        # Constant-address bursts (CTI=001) feed the data register at bus speed
+        print(f"\n--- Test 8: 256-byte stream, {label} ---")
+        dut = make_tb()
+
+        def gen(trace):
+            yield from run_bandwidth_test(dut, result, trace, addr, label, styles)
+
+        simulate(result, dut, gen)
+
+
+for key in PATHS:
+    latency_case(key)
+bandwidth_case("csr",          ("classic", "back-to-back", "burst"))
+bandwidth_case("wb_zero_wait", ("classic", "back-to-back", "burst", "pipelined"))
+
+
+# ---------------------------------------------------------------------------
+# Test 10: constrained-random stress — seeded random packets, junk in the upper
+# bits, random reset_ctrl writes; zlib.crc32 is the (fast) reference
+# ---------------------------------------------------------------------------
+# Packets per path: a quick check in the regression run, thousands in a soak run
+RANDOM_PACKETS      = 10
+RANDOM_SOAK_PACKETS = 2000
+
+
+def random_packets(rng, packets, max_len=64, reset_prob=0.02):
+    """[[("byte", word) | ("reset", word), ...], ...] — one list per packet."""
+    stream = []
+    for _ in range(packets):
+        packet = []
+        for _ in range(rng.randint(1, max_len)):
+            if rng.random() < reset_prob:
+                packet.append(("reset", rng.getrandbits(32)))
+            packet.append(("byte", rng.getrandbits(24) << 8 | rng.getrandbits(8)))
+        stream.append(packet)
+    return stream
+
+
+def run_random_stress(dut, result, trace, data_addr, reset_addr, label, stream):
+    """Send `stream` twice: checked (read back after every byte) and streaming (CTI bursts)."""
+    n_bytes  = sum(op == "byte" for packet in stream for op, _ in packet)
+    n_resets = sum(op == "reset" for packet in stream for op, _ in packet)
+
+    # Checked: every byte write is followed by a read compared with zlib.crc32
+    bfm = WishboneBFM(dut.master)
+    ref = 0
+    first_error = None
+    t0 = time.perf_counter()
+    for p, packet in enumerate(stream):
+        ops, expected = [], []
+        for op, word in packet:
+            if op == "reset":
+                ops.append(("w", reset_addr, word))
+                ref = 0
+            else:
+                ops.append(("w", data_addr, word))
+                ops.append(("r", data_addr))
+                ref = zlib.crc32(bytes([word & 0xFF]), ref)
+                expected.append(ref)
+        res  = yield from bfm.transfer(ops)
+        got  = [r.value for (kind, *_), r in zip(ops, res) if kind == "r"]
+        bad  = [i for i, (g, e) in enumerate(zip(got, expected)) if g != e]
+        if first_error is None and (bad or len(got) != len(expected)):
+            i = bad[0] if bad else len(got)
+            first_error = (f"packet {p} byte {i}: got "
+                           f"{'0x%08x' % got[i] if i < len(got) else 'no answer'}, "
+                           f"expected 0x{expected[i]:08x}")
+            if trace is not None:
+                trace.trigger()
+    checked_s      = time.perf_counter() - t0
+    checked_cycles = bfm.stats.cycles
+
+    # Streaming: bytes of a packet as one constant-address burst, checksum read at the end
     yield from sys_reset(dut)
-    yield from wb_write(dut.master, ADDR_DATA, 0xDEADBE31)   # upper 24 bits set
-    yield
-    val = yield from wb_read(dut.master, ADDR_DATA)
-    check("0xDEADBE31 masked to 0x31", val, ref_checksum([0x31]))
+    bfm = WishboneBFM(dut.master)
+    ref = 0
+    t0 = time.perf_counter()
+    for p, packet in enumerate(stream):
+        burst = []
+        for op, word in packet + [("end", 0)]:
+            if op == "byte":
+                burst.append(word)
+                ref = zlib.crc32(bytes([word & 0xFF]), ref)
+                continue
+            if burst:
+                yield from bfm.burst_write(data_addr, burst, incrementing=False)
+                burst = []
+            if op == "reset":
+                yield from bfm.write(reset_addr, word)
+                ref = 0
+        val = (yield from bfm.read(data_addr)).value
+        if first_error is None and val != ref:
+            first_error = f"streaming, end of packet {p}: got 0x{val:08x}, expected 0x{ref:08x}"
+            if trace is not None:
+                trace.trigger()
+    stream_s      = time.perf_counter() - t0
+    stream_cycles = bfm.stats.cycles
+
+    ok = first_error is None
+    print(f"  {len(stream)} packets, {n_bytes} bytes, {n_resets} reset_ctrl writes")
+    print(f"  checked   {checked_cycles:>7} cycles  {n_bytes / checked_cycles:.3f} bytes/cycle  "
+          f"{n_bytes / checked_s:>8.0f} bytes/s")
+    print(f"  streaming {stream_cycles:>7} cycles  {n_bytes / stream_cycles:.3f} bytes/cycle  "
+          f"{n_bytes / stream_s:>8.0f} bytes/s")
+    print(f"  [{'PASS' if ok else 'FAIL'}] {label}: every byte matches zlib.crc32"
+          + ("" if ok else f" — first mismatch at {first_error}"))
+    result.record(ok, f"{label}: {first_error}")
+
+
+def random_case(key, reset_addr):
+    label, make_tb, addr = PATHS[key]
+
+    @suite.case(f"test10_random_{key}")
+    def case_random(result):
+        print(f"\n--- Test 10: Random stress (seed {args.seed}, {args.random_packets} packets), {label} ---")
+        dut = make_tb()
+        stream = random_packets(random.Random(args.seed), args.random_packets)
+
+        def gen(trace):
+            yield from run_random_stress(dut, result, trace, addr, reset_addr, label, stream)
+
+        simulate(result, dut, gen)
+
+
+random_case("csr",          ADDR_RESET)
+random_case("wb_zero_wait", ADDR_RESET_WB)
+
+
+# ---------------------------------------------------------------------------
+# Test 11: start-up of the modules host scripts, testbenches and the builds import
+# (module, module prefixes it must not load; time budgets: commonLib/importBench.py --budgets)
+# ---------------------------------------------------------------------------
+IMPORT_GUARDS = [
+    ("crc32Map",                 ("migen", "litex")),
+    ("crc32Regs",                ("migen", "litex")),
+    ("crc32Peripheral",          SOC_MODULES),
+    ("testBenchCrc32Peripheral", SOC_MODULES),
+    ("wishBoneCrsCrc32Vhdl",     ("litex_boards", "litex.build.colognechip")),
+]
+
+
+@suite.case("test11_import_modules")
+def case_import_modules(result):
+    """Import each module in a fresh interpreter: without the SoC build stack."""
+    print("\n--- Test 11: Imports (commonLib/importBench.py) ---")
+    here = os.path.dirname(os.path.abspath(__file__))
+    for module, forbidden in IMPORT_GUARDS:
+        timing   = measure_import(module, here, repeat=1)
+        unwanted = loaded(timing.modules, forbidden)
+        ok = not unwanted
+        print(f"  [{'PASS' if ok else 'FAIL'}] {module:<26} {timing.seconds*1e3:6.1f} ms, "
+              f"loads {', '.join(unwanted[:3]) or 'none of ' + forbidden[0] + ', ...'}")
+        result.record(ok, f"{module}: loads {unwanted[:3]}")
+
+
+# ---------------------------------------------------------------------------
+# Test 12: generated register map (crc32Regs.py) with batched accesses
+# ---------------------------------------------------------------------------
+@suite.case("test12_register_batch")
+def case_register_batch(result):
+    """Queue accesses on a Crc32Regs batch; adjacent registers must share one burst."""
+    print("\n--- Test 12: Generated register map, batched accesses ---")
+    dut  = TestBench(hdl=args.verilator)
+    regs = Crc32Regs()
+    data = b"123456789"
+
+    def gen(trace):
+        bfm = WishboneBFM(dut.master)
+
+        # reset_ctrl, 9 × data (same address: one transaction each), the crc32 group as one read burst
+        b = regs.batch()
+        b.crc32_reset_ctrl.write(1)
+        for byte in data:
+            b.crc32_data.write(byte)
+        values = b.read_group("crc32")
+        n_trans = len(b.transactions())
+        yield from run_batch(bfm, b)
+        check(result, trace, f"crc32_data after {data.decode()!r}", values["data"].value, ref_checksum(data))
+        ok = n_trans == len(data) + 2
+        print(f"  [{'PASS' if ok else 'FAIL'}] {len(data) + 1 + len(values)} accesses in {n_trans} bus transactions")
+        result.record(ok, f"{n_trans} transactions, expected {len(data) + 2}")
+
+        # data then reset_ctrl are adjacent: one incrementing write burst clears the CRC
+        b.write_group("crc32", data=0x31, reset_ctrl=1)
+        checksum = b.crc32_data.read()
+        ok = [t[0] for t in b.transactions()] == ["w", "r"] and len(b.transactions()[0][2]) == 2
+        yield from run_batch(bfm, b)
+        check(result, trace, "crc32_data after write_group burst", checksum.value, 0x00000000)
+        print(f"  [{'PASS' if ok else 'FAIL'}] write_group('crc32') sent as one 2-word burst")
+        result.record(ok, "write_group('crc32') burst")
+
+        # Reads and writes interleaved: data, read, reset_ctrl (data + 4), read
+        b.crc32_data.write(0x31)
+        one = b.crc32_data.read()
+        b.crc32_reset_ctrl.write(1)
+        cleared = b.crc32_data.read()
+        kinds = [t[0] for t in b.transactions()]
+        yield from run_batch(bfm, b)
+        check(result, trace, "crc32_data after '1' (mixed batch)", one.value, ref_checksum(b"1"))
+        check(result, trace, "crc32_data after reset (mixed batch)", cleared.value, 0x00000000)
+        ok = kinds == ["w", "r", "w", "r"]
+        print(f"  [{'PASS' if ok else 'FAIL'}] mixed read/write batch as {kinds}")
+        result.record(ok, f"mixed batch transactions {kinds}")
+
+        # Field masks come from csr.svd (full 32-bit fields for plain CSRs)
+        mask = regs.register("crc32_data").fields["data"].mask
+        check(result, trace, "crc32_data.data field mask", mask, 0xFFFFFFFF)
+
+    simulate(result, dut, gen)
+
+
+# ---------------------------------------------------------------------------
+# Test 13: PerfCounters watching the bus and the CRC32 byte strobe
+# ---------------------------------------------------------------------------
+PERF_SLOT = CSR_MAP["perf"]                          # 3
+
+
+class PerfTestBench(Module):
+    """TestBench plus PerfCounters on a second CSR bank, watching the master.
+
+    The counters are added in the order of the SoC Top (--perf-counters), so the
+    bank has the layout of the perf_* registers in crc32Regs.py. The bridge byte
+    streams have no UART here and stay idle.
+    """
+
+    def __init__(self, hdl=False):
+        self.params = {"hdl": hdl, "perf": True}
+        self.master = wishbone.Interface(data_width=32, adr_width=30)
+        self.cycle  = Signal(32)
+        self.sync  += self.cycle.eq(self.cycle + 1)
+
+        self.submodules.dut  = new_peripheral(hdl)
+        self.submodules.perf = PerfCounters()
+        self.perf.add_wishbone("bridge", self.master)
+        self.perf.add_stream("bridge_rx_bytes", stream.Endpoint([("data", 8)]))
+        self.perf.add_stream("bridge_tx_bytes", stream.Endpoint([("data", 8)]))
+        self.perf.add_counter("crc_bytes", self.dut.data.re)
+
+        csr_if = csr_bus.Interface(data_width=32)
+        banks  = [csr_bus.CSRBank(module.get_csrs(), address=slot, paging=CSR_PAGING,
+                                  bus=csr_bus.Interface(data_width=32))
+                  for module, slot in ((self.dut, CRC32_SLOT), (self.perf, PERF_SLOT))]
+        self.submodules += banks
+        self.submodules.csr_ic = csr_bus.Interconnect(csr_if, [bank.bus for bank in banks])
+        self.submodules.wb2csr = Wishbone2CSR(bus_wishbone=self.master, bus_csr=csr_if)
+
+    def sim_ios(self):
+        return set(self.master.flatten()) | {self.cycle, self.dut.sim_reset}
+
+    def register_map(self):
+        """The reference map (crc32Regs.py), which holds the perf_* registers."""
+        return Crc32Regs()
+
+
+@suite.case("test13_perf_counters")
+def case_perf_counters(result):
+    """Count 9 CRC32 bytes and the bus accesses carrying them; snapshot holds, CLEAR restarts."""
+    print("\n--- Test 13: PerfCounters (commonLib/perfCounters.py) ---")
+    dut  = PerfTestBench(hdl=args.verilator)
+    regs = dut.register_map()
+    data = b"123456789"
+
+    def snapshot(bfm, control=SNAPSHOT):
+        b = regs.batch()
+        b.perf_control.write(control)
+        values = b.read_group("perf")
+        yield from run_batch(bfm, b)
+        return {name: p.value for name, p in values.items()}
+
+    def expect(label, got, expected):
+        ok = got == expected
+        print(f"  [{'PASS' if ok else 'FAIL'}] {label}: {got} (expected {expected})")
+        result.record(ok, f"{label}: {got}, expected {expected}")
+
+    check_bank_layout(result, "perf", dut.perf)
+
+    def gen(trace):
+        bfm = WishboneBFM(dut.master)
+
+        yield from bfm.write(regs.register("perf_control").addr, CLEAR)
+        start = yield dut.cycle
+        for byte in data:
+            yield from bfm.write(ADDR_DATA, byte)
+        val = (yield from bfm.read(ADDR_DATA)).value
+        check(result, trace, f"crc32_data after {data.decode()!r}", val, ref_checksum(data))
+        counters = yield from snapshot(bfm)
+        elapsed  = (yield dut.cycle) - start
+
+        # The CLEAR write is acknowledged after it took effect, so it counts as one write
+        expect("crc_bytes", counters["crc_bytes"], len(data))
+        expect("bridge_writes", counters["bridge_writes"], len(data) + 1)
+        expect("bridge_reads", counters["bridge_reads"], 1)
+        hist = [counters[f"bridge_latency{i}"] for i in range(LATENCY_BINS)]
+        accesses = counters["bridge_reads"] + counters["bridge_writes"]
+        expect("latency histogram total", sum(hist), accesses)
+        # Wishbone2CSR has a fixed latency: one bin, and busy cycles within that bin's bounds
+        # (the CLEAR write only counts the cycles after the clear)
+        expect("latency bins used", sum(1 for n in hist if n), 1)
+        low, high = latency_bins(LATENCY_BINS)[next(i for i, n in enumerate(hist) if n)]
+        busy = counters["bridge_busy_cycles"]
+        ok = (accesses - 1) * low <= busy <= accesses * high
+        print(f"  [{'PASS' if ok else 'FAIL'}] bridge_busy_cycles {busy} for {accesses} accesses "
+              f"of {low}..{high} cycles")
+        result.record(ok, f"bridge_busy_cycles {busy}, {accesses} accesses of {low}..{high} cycles")
+        ok = 0 < counters["cycles"] <= elapsed
+        print(f"  [{'PASS' if ok else 'FAIL'}] cycles {counters['cycles']} within the {elapsed} "
+              f"simulation cycles since the CLEAR")
+        result.record(ok, f"cycles {counters['cycles']}, measured {elapsed}")
+
+        # Without a new snapshot the registers hold, even though the counters ran on
+        b = regs.batch()
+        again = b.read_group("perf")
+        yield from run_batch(bfm, b)
+        expect("snapshot held (cycles)", again["cycles"].value, counters["cycles"])
+
+        # SNAPSHOT | CLEAR, then SNAPSHOT: only the clearing write and a few cycles remain
+        yield from snapshot(bfm, SNAPSHOT | CLEAR)
+        cleared = yield from snapshot(bfm)
+        expect("crc_bytes after CLEAR", cleared["crc_bytes"], 0)
+        expect("bridge_writes after CLEAR", cleared["bridge_writes"], 1)
+
+    simulate(result, dut, gen)
+
+
+# ---------------------------------------------------------------------------
+# Test 14: logic analyzer capture, read back in bursts, decoded to a VCD
+# ---------------------------------------------------------------------------
+LA_SLOT      = CSR_MAP["la"]                         # 4
+LA_TB_DEPTH  = 16                                    # Small ring: the capture wraps
+
+
+class AnalyzerTestBench(Module):
+    """TestBench plus a LogicAnalyzer with the probes of the --analyzer build.
+
+    The master reaches the CSRs (Wishbone2CSR) and the capture buffer through a
+    WishboneErrDecoder, as the bridge does in the SoC. Both are at the la_*
+    addresses of the reference map (crc32Regs.py); only the ring is shorter.
+    """
+
+    def __init__(self, hdl=False):
+        self.params = {"hdl": hdl, "analyzer": True}
+        self.master = wishbone.Interface(data_width=32, adr_width=30)
+        self.cycle  = Signal(32)
+        self.sync  += self.cycle.eq(self.cycle + 1)
+
+        self.submodules.dut = dut = new_peripheral(hdl)
+        bus = self.master
+        self.submodules.la = LogicAnalyzer([
+            ("bridge_cyc", bus.cyc), ("bridge_stb", bus.stb),
+            ("bridge_we",  bus.we),  ("bridge_ack", bus.ack),
+            ("crc_write",  dut.data.re), ("crc_reset", dut.reset_ctrl.re),
+            ("crc_byte",   dut.data.r[:8]),
+        ], depth=LA_TB_DEPTH)
+
+        csr_wb = wishbone.Interface(data_width=32, adr_width=30)
+        self.submodules.decoder = WishboneErrDecoder(bus, [
+            ("csr", 0x40000000, 0x10000, csr_wb),
+            ("la",  LA_BASE, self.la.size, self.la.bus),
+        ])
+        csr_if = csr_bus.Interface(data_width=32)
+        banks  = [csr_bus.CSRBank(module.get_csrs(), address=slot, paging=CSR_PAGING,
+                                  bus=csr_bus.Interface(data_width=32))
+                  for module, slot in ((self.dut, CRC32_SLOT), (self.la, LA_SLOT))]
+        self.submodules += banks
+        self.submodules.csr_ic = csr_bus.Interconnect(csr_if, [bank.bus for bank in banks])
+        self.submodules.wb2csr = Wishbone2CSR(bus_wishbone=csr_wb, bus_csr=csr_if)
+
+    def sim_ios(self):
+        return set(self.master.flatten()) | {self.cycle, self.dut.sim_reset, self.la.sample}
+
+
+@suite.case("test14_logic_analyzer")
+def case_logic_analyzer(result):
+    """Trigger on the write of '5', read the wrapped ring in bursts, compare with the simulated probes."""
+    print("\n--- Test 14: Logic analyzer (commonLib/logicAnalyzer.py, laCapture.py) ---")
+    dut  = AnalyzerTestBench(hdl=args.verilator)
+    desc = dut.la.description()
+    regs = Crc32Regs()
+    data = b"123456789"
+    post = 8
+    reference = []          # la.sample in every cycle, as the simulation saw it
+
+    def expect(label, ok, detail):
+        print(f"  [{'PASS' if ok else 'FAIL'}] {label}: {detail}")
+        result.record(ok, f"{label}: {detail}")
+
+    @passive
+    def recorder():
+        while True:
+            reference.append((yield dut.la.sample))
+            yield
+
+    check_bank_layout(result, "la", dut.la)
+
+    def gen(trace):
+        bfm = WishboneBFM(dut.master)
+
+        def reg(name):
+            return regs.register(f"la_{name}").addr
+
+        mask, value = trigger_bits(desc, {"crc_write": 1, "crc_byte": ord("5")})
+        yield from bfm.write(reg("trigger_mask"), mask)
+        yield from bfm.write(reg("trigger_value"), value)
+        yield from bfm.write(reg("post_trigger"), post)
+        yield from bfm.write(reg("arm"), 1)
+        armed = len(reference)
+        yield from feed(bfm, ADDR_DATA, data)
+
+        status = 0
+        for _ in range(20):
+            status = (yield from bfm.read(reg("status"))).value
+            if status & DONE:
+                break
+        expect("status", status & (TRIGGERED | DONE) == TRIGGERED | DONE, f"0x{status:x}")
+        count     = (yield from bfm.read(reg("count"))).value
+        write_ptr = (yield from bfm.read(reg("write_ptr"))).value
+        trig      = (yield from bfm.read(reg("trigger_entry"))).value
+        expect("ring wrapped", count == LA_TB_DEPTH, f"count {count}, depth {LA_TB_DEPTH}")
+
+        words = []
+        for addr, length in read_plan(desc, LA_BASE, count, write_ptr):
+            words += [r.value for r in (yield from bfm.burst_read(addr, length))]
+        runs = decode(words, desc)
+        trig = (trig - write_ptr) % LA_TB_DEPTH          # Oldest entry first
+        expect("post-trigger entries", len(runs) - trig == post, f"{len(runs) - trig}, expected {post}")
+        fields = probe_values(desc, runs[trig][0])
+        expect("trigger sample", (fields["crc_write"], fields["crc_byte"]) == (1, ord("5")), fields)
+
+        # The capture is a contiguous window of the probes; the trigger is their first match after arm
+        captured = expand(runs)
+        at       = sum(run for _, run in runs[:trig])
+        first    = next(i for i in range(armed, len(reference))
+                        if reference[i] & mask == value & mask)
+        start    = first - at
+        window   = reference[start:start + len(captured)]
+        expect("capture matches the simulation", start >= armed and captured == window,
+               f"{len(captured)} cycles in {len(runs)} entries")
+
+        stats = transfer_stats(desc, runs)
+        expect("compression", stats["bytes"] < stats["raw_bytes"],
+               f"{stats['bytes']} bytes read for {stats['raw_bytes']} uncompressed ({stats['ratio']:.1f}x)")
+
+        # Long rings are read in bursts the bridge can carry, oldest entry first
+        plan = read_plan({"depth": 1024, "words": 1}, 0, 1024, 1000)
+        ok = (all(n <= MAX_BURST for _, n in plan) and sum(n for _, n in plan) == 1024
+              and plan[0][0] == 4 * 1000 and plan[1][0] == 0)
+        expect("read plan", ok, [n for _, n in plan])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "la.vcd")
+            write_vcd(path, desc, runs, trig)
+            with open(path) as f:
+                vcd = f.read()
+        n_vars = vcd.count("$var wire")
+        expect("VCD", n_vars == len(desc["probes"]) + 1 and vcd.rstrip().endswith(f"#{10 * len(captured)}"),
+               f"{n_vars} signals, {len(captured)} cycles")
+
+    simulate(result, dut, lambda trace: [gen(trace), recorder()])
+
+
+# ---------------------------------------------------------------------------
+# Test 15: block-RAM SRAM on the bus (--sram-size): fill, readback, memcpy into the CRC32
+# ---------------------------------------------------------------------------
+SRAM_TB_SIZE = 0x400                                 # 256 words
+
+
+class SramTestBench(Module):
+    """TestBench plus a wishbone.SRAM at SRAM_BASE, decoded as in the SoC (WishboneErrDecoder)."""
+
+    def __init__(self, hdl=False):
+        self.params = {"hdl": hdl, "sram": SRAM_TB_SIZE}
+        self.master = wishbone.Interface(data_width=32, adr_width=30)
+        self.cycle  = Signal(32)
+        self.sync  += self.cycle.eq(self.cycle + 1)
+
+        self.submodules.dut  = new_peripheral(hdl)
+        self.submodules.sram = wishbone.SRAM(SRAM_TB_SIZE)
+
+        csr_wb = wishbone.Interface(data_width=32, adr_width=30)
+        csr_if = csr_bus.Interface(data_width=32)
+        self.submodules.decoder = WishboneErrDecoder(self.master, [
+            ("csr",  0x40000000, 0x10000, csr_wb),
+            ("sram", SRAM_BASE, SRAM_TB_SIZE, self.sram.bus),
+        ])
+        self.submodules.csr_bank = csr_bus.CSRBank(self.dut.get_csrs(), address=CRC32_SLOT,
+                                                   paging=CSR_PAGING, bus=csr_if)
+        self.submodules.wb2csr = Wishbone2CSR(bus_wishbone=csr_wb, bus_csr=csr_if)
+
+    def sim_ios(self):
+        return set(self.master.flatten()) | {self.cycle, self.dut.sim_reset}
+
+
+@suite.case("test15_sram")
+def case_sram(result):
+    """Burst fill / readback of the SRAM, then a bus-side memcpy of its bytes into the CRC32."""
+    print("\n--- Test 15: SRAM (--sram-size), fill / readback / memcpy ---")
+    dut   = SramTestBench(hdl=args.verilator)
+    words = SRAM_TB_SIZE // 4
+    data  = pattern(words, seed=args.seed)
+
+    def expect(label, ok, detail):
+        print(f"  [{'PASS' if ok else 'FAIL'}] {label}: {detail}")
+        result.record(ok, f"{label}: {detail}")
+
+    def gen(trace):
+        bfm = WishboneBFM(dut.master)
+
+        start = yield dut.cycle
+        results = yield from bfm.burst_write(SRAM_BASE, data)
+        fill = (yield dut.cycle) - start
+        expect("fill", all(r.ack for r in results), f"{words} words in {fill} cycles "
+               f"({4 * words / fill:.2f} bytes/cycle)")
+
+        start = yield dut.cycle
+        back  = [r.value for r in (yield from bfm.burst_read(SRAM_BASE, words))]
+        read  = (yield dut.cycle) - start
+        expect("readback", back == data, f"{words} words in {read} cycles ({4 * words / read:.2f} bytes/cycle)")
+
+        # Just past the SRAM is unmapped: ERR, not a wrapped SRAM access
+        r = yield from bfm.read(SRAM_BASE + SRAM_TB_SIZE)
+        expect("past the SRAM", r.err and not r.ack, f"ack={int(r.ack)} err={int(r.err)}")
+
+        # memcpy: a bus master moves 64 bytes from the SRAM into the CRC32, one read per word
+        n = 16
+        yield from bfm.write(ADDR_RESET, 1)
+        start = yield dut.cycle
+        for word in (yield from bfm.burst_read(SRAM_BASE, n)):
+            yield from feed(bfm, ADDR_DATA, word.value.to_bytes(4, "little"))
+        copy  = (yield dut.cycle) - start
+        crc   = (yield from bfm.read(ADDR_DATA)).value
+        check(result, trace, f"crc32 of {4 * n} SRAM bytes", crc,
+              zlib.crc32(b"".join(w.to_bytes(4, "little") for w in data[:n])))
+        print(f"  memcpy SRAM -> crc32_data: {4 * n} bytes in {copy} cycles ({4 * n / copy:.2f} bytes/cycle)")
+
+        # Through the bridge the UART dominates: writes go out 8 words per command
+        ok = (uart_bytes(words, 8, write=True) == 6 * (words // 8) + 4 * words
+              and uart_bytes(words, 255, write=False) == 6 * 2 + 4 * words
+              and uart_bytes(words, 255, write=True) == uart_bytes(words, 8, write=True))
+        expect("bridge cost model", ok,
+               f"{words} words: fill {uart_limit(words, 255, True):.0f} B/s, "
+               f"read {uart_limit(words, 255, False):.0f} B/s at 115200 baud")
+
+    simulate(result, dut, gen)
+
+
+# ---------------------------------------------------------------------------
+# Test 16: CRC32 datapath in its own clock domain (--crc-clk-freq)
+# ---------------------------------------------------------------------------
+# (label, crc clock period with sys at 10, FIFO depth)
+CDC_CONFIGS = [
+    ("fast",     4, 16),     # 2.5 × sys
+    ("slow",    26, 16),     # 0.38 × sys: the FIFO absorbs back-to-back writes
+    ("overflow", 90, 4),     # Much slower than the bus, shallow FIFO: writes get dropped
+]
+
+
+class CdcTestBench(Module):
+    """TestBench with the CRC32 accumulator in a "crc" clock domain (CRC32Crossing)."""
+
+    def __init__(self, fifo_depth=16):
+        self.master = wishbone.Interface(data_width=32, adr_width=30)
+        self.cycle  = Signal(32)
+        self.sync  += self.cycle.eq(self.cycle + 1)
+        self.clock_domains.cd_crc = ClockDomain()
+
+        self.submodules.dut = SimCRC32Peripheral(crc_domain="crc", fifo_depth=fifo_depth)
+        csr_if = csr_bus.Interface(data_width=32)
+        self.submodules.csr_bank = csr_bus.CSRBank(self.dut.get_csrs(), address=CRC32_SLOT,
+                                                   paging=CSR_PAGING, bus=csr_if)
+        self.submodules.wb2csr = Wishbone2CSR(bus_wishbone=self.master, bus_csr=csr_if)
+
+
+def wait_idle(bfm, limit=2000):
+    """Poll crc32_status until busy clears: (status, polls)."""
+    for polls in range(1, limit + 1):
+        status = (yield from bfm.read(ADDR_STATUS)).value
+        if not status & STATUS_BUSY:
+            return status, polls
+    return status, polls
+
+
+@suite.case("test16_crc_clock_domain")
+def case_crc_clock_domain(result):
+    """Checksums with the CRC32 on a faster / slower clock; FIFO overflow is reported and cleared."""
+    print("\n--- Test 16: CRC32 in its own clock domain (--crc-clk-freq) ---")
+    if args.verilator:
+        print("  (Migen simulator: the Verilator backend only has the sys clock)")
+    rng    = random.Random(args.seed)
+    packet = bytes(rng.getrandbits(8) for _ in range(64))
+
+    def expect(label, ok, detail):
+        print(f"  [{'PASS' if ok else 'FAIL'}] {label}: {detail}")
+        result.record(ok, f"{label}: {detail}")
+
+    for label, period, depth in CDC_CONFIGS:
+        dut = CdcTestBench(fifo_depth=depth)
+
+        def gen(trace):
+            bfm = WishboneBFM(dut.master)
+            if label == "overflow":
+                # 4-entry FIFO drained every 9 sys cycles: back-to-back writes overrun it
+                for byte in packet[:16]:
+                    yield from bfm.write(ADDR_DATA, byte)
+                status, _ = yield from wait_idle(bfm)
+                expect(f"{label}: overflow flagged", status & STATUS_OVERFLOW != 0, f"status=0x{status:x}")
+                yield from bfm.write(ADDR_RESET, 1)
+                status, _ = yield from wait_idle(bfm)
+                crc = (yield from bfm.read(ADDR_DATA)).value
+                expect(f"{label}: cleared by reset_ctrl", status == 0 and crc == 0,
+                       f"status=0x{status:x}, checksum 0x{crc:08x}")
+                return
+
+            for name, data in [("123456789", b"123456789"), (f"{len(packet)} random bytes", packet)]:
+                yield from bfm.write(ADDR_RESET, 1)
+                start = yield dut.cycle
+                for byte in data:                       # Back to back, no settling cycle
+                    yield from bfm.write(ADDR_DATA, byte)
+                status, polls = yield from wait_idle(bfm)
+                crc    = (yield from bfm.read(ADDR_DATA)).value
+                cycles = (yield dut.cycle) - start
+                check(result, trace, f"{label} ({period / 10:g} × sys period): {name}", crc, zlib.crc32(data))
+                expect(f"{label}: status", status == 0,
+                       f"status=0x{status:x}, idle after {polls} poll(s), {cycles} sys cycles in total")
+
+        trace = trace_from_args(args, signals=[dut.master], case=f"{result.name}_{label}")
+        run_traced(dut, gen(trace), trace, clocks={"sys": 10, "crc": period})
+
+
+# ---------------------------------------------------------------------------
+# Test 17: CRC32Engine variants (--crc-engine xor / bram, --crc-width 4)
+# ---------------------------------------------------------------------------
+class EngineTestBench(Module):
+    """CRC32Peripheral with a CRC32Engine (no black box) behind Wishbone2CSR."""
+
+    def __init__(self, engine, width, crc_domain="sys"):
+        self.master = wishbone.Interface(data_width=32, adr_width=30)
+        self.cycle  = Signal(32)
+        self.sync  += self.cycle.eq(self.cycle + 1)
+        if crc_domain != "sys":
+            self.clock_domains.cd_crc = ClockDomain()
+
+        self.submodules.dut = CRC32Peripheral(None, engine=engine, width=width, crc_domain=crc_domain)
+        csr_if = csr_bus.Interface(data_width=32)
+        self.submodules.csr_bank = csr_bus.CSRBank(self.dut.get_csrs(), address=CRC32_SLOT,
+                                                   paging=CSR_PAGING, bus=csr_if)
+        self.submodules.wb2csr = Wishbone2CSR(bus_wishbone=self.master, bus_csr=csr_if)
+        self.regs = bank_register_map("EngineRegs", "crc32", self.dut, ADDR_DATA)
+
+
+@suite.case("test17_crc_engines")
+def case_crc_engines(result):
+    """XOR-network and block-RAM engines: every width against zlib, then as the peripheral."""
+    print("\n--- Test 17: CRC32 engines (XOR network / block-RAM slice-by-N) ---")
+    if args.verilator:
+        print("  (Migen simulator: the engines have no black box)")
+    rng = random.Random(args.seed)
+
+    def expect(label, ok, detail):
+        print(f"  [{'PASS' if ok else 'FAIL'}] {label}: {detail}")
+        result.record(ok, f"{label}: {detail}")
+
+    # Engines alone: one command per cycle, random byte counts, junk above them
+    for engine in ENGINES:
+        for width in WIDTHS:
+            dut    = CRC32Engine(width, engine)
+            chunks = [bytes(rng.getrandbits(8) for _ in range(rng.randint(1, width))) for _ in range(48)]
+            got    = []
+
+            def gen():
+                for chunk in chunks:
+                    junk = rng.getrandbits(8 * (width - len(chunk))) << 8 * len(chunk)
+                    yield dut.data.eq(int.from_bytes(chunk, "little") | junk)
+                    yield dut.nbytes.eq(len(chunk))
+                    yield dut.we.eq(1)
+                    yield
+                yield dut.we.eq(0)
+                yield
+                got.append((yield dut.crc) ^ 0xFFFFFFFF)
+
+            run_traced(dut, gen())
+            data = b"".join(chunks)
+            res  = engine_resources(engine, width)
+            expect(f"{engine} × {width} byte(s)", got[0] == zlib.crc32(data),
+                   f"{len(data)} bytes in {len(chunks)} cycles; widest XOR {res['xor_inputs']} inputs, "
+                   f"{res['xor_gates']} XOR2, {res['bram_bits'] // 8192} × 8 Kbit tables")
+
+    # Peripheral: crc32_word writes 4 bytes, crc32_data the tail; same checksum as byte by byte
+    packet = bytes(rng.getrandbits(8) for _ in range(64))
+    for engine, crc_domain in [("xor", "sys"), ("bram", "sys"), ("bram", "crc")]:
+        dut = EngineTestBench(engine, 4, crc_domain)
+
+        def gen(trace):
+            bfm  = WishboneBFM(dut.master)
+            word = dut.regs.crc32_word.addr
+            for name, data in [("123456789", b"123456789"), (f"{len(packet)} random bytes", packet)]:
+                yield from bfm.write(ADDR_RESET, 1)
+                start = yield dut.cycle
+                tail  = len(data) % 4
+                for i in range(0, len(data) - tail, 4):
+                    yield from bfm.write(word, int.from_bytes(data[i:i + 4], "little"))
+                for byte in data[len(data) - tail:]:
+                    yield from bfm.write(ADDR_DATA, byte)
+                if crc_domain != "sys":
+                    yield from wait_idle(bfm)
+                yield
+                crc    = (yield from bfm.read(ADDR_DATA)).value
+                cycles = (yield dut.cycle) - start
+                check(result, trace, f"{engine} peripheral ({crc_domain}), words + bytes: {name}", crc,
+                      zlib.crc32(data))
+            print(f"  {len(packet)} bytes through crc32_word in {cycles} cycles "
+                  f"({len(packet) / cycles:.2f} bytes/cycle)")
+
+        trace = trace_from_args(args, signals=[dut.master], case=f"{result.name}_{engine}_{crc_domain}")
+        run_traced(dut, gen(trace), trace, clocks={"sys": 10, "crc": 4} if crc_domain != "sys" else {"sys": 10})
+
+
+# ---------------------------------------------------------------------------
+# Test 18: CRC32Stream tap on the UART bridge RX stream
+# ---------------------------------------------------------------------------
+UART_CRC_SLOT = CSR_MAP["uart_crc"]                  # 5
+
+
+class UartCrcTestBench(Module):
+    """Host bytes → CRC32Stream → Stream2Wishbone (bridge core) → CSR banks of CRC32 and the tap.
+
+    The tap's bank is at the uart_crc_* addresses of the reference map (crc32Regs.py).
+    """
+
+    def __init__(self):
+        from litex.soc.cores.uart import Stream2Wishbone
+
+        self.rx = stream.Endpoint([("data", 8)])      # Host → bridge
+        self.tx = stream.Endpoint([("data", 8)])      # Bridge → host
+        self.submodules.tap    = CRC32Stream()
+        self.submodules.bridge = Stream2Wishbone(clk_freq=1e6)
+        self.submodules.dut    = SimCRC32Peripheral()
+        self.comb += [
+            self.rx.connect(self.tap.sink),
+            self.tap.source.connect(self.bridge.sink),
+            self.bridge.source.connect(self.tx),
+        ]
+
+        csr_if = csr_bus.Interface(data_width=32)
+        banks  = [csr_bus.CSRBank(module.get_csrs(), address=slot, paging=CSR_PAGING,
+                                  bus=csr_bus.Interface(data_width=32))
+                  for module, slot in ((self.dut, CRC32_SLOT), (self.tap, UART_CRC_SLOT))]
+        self.submodules += banks
+        self.submodules.csr_ic = csr_bus.Interconnect(csr_if, [bank.bus for bank in banks])
+        self.submodules.wb2csr = Wishbone2CSR(bus_wishbone=self.bridge.wishbone, bus_csr=csr_if)
+        self.regs = Crc32Regs()
+
+
+def uart_send(tb, data):
+    """Hand `data` to the bridge one byte per beat, as the RS232 receiver would."""
+    for byte in data:
+        yield tb.rx.data.eq(byte)
+        yield tb.rx.valid.eq(1)
+        yield
+        while not (yield tb.rx.ready):
+            yield
+        yield tb.rx.valid.eq(0)
+        yield
+
+
+def uart_receive(tb, n):
+    """The next `n` bytes the bridge sends back."""
+    data = []
+    yield tb.tx.ready.eq(1)
+    while len(data) < n:
+        if (yield tb.tx.valid):
+            data.append((yield tb.tx.data))
+        yield
+    yield tb.tx.ready.eq(0)
+    return bytes(data)
+
+
+@suite.case("test18_stream_crc")
+def case_stream_crc(result):
+    """Bridge commands checksummed in line: CSR pair against the bytes sent; 32-bit stream with gaps."""
+    print("\n--- Test 18: CRC32Stream (in-line CRC on the bridge RX stream) ---")
+    if args.verilator:
+        print("  (Migen simulator: the bridge core and the tap are Migen)")
+    rng = random.Random(args.seed)
+
+    def expect(label, ok, detail):
+        print(f"  [{'PASS' if ok else 'FAIL'}] {label}: {detail}")
+        result.record(ok, f"{label}: {detail}")
+
+    dut = UartCrcTestBench()
+    crc_addr, bytes_addr = dut.regs.uart_crc_crc.addr, dut.regs.uart_crc_bytes.addr
+    check_bank_layout(result, "uart_crc", dut.tap)
+
+    def gen(trace):
+        def write(addr, words):
+            yield from uart_send(dut, bridge_commands(addr, words))
+
+        def read(addr, length=1):
+            yield from uart_send(dut, bridge_commands(addr, length=length))
+            data = yield from uart_receive(dut, 4 * length)
+            return [int.from_bytes(data[i:i + 4], "big") for i in range(0, len(data), 4)]
+
+        yield from write(dut.regs.uart_crc_reset_ctrl.addr, [1])
+        sent = b""
+        for byte in b"123456789":
+            yield from write(ADDR_DATA, [byte])
+            sent += bridge_commands(ADDR_DATA, [byte])
+        (crc,) = yield from read(ADDR_DATA)
+        sent  += bridge_commands(ADDR_DATA, length=1)
+        check(result, trace, "crc32_data through the tapped bridge", crc, zlib.crc32(b"123456789"))
+
+        # The pair is read by one command, received in full before the bridge reads them
+        sent += bridge_commands(crc_addr, length=2)
+        crc, count = yield from read(crc_addr, 2)
+        expect("uart_crc_crc", crc == zlib.crc32(sent),
+               f"0x{crc:08x} (zlib.crc32 of the {len(sent)} command bytes: 0x{zlib.crc32(sent):08x})")
+        expect("uart_crc_bytes", count == len(sent), f"{count} (expected {len(sent)})")
+
+        # A burst write of 12 words is two commands (comm_uart sends 8 words at most)
+        yield from write(dut.regs.uart_crc_reset_ctrl.addr, [1])
+        words = [rng.getrandbits(32) for _ in range(12)]
+        # (no SRAM in this testbench: the CSR bridge acknowledges the writes)
+        yield from write(SRAM_BASE, words)
+        sent = bridge_commands(SRAM_BASE, words) + bridge_commands(crc_addr, length=2)
+        crc, count = yield from read(crc_addr, 2)
+        expect("after reset_ctrl, 12-word burst write", (crc, count) == (zlib.crc32(sent), len(sent)),
+               f"0x{crc:08x} / {count} bytes (expected 0x{zlib.crc32(sent):08x} / {len(sent)})")
+
+    trace = trace_from_args(args, signals=[dut.bridge.wishbone], case=result.name)
+    run_traced(dut, gen(trace), trace)
+
+    # 32-bit stream, random valid on the sink and ready on the source
+    for engine in ENGINES:
+        tap   = CRC32Stream(data_width=32, engine=engine)
+        beats = [rng.getrandbits(32) for _ in range(64)]
+        out   = []
+
+        def source():
+            for beat in beats:
+                while rng.random() < 0.3:
+                    yield tap.sink.valid.eq(0)
+                    yield
+                yield tap.sink.valid.eq(1)
+                yield tap.sink.data.eq(beat)
+                yield
+                while not (yield tap.sink.ready):
+                    yield
+            yield tap.sink.valid.eq(0)
+
+        def sink():
+            while len(out) < len(beats):
+                ready = rng.random() < 0.6
+                yield tap.source.ready.eq(ready)
+                yield
+                if ready and (yield tap.source.valid):
+                    out.append((yield tap.source.data))
+            yield
+            out.append(((yield tap.crc.status), (yield tap.bytes.status)))
+
+        run_traced(tap, [source(), sink()])
+        data = b"".join(beat.to_bytes(4, "little") for beat in beats)
+        crc, count = out.pop()
+        expect(f"{engine}, 32-bit beats with gaps", out == beats and (crc, count) == (zlib.crc32(data), len(data)),
+               f"{len(out)} beats passed unchanged, 0x{crc:08x} / {count} bytes "
+               f"(expected 0x{zlib.crc32(data):08x} / {len(data)})")
+
+
+# ---------------------------------------------------------------------------
+# Test 19: bridge client tracing (commonLib/bridgeTrace.py) on a bridge model
+# ---------------------------------------------------------------------------
+SERVER_OVERHEAD = 300e-6                             # Model: litex_server + TCP per round trip
+
+
+class BridgeModel:
+    """RemoteClient stand-in: CRC32 registers in Python, a clock advanced by UART + server time."""
+
+    def __init__(self, baud=115200):
+        self.baud = baud
+        self.now  = 0.0
+        self.crc  = 0xFFFFFFFF
+
+    def clock(self):
+        return self.now
+
+    def _round_trip(self, kind, words):
+        self.now += SERVER_OVERHEAD + uart_seconds(kind, words, self.baud)
+
+    def write(self, addr, data):
+        words = data if isinstance(data, list) else [data]
+        for i, value in enumerate(words):
+            if addr + 4 * i == ADDR_DATA:
+                self.crc = crc32_ref(self.crc, value & 0xFF)
+            elif addr + 4 * i == ADDR_RESET:
+                self.crc = 0xFFFFFFFF
+        self._round_trip("w", len(words))
+
+    def read(self, addr, length=None):
+        self._round_trip("r", length or 1)
+        values = [~self.crc & 0xFFFFFFFF if addr + 4 * i == ADDR_DATA else 0 for i in range(length or 1)]
+        return values if length is not None else values[0]
+
+
+@suite.case("test19_bridge_trace")
+def case_bridge_trace(result):
+    """TracingClient under Crc32Regs: counts, percentiles, UART share and exports match the model."""
+    print("\n--- Test 19: Bridge client tracing (commonLib/bridgeTrace.py) ---")
+    model  = BridgeModel()
+    client = TracingClient(model, names=Crc32Regs, clock=model.clock)
+    regs   = Crc32Regs(client)
+    data   = b"123456789"
+
+    def expect(label, ok, detail):
+        print(f"  [{'PASS' if ok else 'FAIL'}] {label}: {detail}")
+        result.record(ok, f"{label}: {detail}")
+
+    regs.crc32_reset_ctrl.write(1)
+    for byte in data:
+        regs.crc32_data.write(byte)
+        model.now += 1e-3                            # Script work between transactions
+    values = regs.read_group("crc32")
+    expect("checksum through the tracing client", values["data"] == ref_checksum(data),
+           f"0x{values['data']:08x}")
+
+    stats = client.address_stats()
+    expect("one transaction per round trip", len(client.transactions) == regs.round_trips,
+           f"{len(client.transactions)} recorded, {regs.round_trips} round trips")
+    expect("per-register counts", (stats["crc32_data"]["writes"], stats["crc32_data"]["reads"],
+                                   stats["crc32_reset_ctrl"]["writes"]) == (len(data), 1, 1),
+           f"crc32_data {stats['crc32_data']['writes']} writes / {stats['crc32_data']['reads']} read(s), "
+           f"crc32_reset_ctrl {stats['crc32_reset_ctrl']['writes']} write(s)")
+
+    # One-word writes dominate: p50 is their round trip, p99 the burst read of the crc32 group
+    write_us = (SERVER_OVERHEAD + uart_seconds("w", 1, model.baud)) * 1e6
+    read_us  = (SERVER_OVERHEAD + uart_seconds("r", len(Crc32Regs.groups["crc32"]), model.baud)) * 1e6
+    s = client.summary()
+    expect("p50 / p99 latency", abs(s["p50_us"] - write_us) < 1e-3 and abs(s["p99_us"] - read_us) < 1e-3,
+           f"{s['p50_us']:.0f} / {s['p99_us']:.0f} us (model {write_us:.0f} / {read_us:.0f} us)")
+    expect("time split", abs(s["server_s"] - SERVER_OVERHEAD * regs.round_trips) < 1e-9
+           and abs(s["host_s"] - len(data) * 1e-3) < 1e-9,
+           f"UART {s['uart_s'] * 1e3:.2f} ms, server {s['server_s'] * 1e3:.2f} ms, "
+           f"between transactions {s['host_s'] * 1e3:.2f} ms")
+
+    trace  = json.loads(json.dumps(client.to_chrome_trace()))
+    spans  = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    exported = json.loads(json.dumps(client.to_json()))
+    expect("exports", len(spans) == 2 * regs.round_trips and all(e["dur"] >= 0 for e in spans)
+           and len(exported["transactions"]) == regs.round_trips
+           and exported["transactions"][-1]["name"] == "crc32_data",
+           f"{len(spans)} Chrome trace spans, {len(exported['transactions'])} JSON transactions")
+    print(client.format_summary())
+
+
+# ---------------------------------------------------------------------------
+# Test 9 (--soak BYTES): long stream, simulator speed in cycles per second
+# ---------------------------------------------------------------------------
+def case_soak(result):
+    print(f"\n--- Test 9: {args.soak}-byte soak through the zero-wait register file ---")
+    label, make_tb, addr = PATHS["wb_zero_wait"]
+    dut = make_tb()
+    cycles = []
+
+    def gen(trace):
+        cycles.append((yield from run_bandwidth_test(dut, result, trace, addr, "soak", ("burst",), n=args.soak)))
+
+    t0 = time.perf_counter()
+    simulate(result, dut, gen)
+    elapsed = time.perf_counter() - t0
+    print(f"  {cycles[0]} cycles in {elapsed:.2f} s wall time "
+          f"({cycles[0] / elapsed / 1e3:.1f} kcycles/s{', including the Verilator build' if args.verilator else ''})")
+
+
+def main():
+    global args
+    parser = argparse.ArgumentParser(description="CRC32 peripheral testbench")
+    parser.add_argument("--verilator", action="store_true",
+                        help="Simulate with Verilator and the real hdl/crc.v instead of MigenCRC32Step")
+    parser.add_argument("--soak", type=int, default=0, metavar="BYTES",
+                        help="Also stream BYTES bytes through the zero-wait register file (Test 9)")
+    parser.add_argument("--seed", type=int, default=1,
+                        help="Seed of the random stress test (Test 10)")
+    parser.add_argument("--random-packets", type=int, metavar="N",
+                        help=f"Random packets per path in Test 10, 1-64 bytes each "
+                             f"(default {RANDOM_PACKETS}, {RANDOM_SOAK_PACKETS} with --soak)")
+    add_trace_arguments(parser, "test_crc32_peripheral.vcd")
+    add_runner_arguments(parser)
+    args = parser.parse_args()
+
+    if args.verilator and not verilator_available():
+        parser.error("--verilator: verilator not found on PATH")
+    if args.random_packets is None:
+        args.random_packets = RANDOM_SOAK_PACKETS if args.soak else RANDOM_PACKETS
+    if args.soak:
+        suite.case("test09_soak")(case_soak)
 
-    # ------------------------------------------------------------------
-    # Summary
-    # ------------------------------------------------------------------
-    print(f"\n{'='*50}")
-    print(f"Results: {passed} passed, {failed} failed")
-    if failed:
-        raise SystemExit(1)
+    print(f"Simulator: {'Verilator (hdl/crc.v)' if args.verilator else 'Migen (MigenCRC32Step)'}")
+    raise SystemExit(suite.run(args))
 
 
-dut = TestBench()
-run_simulation(dut, run_test(dut), vcd_name="test_crc32_peripheral.vcd")
+if __name__ == "__main__":
+    main()
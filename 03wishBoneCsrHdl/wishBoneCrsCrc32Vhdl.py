@@ -23,134 +23,72 @@ Register map:
                       read  : 32-bit running CRC32 checksum (inverted accumulator)
   crc32_reset_ctrl: location 2 → 0x40000804  (32-bit w)
                       write : any value → sets the CRC accumulator to 0xFFFFFFFF (reset state)
+  crc32_status    : location 2 → 0x40000808  (32-bit r, --crc-clk-freq only)
+                      bit 0 busy, bit 1 overflow
+
+  With --wishbone-regs the CRC32 registers bypass the CSR bus and are mapped
+  as a zero-wait-state Wishbone register file (regs_map):
+  crc32_data      : 0x40010000
+  crc32_reset_ctrl: 0x40010004
+
+  With --perf-counters a PerfCounters peripheral (commonLib/perfCounters.py)
+  at location 3 → 0x40000C00 counts cycles, bridge accesses and ACK latencies,
+  bridge bytes in / out and CRC32 bytes; read it with commonLib/perfReport.py.
+
+  With --analyzer a logic analyzer (commonLib/logicAnalyzer.py) samples the
+  bridge bus strobes and the CRC32 byte writes: la_* at location 4 → 0x40001000,
+  capture buffer at 0x40020000. Capture with commonLib/laCapture.py and
+  build/la.json.
+
+  With --sram-size BYTES block RAM is mapped at 0x40040000 (mem_map "sram");
+  commonLib/sramBench.py measures fill / readback throughput through the bridge.
+
+  With --sys-clk-freq HZ the sys clock comes from the CCGM1A1 PLL instead of
+  the 10 MHz oscillator (commonLib/gatemateCrg.py); the UART bridge divider,
+  CONFIG_CLOCK_FREQUENCY in csr.json and the nextpnr timing target follow it.
+
+  With --crc-clk-freq HZ the CRC32 datapath runs in its own "crc" clock domain
+  from a second PLL: written bytes cross over on an AsyncFIFO and the checksum
+  comes back through a synchroniser, with crc32_status telling when it is
+  current. The bus and the CRC32 are timed against their own clocks.
+
+  With --crc-engine xor / bram the CRC32 is computed by a CRC32Engine
+  (crc32Engine.py: generated XOR network, or slice-by-N lookup tables in
+  block RAM) instead of the black box; --crc-width 4 adds crc32_word, which
+  takes 4 bytes per write. crcEngineReport.py compares their utilization and
+  Fmax.
+
+  With --uart-crc the bytes the host sends pass through a CRC32Stream tap
+  (crc32Stream.py) between the UART receiver and the bridge: uart_crc_crc /
+  uart_crc_bytes at location 5 → 0x40001400 checksum everything received
+  since the last uart_crc_reset_ctrl write, without extra bus accesses.
 
 """
 
+import argparse
 import os
-import re
-import subprocess
-from shutil import which
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 
 from migen import *
 from litex.soc.integration.soc_core import SoCMini
-from litex.soc.integration.builder import Builder
-from litex.soc.interconnect.csr import AutoCSR, CSR, CSRStorage
-from litex_boards.platforms import olimex_gatemate_a1_evb
-from litex.build.colognechip.colognechip import CologneChipToolchain
-
-# Paths to the user-local GHDL Yosys plugin built without system-wide install.
-# Build once with:  (see README / build notes)
-_GHDL_PLUGIN = os.path.expanduser("~/.local/share/yosys/plugins/ghdl.so")
-_GHDL_LIB    = os.path.expanduser("~/.local/lib")
-
-
-class GhdlCologneChipToolchain(CologneChipToolchain):
-    """CologneChip toolchain extended with GHDL plugin support for VHDL sources.
-
-    After the Yosys script (.ys) is generated by LiteX, every ``read_vhdl``
-    line is replaced by a ``ghdl`` command, and the GHDL plugin is loaded at
-    the top of the script.  ``LD_LIBRARY_PATH`` is set so the dynamic linker
-    finds libghdl / libgnat without a system-wide install.
-    """
-
-    def build_project(self):
-        super().build_project()
-        ys_file = f"{self._build_name}.ys"
-        with open(ys_file) as f:
-            content = f.read()
-
-        vhdl_cmds, other_lines = [], []
-        for line in content.splitlines():
-            stripped = line.strip()
-            if stripped.startswith("read_vhdl"):
-                vhdl_file = stripped[len("read_vhdl"):].strip()
-                # ghdl requires explicit "-e <entity>" to enter analyse+elaborate mode
-                entity = os.path.splitext(os.path.basename(vhdl_file))[0]
-                vhdl_cmds.append(f"ghdl {vhdl_file} -e {entity}")
-            else:
-                other_lines.append(line)
-
-        if vhdl_cmds:
-            header = [f"plugin -i {_GHDL_PLUGIN}"] + vhdl_cmds
-            patched = "\n".join(header) + "\n" + "\n".join(other_lines)
-            with open(ys_file, "w") as f:
-                f.write(patched)
-
-    def run_script(self, script):
-        if which("yosys") is None or which("p_r") is None:
-            raise OSError("Unable to find CologneChip toolchain (yosys / p_r).")
-        env = os.environ.copy()
-        ld = env.get("LD_LIBRARY_PATH", "")
-        env["LD_LIBRARY_PATH"] = f"{_GHDL_LIB}:{ld}" if ld else _GHDL_LIB
-        if subprocess.call(["bash", script], env=env) != 0:
-            raise OSError("Error occured during Yosys/p_r's script execution.")
-
-CLK_FREQ = int(10e6)
-BAUDRATE = 115200
+from commonLib.wishboneDecoder import add_guarded_master
+from commonLib.wishboneRegisters import add_wishbone_csr_peripheral
+from commonLib.elabCache import add_cache_arguments, build_cached
+from commonLib.csrGen import write_register_map
+from commonLib.perfCounters import add_perf_counters
+from commonLib.logicAnalyzer import add_logic_analyzer, write_description
+from commonLib.gatemateCrg import GateMateCRG, check_sys_clk_freq
+from crc32Map import (
+    BAUDRATE, CLK_FREQ, CSR_MAP, CSR_PAGING, LA_DEPTH, LA_MAP, MEM_MAP, REGS_MAP, SRAM_MAX_SIZE,
+)
+from crc32Peripheral import HDL_SOURCES, PERIPHERAL_ENGINES, PERIPHERAL_WIDTHS, CRC32Peripheral
+from crc32Stream import CRC32Stream
+
+# Builder, UARTWishboneBridge, the board platform and the GHDL toolchain are imported where
+# they are used: importing this module only costs SoCMini.
 
 
-
-# Create:
-#+--------------------------------------------+
-#|   CRC32Peripheral (AutoCSR peripheral)     |
-#|     @ 0x40000800                           |
-#|     Single 32-bit CSR register:            |
-#|       write [7:0] → feed byte into CRC32   |
-#|       read  [31:0] → running CRC32 checksum|
-#|     Accumulator resets on system reset     |
-#+--------------------------------------------+
-class CRC32Peripheral(Module, AutoCSR):
-    """CSR-mapped CRC32 peripheral.
-
-    Two registers within location slot 2:
-      crc32_data       @ 0x40000800 (32-bit rw)
-        write : lower 8 bits are fed into the CRC32 accumulator
-        read  : 32-bit running CRC32 checksum (final XOR / bit-inverted accumulator)
-      crc32_reset_ctrl @ 0x40000804 (32-bit w)
-        write : any value → resets the accumulator to 0xFFFFFFFF
-
-    The accumulator initialises to 0xFFFFFFFF on system reset.
-    The CRC32 step is computed by the VHDL entity in hdl/crc.vhdl.
-    """
-
-    def __init__(self, platform):
-        # data : CRS Address CRS_MAP + Offset = 0x40000800 + 0 (first registered CRS)
-        # data CSR: write[7:0] = data byte in, read[31:0] = checksum out
-        # if the bus writes data to the address 0x40000800 self.data is automaticaly updated
-        self.data = CSR(32, name="data")
-        # reset_ctrl CSR: writing any value resets the CRC accumulator to 0xFFFFFFFF
-        # reset_ctrl CSR: writing any value resets the CRC accumulator to 0xFFFFFFFF
-        # if the bus writes data to the address 0x40000804 self.reset_ctrl is automaticaly updated
-        self.reset_ctrl = CSRStorage(32, name="reset_ctrl", reset=0)
-
-        # Internal signals — reset values applied automatically on system reset
-        crc_in  = Signal(32, reset=0xFFFFFFFF)   # Accumulated CRC; CRC32 init = 0xFFFFFFFF
-        crc_out = Signal(32)                     # Combinatorial output from VHDL crc entity
-        out_buf = Signal(32, reset=0xFFFFFFFF)   # Registered checksum; reset matches crc_in
-
-        # Instantiate the VHDL crc entity (hdl/crc.vhdl)
-        platform.add_source(os.path.join(os.path.dirname(__file__), "hdl/crc.vhdl"))
-        self.specials += Instance("crc",
-            i_crcIn  = crc_in,
-            i_data   = self.data.r[0:8],   # lower 8 bits written by host (c.r = bus dat_w)
-            o_crcOut = crc_out,
-        )
-
-        # Reset takes priority: writing reset_ctrl restores accumulator to 0xFFFFFFFF.
-        # On each host data write (data.re fires): feed crcOut back as next crcIn (accumulation).
-        self.sync += [
-            If(self.reset_ctrl.re,           # Writing to 0x40000804 triggers "register enable" (write strobe) for reset_ctrl.re
-                crc_in.eq(0xFFFFFFFF),
-                out_buf.eq(0xFFFFFFFF),
-            ).Elif(self.data.re,			 # Writing to 0x400008040 triggers "register enable" (write strobe) for data.re
-                crc_in.eq(crc_out),
-                out_buf.eq(crc_out),
-            )
-        ]
-
-        # Read path: c.w is what the host reads — invert out_buf for CRC32 final XOR step
-        self.comb += self.data.w.eq(~out_buf)
-
 # Create:
 #+------------------------------------+
 #| SoCMini (Top)                      |
@@ -166,59 +104,171 @@ class CRC32Peripheral(Module, AutoCSR):
 #|    @ 0x40000800                    |
 #+------------------------------------+
 class Top(SoCMini):
-    # Set CSR region base address to 0x40000000
-    mem_map = {
-        **SoCMini.mem_map,
-        "csr": 0x40000000,
-    }
-
-    # Explicitly assign CSR location slots per peripheral
-    # Address = 0x40000000 + location × 0x400
-    csr_map = {
-        "ctrl": 0,   # 0x40000000
-        "crc32":  2, # 0x40000800
-    }
-
-    def __init__(self, platform):
+    # Address maps live in crc32Map.py: CSR region at 0x40000000, one
+    # 0x400 location slot per peripheral, register files above the CSR window
+    mem_map  = {**SoCMini.mem_map, **MEM_MAP}
+    csr_map  = CSR_MAP
+    regs_map = REGS_MAP
+    la_map   = LA_MAP
+
+    def __init__(self, platform, wishbone_regs=False, perf_counters=False, analyzer=False,
+                 sram_size=0, sys_clk_freq=CLK_FREQ, crc_clk_freq=None, crc_engine="hdl", crc_width=1,
+                 uart_crc=False):
+        # sys clock from the 10 MHz oscillator, through the PLL for any other frequency
+        self.submodules.crg = GateMateCRG(platform, sys_clk_freq)
+
         # Initialize SoCMini with UART Wishbone bridge as the bus master.
         SoCMini.__init__(
             self,
             platform,
-            clk_freq=CLK_FREQ,
+            clk_freq=self.crg.sys_clk_freq,
             uart_name="crossover",
             csr_address_width=14,
-            csr_paging=0x400,
+            csr_paging=CSR_PAGING,
         )
 
         # UART-to-Wishbone bridge — host PC becomes bus master
-        from litex.soc.cores.uart import UARTWishboneBridge
+        from litex.soc.cores.uart import RS232PHY, Stream2Wishbone, UARTWishboneBridge
         serial = platform.request("serial")
-        self.submodules.bridge = UARTWishboneBridge(
-            pads=serial, clk_freq=CLK_FREQ, baudrate=BAUDRATE,
-        )
-        self.bus.add_master(name="bridge", master=self.bridge.wishbone)
+        if uart_crc:
+            # Same bridge, with a CRC32Stream tap on the received bytes
+            self.submodules.bridge_phy = phy = RS232PHY(serial, self.sys_clk_freq, BAUDRATE)
+            self.submodules.bridge   = Stream2Wishbone(clk_freq=self.sys_clk_freq)
+            self.submodules.uart_crc = CRC32Stream()
+            self.comb += [
+                phy.source.connect(self.uart_crc.sink),
+                self.uart_crc.source.connect(self.bridge.sink),
+                self.bridge.source.connect(phy.sink),
+            ]
+        else:
+            self.submodules.bridge = UARTWishboneBridge(
+                pads=serial, clk_freq=self.sys_clk_freq, baudrate=BAUDRATE,
+            )
 
-        
-        # CRC32 peripheral — auto-registered as CSR peripheral via AutoCSR
-        self.submodules.crc32 = CRC32Peripheral(self.platform)
+        crc_domain = "sys"
+        if crc_clk_freq:
+            # CRC32 datapath on its own clock, crossing to / from sys inside the peripheral
+            self.crg.add_domain("crc", crc_clk_freq)
+            crc_domain = "crc"
+        crc32 = CRC32Peripheral(self.platform, "vhdl", crc_domain=crc_domain,
+                                engine=crc_engine, width=crc_width)
+        if wishbone_regs:
+            # CRC32 peripheral — Wishbone-native register file, no Wishbone2CSR wait states
+            add_wishbone_csr_peripheral(self, "crc32", crc32, self.regs_map["crc32"])
+        else:
+            # CRC32 peripheral — auto-registered as CSR peripheral via AutoCSR
+            self.submodules.crc32 = crc32
+
+        if sram_size:
+            # Block RAM on the SoC bus: the host fills / reads it with bridge bursts
+            # (commonLib/sramBench.py), other bus masters read it at bus speed
+            if sram_size > SRAM_MAX_SIZE:
+                raise ValueError(f"sram_size 0x{sram_size:x} exceeds 0x{SRAM_MAX_SIZE:x}")
+            self.add_ram("sram", self.mem_map["sram"], sram_size)
+
+        if analyzer:
+            # Bridge side of the bus and the CRC32 byte writes, one sample per sys_clk cycle
+            bus = self.bridge.wishbone
+            add_logic_analyzer(self, "la", [
+                ("bridge_cyc", bus.cyc), ("bridge_stb", bus.stb),
+                ("bridge_we",  bus.we),  ("bridge_ack", bus.ack),
+                ("crc_write",  crc32.data.re), ("crc_reset", crc32.reset_ctrl.re),
+                ("crc_byte",   crc32.data.r[:8]),
+            ], self.la_map["la"], depth=LA_DEPTH)
+
+        # Bridge enters the SoC bus through a watchdog + error decoder: addresses
+        # outside the SoC regions ("csr", plus "crc32" with wishbone_regs, "la"
+        # with analyzer, "sram" with sram_size) answer 0xDEADC0DE at once instead
+        # of being ACKed by the CSR bridge
+        add_guarded_master(self, "bridge", self.bridge.wishbone)
+
+        if perf_counters:
+            # Host-side view of the bridge (before the watchdog) and the CRC32 byte strobe
+            add_perf_counters(self,
+                buses   = [("bridge", self.bridge.wishbone)],
+                streams = [("bridge_rx_bytes", self.bridge.sink), ("bridge_tx_bytes", self.bridge.source)],
+                events  = [("crc_bytes", crc32.data.re)] +
+                          ([("crc_words", crc32.word.re)] if crc_width > 1 else []),
+            )
 
 
 # ------------------
 # Build  The System 
 # ------------------
 def main():
+	from litex.soc.integration.builder import Builder
+	from litex_boards.platforms import olimex_gatemate_a1_evb
+	from ghdlToolchain import GhdlCologneChipToolchain
+
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--wishbone-regs", action="store_true",
+		help="Map the CRC32 registers as a Wishbone-native register file instead of CSRs")
+	parser.add_argument("--perf-counters", action="store_true",
+		help="Add the PerfCounters peripheral (cycles, bridge accesses / latency / bytes, CRC32 bytes)")
+	parser.add_argument("--analyzer", action="store_true",
+		help="Add the logic analyzer (capture with commonLib/laCapture.py)")
+	parser.add_argument("--sys-clk-freq", type=float, default=CLK_FREQ,
+		help="sys clock in Hz; anything but the 10 MHz oscillator uses the PLL")
+	parser.add_argument("--crc-clk-freq", type=float, default=None,
+		help="Run the CRC32 datapath in its own clock domain at this frequency (Hz)")
+	parser.add_argument("--crc-engine", choices=PERIPHERAL_ENGINES, default="hdl",
+		help="CRC32 datapath: the HDL black box, a generated XOR network or block-RAM lookup tables")
+	parser.add_argument("--crc-width", type=int, choices=PERIPHERAL_WIDTHS, default=1,
+		help="Bytes per write: 4 adds crc32_word (--crc-engine xor / bram)")
+	parser.add_argument("--uart-crc", action="store_true",
+		help="Checksum the bytes received by the UART bridge in line (uart_crc_crc / uart_crc_bytes)")
+	parser.add_argument("--sram-size", type=lambda x: int(x, 0), default=0,
+		help=f"Add this many bytes of block-RAM SRAM at 0x40040000 (max 0x{SRAM_MAX_SIZE:x})")
+	parser.add_argument("--reference-map", action="store_true",
+		help="Also rewrite the committed reference map crc32Regs.py that the testbenches import (forces a rebuild)")
+	add_cache_arguments(parser)
+	args = parser.parse_args()
+	if args.sram_size > SRAM_MAX_SIZE:
+		parser.error(f"--sram-size: at most 0x{SRAM_MAX_SIZE:x} bytes")
+	try:
+		check_sys_clk_freq(args.sys_clk_freq)
+	except ValueError as e:
+		parser.error(f"--sys-clk-freq: {e}")
+	if args.crc_clk_freq is not None:
+		try:
+			check_sys_clk_freq(args.crc_clk_freq)
+		except ValueError as e:
+			parser.error(f"--crc-clk-freq: {e}")
+	crc_clk_freq = int(args.crc_clk_freq) if args.crc_clk_freq else None
+	if args.crc_width > 1 and args.crc_engine == "hdl":
+		parser.error("--crc-width 4: needs --crc-engine xor or bram (the black box takes one byte)")
 
 	#Select dev-board to run the example
 	platform = olimex_gatemate_a1_evb.Platform()
 	platform.toolchain = GhdlCologneChipToolchain()
-	soc = Top(platform)
-
-	# Use Builder to generate csr.csv and other exports
-	builder = Builder(soc, output_dir="build", compile_gateware=True, compile_software=False)
-	builder.build()
+	bitstream = "build/gateware/olimex_gatemate_a1_evb_00.cfg"
+
+	# Use Builder to generate csr.csv / csr.json / csr.svd and the register map.
+	# Skipped, elaboration included, when sources and options are unchanged since the last build
+	def build():
+		soc = Top(platform, wishbone_regs=args.wishbone_regs, perf_counters=args.perf_counters,
+			analyzer=args.analyzer, sram_size=args.sram_size,
+			sys_clk_freq=int(args.sys_clk_freq), crc_clk_freq=crc_clk_freq,
+			crc_engine=args.crc_engine, crc_width=args.crc_width, uart_crc=args.uart_crc)
+		builder = Builder(soc, output_dir="build", compile_gateware=True, compile_software=False,
+			csr_csv="build/csr.csv", csr_json="build/csr.json", csr_svd="build/csr.svd")
+		builder.build()
+		if args.analyzer:
+			# Probe list for commonLib/laCapture.py
+			write_description(soc.la, "build/la.json")
+		# Typed register map of this build for host scripts (commonLib/csrAccess.py)
+		write_register_map("build/csr.json", "build/crc32Regs.py", "Crc32Regs", svd_path="build/csr.svd", soc=soc)
+		if args.reference_map:
+			write_register_map("build/csr.json", "crc32Regs.py", "Crc32Regs", svd_path="build/csr.svd", soc=soc)
+	build_cached("build", build, params={"wishbone_regs": args.wishbone_regs, "perf_counters": args.perf_counters,
+		"analyzer": args.analyzer, "sram_size": args.sram_size, "sys_clk_freq": int(args.sys_clk_freq),
+		"crc_clk_freq": crc_clk_freq, "crc_engine": args.crc_engine, "crc_width": args.crc_width,
+		"uart_crc": args.uart_crc}, outputs=[bitstream],
+		sources=[HDL_SOURCES["vhdl"]],
+		force=args.rebuild or args.reference_map)
 
 	# Program the chip
-	platform.create_programmer().load_bitstream("build/gateware/olimex_gatemate_a1_evb_00.cfg")
+	platform.create_programmer().load_bitstream(bitstream)
 
 if __name__ == "__main__":
     main()
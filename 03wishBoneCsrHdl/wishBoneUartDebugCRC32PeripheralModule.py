@@ -1,21 +1,50 @@
+"""
+Host-side check of the CRC32 peripheral over the UART bridge (litex_server).
+
+    python wishBoneUartDebugCRC32PeripheralModule.py
+    python wishBoneUartDebugCRC32PeripheralModule.py --trace trace.json --chrome-trace trace.chrome.json
+
+With --trace / --chrome-trace every bridge transaction is timed
+(commonLib/bridgeTrace.py): a summary of where the time went is printed at
+the end and the transactions are written as JSON and / or a Chrome trace.
+"""
+import argparse
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+# Register map of the last build (build/crc32Regs.py) if there is one, else the reference map
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "build"))
+
 from litex import RemoteClient
+from crc32Regs import CRC32_DATA_ADDR, Crc32Regs
+from commonLib.bridgeTrace import TracingClient
+
+parser = argparse.ArgumentParser(description="CRC32 peripheral check over the UART bridge")
+parser.add_argument("--trace", metavar="FILE", help="Write the timed bridge transactions as JSON")
+parser.add_argument("--chrome-trace", metavar="FILE", help="Write them as a Chrome trace (chrome://tracing)")
+args = parser.parse_args()
 
 wb = RemoteClient()
+if args.trace or args.chrome_trace:
+    wb = TracingClient(wb, names=Crc32Regs)
 wb.open()
 
-print("Testing the CRC32Peripherial module 0x40000800 ---")
+# Register addresses come from the map generated by the last build (build/crc32Regs.py)
+regs = Crc32Regs(wb)
+
+print(f"Testing the CRC32Peripherial module 0x{CRC32_DATA_ADDR:08x} ---")
 # Feed bytes into the CRC32 accumulator (only lower 8 bits are used)
 print("\n---  Clear the CRC32 Acumulator---\n")
-print("\n---  write byte 0x1 at 0x40000804 ---\n")
-wb.write(0x40000804, 0x1)   # byte '1'
-value = wb.read(0x40000804)
+print(f"\n---  write 0x1 to crc32_reset_ctrl (0x{regs.crc32_reset_ctrl.addr:08x}) ---\n")
+regs.crc32_reset_ctrl.write(0x1)
+value = regs.crc32_reset_ctrl.read()
 expectedValue=0x0
 print(f"Readback Result value x{value:08x} " )
 
 
-print("\n--- Test 1: write byte 0x31 at 0x40000800 ---\n")
-wb.write(0x40000800, 0x31)   # byte '1'
-value = wb.read(0x40000800)
+print("\n--- Test 1: write byte 0x31 to crc32_data ---\n")
+regs.crc32_data.write(0x31)   # byte '1'
+value = regs.crc32_data.read()
 expectedValue=0x83DCEFB7
 print(f"Readback Result value x{value:08x} " )
 if(value!=expectedValue):
@@ -23,9 +52,9 @@ if(value!=expectedValue):
 else:
     print(" - Value correct\n")
 
-print("\n--- Test 2: write byte 0x32 at 0x40000800 ---\n")
-wb.write(0x40000800, 0x32)   # byte '2'
-value = wb.read(0x40000800)
+print("\n--- Test 2: write byte 0x32 to crc32_data ---\n")
+regs.crc32_data.write(0x32)   # byte '2'
+value = regs.crc32_data.read()
 expectedValue=0x4F5344CD
 print(f"Readback Result value x{value:08x} " )
 if(value!=expectedValue):
@@ -33,9 +62,9 @@ if(value!=expectedValue):
 else:
     print(" - Value correct\n")
 
-print("\n--- Test 3: write byte 0x33 at 0x40000800 ---\n")
-wb.write(0x40000800, 0x33)   # byte '3'
-value = wb.read(0x40000800)
+print("\n--- Test 3: write byte 0x33 to crc32_data ---\n")
+regs.crc32_data.write(0x33)   # byte '3'
+value = regs.crc32_data.read()
 expectedValue=0x884863D2
 print(f"Readback Result value x{value:08x} " )
 if(value!=expectedValue):
@@ -46,16 +75,16 @@ else:
 
 # Feed bytes into the CRC32 accumulator (only lower 8 bits are used)
 print("\n---  Test 4: Clear the CRC32 Acumulator---\n")
-print("\n---  write byte 0x1 at 0x40000804 ---\n")
-wb.write(0x40000804, 0x1)   # byte '1'
-value = wb.read(0x40000804)
+print(f"\n---  write 0x1 to crc32_reset_ctrl (0x{regs.crc32_reset_ctrl.addr:08x}) ---\n")
+regs.crc32_reset_ctrl.write(0x1)
+value = regs.crc32_reset_ctrl.read()
 expectedValue=0x0
 print(f"Readback Result value x{value:08x} " )
 
 
-print("\n--- Test 5: write byte 0x31 at 0x40000800 ---\n")
-wb.write(0x40000800, 0x31)   # byte '1'
-value = wb.read(0x40000800)
+print("\n--- Test 5: write byte 0x31 to crc32_data ---\n")
+regs.crc32_data.write(0x31)   # byte '1'
+value = regs.crc32_data.read()
 expectedValue=0x83DCEFB7
 print(f"Readback Result value x{value:08x} " )
 if(value!=expectedValue):
@@ -63,4 +92,18 @@ if(value!=expectedValue):
 else:
     print(" - Value correct\n")
 
-wb.close()
\ No newline at end of file
+
+# Both CRC32 registers in one burst (one bridge round trip instead of two)
+print("\n--- Test 6: read the crc32 registers as one burst ---\n")
+values = regs.read_group("crc32")
+print(f"data x{values['data']:08x}  reset_ctrl x{values['reset_ctrl']:08x}")
+print(f"Bridge round trips: {regs.round_trips}")
+
+wb.close()
+
+if isinstance(wb, TracingClient):
+    print("\n" + wb.format_summary())
+    if args.trace:
+        wb.write_json(args.trace)
+    if args.chrome_trace:
+        wb.write_chrome_trace(args.chrome_trace)
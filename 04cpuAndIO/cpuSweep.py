@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Configuration sweep for MySoC (vexriscvLedPeripheral.py).
+
+Builds every configuration of CONFIGS (CPU variant / caches, integrated SRAM
+size, boot mode) into build/sweep/<name>, reports the place-and-route
+utilization of each (GateMate CPEs and block RAM) and, with --port, loads each
+bitstream and runs build/sweep/<name>/firmware/cpubench.bin through the BIOS
+serial boot to collect cycles per iteration.
+
+    python cpuSweep.py                                  # build all, utilization only
+    python cpuSweep.py --port /dev/ttyACM0              # + cpubench on the board
+    python cpuSweep.py --only lite-xip standard-sram --json sweep.json
+
+Builds are cached (commonLib/elabCache.py), so rerunning the sweep only builds
+configurations whose options or sources changed; the utilization of a cached
+build is read back from <build dir>/utilization.json.
+"""
+
+import argparse
+import json
+import os
+import re
+import select
+import signal
+import subprocess
+import sys
+import time
+
+HERE         = os.path.dirname(os.path.abspath(__file__))
+BUILD_SCRIPT = os.path.join(HERE, "vexriscvLedPeripheral.py")
+SWEEP_DIR    = os.path.join("build", "sweep")
+
+# name -> vexriscvLedPeripheral.py options
+CONFIGS = {
+    "minimal-xip":   ["--cpu-variant", "minimal"],
+    "lite-xip":      ["--icache-size", "2048", "--dcache-size", "2048"],
+    "standard-xip":  ["--icache-size", "4096", "--dcache-size", "4096"],
+    "standard-sram": ["--icache-size", "4096", "--dcache-size", "4096",
+                      "--integrated-sram-size", "0x4000", "--boot", "sram"],
+    "full-xip":      ["--cpu-variant", "full"],
+}
+
+# "<resource>  <used> / <available>" lines of the place-and-route utilization report
+_UTILIZATION = re.compile(r"^\s*([A-Za-z][\w ]*?)\s*:?\s+(\d+)\s*/\s*(\d+)", re.MULTILINE)
+# cpubench result lines: "<kernel> <cycles/iter> <iter/s> ..."
+_KERNEL      = re.compile(r"^(list|matrix|state|string|total)\s+(\d+)\s", re.MULTILINE)
+
+
+def parse_utilization(text):
+    """{resource: (used, available)} from the place-and-route output (last report wins)."""
+    return {name.strip(): (int(used), int(avail)) for name, used, avail in _UTILIZATION.findall(text)}
+
+
+def parse_cpubench(text):
+    """({kernel: cycles per iteration}, checks passed) from the cpubench console output."""
+    cycles = {name: int(value) for name, value in _KERNEL.findall(text)}
+    return cycles, "Results: all checks passed" in text
+
+
+def _resource(utilization, prefix):
+    # First resource whose name starts with prefix ("CPE", "RAM"), formatted as used/available
+    for name, (used, avail) in utilization.items():
+        if name.upper().startswith(prefix):
+            return f"{used}/{avail}"
+    return "-"
+
+
+def build(name, options, port=None):
+    """Build (and with a port, load) one configuration; returns its utilization."""
+    build_dir = os.path.join(SWEEP_DIR, name)
+    os.makedirs(build_dir, exist_ok=True)
+    cmd = [sys.executable, BUILD_SCRIPT, "--build-dir", build_dir] + options
+    if port is None:
+        cmd.append("--no-load")
+
+    print(f"[{name}] {' '.join(cmd[1:])}")
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    with open(os.path.join(build_dir, "build.log"), "w") as f:
+        f.write(proc.stdout)
+    if proc.returncode:
+        sys.stdout.write(proc.stdout[-4000:])
+        raise RuntimeError(f"{name}: build failed, see {build_dir}/build.log")
+
+    # A cached build prints no report: keep the one of the last real build
+    report_path = os.path.join(build_dir, "utilization.json")
+    utilization = parse_utilization(proc.stdout)
+    if utilization:
+        with open(report_path, "w") as f:
+            json.dump(utilization, f, indent=2)
+    elif os.path.exists(report_path):
+        with open(report_path) as f:
+            utilization = {k: tuple(v) for k, v in json.load(f).items()}
+    return utilization
+
+
+def run_cpubench(port, kernel, timeout=60.0):
+    """Serial-boot kernel with litex_term and return the console output up to the results line."""
+    import pty                      # POSIX only, and only needed with --port
+
+    pid, fd = pty.fork()
+    if pid == 0:
+        os.execvp("litex_term", ["litex_term", port, "--kernel", kernel])
+
+    output   = b""
+    deadline = time.monotonic() + timeout
+    try:
+        time.sleep(1.0)
+        os.write(fd, b"\nserialboot\n")     # BIOS console command; litex_term answers with the kernel
+        while time.monotonic() < deadline:
+            ready, _, _ = select.select([fd], [], [], 0.2)
+            if not ready:
+                continue
+            try:
+                chunk = os.read(fd, 4096)
+            except OSError:                 # litex_term exited
+                break
+            output += chunk
+            tail = output.split(b"Results:", 1)
+            if len(tail) == 2 and b"\n" in tail[1]:
+                break
+    finally:
+        os.kill(pid, signal.SIGTERM)
+        os.waitpid(pid, 0)
+        os.close(fd)
+    return output.decode(errors="replace")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and benchmark MySoC configurations")
+    parser.add_argument("--only",    nargs="+", choices=sorted(CONFIGS), help="Configurations to run")
+    parser.add_argument("--port",    help="UART of the board (e.g. /dev/ttyACM0): load and run cpubench")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for cpubench results")
+    parser.add_argument("--json",    help="Write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    for name in args.only or CONFIGS:
+        utilization = build(name, CONFIGS[name], args.port)
+        result = {"config": name, "options": CONFIGS[name], "utilization": utilization}
+        if args.port:
+            kernel = os.path.join(SWEEP_DIR, name, "firmware", "cpubench.bin")
+            result["cycles"], result["passed"] = parse_cpubench(run_cpubench(args.port, kernel, args.timeout))
+        results.append(result)
+
+    print(f"\n{'config':<15} {'CPEs':>13} {'block RAM':>10} {'cycles/iter':>12}  check")
+    for r in results:
+        cycles = r.get("cycles", {}).get("total", "-")
+        check  = ("PASS" if r["passed"] else "FAIL") if "passed" in r else "-"
+        print(f"{r['config']:<15} {_resource(r['utilization'], 'CPE'):>13} "
+              f"{_resource(r['utilization'], 'RAM'):>10} {cycles:>12}  {check}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
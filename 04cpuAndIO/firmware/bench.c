@@ -0,0 +1,79 @@
+// Cycle timing helpers shared by the firmware benchmarks.
+
+#include <stdio.h>
+
+#include <irq.h>
+#include <libbase/uart.h>
+#include <generated/csr.h>
+#include <generated/soc.h>
+#include <generated/mem.h>
+#include <system.h>
+
+#include "bench.h"
+
+#ifndef BOOT_NAME
+#define BOOT_NAME "xip"
+#endif
+
+// Set by MySoC (vexriscvLedPeripheral.py)
+#ifndef CONFIG_CPU_VARIANT_NAME
+#define CONFIG_CPU_VARIANT_NAME "?"
+#endif
+#ifndef CONFIG_CPU_ICACHE_SIZE
+#define CONFIG_CPU_ICACHE_SIZE 0
+#endif
+#ifndef CONFIG_CPU_DCACHE_SIZE
+#define CONFIG_CPU_DCACHE_SIZE 0
+#endif
+
+void timer_start(void)
+{
+	timer0_en_write(0);
+	timer0_reload_write(0);
+	timer0_load_write(0xffffffff);
+	timer0_en_write(1);
+}
+
+uint32_t timer_cycles(void)
+{
+	timer0_update_value_write(1);
+	return 0xffffffff - timer0_value_read();
+}
+
+uint32_t timer_overhead(void)
+{
+	timer_start();
+	return timer_cycles();
+}
+
+// No floating point in printf: print thousandths as "x.yyy"
+void print_milli(uint32_t milli)
+{
+	printf("%lu.%03lu", (unsigned long)(milli / 1000), (unsigned long)(milli % 1000));
+}
+
+int check(const char *label, uint32_t got, uint32_t expected)
+{
+	int ok = got == expected;
+	printf("  [%s] %s: 0x%08lx (expected 0x%08lx)\n", ok ? "PASS" : "FAIL", label,
+	       (unsigned long)got, (unsigned long)expected);
+	return ok;
+}
+
+void bench_init(void)
+{
+#ifdef CONFIG_CPU_HAS_INTERRUPT
+	irq_setmask(0);
+	irq_setie(1);
+#endif
+	uart_init();
+	// With BOOT=sram crt0 has just copied the code into SRAM as data
+	flush_cpu_icache();
+}
+
+void print_config(void)
+{
+	printf("CPU %s %s (I$ %d B, D$ %d B), SRAM %d B, sys_clk %lu Hz, boot %s\n",
+	       CONFIG_CPU_HUMAN_NAME, CONFIG_CPU_VARIANT_NAME, CONFIG_CPU_ICACHE_SIZE, CONFIG_CPU_DCACHE_SIZE,
+	       (int)SRAM_SIZE, (unsigned long)CONFIG_CLOCK_FREQUENCY, BOOT_NAME);
+}
@@ -0,0 +1,16 @@
+// Cycle timing helpers shared by the firmware benchmarks (timer0, one count per sys_clk cycle).
+
+#ifndef BENCH_H
+#define BENCH_H
+
+#include <stdint.h>
+
+void     timer_start(void);                       // Restart timer0 as a free-running down counter
+uint32_t timer_cycles(void);                      // Cycles since timer_start()
+uint32_t timer_overhead(void);                    // Cycles timer_start() + timer_cycles() cost themselves
+void     print_milli(uint32_t milli);             // "x.yyy" from thousandths
+int      check(const char *label, uint32_t got, uint32_t expected);
+void     bench_init(void);                        // IRQs, UART, I-cache flush (code copied to SRAM)
+void     print_config(void);                      // CPU variant, sys_clk, boot mode
+
+#endif
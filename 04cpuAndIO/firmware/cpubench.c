@@ -0,0 +1,339 @@
+// CPU benchmark in the style of CoreMark / Dhrystone, for comparing MySoC
+// configurations (CPU variant / caches, SRAM size, boot mode).
+//
+// Loaded into main_ram by the BIOS:  litex_term /dev/ttyACM0 --kernel build/firmware/cpubench.bin
+//
+// Four kernels, each run ITERATIONS times and timed with timer0 (bench.c):
+//   list    : linked list find, reverse and merge sort          (pointer chasing)
+//   matrix  : 12 × 12 int16 multiply-accumulate, add, scale      (MUL, loads)
+//   state   : state machine classifying number tokens            (branches)
+//   string  : record copies, strcpy / strcmp, small calls        (Dhrystone-like)
+// Every kernel folds its results into a CRC16, checked against the value
+// computed on the host, so a faster configuration cannot be a broken one.
+
+#include <stdio.h>
+#include <stdint.h>
+#include <string.h>
+
+#include <libbase/console.h>
+#include <generated/soc.h>
+
+#include "bench.h"
+
+#define ITERATIONS 10
+
+// ---------------------------------------------------------------------------
+// CRC16 (CCITT, reflected) to validate kernel results
+// ---------------------------------------------------------------------------
+static uint16_t crc16(uint16_t crc, uint32_t value)
+{
+	for (int i = 0; i < 32; i++, value >>= 1) {
+		int mix = (crc ^ value) & 1;
+		crc >>= 1;
+		if (mix)
+			crc ^= 0x8408;
+	}
+	return crc;
+}
+
+// Small LCG, identical on target and host
+static uint32_t lcg(uint32_t *seed)
+{
+	*seed = *seed * 1103515245u + 12345u;
+	return *seed >> 16;
+}
+
+// ---------------------------------------------------------------------------
+// list: find, reverse, merge sort (by value, then back by index)
+// ---------------------------------------------------------------------------
+#define LIST_N 64
+
+struct node {
+	struct node *next;
+	int16_t      value;
+	int16_t      idx;
+};
+
+static struct node nodes[LIST_N];
+
+static struct node *list_merge_sort(struct node *head, int by_value)
+{
+	// Bottom-up merge sort of a singly linked list
+	for (int width = 1;; width *= 2) {
+		struct node *p = head, *tail = NULL;
+		int merges = 0;
+		head = NULL;
+		while (p) {
+			struct node *q = p;
+			int psize = 0, qsize = width;
+			merges++;
+			while (psize < width && q) {
+				psize++;
+				q = q->next;
+			}
+			while (psize > 0 || (qsize > 0 && q)) {
+				struct node *e;
+				if (psize == 0) {
+					e = q; q = q->next; qsize--;
+				} else if (qsize == 0 || !q) {
+					e = p; p = p->next; psize--;
+				} else if ((by_value ? p->value - q->value : p->idx - q->idx) <= 0) {
+					e = p; p = p->next; psize--;
+				} else {
+					e = q; q = q->next; qsize--;
+				}
+				if (tail)
+					tail->next = e;
+				else
+					head = e;
+				tail = e;
+			}
+			p = q;
+		}
+		tail->next = NULL;
+		if (merges <= 1)
+			return head;
+	}
+}
+
+static uint16_t bench_list(uint32_t seed)
+{
+	uint16_t crc = 0;
+	struct node *head = NULL;
+
+	for (int i = 0; i < LIST_N; i++) {
+		nodes[i].idx   = i;
+		nodes[i].value = (int16_t)(lcg(&seed) & 0x7fff);
+		nodes[i].next  = head;
+		head = &nodes[i];
+	}
+
+	// find: count values below a few keys
+	for (int k = 0; k < 4; k++) {
+		int16_t key = (int16_t)(lcg(&seed) & 0x7fff);
+		int count = 0;
+		for (struct node *n = head; n; n = n->next)
+			count += n->value < key;
+		crc = crc16(crc, count);
+	}
+
+	// reverse
+	struct node *prev = NULL;
+	while (head) {
+		struct node *next = head->next;
+		head->next = prev;
+		prev = head;
+		head = next;
+	}
+	head = prev;
+
+	head = list_merge_sort(head, 1);
+	for (struct node *n = head; n; n = n->next)
+		crc = crc16(crc, n->value);
+	head = list_merge_sort(head, 0);
+	crc = crc16(crc, head->value);
+	return crc;
+}
+
+// ---------------------------------------------------------------------------
+// matrix: C = A × B, then A += k, C = A × k
+// ---------------------------------------------------------------------------
+#define MAT_N 12
+
+static int16_t mat_a[MAT_N][MAT_N], mat_b[MAT_N][MAT_N];
+static int32_t mat_c[MAT_N][MAT_N];
+
+static uint16_t bench_matrix(uint32_t seed)
+{
+	uint16_t crc = 0;
+
+	for (int i = 0; i < MAT_N; i++)
+		for (int j = 0; j < MAT_N; j++) {
+			mat_a[i][j] = (int16_t)((lcg(&seed) & 0xff) - 128);
+			mat_b[i][j] = (int16_t)((lcg(&seed) & 0xff) - 128);
+		}
+
+	for (int i = 0; i < MAT_N; i++)
+		for (int j = 0; j < MAT_N; j++) {
+			int32_t sum = 0;
+			for (int k = 0; k < MAT_N; k++)
+				sum += (int32_t)mat_a[i][k] * mat_b[k][j];
+			mat_c[i][j] = sum;
+			crc = crc16(crc, (uint32_t)sum);
+		}
+
+	for (int i = 0; i < MAT_N; i++)
+		for (int j = 0; j < MAT_N; j++) {
+			mat_a[i][j] += 7;
+			mat_c[i][j] = (int32_t)mat_a[i][j] * -3;
+			crc = crc16(crc, (uint32_t)mat_c[i][j]);
+		}
+	return crc;
+}
+
+// ---------------------------------------------------------------------------
+// state: classify comma-separated tokens (int, float, exponent, invalid)
+// ---------------------------------------------------------------------------
+enum { S_START, S_SIGN, S_INT, S_DOT, S_FLOAT, S_EXP, S_EXP_SIGN, S_SCI, S_INVALID, S_COUNT };
+
+static const char *const tokens[] = {
+	"5012", "1234", "-874", "+122", "7.12", "0.33e4", "-.5", "abc",
+	"1e", "2.5e-3", "++1", "99999", "-0", "3.", "e7", "-12e+5",
+};
+
+static char state_input[256];
+
+static int next_state(int state, char c)
+{
+	int digit = c >= '0' && c <= '9';
+	switch (state) {
+	case S_START:    return digit ? S_INT : (c == '+' || c == '-') ? S_SIGN : c == '.' ? S_DOT : S_INVALID;
+	case S_SIGN:     return digit ? S_INT : c == '.' ? S_DOT : S_INVALID;
+	case S_INT:      return digit ? S_INT : c == '.' ? S_DOT : (c == 'e' || c == 'E') ? S_EXP : S_INVALID;
+	case S_DOT:      return digit ? S_FLOAT : S_INVALID;
+	case S_FLOAT:    return digit ? S_FLOAT : (c == 'e' || c == 'E') ? S_EXP : S_INVALID;
+	case S_EXP:      return digit ? S_SCI : (c == '+' || c == '-') ? S_EXP_SIGN : S_INVALID;
+	case S_EXP_SIGN: return digit ? S_SCI : S_INVALID;
+	case S_SCI:      return digit ? S_SCI : S_INVALID;
+	default:         return S_INVALID;
+	}
+}
+
+static uint16_t bench_state(uint32_t seed)
+{
+	uint16_t crc = 0;
+	uint32_t finals[S_COUNT] = {0};
+	uint32_t transitions = 0;
+	char *p = state_input;
+
+	// Random token order per seed, as CoreMark varies its input
+	for (int i = 0; i < 24; i++) {
+		const char *t = tokens[lcg(&seed) % (sizeof(tokens) / sizeof(tokens[0]))];
+		size_t len = strlen(t);
+		memcpy(p, t, len);
+		p += len;
+		*p++ = ',';
+	}
+	*p = 0;
+
+	int state = S_START;
+	for (p = state_input; *p; p++) {
+		if (*p == ',') {
+			finals[state]++;
+			state = S_START;
+			continue;
+		}
+		int next = next_state(state, *p);
+		transitions += next != state;
+		state = next;
+	}
+
+	for (int s = 0; s < S_COUNT; s++)
+		crc = crc16(crc, finals[s]);
+	return crc16(crc, transitions);
+}
+
+// ---------------------------------------------------------------------------
+// string: Dhrystone-flavoured record and string handling
+// ---------------------------------------------------------------------------
+struct record {
+	struct record *comp;
+	int            discr;
+	int            int_comp;
+	char           str_comp[31];
+};
+
+static struct record rec_a, rec_b;
+static char str_1[31], str_2[31];
+
+static int __attribute__((noinline)) proc_add(int a, int b)
+{
+	return a + 2 * b - 1;
+}
+
+static int __attribute__((noinline)) func_compare(const char *a, const char *b)
+{
+	return strcmp(a, b) > 0;
+}
+
+static uint16_t bench_string(uint32_t seed)
+{
+	uint16_t crc = 0;
+	int acc = (int)(seed & 0xff);
+
+	for (int run = 0; run < 50; run++) {
+		rec_a.comp     = &rec_b;
+		rec_a.discr    = run & 3;
+		rec_a.int_comp = proc_add(run, acc);
+		strcpy(rec_a.str_comp, "DHRYSTONE PROGRAM, SOME STRING");
+		rec_b = rec_a;                                  // structure assignment
+		rec_b.int_comp = proc_add(rec_b.int_comp, 3);
+
+		strcpy(str_1, "DHRYSTONE PROGRAM, 1'ST STRING");
+		strcpy(str_2, "DHRYSTONE PROGRAM, 2'ND STRING");
+		str_2[run % 30] = 'A' + (run % 26);
+		acc += func_compare(str_1, str_2) ? rec_b.int_comp : -rec_a.discr;
+		acc &= 0xffff;
+	}
+	crc = crc16(crc, (uint32_t)acc);
+	return crc16(crc, (uint32_t)rec_b.int_comp);
+}
+
+// ---------------------------------------------------------------------------
+// Runner
+// ---------------------------------------------------------------------------
+struct kernel {
+	const char *name;
+	uint16_t  (*run)(uint32_t seed);
+	uint16_t    expected;       // CRC16 over ITERATIONS runs with seeds 1..ITERATIONS (host)
+};
+
+static const struct kernel kernels[] = {
+	{"list",   bench_list,   0x766a},
+	{"matrix", bench_matrix, 0x9c83},
+	{"state",  bench_state,  0xbbc4},
+	{"string", bench_string, 0x9db3},
+};
+
+static void benchmark(void)
+{
+	uint32_t overhead = timer_overhead();
+	uint32_t total = 0;
+	int ok = 1;
+
+	printf("\n%-8s %12s %14s %10s  %s\n", "kernel", "cycles/iter", "iter/s", "crc16", "check");
+	for (unsigned k = 0; k < sizeof(kernels) / sizeof(kernels[0]); k++) {
+		const struct kernel *kern = &kernels[k];
+		uint16_t crc = 0;
+
+		timer_start();
+		for (uint32_t i = 1; i <= ITERATIONS; i++)
+			crc = crc16(crc, kern->run(i));
+		uint32_t cycles = (timer_cycles() - overhead) / ITERATIONS;
+
+		total += cycles;
+		ok &= crc == kern->expected;
+		printf("%-8s %12lu %14lu     0x%04x  %s\n", kern->name, (unsigned long)cycles,
+		       (unsigned long)(CONFIG_CLOCK_FREQUENCY / (cycles ? cycles : 1)), crc,
+		       crc == kern->expected ? "PASS" : "FAIL");
+	}
+
+	printf("%-8s %12lu %14lu\n", "total", (unsigned long)total,
+	       (unsigned long)(CONFIG_CLOCK_FREQUENCY / (total ? total : 1)));
+	print_config();
+	printf("Results: %s\n", ok ? "all checks passed" : "FAILED");
+}
+
+int main(void)
+{
+	bench_init();
+	printf("\nCPU benchmark (CoreMark / Dhrystone style), %d iterations per kernel\n", ITERATIONS);
+
+	while (1) {
+		benchmark();
+		printf("\nPress any key to run again\n");
+		getchar();
+	}
+
+	return 0;
+}
@@ -0,0 +1,56 @@
+// CRC32 driver: CRC32Peripheral (CSR) and table-driven software reference.
+
+#include <generated/csr.h>
+
+#include "crc32.h"
+
+#define CRC32_POLY 0xEDB88320u     // Reflected 0x04C11DB7
+
+// ---------------------------------------------------------------------------
+// CRC32Peripheral: crc32_data (write [7:0] = byte in, read = checksum),
+// crc32_reset_ctrl (any write restarts at 0xFFFFFFFF)
+// ---------------------------------------------------------------------------
+#ifdef CSR_CRC32_BASE
+
+void crc32_reset(void)
+{
+	crc32_reset_ctrl_write(1);
+}
+
+uint32_t crc32_update(const uint8_t *buf, size_t len)
+{
+	// One CSR store per byte; the peripheral latches it in the bus cycle
+	while (len--)
+		crc32_data_write(*buf++);
+	return crc32_data_read();
+}
+
+uint32_t crc32_value(void)
+{
+	return crc32_data_read();
+}
+
+#endif
+
+// ---------------------------------------------------------------------------
+// Software: one table lookup per byte
+// ---------------------------------------------------------------------------
+static uint32_t crc32_table[256];
+
+void crc32_sw_init(void)
+{
+	for (uint32_t i = 0; i < 256; i++) {
+		uint32_t crc = i;
+		for (int bit = 0; bit < 8; bit++)
+			crc = (crc & 1) ? (crc >> 1) ^ CRC32_POLY : crc >> 1;
+		crc32_table[i] = crc;
+	}
+}
+
+uint32_t crc32_sw_update(uint32_t crc, const uint8_t *buf, size_t len)
+{
+	crc = ~crc;
+	while (len--)
+		crc = crc32_table[(crc ^ *buf++) & 0xff] ^ (crc >> 8);
+	return ~crc;
+}
@@ -0,0 +1,21 @@
+// CRC32 driver for the CRC32Peripheral of vexriscvLedPeripheral.py
+// (03wishBoneCsrHdl/crc32Peripheral.py) and a table-driven software CRC32.
+//
+// Both compute CRC-32/ISO-HDLC (zlib.crc32): crc32("123456789") = 0xCBF43926.
+
+#ifndef CRC32_H
+#define CRC32_H
+
+#include <stddef.h>
+#include <stdint.h>
+
+// Peripheral: one byte per crc32_data write, running checksum on read.
+void     crc32_reset(void);                                // Start a new checksum
+uint32_t crc32_update(const uint8_t *buf, size_t len);     // Feed len bytes, return running CRC32
+uint32_t crc32_value(void);                                // Running CRC32, no bytes fed
+
+// Software: zlib-style, start with crc = 0 and pass the result back in to continue.
+void     crc32_sw_init(void);                              // Build the 256-entry table
+uint32_t crc32_sw_update(uint32_t crc, const uint8_t *buf, size_t len);
+
+#endif
@@ -0,0 +1,107 @@
+// CRC32 benchmark: table-driven software CRC32 vs the CRC32Peripheral.
+//
+// Loaded into main_ram by the BIOS:  litex_term /dev/ttyACM0 --kernel build/firmware/crc32bench.bin
+// Cycles are counted with timer0 (bench.c, one count per sys_clk cycle).
+
+#include <stdio.h>
+#include <stdint.h>
+
+#include <libbase/console.h>
+
+#include "bench.h"
+#include "crc32.h"
+#include "perf.h"
+
+#define MAX_LEN 2048
+
+static uint8_t buf[MAX_LEN];
+static const unsigned sizes[] = {16, 64, 256, 1024, MAX_LEN};
+
+// Bytes per cycle, integer only (len ≤ MAX_LEN keeps len × 1000 in 32 bits)
+static void print_rate(unsigned len, uint32_t cycles)
+{
+	printf("%6lu cycles  ", (unsigned long)cycles);
+	print_milli(cycles ? len * 1000u / cycles : 0);
+	printf(" B/cycle");
+}
+
+#ifdef CSR_PERF_BASE
+// Bus view of one peripheral run, from the PerfCounters
+static void perf_report(unsigned len)
+{
+	perf_clear();
+	crc32_reset();
+	crc32_update(buf, len);
+	perf_snapshot();
+
+	uint32_t accesses = perf_dbus_reads_read() + perf_dbus_writes_read();
+	uint32_t busy     = (uint32_t)perf_dbus_busy_cycles_read();
+	printf("\nperf: %lu B in %lu cycles, CRC32 bytes %lu, dbus %lu reads / %lu writes, ACK latency ",
+	       (unsigned long)len, (unsigned long)perf_cycles_read(), (unsigned long)perf_crc_bytes_read(),
+	       (unsigned long)perf_dbus_reads_read(), (unsigned long)perf_dbus_writes_read());
+	print_milli(accesses ? (uint32_t)((uint64_t)busy * 1000 / accesses) : 0);
+	printf(" cycles (mean)\n");
+}
+#endif
+
+static void benchmark(void)
+{
+	uint32_t overhead, t, sw, hw;
+	int ok = 1;
+
+	// Check value of CRC-32/ISO-HDLC
+	ok &= check("software crc32(\"123456789\")", crc32_sw_update(0, (const uint8_t *)"123456789", 9), 0xCBF43926);
+	crc32_reset();
+	ok &= check("peripheral crc32(\"123456789\")", crc32_update((const uint8_t *)"123456789", 9), 0xCBF43926);
+
+	for (unsigned i = 0; i < MAX_LEN; i++)
+		buf[i] = (uint8_t)(i * 7 + 3);
+
+	// Cost of starting and reading the timer itself
+	overhead = timer_overhead();
+
+	printf("\n%-6s  %-36s  %s\n", "bytes", "software (table)", "CRC32Peripheral");
+	for (unsigned i = 0; i < sizeof(sizes) / sizeof(sizes[0]); i++) {
+		unsigned len = sizes[i];
+
+		timer_start();
+		sw = crc32_sw_update(0, buf, len);
+		t  = timer_cycles() - overhead;
+		printf("%6u  ", len);
+		print_rate(len, t);
+
+		timer_start();
+		crc32_reset();
+		hw = crc32_update(buf, len);
+		t  = timer_cycles() - overhead;
+		printf("  ");
+		print_rate(len, t);
+		printf("%s\n", sw == hw ? "" : "  MISMATCH");
+		ok &= sw == hw;
+	}
+
+#ifdef CSR_PERF_BASE
+	perf_report(MAX_LEN);
+#endif
+
+	printf("\n");
+	print_config();
+	printf("timer overhead %lu cycles subtracted\n", (unsigned long)overhead);
+	printf("Results: %s\n", ok ? "all checks passed" : "FAILED");
+}
+
+int main(void)
+{
+	bench_init();
+
+	printf("\nCRC32 benchmark: table-driven software vs CRC32Peripheral\n");
+	crc32_sw_init();
+
+	while (1) {
+		benchmark();
+		printf("\nPress any key to run again\n");
+		getchar();
+	}
+
+	return 0;
+}
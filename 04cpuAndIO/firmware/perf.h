@@ -0,0 +1,28 @@
+// PerfCounters (commonLib/perfCounters.py), in the SoC when built with --perf-counters.
+//
+// The counters run all the time; perf_snapshot() copies them into the perf_*
+// CSRs read by the generated accessors (perf_cycles_read(), perf_dbus_reads_read(), ...).
+
+#ifndef PERF_H
+#define PERF_H
+
+#include <generated/csr.h>
+
+#ifdef CSR_PERF_BASE
+
+#define PERF_SNAPSHOT 0x1
+#define PERF_CLEAR    0x2
+
+static inline void perf_clear(void)
+{
+	perf_control_write(PERF_CLEAR);
+}
+
+static inline void perf_snapshot(void)
+{
+	perf_control_write(PERF_SNAPSHOT);
+}
+
+#endif
+
+#endif
@@ -1,4 +1,32 @@
 #!/usr/bin/env python3
+"""
+VexRiscv SoC (MySoC) on the GateMate A1 EVB with an LED and the CRC32 peripheral.
+
+The CRC32Peripheral of 03wishBoneCsrHdl (hdl/crc.v black box) sits on the CPU's
+CSR bus next to the LED. firmware/ holds a C driver for it (crc32_update(buf, len))
+and a benchmark comparing it with a table-driven software CRC32, in bytes per
+cycle, plus a CoreMark / Dhrystone style CPU benchmark (cpubench). The firmware
+runs from a 16 KB integrated main RAM, loaded by the BIOS.
+
+Build:  python vexriscvLedPeripheral.py        (gateware, BIOS and build/firmware/*.bin)
+Run:    litex_term /dev/ttyACM0 --kernel build/firmware/crc32bench.bin
+
+Configuration knobs (cpuSweep.py builds and benchmarks a set of them):
+  --cpu-variant / --icache-size / --dcache-size   VexRiscv variant (caches are fixed per variant)
+  --integrated-sram-size / --integrated-main-ram-size
+  --boot xip|sram     firmware runs in place from main_ram, or is copied to SRAM by crt0
+  --build-dir DIR     keeps one build per configuration side by side
+  --perf-counters     PerfCounters peripheral (commonLib/perfCounters.py): cycles,
+                      CPU bus accesses / ACK latencies, CRC32 bytes (firmware/perf.h)
+
+CSRs (generated csr.h): led_peripheral_control, crc32_data, crc32_reset_ctrl.
+"""
+
+import os
+import subprocess
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "03wishBoneCsrHdl"))
 
 from migen import *
 from litex_boards.targets.olimex_gatemate_a1_evb import BaseSoC
@@ -7,8 +35,45 @@ from litex_boards.platforms import olimex_gatemate_a1_evb
 from litex.soc.integration.builder import Builder
 from litex.soc.integration.soc_core import soc_core_args, soc_core_argdict
 from litex.soc.interconnect.csr import AutoCSR, CSRStorage
+from commonLib.elabCache import add_cache_arguments, build_cached
+from commonLib.perfCounters import add_perf_counters
+from crc32Peripheral import HDL_SOURCES, CRC32Peripheral
 import argparse
 
+# C driver + benchmark, built against the BIOS build's libraries and headers
+FIRMWARE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "firmware")
+
+# Instruction / data cache bytes of the prebuilt VexRiscv variants (pythondata-cpu-vexriscv).
+# The sizes are fixed by each variant's netlist, so --icache-size / --dcache-size select a variant.
+VEXRISCV_CACHES = {
+    "minimal":  (0,    0),
+    "lite":     (2048, 2048),
+    "standard": (4096, 4096),
+    "full":     (4096, 4096),
+}
+
+
+def select_variant(variant, icache_size, dcache_size):
+    """VexRiscv variant for the requested cache sizes (None = any); raises ValueError if none fits."""
+    def fits(name):
+        icache, dcache = VEXRISCV_CACHES[name]
+        return icache_size in (None, icache) and dcache_size in (None, dcache)
+
+    if variant is not None:
+        base = variant.split("+")[0]
+        if base in VEXRISCV_CACHES and not fits(base):
+            raise ValueError(f"variant {variant} has I$ {VEXRISCV_CACHES[base][0]} B / "
+                             f"D$ {VEXRISCV_CACHES[base][1]} B")
+        return variant
+    if icache_size is None and dcache_size is None:
+        return None
+    for name in VEXRISCV_CACHES:
+        if fits(name):
+            return name
+    raise ValueError("no VexRiscv variant with I$ {} B / D$ {} B (available: {})".format(
+        icache_size, dcache_size,
+        ", ".join(f"{name} {i}/{d}" for name, (i, d) in VEXRISCV_CACHES.items())))
+
 
 # -------------------------------------------------
 # AutoCSR LED Peripheral
@@ -23,10 +88,11 @@ class LedPeripheral(Module, AutoCSR):
 # Custom SoC
 # -------------------------------------------------
 class MySoC(BaseSoC):
-    def __init__(self, **kwargs):
+    def __init__(self, perf_counters=False, **kwargs):
         kwargs.setdefault("cpu_type", "vexriscv")
         kwargs.setdefault("uart_baudrate", 115200)
         kwargs.setdefault("integrated_rom_size", 0x8000)  # 32KB BIOS ROM at CPU reset address 0x00000000
+        kwargs.setdefault("integrated_main_ram_size", 0x4000)  # 16KB main RAM for firmware/ (BIOS serial boot)
 
         BaseSoC.__init__(self,
             with_led_chaser=False,     # Disable chaser so we can claim user_led_n ourselves
@@ -35,6 +101,13 @@ class MySoC(BaseSoC):
 
         platform = self.platform
 
+        # Configuration reported by the firmware (generated/soc.h: CONFIG_CPU_VARIANT_NAME, ...)
+        variant = getattr(self.cpu, "variant", None) or "none"
+        icache, dcache = VEXRISCV_CACHES.get(variant.split("+")[0], (0, 0))
+        self.add_config("CPU_VARIANT_NAME", variant)
+        self.add_config("CPU_ICACHE_SIZE",  icache)
+        self.add_config("CPU_DCACHE_SIZE",  dcache)
+
         # Request physical LED from platform (active-low: _n suffix)
         led = platform.request("user_led_n", 0)
 
@@ -44,6 +117,17 @@ class MySoC(BaseSoC):
         # Register as CSR
         self.add_csr("led_peripheral")
 
+        # CRC32 peripheral (Verilog black box): crc32_data / crc32_reset_ctrl CSRs
+        self.submodules.crc32 = CRC32Peripheral(platform, "verilog")
+        self.add_csr("crc32")
+
+        if perf_counters:
+            # CPU instruction / data buses and the CRC32 byte strobe: perf_* CSRs
+            add_perf_counters(self,
+                buses  = list(zip(("ibus", "dbus"), self.cpu.periph_buses)),
+                events = [("crc_bytes", self.crc32.data.re)],
+            )
+
 
 # -------------------------------------------------
 # Build & Flash
@@ -51,15 +135,52 @@ class MySoC(BaseSoC):
 def main():
     parser = argparse.ArgumentParser()
     soc_core_args(parser)
+    # soc_core_args defaults to a 128KB ROM, which would override MySoC's 32KB and
+    # leave no block RAM for main_ram
+    parser.set_defaults(integrated_rom_size=0x8000)
+    parser.add_argument("--icache-size", type=int, help="Instruction cache bytes (selects the VexRiscv variant)")
+    parser.add_argument("--dcache-size", type=int, help="Data cache bytes (selects the VexRiscv variant)")
+    parser.add_argument("--boot",        choices=("xip", "sram"), default="xip",
+                        help="Firmware runs in place from main_ram (xip) or from SRAM after crt0 copies it")
+    parser.add_argument("--build-dir",   default="build", help="Output directory (one per configuration)")
+    parser.add_argument("--no-load",     action="store_true", help="Build only, do not load the bitstream")
+    parser.add_argument("--perf-counters", action="store_true",
+                        help="Add the PerfCounters peripheral (cycles, CPU bus accesses / latency, CRC32 bytes)")
+    add_cache_arguments(parser)
     args = parser.parse_args()
 
-    soc = MySoC(**soc_core_argdict(args))
-    builder = Builder(soc, output_dir="build", compile_gateware=True, compile_software=True)
-    builder.build()
+    try:
+        args.cpu_variant = select_variant(args.cpu_variant, args.icache_size, args.dcache_size)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Same path as builder.get_bitstream_filename(mode="sram"), known without elaborating
+    platform  = olimex_gatemate_a1_evb.Platform()
+    build_dir = args.build_dir
+    bitstream = os.path.join(build_dir, "gateware", platform.name + platform.get_bitstream_extension("sram"))
+
+    # Elaboration, gateware and BIOS build are skipped when sources and options are unchanged
+    def build():
+        soc = MySoC(perf_counters=args.perf_counters, **soc_core_argdict(args))
+        builder = Builder(soc, output_dir=build_dir, compile_gateware=True, compile_software=True)
+        builder.build()
+    build_cached(build_dir, build, params={**soc_core_argdict(args), "perf_counters": args.perf_counters},
+                 outputs=[bitstream],
+                 sources=[HDL_SOURCES["verilog"]], force=args.rebuild)
+
+    # Benchmarks, built out of tree into <build dir>/firmware (make rebuilds them only when
+    # their sources, BOOT or the BIOS build changed)
+    firmware_out = os.path.join(build_dir, "firmware")
+    os.makedirs(firmware_out, exist_ok=True)
+    subprocess.run(["make", "-C", firmware_out, "-f", os.path.join(FIRMWARE_DIR, "Makefile"),
+                    "BUILD_DIR=" + os.path.abspath(build_dir), "BOOT=" + args.boot], check=True)
+
+    if args.no_load:
+        return
 
     # Flash bitstream to FPGA SRAM via dirtyJtag
-    prog = soc.platform.create_programmer()
-    prog.load_bitstream(builder.get_bitstream_filename(mode="sram"))
+    prog = platform.create_programmer()
+    prog.load_bitstream(bitstream)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,6 @@
+"""
+Shared Migen/LiteX building blocks used by the example projects.
+
+The example directories add the repository root to ``sys.path`` and import
+from here, e.g. ``from commonLib.wishboneDecoder import WishboneErrDecoder``.
+"""
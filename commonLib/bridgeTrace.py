@@ -0,0 +1,223 @@
+"""
+Transaction tracing for the bridge client: where host-side time goes.
+
+TracingClient wraps a litex RemoteClient (or anything with read() / write())
+and times every transaction. The host scripts and RegisterMap use it
+unchanged:
+
+    wb   = TracingClient(RemoteClient(), names=Crc32Regs)
+    regs = Crc32Regs(wb)
+    ...
+    print(wb.format_summary())
+    wb.write_json("trace.json")                  # transactions + per-address statistics
+    wb.write_chrome_trace("trace.chrome.json")   # chrome://tracing, ui.perfetto.dev
+
+Each transaction is one RemoteClient call, i.e. one round trip host →
+litex_server (TCP) → UART → FPGA bus → back. Its time is split into what
+the UART needs for the bytes of the command and the reply at `baud` (the
+model of commonLib/sramBench.py; the bus access itself is a few sys_clk
+cycles) and the rest: litex_server, TCP and the host. The summary also
+gives the time the script spent between transactions.
+
+Per register (address): count, p50 / p99 / max latency and a histogram of
+power-of-two microsecond bins. Plain Python, no LiteX import.
+"""
+
+import json
+import time
+from collections import namedtuple
+
+from commonLib.sramBench import uart_bytes
+
+# Latency histogram: bin i counts latencies up to 2**i µs, the last bin the rest
+HISTOGRAM_BINS = 16
+
+Transaction = namedtuple("Transaction", "kind addr words start duration")
+
+
+def percentile(values, p):
+    """Nearest-rank percentile `p` (0..100) of `values`; None when empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank    = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def histogram(durations, bins=HISTOGRAM_BINS):
+    """Counts per power-of-two bin of `durations` (seconds): bin i is up to 2**i µs."""
+    counts = [0] * bins
+    for d in durations:
+        us = d * 1e6
+        i  = 0
+        while i < bins - 1 and us > 2**i:
+            i += 1
+        counts[i] += 1
+    return counts
+
+
+def uart_seconds(kind, words, baud):
+    """UART time of one transaction (command and reply bytes, 8N1), as comm_uart sends it."""
+    return uart_bytes(words, words, kind == "w") * 10 / baud
+
+
+# Create:
+#+----------------------------------------------+
+#|   TracingClient                              |
+#|     read / write -> client, timed            |
+#|     transactions, per-address statistics     |
+#|     JSON / Chrome trace export               |
+#+----------------------------------------------+
+class TracingClient:
+    """Times every read() / write() of `client`.
+
+    names   : {address: name}, or a RegisterMap class / instance, to label addresses
+    baud    : bridge baud rate, for the UART share of each transaction
+    enabled : record (can be switched at any time)
+    clock   : time source in seconds
+    """
+
+    def __init__(self, client, names=None, baud=115200, enabled=True, clock=time.perf_counter):
+        self.client       = client
+        self.baud         = baud
+        self.enabled      = enabled
+        self.clock        = clock
+        self.transactions = []
+        if names is not None and not isinstance(names, dict):
+            names = {r.addr: r.name for r in names.registers}
+        self.names = names or {}
+
+    # Client interface ----------------------------------------------------------
+
+    def open(self):
+        self.client.open()
+
+    def close(self):
+        self.client.close()
+
+    def read(self, addr, length=None, **kwargs):
+        start = self.clock()
+        value = self.client.read(addr, length, **kwargs)
+        self._record("r", addr, 1 if length is None else length, start)
+        return value
+
+    def write(self, addr, data, **kwargs):
+        start = self.clock()
+        self.client.write(addr, data, **kwargs)
+        self._record("w", addr, len(data) if isinstance(data, list) else 1, start)
+
+    def _record(self, kind, addr, words, start):
+        if self.enabled:
+            self.transactions.append(Transaction(kind, addr, words, start, self.clock() - start))
+
+    def clear(self):
+        self.transactions = []
+
+    # Statistics ----------------------------------------------------------------
+
+    def name(self, addr):
+        return self.names.get(addr, f"0x{addr:08x}")
+
+    def address_stats(self):
+        """{name: {reads, writes, words, p50_us, p99_us, max_us, histogram}}, busiest first."""
+        by_addr = {}
+        for t in self.transactions:
+            by_addr.setdefault(t.addr, []).append(t)
+        stats = {}
+        for addr, ts in sorted(by_addr.items(), key=lambda item: -len(item[1])):
+            durations = [t.duration for t in ts]
+            stats[self.name(addr)] = {
+                "addr":      addr,
+                "reads":     sum(t.kind == "r" for t in ts),
+                "writes":    sum(t.kind == "w" for t in ts),
+                "words":     sum(t.words for t in ts),
+                "p50_us":    percentile(durations, 50) * 1e6,
+                "p99_us":    percentile(durations, 99) * 1e6,
+                "max_us":    max(durations) * 1e6,
+                "histogram": histogram(durations),
+            }
+        return stats
+
+    def summary(self):
+        """Totals: wall time, time in transactions, its UART share, and the time between them."""
+        ts = self.transactions
+        if not ts:
+            return {"transactions": 0}
+        durations = [t.duration for t in ts]
+        busy  = sum(durations)
+        uart  = sum(uart_seconds(t.kind, t.words, self.baud) for t in ts)
+        wall  = ts[-1].start + ts[-1].duration - ts[0].start
+        return {
+            "transactions": len(ts),
+            "words":        sum(t.words for t in ts),
+            "wall_s":       wall,
+            "bridge_s":     busy,               # Inside client calls
+            "uart_s":       uart,               # Of which the UART model
+            "server_s":     busy - uart,        # litex_server, TCP, host side of the client
+            "host_s":       wall - busy,        # The script between transactions
+            "p50_us":       percentile(durations, 50) * 1e6,
+            "p99_us":       percentile(durations, 99) * 1e6,
+            "histogram":    histogram(durations),
+        }
+
+    def format_summary(self):
+        """Printable summary and per-address table."""
+        s = self.summary()
+        if not s["transactions"]:
+            return "No bridge transactions recorded"
+        lines = [
+            f"{s['transactions']} bridge transactions ({s['words']} words) in {s['wall_s'] * 1e3:.1f} ms",
+            f"  {'in transactions':<30} {s['bridge_s'] * 1e3:9.1f} ms",
+            f"  {f'  UART at {self.baud} baud (model)':<30} {s['uart_s'] * 1e3:9.1f} ms",
+            f"  {'  litex_server / TCP / host':<30} {s['server_s'] * 1e3:9.1f} ms",
+            f"  {'between transactions':<30} {s['host_s'] * 1e3:9.1f} ms",
+            f"  latency p50 {s['p50_us']:.0f} us, p99 {s['p99_us']:.0f} us",
+            "",
+            f"{'register':<24} {'reads':>6} {'writes':>6} {'p50 us':>8} {'p99 us':>8} {'max us':>8}",
+        ]
+        for name, a in self.address_stats().items():
+            lines.append(f"{name:<24} {a['reads']:>6} {a['writes']:>6} {a['p50_us']:>8.0f} "
+                         f"{a['p99_us']:>8.0f} {a['max_us']:>8.0f}")
+        return "\n".join(lines)
+
+    # Export --------------------------------------------------------------------
+
+    def to_json(self):
+        """Transactions (times relative to the first), summary and per-address statistics."""
+        t0 = self.transactions[0].start if self.transactions else 0
+        return {
+            "baud":         self.baud,
+            "summary":      self.summary(),
+            "addresses":    self.address_stats(),
+            "transactions": [{"kind": t.kind, "addr": t.addr, "name": self.name(t.addr), "words": t.words,
+                              "start_us": (t.start - t0) * 1e6, "duration_us": t.duration * 1e6}
+                             for t in self.transactions],
+        }
+
+    def to_chrome_trace(self):
+        """Chrome trace events: one span per transaction, the UART model as a span on its own row."""
+        t0     = self.transactions[0].start if self.transactions else 0
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "bridge transactions"}},
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": 2, "args": {"name": f"UART {self.baud} baud (model)"}},
+        ]
+        for t in self.transactions:
+            start = (t.start - t0) * 1e6
+            dur   = t.duration * 1e6
+            label = f"{'read' if t.kind == 'r' else 'write'} {self.name(t.addr)}"
+            args  = {"addr": f"0x{t.addr:08x}", "words": t.words}
+            events.append({"name": label, "cat": "bridge", "ph": "X", "pid": 1, "tid": 1,
+                           "ts": start, "dur": dur, "args": args})
+            # The wire time is the tail of the round trip: drawn ending with it
+            uart = min(uart_seconds(t.kind, t.words, self.baud) * 1e6, dur)
+            events.append({"name": "uart", "cat": "uart", "ph": "X", "pid": 1, "tid": 2,
+                           "ts": start + dur - uart, "dur": uart, "args": args})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_json(), f, indent=2)
+
+    def write_chrome_trace(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
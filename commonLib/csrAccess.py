@@ -0,0 +1,429 @@
+"""
+Typed register access for the register maps generated by commonLib/csrGen.py.
+
+Host scripts used to hard-code addresses (wb.write(0x40000800, b)). A
+generated map (e.g. 03wishBoneCsrHdl/crc32Regs.py) holds every register of
+the build with its address, size and fields; this module gives it an API:
+
+    from crc32Regs import Crc32Regs
+    regs = Crc32Regs(RemoteClient())               # any client with read()/write()
+    regs.crc32_reset_ctrl.write(1)
+    crc = regs.crc32_data.read()
+    regs.led_control.write_field("control", 1)     # read-modify-write of one field
+
+Batching: accesses queued on a Batch are sent when it is flushed, and runs
+of accesses to adjacent registers (same direction, ascending addresses) are
+merged into one burst, i.e. one RemoteClient round trip:
+
+    with regs.batch() as b:
+        b.ctrl_scratch.write(0x1234)
+        status = b.ctrl_bus_errors.read()          # Pending; .value after the block
+    values = regs.read_group("crc32")              # whole peripheral, one burst
+
+RemoteClient bursts are incrementing only; repeated writes to one register
+(e.g. streaming bytes into crc32_data) stay one round trip each.
+
+In simulation, run_batch(bfm, batch) replays the same transactions with a
+commonLib/wishboneBfm.py WishboneBFM (burst_write / burst_read).
+
+Shadow cache: registers the generator marked cacheable (CSRStorage that only
+the host writes, e.g. ctrl_scratch, led_control) read back what was last
+written, so with cache=True the map keeps a shadow of them:
+
+    regs = LedRegs(RemoteClient(), cache=True, verify_every=8)
+    regs.led_control.write(1)
+    regs.led_control.read()                        # Served from the shadow
+    regs.led_control.write(1)                      # Same value: not sent
+
+Reads of cacheable registers are served locally once their value is known,
+writes of the value already held are dropped, and every other register
+(status, CSR with side effects such as crc32_data) always goes to the bus.
+verify_every=N reads back every Nth cacheable write and raises
+ShadowMismatch when the hardware disagrees. A write to ctrl_reset (SoC reset)
+or invalidate() forgets the shadow. cache_hits / writes_coalesced count what
+the cache saved. Batched writes reach the shadow when the batch is flushed;
+until then only the batch itself sees them.
+
+Multi-word registers are big-endian across words (LiteX CSR ordering "big").
+"""
+
+from collections import ChainMap, namedtuple
+
+# Writes here reset the SoC (LiteX SoCController), and with it every CSRStorage
+RESET_REGISTERS = ("ctrl_reset",)
+
+
+class ShadowMismatch(RuntimeError):
+    """A verify readback of a cacheable register differs from the shadow."""
+
+
+class Field(namedtuple("Field", "name offset size")):
+    """Bit field of a register: bits [offset + size - 1 : offset]."""
+
+    @property
+    def mask(self):
+        return ((1 << self.size) - 1) << self.offset
+
+    def extract(self, value):
+        return (value & self.mask) >> self.offset
+
+    def insert(self, value, field_value):
+        return (value & ~self.mask) | ((field_value << self.offset) & self.mask)
+
+
+# Create:
+#+----------------------------------------------+
+#|   Register                                   |
+#|     - byte address, size in 32-bit words     |
+#|     - access ("rw" / "ro"), fields           |
+#|     - cacheable: reads back the last write   |
+#|     - value <-> bus words                    |
+#+----------------------------------------------+
+class Register:
+    """One register of a generated map (not bound to a bus)."""
+
+    def __init__(self, name, addr, size=1, access="rw", fields=(), cacheable=False):
+        self.name      = name
+        self.addr      = addr
+        self.size      = size               # 32-bit words
+        self.access    = access
+        self.fields    = {f.name: f for f in fields}
+        self.cacheable = cacheable
+
+    @property
+    def mask(self):
+        """Bits covered by the fields (all bits when none are known)."""
+        if not self.fields:
+            return (1 << (32 * self.size)) - 1
+        mask = 0
+        for f in self.fields.values():
+            mask |= f.mask
+        return mask
+
+    def to_words(self, value):
+        return [(value >> (32 * (self.size - 1 - i))) & 0xFFFFFFFF for i in range(self.size)]
+
+    def from_words(self, words):
+        value = 0
+        for word in words:
+            value = (value << 32) | (word & 0xFFFFFFFF)
+        return value
+
+    def __repr__(self):
+        return f"Register({self.name!r}, 0x{self.addr:08x}, size={self.size}, access={self.access!r})"
+
+
+class Pending:
+    """Result of a batched read; `value` is set when the batch is flushed.
+
+    `expected` is set on the readbacks verify_every adds behind a write.
+    """
+
+    def __init__(self, register, value=None, expected=None):
+        self.register = register
+        self.value    = value
+        self.expected = expected
+
+    def __repr__(self):
+        return f"Pending({self.register.name}, {self.value!r})"
+
+
+# Create:
+#+----------------------------------------------+
+#|   BoundRegister                              |
+#|     - register + target (map or batch)       |
+#|     - read / write / fields                  |
+#+----------------------------------------------+
+class BoundRegister:
+    """A Register accessed through a RegisterMap (immediately) or a Batch (deferred)."""
+
+    def __init__(self, target, register):
+        self._target  = target
+        self.register = register
+
+    def read(self):
+        return self._target._read(self.register)
+
+    def write(self, value):
+        if self.register.access == "ro":
+            raise ValueError(f"Register '{self.register.name}' is read-only")
+        self._target._write(self.register, value)
+
+    def read_field(self, name):
+        return self.register.fields[name].extract(self._target._read_now(self.register))
+
+    def write_field(self, name, value):
+        """Read-modify-write of one field (two bus accesses)."""
+        reg = self.register
+        self.write(reg.fields[name].insert(self._target._read_now(reg), value))
+
+    def __getattr__(self, name):
+        # Register attributes (addr, mask, fields, ...)
+        return getattr(self.register, name)
+
+
+# Create:
+#+----------------------------------------------+
+#|   Batch                                      |
+#|     - queued reads / writes                  |
+#|     - adjacent runs -> one burst each        |
+#+----------------------------------------------+
+class Batch:
+    """Accesses queued on a RegisterMap, sent as few bursts as possible."""
+
+    def __init__(self, regmap):
+        self._map    = regmap
+        self._ops    = []       # ["w", byte_addr, [words], [(Register, value)]]
+                                # ["r", byte_addr, n_words, [(Pending, word offset)]]
+        self._values = {}       # Cacheable register name → value queued in this batch
+        self._reset  = False    # A reset register write is queued: the map's shadow is stale
+
+    def __getattr__(self, name):
+        return BoundRegister(self, self._map.register(name))
+
+    def _shadow(self):
+        # The map's shadow as it will be once the queued writes are flushed
+        return ChainMap(self._values) if self._reset else ChainMap(self._values, self._map._shadow)
+
+    def _write(self, register, value):
+        if self._map._coalesce(register, value, self._shadow()):
+            return
+        self._queue("w", register.addr, register.to_words(value), (register, value))
+        if register.name in RESET_REGISTERS:
+            self._values.clear()
+            self._reset = True
+        if self._map.cache and register.cacheable:
+            self._values[register.name] = value & register.mask
+        if self._map._verify_due(register):
+            self._queue("r", register.addr, register.size, Pending(register, expected=value & register.mask))
+
+    def _read(self, register):
+        value = self._map._lookup(register, self._shadow())
+        if value is not None:
+            return Pending(register, value)
+        pending = Pending(register)
+        self._queue("r", register.addr, register.size, pending)
+        return pending
+
+    def _read_now(self, register):
+        raise TypeError("Field read-modify-write needs an immediate read; use the map, not a batch")
+
+    def _queue(self, kind, addr, payload, entry):
+        # entry: (Register, value) of a write, Pending of a read
+        n = len(payload) if kind == "w" else payload
+        if self._ops:
+            last = self._ops[-1]
+            last_n = len(last[2]) if last[0] == "w" else last[2]
+            if last[0] == kind and addr == last[1] + 4 * last_n:
+                if kind == "w":
+                    last[2].extend(payload)
+                    last[3].append(entry)
+                else:
+                    last[3].append((entry, last[2]))
+                    last[2] += n
+                return
+        self._ops.append([kind, addr, list(payload) if kind == "w" else n,
+                          [entry] if kind == "w" else [(entry, 0)]])
+
+    def write_group(self, group, **values):
+        for name, value in values.items():
+            getattr(self, f"{group}_{name}").write(value)
+
+    def read_group(self, group):
+        return {name[len(group) + 1:]: getattr(self, name).read()
+                for name in self._map.groups[group]}
+
+    def transactions(self):
+        """[("w", byte_addr, [words]) / ("r", byte_addr, n_words)], one per burst."""
+        return [(kind, addr, payload) for kind, addr, payload, _ in self._ops]
+
+    def complete(self, read_data):
+        """Hand the words read by each "r" transaction (in order) to the Pending results.
+
+        The writes and reads of the batch then reach the shadow in queue order.
+        """
+        ops = self._ops
+        self._ops, self._values, self._reset = [], {}, False
+        reads = [op for op in ops if op[0] == "r"]
+        for (_, _, _, pendings), words in zip(reads, read_data):
+            for pending, offset in pendings:
+                pending.value = pending.register.from_words(words[offset:offset + pending.register.size])
+        for kind, _, _, entries in ops:
+            for entry in entries:
+                if kind == "w":
+                    self._map._written(*entry)
+                else:
+                    pending = entry[0]
+                    self._map._read_back(pending.register, pending.value, pending.expected)
+
+    def flush(self):
+        self.complete(self._map._execute(self.transactions()))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+
+
+# Create:
+#+----------------------------------------------+
+#|   RegisterMap                                |
+#|     - base of every generated map            |
+#|     - regs.<name>.read() / .write(v)         |
+#|     - client round trips counted             |
+#+----------------------------------------------+
+class RegisterMap:
+    """Generated maps subclass this and fill in `registers` and `groups`.
+
+    client       : object with read(addr, length=None) and write(addr, value or [words])
+                   (litex RemoteClient); may be None for simulation-only use.
+    cache        : keep a shadow of the cacheable registers (see the module docstring)
+    verify_every : read back every Nth cacheable write (0: never)
+    """
+
+    registers = ()      # Register instances
+    groups    = {}      # CSR region name → register names, in address order
+
+    def __init__(self, client=None, cache=False, verify_every=0):
+        self.client           = client
+        self.cache            = cache
+        self.verify_every     = verify_every
+        self.round_trips      = 0
+        self.cache_hits       = 0       # Reads served from the shadow
+        self.writes_coalesced = 0       # Writes dropped: the register already held the value
+        self.verified         = 0       # Verify readbacks done
+        self._by_name         = {r.name: r for r in self.registers}
+        self._shadow          = {}      # Register name → value last written / read
+        self._writes          = 0       # Cacheable writes sent, for verify_every
+
+    def register(self, name):
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise AttributeError(f"No register '{name}' in {type(self).__name__}") from None
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return BoundRegister(self, self.register(name))
+
+    def batch(self):
+        return Batch(self)
+
+    def read_group(self, group):
+        """All registers of CSR region `group` in one burst: {short name: value}."""
+        with self.batch() as b:
+            pending = b.read_group(group)
+        return {name: p.value for name, p in pending.items()}
+
+    def write_group(self, group, **values):
+        """Write registers of `group` (by short name); adjacent ones go as one burst."""
+        with self.batch() as b:
+            b.write_group(group, **values)
+
+    def invalidate(self, name=None):
+        """Forget the shadow of register `name`, or of all registers."""
+        if name is None:
+            self._shadow.clear()
+        else:
+            self._shadow.pop(self.register(name).name, None)
+
+    # Shadow cache --------------------------------------------------------------
+
+    def _lookup(self, register, shadow=None):
+        # Shadow value of a cacheable register, or None (read it from the bus)
+        if not (self.cache and register.cacheable):
+            return None
+        value = (self._shadow if shadow is None else shadow).get(register.name)
+        if value is not None:
+            self.cache_hits += 1
+        return value
+
+    def _coalesce(self, register, value, shadow=None):
+        # True when the register already holds `value`: the write is dropped
+        shadow = self._shadow if shadow is None else shadow
+        if self.cache and register.cacheable and shadow.get(register.name) == value & register.mask:
+            self.writes_coalesced += 1
+            return True
+        return False
+
+    def _written(self, register, value):
+        # Record a write that has reached the bus
+        if register.name in RESET_REGISTERS:
+            self._shadow.clear()
+        if self.cache and register.cacheable:
+            self._shadow[register.name] = value & register.mask
+
+    def _verify_due(self, register):
+        # Count a cacheable write; True when it is to be read back
+        if not (self.cache and register.cacheable):
+            return False
+        self._writes += 1
+        return bool(self.verify_every) and self._writes % self.verify_every == 0
+
+    def _read_back(self, register, value, expected=None):
+        # Value read from the bus: check a verify readback, fill the shadow
+        if expected is not None:
+            self.verified += 1
+            if value != expected:
+                self._shadow[register.name] = value
+                raise ShadowMismatch(f"Register '{register.name}' reads back 0x{value:x}, "
+                                     f"0x{expected:x} was written")
+        if self.cache and register.cacheable:
+            self._shadow.setdefault(register.name, value)
+
+    # Immediate accesses --------------------------------------------------------
+
+    def _read(self, register):
+        value = self._lookup(register)
+        if value is None:
+            value = register.from_words(self._execute([("r", register.addr, register.size)])[0])
+            self._read_back(register, value)
+        return value
+
+    _read_now = _read
+
+    def _write(self, register, value):
+        if self._coalesce(register, value):
+            return
+        self._execute([("w", register.addr, register.to_words(value))])
+        self._written(register, value)
+        if self._verify_due(register):
+            expected = value & register.mask
+            self._read_back(register, register.from_words(
+                self._execute([("r", register.addr, register.size)])[0]), expected)
+
+    def _execute(self, transactions):
+        """Run the transactions on the client; returns the words of each read."""
+        if self.client is None:
+            raise RuntimeError(f"{type(self).__name__} has no client; use run_batch() in simulation")
+        read_data = []
+        for kind, addr, payload in transactions:
+            self.round_trips += 1
+            if kind == "w":
+                self.client.write(addr, payload if len(payload) > 1 else payload[0])
+            elif payload > 1:
+                read_data.append(list(self.client.read(addr, payload)))
+            else:
+                read_data.append([self.client.read(addr)])
+        return read_data
+
+
+def run_batch(bfm, batch):
+    """Simulation generator: execute `batch` with a WishboneBFM, one CTI burst per transaction.
+
+    Returns the WishboneResults of every beat; the batch's Pending reads are filled in.
+    """
+    results   = []
+    read_data = []
+    for kind, addr, payload in batch.transactions():
+        if kind == "w":
+            beats = yield from bfm.burst_write(addr, payload)
+        else:
+            beats = yield from bfm.burst_read(addr, payload)
+            read_data.append([r.value for r in beats])
+        results += beats
+    batch.complete(read_data)
+    return results
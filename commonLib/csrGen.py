@@ -0,0 +1,237 @@
+"""
+Register-map generator: Builder CSR exports → Python module.
+
+The Builder writes the register layout of a build to csr.csv / csr.json
+(addresses, sizes, access) and csr.svd (bit fields). generate() turns them
+into a Python module with
+
+  - <REG>_ADDR constants and <REG>_<FIELD>_MASK / _OFFSET constants,
+  - <REGION>_BASE / <REGION>_SIZE for the memory regions,
+  - a RegisterMap subclass (commonLib/csrAccess.py) with typed per-register
+    accessors, per-peripheral groups and burst batching,
+
+so host scripts and testbenches stop recomputing addresses by hand. The
+output is deterministic: regenerating an unchanged build gives the same file.
+
+The build scripts write the map of every build to build/ (write_register_map),
+next to csr.json; host scripts import that one when it exists. The map
+committed beside each build script is a fixed reference that the testbenches
+import: a build only rewrites it when asked to with --reference-map. By hand,
+from the repository root:
+
+    python -m commonLib.csrGen 03wishBoneCsrHdl/build/csr.json \\
+        --svd 03wishBoneCsrHdl/build/csr.svd --class Crc32Regs -o 03wishBoneCsrHdl/build/crc32Regs.py
+
+Without an SVD every register gets one field spanning all its bits.
+
+csr.json does not tell a CSRStorage from a plain CSR (both are "rw"), so the
+build scripts also pass their SoC: its CSRStorage registers that only the
+host writes (no write_from_dev, no pulse fields) are marked cacheable, for the
+shadow cache of commonLib/csrAccess.py. Maps generated without the SoC cache
+nothing.
+Tools that read a build they were not generated for (commonLib/perfReport.py)
+build the same class at run time with register_map_class().
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_csr(path):
+    """Read csr.json or csr.csv into the csr.json layout (csr_bases, csr_registers, memories)."""
+    if path.endswith(".json"):
+        with open(path) as f:
+            return json.load(f)
+
+    csr = {"csr_bases": {}, "csr_registers": {}, "constants": {}, "memories": {}}
+    with open(path, newline="") as f:
+        for row in csv.reader(line for line in f if not line.startswith("#")):
+            if not row:
+                continue
+            kind, name, value = row[0], row[1], row[2]
+            if kind == "csr_base":
+                csr["csr_bases"][name] = int(value, 0)
+            elif kind == "csr_register":
+                csr["csr_registers"][name] = {"addr": int(value, 0), "size": int(row[3]), "type": row[4]}
+            elif kind == "constant":
+                csr["constants"][name] = value
+            elif kind == "memory_region":
+                csr["memories"][name] = {"base": int(value, 0), "size": int(row[3]), "type": row[4]}
+    return csr
+
+
+def load_svd_fields(path):
+    """{register name ("<peripheral>_<register>", lower case): [(field, lsb, width)]} from csr.svd."""
+    import xml.etree.ElementTree as ET      # Only needed with --svd
+
+    fields = {}
+    for periph in ET.parse(path).getroot().iter("peripheral"):
+        prefix = periph.findtext("name").lower()
+        for reg in periph.iter("register"):
+            entries = []
+            for field in reg.iter("field"):
+                lsb = int(field.findtext("lsb"))
+                msb = int(field.findtext("msb"))
+                entries.append((field.findtext("name").lower(), lsb, msb - lsb + 1))
+            fields[f"{prefix}_{reg.findtext('name').lower()}"] = entries
+    return fields
+
+
+def _identifier(name):
+    return re.sub(r"\W", "_", name)
+
+
+def _group_of(reg_name, bases):
+    # Longest CSR region name that prefixes the register ("crc32" for "crc32_data")
+    matches = [b for b in bases if reg_name.startswith(b + "_")]
+    return max(matches, key=len) if matches else None
+
+
+def _register_fields(registers, bases, fields):
+    # {register: [(field, lsb, width)]}: SVD fields, or one field spanning the register
+    reg_fields = {}
+    for name, reg in registers:
+        group = _group_of(name, bases)
+        short = name[len(group) + 1:] if group else name
+        reg_fields[name] = fields.get(name) or [(short, 0, 32 * reg["size"])]
+    return reg_fields
+
+
+def cacheable_registers(soc):
+    """Names of the CSRStorage registers of `soc` that read back what the host wrote."""
+    from litex.soc.interconnect.csr import CSRStorage
+
+    names = set()
+    for region_name, region in soc.csr.regions.items():
+        if not isinstance(region.obj, list):
+            continue
+        for csr in region.obj:
+            fields = getattr(csr, "fields", None)
+            pulse  = fields is not None and any(f.pulse for f in fields.fields)
+            if isinstance(csr, CSRStorage) and not hasattr(csr, "dat_w") and not pulse:
+                names.add(f"{region_name}_{csr.name}")
+    return names
+
+
+def generate(csr, fields=None, class_name="Registers", source="csr.json", cacheable=(), root=".."):
+    """Python source of the register-map module for `csr` (load_csr() layout).
+
+    root : repository root relative to the module's directory (for commonLib)
+    """
+    fields    = fields or {}
+    registers = sorted(csr["csr_registers"].items(), key=lambda item: item[1]["addr"])
+    bases     = csr.get("csr_bases", {})
+
+    lines = [
+        '"""',
+        f"Register map generated by commonLib/csrGen.py from {source}; do not edit.",
+        "",
+        "Every build writes its map to build/; the copy beside the build script",
+        "is the reference map, rewritten only with --reference-map. See",
+        "commonLib/csrAccess.py for the API.",
+        '"""',
+        "",
+        "import os",
+        "import sys",
+        "",
+        f"sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), \"{root}\"))",
+        "from commonLib.csrAccess import Field, Register, RegisterMap",
+        "",
+    ]
+
+    memories = csr.get("memories", {})
+    if memories:
+        lines.append("# Memory regions")
+        for name, mem in sorted(memories.items(), key=lambda item: item[1]["base"]):
+            ident = _identifier(name).upper()
+            lines.append(f"{ident}_BASE = 0x{mem['base']:08x}")
+            lines.append(f"{ident}_SIZE = 0x{mem['size']:x}")
+        lines.append("")
+
+    lines.append("# Register addresses")
+    width = max((len(name) for name, _ in registers), default=0) + len("_ADDR")
+    for name, reg in registers:
+        lines.append(f"{(_identifier(name).upper() + '_ADDR'):<{width}} = 0x{reg['addr']:08x}")
+    lines.append("")
+
+    reg_fields = _register_fields(registers, bases, fields)
+
+    lines.append("# Field masks and offsets")
+    for name, _ in registers:
+        for field, lsb, size in reg_fields[name]:
+            ident = f"{_identifier(name)}_{_identifier(field)}".upper()
+            mask  = ((1 << size) - 1) << lsb
+            lines.append(f"{ident}_MASK = 0x{mask:08x}")
+            lines.append(f"{ident}_OFFSET = {lsb}")
+    lines.append("")
+    lines.append("")
+
+    lines.append(f"class {class_name}(RegisterMap):")
+    lines.append("    registers = (")
+    for name, reg in registers:
+        field_list = ", ".join(f"Field({field!r}, {lsb}, {size})" for field, lsb, size in reg_fields[name])
+        lines.append(f"        Register({name!r}, 0x{reg['addr']:08x}, size={reg['size']}, "
+                     f"access={reg['type']!r},{' cacheable=True,' if name in cacheable else ''}")
+        lines.append(f"                 fields=({field_list},)),")
+    lines.append("    )")
+    lines.append("    groups = {")
+    for base in sorted(bases, key=lambda b: bases[b]):
+        members = [name for name, _ in registers if _group_of(name, bases) == base]
+        lines.append(f"        {base!r}: {tuple(members)!r},")
+    lines.append("    }")
+    return "\n".join(lines) + "\n"
+
+
+def register_map_class(csr, fields=None, class_name="Registers"):
+    """The RegisterMap subclass generate() would write, built in memory."""
+    from commonLib.csrAccess import Field, Register, RegisterMap
+
+    fields     = fields or {}
+    registers  = sorted(csr["csr_registers"].items(), key=lambda item: item[1]["addr"])
+    bases      = csr.get("csr_bases", {})
+    reg_fields = _register_fields(registers, bases, fields)
+    return type(class_name, (RegisterMap,), {
+        "registers": tuple(Register(name, reg["addr"], size=reg["size"], access=reg["type"],
+                                    fields=tuple(Field(*f) for f in reg_fields[name]))
+                           for name, reg in registers),
+        "groups":    {base: tuple(name for name, _ in registers if _group_of(name, bases) == base)
+                      for base in sorted(bases, key=lambda b: bases[b])},
+    })
+
+
+def write_register_map(csr_path, output, class_name="Registers", svd_path=None, soc=None):
+    """Generate `output` from a Builder export; the file is only rewritten when it changes.
+
+    soc : the SoC just built, to mark its cacheable registers (cacheable_registers())
+    """
+    fields    = load_svd_fields(svd_path) if svd_path and os.path.exists(svd_path) else None
+    cacheable = cacheable_registers(soc) if soc is not None else ()
+    root      = os.path.relpath(REPO_ROOT, os.path.dirname(os.path.abspath(output))).replace(os.sep, "/")
+    code      = generate(load_csr(csr_path), fields, class_name, os.path.basename(csr_path), cacheable, root)
+    if os.path.exists(output):
+        with open(output) as f:
+            if f.read() == code:
+                return False
+    with open(output, "w") as f:
+        f.write(code)
+    print(f"Register map written to {output}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a Python register map from csr.json / csr.csv")
+    parser.add_argument("csr",         help="csr.json or csr.csv written by the Builder")
+    parser.add_argument("--svd",       help="csr.svd, for the register fields")
+    parser.add_argument("--class",     dest="class_name", default="Registers", help="Generated class name")
+    parser.add_argument("-o", "--output", required=True, help="Python module to write")
+    args = parser.parse_args()
+    write_register_map(args.csr, args.output, args.class_name, args.svd)
+
+
+if __name__ == "__main__":
+    main()
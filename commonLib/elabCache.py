@@ -0,0 +1,109 @@
+"""
+Elaboration cache for Migen / LiteX designs.
+
+Every build re-imports LiteX, re-elaborates Top (SoCMini, UART bridge, CSR
+banks), converts it to Verilog and runs the toolchain, even when nothing has
+changed since the last run. The cache identifies a design by a key over
+
+  - the Python sources of every module of this repository loaded so far
+    (the build or testbench script, commonLib, imported design modules),
+  - extra HDL files (Instance() black boxes such as hdl/crc.vhdl),
+  - the installed Migen / LiteX versions,
+  - the parameters the design is built with (command line options, ...),
+
+and skips elaboration, Verilog generation and the toolchain run when the key
+of the last successful build is unchanged and its outputs still exist:
+
+    build_cached("build", lambda: Builder(Top(platform), ...).build(),
+                 params=vars(args), outputs=[bitstream], sources=["hdl/crc.vhdl"])
+
+run_verilator() keys its compiled simulation models the same way (see
+commonLib/verilatorSim.py). The Migen Python simulator needs the live Module
+objects, so run_simulation() testbenches still elaborate on every run.
+
+Repo modules imported only after the key is taken (e.g. inside a function)
+are not covered; list their files in `sources`.
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+# Modules below this directory belong to the design
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Key of the last successful build, written into the build directory
+STAMP_NAME = ".elab_key"
+
+
+def _tool_versions():
+    import importlib.metadata       # Slow to import; only needed once a key is taken
+    versions = {}
+    for dist in ("migen", "litex", "litex-boards"):
+        try:
+            versions[dist] = importlib.metadata.version(dist)
+        except importlib.metadata.PackageNotFoundError:
+            versions[dist] = None
+    return versions
+
+
+def repo_modules():
+    """Source files of the loaded modules that belong to this repository."""
+    files = set()
+    for module in list(sys.modules.values()):
+        filename = getattr(module, "__file__", None)
+        if filename and filename.endswith(".py"):
+            filename = os.path.abspath(filename)
+            if filename.startswith(REPO_ROOT + os.sep):
+                files.add(filename)
+    return sorted(files)
+
+
+def design_key(params=None, sources=()):
+    """Hex digest identifying a design: repo sources + HDL `sources` + tool versions + `params`.
+
+    `params` must have a stable repr() (dicts, tuples, strings, numbers).
+    """
+    h = hashlib.sha256()
+    for filename in repo_modules() + sorted(os.path.abspath(s) for s in sources):
+        h.update(os.path.relpath(filename, REPO_ROOT).encode() + b"\0")
+        with open(filename, "rb") as f:
+            h.update(f.read())
+        h.update(b"\0")
+    h.update(repr(sorted(_tool_versions().items())).encode())
+    h.update(repr(params).encode())
+    return h.hexdigest()[:16]
+
+
+def build_cached(build_dir, build, params=None, outputs=(), sources=(), force=False):
+    """Run `build()` unless `build_dir` already holds the outputs of the same design.
+
+    build   : callable elaborating and building the design (Top(...), Builder.build(), ...)
+    outputs : files the build produces; the cache only hits when all of them exist
+    force   : always build (--rebuild)
+    Returns True when `build()` ran, False on a cache hit.
+    """
+    key   = design_key(params, sources)
+    stamp = os.path.join(build_dir, STAMP_NAME)
+    if not force and os.path.exists(stamp) and all(os.path.exists(o) for o in outputs):
+        with open(stamp) as f:
+            if json.load(f).get("key") == key:
+                print(f"Design unchanged (key {key}), reusing {build_dir}")
+                return False
+
+    # A failed build must not leave the previous key next to half-written outputs
+    if os.path.exists(stamp):
+        os.remove(stamp)
+    build()
+
+    os.makedirs(build_dir, exist_ok=True)
+    with open(stamp, "w") as f:
+        json.dump({"key": key, "params": repr(params), "versions": _tool_versions()}, f, indent=2)
+    return True
+
+
+def add_cache_arguments(parser):
+    """--rebuild option for a build script."""
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Elaborate and build even when the design is unchanged since the last build")
@@ -0,0 +1,123 @@
+"""
+Host side of the input event FIFO (commonLib/eventFifo.py).
+
+Instead of polling an input register, the host reads the FIFO level and
+then exactly that many entries in bursts through the UART bridge; an idle
+input costs one register read per drain, a burst of edges a few bursts:
+
+    litex_server --uart --uart-port=/dev/ttyACM0 &
+    python -m commonLib.eventDrain 02wishBoneMasterAndPerrial/build/csr.json --follow 0.2
+
+Each event is printed with its time since the first event (in µs, at the
+build's sys_clk frequency), the inputs that changed and the input state.
+The 32-bit timestamps are unwrapped from event to event, so a gap of more
+than one wrap (7 minutes at 10 MHz) between two events is shortened.
+
+The transfer helpers are plain functions of the data so the testbench can
+run them against the simulated FIFO: read_plan() lists the bursts,
+decode() turns the words into events, unwrap() makes the times monotonic.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+
+from commonLib.laCapture import MAX_BURST
+
+# Word 1 of an entry: valid bit, input state in the low half, changed inputs in the high half
+VALID = 1 << 31
+ENTRY_WORDS = 2
+
+Event = namedtuple("Event", "time state changed")
+
+
+def read_plan(base, level):
+    """Bursts (byte address, words) reading `level` entries: whole entries, at most MAX_BURST words."""
+    words = ENTRY_WORDS * level
+    step  = MAX_BURST - MAX_BURST % ENTRY_WORDS
+    return [(base, min(step, words - i)) for i in range(0, words, step)]
+
+
+def decode(words):
+    """[Event] from FIFO words; entries without the valid bit (empty reads) are dropped."""
+    events = []
+    for i in range(0, len(words) - 1, ENTRY_WORDS):
+        stamp, info = words[i], words[i + 1]
+        if info & VALID:
+            events.append(Event(stamp, info & 0x7FFF, (info >> 16) & 0x7FFF))
+    return events
+
+
+def unwrap(events, last=None):
+    """Events with monotonic times: each 32-bit timestamp taken after the previous one.
+
+    last : unwrapped time of the event before these (None starts from the first)
+    """
+    out = []
+    for e in events:
+        t = e.time if last is None else last + ((e.time - last) & 0xFFFFFFFF)
+        out.append(e._replace(time=t))
+        last = t
+    return out
+
+
+# Board access ------------------------------------------------------------------
+
+def drain(client, regs, base, name="ev"):
+    """Read everything in the FIFO now: [Event] (raw 32-bit times), oldest first."""
+    level = getattr(regs, f"{name}_level").read()
+    words = []
+    for addr, length in read_plan(base, level):
+        words += client.read(addr, length)
+    return decode(words)
+
+
+def main():
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from commonLib.csrGen import load_csr, register_map_class
+
+    parser = argparse.ArgumentParser(description="Drain the input event FIFO")
+    parser.add_argument("csr",      help="csr.json of the build on the board")
+    parser.add_argument("--name",   default="ev", help="CSR / memory region name of the event FIFO")
+    parser.add_argument("--follow", type=float, metavar="SECONDS",
+                        help="Keep draining at this interval until Ctrl-C")
+    parser.add_argument("--clear",  action="store_true", help="Empty the FIFO and zero the counters first")
+    parser.add_argument("--port",   type=int, default=1234, help="litex_server port")
+    args = parser.parse_args()
+
+    csr      = load_csr(args.csr)
+    clk_freq = int(csr.get("constants", {}).get("config_clock_frequency", 10_000_000))
+    base     = csr["memories"][args.name]["base"]
+
+    from litex import RemoteClient
+
+    client = RemoteClient(port=args.port)
+    client.open()
+    try:
+        regs = register_map_class(csr, class_name="EvRegs")(client)
+        reg  = lambda r: getattr(regs, f"{args.name}_{r}")
+        if args.clear:
+            reg("clear").write(1)
+        first = last = None
+        try:
+            while True:
+                for e in unwrap(drain(client, regs, base, args.name), last):
+                    first = e.time if first is None else first
+                    last  = e.time
+                    print(f"{(e.time - first) * 1e6 / clk_freq:14.1f} us  "
+                          f"changed 0x{e.changed:04x}  state 0x{e.state:04x}")
+                if not args.follow:
+                    break
+                time.sleep(args.follow)
+        except KeyboardInterrupt:
+            pass
+        print(f"events {reg('events').read()}, overflow {reg('overflow').read()}, "
+              f"max level {reg('max_level').read()}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Input event capture: edges on a set of inputs, timestamped in sys_clk
+cycles, queued in a block-RAM FIFO that the host drains with burst reads.
+
+    ev = EventFifo(platform.request("user_btn_n", 0), depth=512)
+
+Polling an input register over the bridge costs a round trip per sample
+and misses anything shorter than the polling period. Here every edge, down
+to a one-cycle pulse, becomes one FIFO entry; the host reads `level` and
+then exactly that many entries in one burst, so the traffic follows the
+activity on the inputs instead of the polling rate.
+
+Inputs go through a two-flop synchroniser; an edge is recorded when an
+input changes in a direction enabled in `rise` / `fall`. Inputs that
+change in the same cycle share one entry. An entry is two 32-bit words:
+
+  word 0   timestamp: free-running sys_clk cycle counter (wraps at 2**32),
+           the same two synchroniser cycles after every edge
+  word 1   bits [n-1:0] input state after the edge, bits [16+n-1:16] inputs
+           that changed, bit 31 set (reads of an empty FIFO return 0)
+
+The FIFO is read through a bus window: every read anywhere in it returns
+the next word, so incrementing and fixed-address bursts both work; an
+entry leaves the FIFO with the read of its second word.
+
+CSRs:
+
+  rise / fall   inputs whose rising / falling edges are recorded (all after reset)
+  level         entries in the FIFO
+  max_level     highest level since the last clear
+  events        entries recorded since the last clear
+  overflow      edges dropped because the FIFO was full
+  time          the timestamp counter now
+  clear         any write empties the FIFO and zeroes the counters
+
+add_event_fifo() adds one to a SoC (CSRs + the bus window) and
+commonLib/eventDrain.py drains and decodes it.
+"""
+
+from migen import *
+from migen.genlib.cdc import MultiReg
+from migen.genlib.fifo import SyncFIFOBuffered
+from litex.soc.interconnect import wishbone
+from litex.soc.interconnect.csr import AutoCSR, CSR, CSRStatus, CSRStorage
+
+# Inputs per EventFifo: state and changed masks share word 1 with the valid bit
+MAX_INPUTS = 15
+
+# Bus window: any word in it reads the FIFO, large enough for a 255-word bridge burst
+WINDOW_SIZE = 0x400
+
+
+# Create:
+#+----------------------------------------------+
+#|   EventFifo (AutoCSR + bus slave)            |
+#|     inputs -> MultiReg -> edge detect        |
+#|     (timestamp, state, changed)              |
+#|       -> SyncFIFOBuffered (BRAM)             |
+#|       -> bus window, two words per entry     |
+#+----------------------------------------------+
+class EventFifo(Module, AutoCSR):
+    """Timestamped edge events of `inputs` in a FIFO of `depth` entries.
+
+    inputs : Signal of 1..MAX_INPUTS bits (asynchronous to sys is fine)
+    depth  : FIFO entries (power of two; the output register holds one more)
+
+    `bus` is a Wishbone slave of `size` bytes; reads return the FIFO words,
+    writes are acknowledged and ignored.
+    """
+
+    def __init__(self, inputs, depth=512):
+        n = len(inputs)
+        if not 1 <= n <= MAX_INPUTS:
+            raise ValueError(f"EventFifo: {n} inputs, at most {MAX_INPUTS}")
+        if depth & (depth - 1):
+            raise ValueError(f"EventFifo depth {depth} is not a power of two")
+        self.inputs = n
+        self.depth  = depth
+        self.size   = WINDOW_SIZE
+        self.bus    = bus = wishbone.Interface(data_width=32, adr_width=30)
+
+        level_bits = bits_for(depth + 1)
+
+        self.rise      = CSRStorage(n, reset=2**n - 1, name="rise", description="Inputs whose rising edges are recorded")
+        self.fall      = CSRStorage(n, reset=2**n - 1, name="fall", description="Inputs whose falling edges are recorded")
+        self.level     = CSRStatus(level_bits, name="level", description="Entries in the FIFO")
+        self.max_level = CSRStatus(level_bits, name="max_level", description="Highest level since the last clear")
+        self.events    = CSRStatus(32, name="events", description="Entries recorded since the last clear")
+        self.overflow  = CSRStatus(32, name="overflow", description="Edges dropped on a full FIFO")
+        self.time      = CSRStatus(32, name="time", description="Timestamp counter")
+        self.clear     = CSR(1, name="clear")      # Any write empties the FIFO and zeroes the counters
+
+        # # #
+
+        now     = Signal(32)
+        state   = Signal(n)
+        prev    = Signal(n)
+        changed = Signal(n)
+        self.specials += MultiReg(inputs, state)
+        self.sync += [
+            now.eq(now + 1),
+            prev.eq(state),
+        ]
+        self.comb += changed.eq((state ^ prev) & ((state & self.rise.storage) | (~state & self.fall.storage)))
+
+        fifo = ResetInserter()(SyncFIFOBuffered(64, depth))
+        self.submodules.fifo = fifo
+        events   = Signal(32)
+        overflow = Signal(32)
+        high     = Signal(level_bits)
+        word1    = Signal(32)
+        self.comb += [
+            word1[:n].eq(state),
+            word1[16:16 + n].eq(changed),
+            word1[31].eq(1),
+            fifo.reset.eq(self.clear.re),
+            fifo.din.eq(Cat(now, word1)),
+            fifo.we.eq((changed != 0) & ~self.clear.re),
+        ]
+        self.sync += If(self.clear.re,
+            events.eq(0), overflow.eq(0), high.eq(0),
+        ).Else(
+            If(fifo.we,
+                If(fifo.writable, events.eq(events + 1)).Else(overflow.eq(overflow + 1)),
+            ),
+            If(fifo.level > high, high.eq(fifo.level)),
+        )
+
+        self.comb += [
+            self.level.status.eq(fifo.level),
+            self.max_level.status.eq(high),
+            self.events.status.eq(events),
+            self.overflow.status.eq(overflow),
+            self.time.status.eq(now),
+        ]
+
+        # Bus window: word 0 / word 1 of the head entry in turn; pop after word 1
+        second = Signal()
+        read   = Signal()
+        self.comb += [
+            read.eq(bus.cyc & bus.stb & ~bus.we & bus.ack),
+            bus.dat_r.eq(Mux(fifo.readable, Mux(second, fifo.dout[32:], fifo.dout[:32]), 0)),
+            fifo.re.eq(read & second & fifo.readable),
+        ]
+        self.sync += [
+            bus.ack.eq(bus.cyc & bus.stb & ~bus.ack),
+            If(self.clear.re,
+                second.eq(0),
+            ).Elif(read & fifo.readable,
+                second.eq(~second),
+            ),
+        ]
+
+
+def add_event_fifo(soc, name, inputs, origin, depth=512):
+    """Add an EventFifo as CSR peripheral `name` with its read window at byte address `origin`.
+
+    Call before add_guarded_master() so the window is part of the bridge
+    decoder table.
+    """
+    # litex.soc.integration.soc pulls in every CPU wrapper; only SoC builds need it
+    from litex.soc.integration.soc import SoCRegion
+
+    ev = EventFifo(inputs, depth)
+    setattr(soc.submodules, name, ev)
+    soc.add_csr(name, use_loc_if_exists=True)
+    soc.bus.add_slave(name=name, slave=ev.bus, region=SoCRegion(origin=origin, size=ev.size, cached=False))
+    return ev
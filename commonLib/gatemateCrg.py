@@ -0,0 +1,156 @@
+"""
+Clock / reset generator for the SoCMini designs on the GateMate A1 EVB.
+
+The board oscillator (clk0) runs at 10 MHz. GateMateCRG drives the sys clock
+domain from it either directly (sys_clk_freq == OSC_FREQ) or through the
+CCGM1A1 PLL (CC_PLL, litex.soc.cores.clock.colognechip.GateMatePLL):
+
+    self.crg = GateMateCRG(platform, sys_clk_freq=40e6)
+    SoCMini.__init__(self, platform, clk_freq=self.crg.sys_clk_freq, ...)
+
+Everything clocked from sys then follows sys_clk_freq: the SoC's
+CONFIG_CLOCK_FREQUENCY (csr.json), the UART bridge's baud phase accumulator
+(pass clk_freq=crg.sys_clk_freq) and the period constraint on the sys clock,
+which the patched CologneChip toolchain (litexPatch/colognechip.py) hands to
+nextpnr as its target frequency.
+
+Reset sequencing (ResetSequencer): sys stays in reset until the PLL is
+locked, then for `reset_cycles` more cycles; a request on `rst` (the SoC
+controller's soc_rst, or the user button with with_reset_button=True)
+restarts the count. Only the button resets the PLL itself, so a software
+reset never stops the clock.
+
+add_domain() adds further clock domains (e.g. a fast CRC32 datapath), each
+from its own CC_PLL (the CCGM1A1 has four; one PLL's outputs only run at one
+or two times the same frequency), reset together with sys and constrained
+on their own period.
+"""
+
+from migen import *
+from migen.genlib.resetsync import AsyncResetSynchronizer
+
+# clk0 of the GateMate A1 EVB
+OSC_FREQ = int(10e6)
+
+# Highest PLL output per CC_PLL performance mode (core supply), as in GateMatePLL
+PLL_MAX_FREQ = {
+    "lowpower": 250e6,
+    "economy":  312.5e6,
+    "speed":    416.75e6,
+}
+
+
+def check_sys_clk_freq(freq, perf_mode="economy"):
+    """Raise ValueError unless the PLL can produce `freq` (sys or add_domain()) in `perf_mode`."""
+    if perf_mode not in PLL_MAX_FREQ:
+        raise ValueError(f"perf_mode '{perf_mode}': use one of {', '.join(PLL_MAX_FREQ)}")
+    if not 0 < freq <= PLL_MAX_FREQ[perf_mode]:
+        raise ValueError(f"{freq / 1e6:g} MHz is outside "
+                         f"0..{PLL_MAX_FREQ[perf_mode] / 1e6:g} MHz ({perf_mode})")
+
+
+# Create:
+#+----------------------------------------------+
+#|   ResetSequencer                             |
+#|     - reset until `ready`, then N cycles     |
+#|     - `request` restarts the count           |
+#+----------------------------------------------+
+class ResetSequencer(Module):
+    """Hold `reset` while `ready` is low and for `cycles` cycles after it rises.
+
+    Runs in a reset-less domain (`domain`) on the clock it sequences, so it
+    counts through its own output. `request` restarts the count.
+    """
+
+    def __init__(self, ready, request, cycles=64, domain="por"):
+        self.reset = Signal()
+
+        count = Signal(max=cycles + 1, reset=cycles)
+        sync  = getattr(self.sync, domain)
+        sync += [
+            If(~ready | request,
+                count.eq(cycles),
+            ).Elif(count != 0,
+                count.eq(count - 1),
+            ),
+        ]
+        self.comb += self.reset.eq(count != 0)
+
+
+# Create:
+#+----------------------------------------------+
+#|   GateMateCRG                                |
+#|     clk0 (10 MHz) -> [CC_PLL] -> sys         |
+#|     locked + rst -> ResetSequencer -> sys rst|
+#+----------------------------------------------+
+class GateMateCRG(Module):
+    """sys clock domain at `sys_clk_freq`, from clk0 directly or through the PLL.
+
+    perf_mode         : CC_PLL performance mode ("lowpower", "economy", "speed"),
+                        must match the board's core supply; bounds sys_clk_freq
+    reset_cycles      : sys cycles held in reset after the PLL locks
+    with_reset_button : user_btn_n resets the PLL and the SoC
+
+    `rst` is connected to the SoC controller's soc_rst by LiteX (ctrl_reset).
+    """
+
+    def __init__(self, platform, sys_clk_freq=OSC_FREQ, perf_mode="economy", reset_cycles=64,
+                 with_reset_button=False):
+        check_sys_clk_freq(sys_clk_freq, perf_mode)
+        self.sys_clk_freq = int(sys_clk_freq)
+        self.rst          = Signal()
+        self.clock_domains.cd_sys = ClockDomain()
+        self.clock_domains.cd_por = ClockDomain(reset_less=True)
+
+        # # #
+
+        self._platform  = platform
+        self._perf_mode = perf_mode
+        self._clk0      = clk0 = platform.request("clk0")
+        self._pll_reset = pll_reset = Signal()
+        if with_reset_button:
+            self.comb += pll_reset.eq(~platform.request("user_btn_n"))
+
+        if self.sys_clk_freq == OSC_FREQ:
+            # No PLL: clk0 is sys, and its platform period constraint applies
+            self.comb += self.cd_sys.clk.eq(clk0)
+            locked = ~pll_reset
+        else:
+            # Imported here: only PLL builds need the LiteX clocking helpers
+            from litex.soc.cores.clock.colognechip import GateMatePLL
+
+            self.submodules.pll = pll = GateMatePLL(perf_mode=perf_mode)
+            self.comb += pll.reset.eq(pll_reset)
+            pll.register_clkin(clk0, OSC_FREQ)
+            pll.create_clkout(self.cd_sys, self.sys_clk_freq, with_reset=False)
+            platform.add_period_constraint(self.cd_sys.clk, 1e9 / self.sys_clk_freq)
+            locked = pll.locked
+
+        self.comb += self.cd_por.clk.eq(self.cd_sys.clk)
+        self.submodules.sequencer = ResetSequencer(locked, self.rst | pll_reset, reset_cycles)
+        self.specials += AsyncResetSynchronizer(self.cd_sys, self.sequencer.reset)
+
+    def add_domain(self, name, freq):
+        """Add clock domain `name` at `freq`, from clk0 directly or through its own PLL.
+
+        Held in reset while its PLL is unlocked and whenever sys is being
+        reset, so logic crossing between the two domains restarts together.
+        """
+        check_sys_clk_freq(freq, self._perf_mode)
+        cd = ClockDomain(name)
+        setattr(self.clock_domains, f"cd_{name}", cd)
+        if int(freq) == OSC_FREQ:
+            self.comb += cd.clk.eq(self._clk0)
+            reset = self.sequencer.reset
+        else:
+            from litex.soc.cores.clock.colognechip import GateMatePLL
+
+            pll = GateMatePLL(perf_mode=self._perf_mode)
+            setattr(self.submodules, f"pll_{name}", pll)
+            self.comb += pll.reset.eq(self._pll_reset)
+            pll.register_clkin(self._clk0, OSC_FREQ)
+            pll.create_clkout(cd, int(freq), with_reset=False)
+            self._platform.add_period_constraint(cd.clk, 1e9 / int(freq))
+            reset = ~pll.locked | self.sequencer.reset
+        self.specials += AsyncResetSynchronizer(cd, reset)
+        return cd
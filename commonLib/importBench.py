@@ -0,0 +1,124 @@
+"""
+Import-time benchmark for the example entry points.
+
+Host scripts and testbenches only need the address maps and the peripheral
+classes; importing a SoC build module instead drags in SoCMini (and with it
+every LiteX CPU wrapper), Builder, the board platform and the toolchain.
+measure_import() times one import in a fresh interpreter, so nothing is
+served from modules loaded earlier, and records which modules it loaded:
+
+    timing = measure_import("ledMap", os.path.dirname(__file__))
+    timing.seconds                          # best of `repeat` runs
+    loaded(timing.modules, SOC_MODULES)     # SoC build modules it pulled in
+
+The testbenches check with it that their imports stay clear of the SoC
+build stack (import_modules test case). Wall-clock budgets do not belong in
+the regression suite, which runs its cases in parallel; they are checked
+here instead, on an otherwise idle machine.
+
+Command line, from the repository root:
+    python -m commonLib.importBench 02wishBoneMasterAndPerrial:ledMap 03wishBoneCsrHdl:crc32Map ...
+    python -m commonLib.importBench --budgets       # every module in BUDGETS, exit status 1 if one is over
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import namedtuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules only a SoC build needs (module name prefixes)
+SOC_MODULES = (
+    "litex.soc.integration.soc",
+    "litex.soc.integration.soc_core",
+    "litex.soc.integration.builder",
+    "litex.soc.cores.cpu",
+    "litex.build.colognechip",       # Toolchain (litex.build.io etc. come with the interconnect)
+    "litex_boards",
+)
+
+# Start-up budgets of the modules host scripts, testbenches and the builds import
+# (directory, module, seconds)
+BUDGETS = [
+    ("02wishBoneMasterAndPerrial", "ledMap",                   0.02),
+    ("02wishBoneMasterAndPerrial", "ledRegs",                  0.02),
+    ("02wishBoneMasterAndPerrial", "ledPeripheral",            0.25),
+    ("02wishBoneMasterAndPerrial", "testBenchLedPeripheral",   0.5),
+    ("02wishBoneMasterAndPerrial", "uartWishBoneCrsLed",       1.0),
+    ("03wishBoneCsrHdl",           "crc32Map",                 0.02),
+    ("03wishBoneCsrHdl",           "crc32Regs",                0.02),
+    ("03wishBoneCsrHdl",           "crc32Peripheral",          0.25),
+    ("03wishBoneCsrHdl",           "testBenchCrc32Peripheral", 0.5),
+    ("03wishBoneCsrHdl",           "wishBoneCrsCrc32Vhdl",     1.0),
+]
+
+# module  : imported module name
+# seconds : wall time of the import statement (best run)
+# modules : names in sys.modules after the import
+ImportTiming = namedtuple("ImportTiming", "module seconds modules")
+
+
+def measure_import(module, path, repeat=3):
+    """Import `module` from directory `path` in `repeat` fresh interpreters."""
+    code = (
+        "import json, sys, time\n"
+        f"sys.path[:0] = [{os.path.abspath(path)!r}, {REPO_ROOT!r}]\n"
+        "t = time.perf_counter()\n"
+        f"import {module}\n"
+        "t = time.perf_counter() - t\n"
+        "print(json.dumps([t, sorted(sys.modules)]))\n"
+    )
+    best = None
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], cwd=path, check=True,
+                             capture_output=True, text=True).stdout
+        seconds, modules = json.loads(out.splitlines()[-1])     # Modules may print on import
+        if best is None or seconds < best.seconds:
+            best = ImportTiming(module, seconds, frozenset(modules))
+    return best
+
+
+def loaded(modules, prefixes):
+    """The names in `modules` that are, or are inside, one of `prefixes`."""
+    return sorted(m for m in modules if any(m == p or m.startswith(p + ".") for p in prefixes))
+
+
+def check_budgets(repeat=5):
+    """Time every module in BUDGETS; True if all are within budget."""
+    ok = True
+    print(f"{'module':<50} {'ms':>8} {'budget':>8}")
+    for path, module, budget in BUDGETS:
+        t = measure_import(module, os.path.join(REPO_ROOT, path), repeat)
+        within = t.seconds <= budget
+        ok &= within
+        print(f"{path + ':' + module:<50} {t.seconds*1e3:8.1f} {budget*1e3:8.0f}  {'ok' if within else 'OVER'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time module imports in fresh interpreters")
+    parser.add_argument("targets", nargs="*", metavar="DIR:MODULE",
+                        help="Module to import, with the directory it is imported from")
+    parser.add_argument("--budgets", action="store_true",
+                        help="Check the start-up budgets of the example modules (BUDGETS)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per module (best is reported)")
+    args = parser.parse_args()
+    if not args.targets and not args.budgets:
+        parser.error("give DIR:MODULE targets or --budgets")
+
+    if args.targets:
+        print(f"{'module':<40} {'ms':>8} {'modules':>8} {'SoC build modules':>18}")
+    for target in args.targets:
+        path, module = target.rsplit(":", 1)
+        t = measure_import(module, os.path.join(REPO_ROOT, path), args.repeat)
+        print(f"{target:<40} {t.seconds*1e3:8.1f} {len(t.modules):8} "
+              f"{len(loaded(t.modules, SOC_MODULES)):18}")
+    if args.budgets and not check_budgets(args.repeat):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Host side of the on-chip logic analyzer (commonLib/logicAnalyzer.py).
+
+Arms a capture through the UART bridge, waits for the trigger, reads the
+run-length compressed buffer back with burst reads and writes a VCD that
+opens next to the simulation waveforms (same layout as the Migen VCD writer:
+one scope, 10 time units per sys_clk cycle):
+
+    litex_server --uart --uart-port=/dev/ttyACM0 &
+    python -m commonLib.laCapture 03wishBoneCsrHdl/build/csr.json 03wishBoneCsrHdl/build/la.json \\
+        --trigger bridge_stb=1 --post 256 --vcd capture.vcd
+
+The build's la.json (written by the build scripts with --analyzer) lists the
+probes; csr.json gives the la_* registers and the buffer's bus region.
+
+Only the valid entries are read, oldest first, in bursts of at most 255
+words (the bridge's length field is one byte). The report compares the bytes
+moved with what the same window would cost uncompressed.
+
+The transfer helpers are plain functions of the data so the testbench can
+run them against the simulated buffer: read_plan() lists the bursts,
+decode() turns the words into runs, write_vcd() writes the waveform.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# status register bits (LogicAnalyzer.status)
+CAPTURING = 0x1
+TRIGGERED = 0x2
+DONE      = 0x4
+
+# Longest UARTWishboneBridge burst: the length field is one byte
+MAX_BURST = 255
+# Bytes on the UART per read burst: command, length, 32-bit address; then 4 per word
+BURST_HEADER_BYTES = 6
+
+
+def trigger_bits(desc, conditions):
+    """(mask, value) of the trigger register for {probe: value}; empty triggers at once."""
+    mask = value = 0
+    offset = 0
+    for name, width in desc["probes"]:
+        if name in conditions:
+            field  = (1 << width) - 1
+            mask  |= field << offset
+            value |= (conditions[name] & field) << offset
+        offset += width
+    unknown = set(conditions) - {name for name, _ in desc["probes"]}
+    if unknown:
+        raise ValueError(f"Unknown probe(s): {', '.join(sorted(unknown))}")
+    return mask, value
+
+
+def read_plan(desc, base, count, write_ptr):
+    """Bursts (byte address, words) reading the `count` valid entries, oldest first."""
+    depth, words = desc["depth"], desc["words"]
+    first  = 0 if count < depth else write_ptr          # Full ring: the oldest entry is the next to write
+    plan   = []
+    # Unwrap the ring into at most two contiguous spans, then cut each into bursts
+    spans  = [(first, min(count, depth - first)), (0, count - min(count, depth - first))]
+    for start, n in spans:
+        word, end = start * words, (start + n) * words
+        while word < end:
+            length = min(MAX_BURST - MAX_BURST % words, end - word)   # Whole entries per burst
+            plan.append((base + 4 * word, length))
+            word += length
+    return plan
+
+
+def decode(data, desc):
+    """[(sample, run length)] from the words read with read_plan()."""
+    words, width = desc["words"], sum(w for _, w in desc["probes"])
+    runs = []
+    for i in range(0, len(data), words):
+        entry = sum(word << (32 * k) for k, word in enumerate(data[i:i + words]))
+        runs.append((entry & ((1 << width) - 1), (entry >> width) + 1))
+    return runs
+
+
+def probe_values(desc, sample):
+    """{probe: value} of one sample."""
+    values, offset = {}, 0
+    for name, width in desc["probes"]:
+        values[name] = (sample >> offset) & ((1 << width) - 1)
+        offset += width
+    return values
+
+
+def expand(runs):
+    """One sample per cycle (for comparisons with a simulation)."""
+    return [sample for sample, run in runs for _ in range(run)]
+
+
+def transfer_stats(desc, runs, baud=115200):
+    """Bytes over the bridge for this capture vs. the same window uncompressed."""
+    words, width = desc["words"], sum(w for _, w in desc["probes"])
+    samples  = sum(run for _, run in runs)
+    per_raw  = (width + 31) // 32                           # Words per sample without run lengths
+
+    def cost(n_words):
+        bursts = -(-n_words // MAX_BURST)
+        return BURST_HEADER_BYTES * bursts + 4 * n_words
+
+    compressed, raw = cost(len(runs) * words), cost(samples * per_raw)
+    return {
+        "entries":     len(runs),
+        "samples":     samples,
+        "bytes":       compressed,
+        "raw_bytes":   raw,
+        "ratio":       raw / compressed if compressed else 0,
+        "seconds":     compressed * 10 / baud,             # 8N1: 10 bits per byte
+        "raw_seconds": raw * 10 / baud,
+    }
+
+
+def write_vcd(path, desc, runs, trigger=None, module_name="la", period=10):
+    """Write the runs as a VCD: one wire per probe plus `trigger`, `period` time units per cycle.
+
+    trigger : index in `runs` of the trigger entry (its first sample), or None
+    """
+    probes = desc["probes"] + [("trigger", 1)]
+    codes  = [chr(33 + i) for i in range(len(probes))]     # Single-character codes, like Migen
+
+    def value(code, width, v):
+        return f"b{v:0{width}b} {code}\n" if width > 1 else f"{v}{code}\n"
+
+    with open(path, "w") as out:
+        out.write(f"$scope module {module_name} $end\n")
+        for (name, width), code in zip(probes, codes):
+            out.write(f"$var wire {width} {code} {name} $end\n")
+        out.write("$enddefinitions $end\n$dumpvars\n")
+        for (name, width), code in zip(probes, codes):
+            out.write(value(code, width, 0))
+        out.write("$end\n")
+
+        last = {}
+        t    = 0
+        for i, (sample, run) in enumerate(runs):
+            fields = probe_values(desc, sample)
+            fields["trigger"] = int(i == trigger)
+            changes = [value(code, width, fields[name]) for (name, width), code in zip(probes, codes)
+                       if last.get(name) != fields[name]]
+            if changes:
+                out.write(f"#{t}\n" + "".join(changes))
+            last.update(fields)
+            # The trigger marker covers one cycle
+            if i == trigger and run > 1:
+                out.write(f"#{t + period}\n" + value(codes[-1], 1, 0))
+                last["trigger"] = 0
+            t += run * period
+        out.write(f"#{t}\n")
+
+
+# Board access ------------------------------------------------------------------
+
+def arm(regs, desc, trigger=None, post=None, name="la"):
+    """Program the trigger ({probe: value}) and post-trigger entries, then start a capture."""
+    mask, value = trigger_bits(desc, trigger or {})
+    getattr(regs, f"{name}_trigger_mask").write(mask)
+    getattr(regs, f"{name}_trigger_value").write(value)
+    getattr(regs, f"{name}_post_trigger").write(desc["depth"] // 2 if post is None else post)
+    getattr(regs, f"{name}_arm").write(1)
+
+
+def wait_done(regs, name="la", timeout=10.0, poll=0.05):
+    """Poll status until the capture is done; on timeout stop it (keeps what was captured)."""
+    deadline = time.monotonic() + timeout
+    while True:
+        status = getattr(regs, f"{name}_status").read()
+        if status & DONE:
+            return status
+        if time.monotonic() > deadline:
+            getattr(regs, f"{name}_stop").write(1)
+            return getattr(regs, f"{name}_status").read()
+        time.sleep(poll)
+
+
+def read_capture(client, regs, desc, base, name="la"):
+    """Read the finished capture: (runs, index of the trigger entry or None)."""
+    status    = getattr(regs, f"{name}_status").read()
+    count     = getattr(regs, f"{name}_count").read()
+    write_ptr = getattr(regs, f"{name}_write_ptr").read()
+    data = []
+    for addr, length in read_plan(desc, base, count, write_ptr):
+        data += client.read(addr, length)
+    trigger = None
+    if status & TRIGGERED:
+        first   = 0 if count < desc["depth"] else write_ptr
+        trigger = (getattr(regs, f"{name}_trigger_entry").read() - first) % desc["depth"]
+        trigger = trigger if trigger < count else None     # Overwritten (post_trigger > depth)
+    return decode(data, desc), trigger
+
+
+def main():
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    import json
+    from commonLib.csrGen import load_csr, register_map_class
+
+    parser = argparse.ArgumentParser(description="Capture with the on-chip logic analyzer")
+    parser.add_argument("csr",       help="csr.json of the build on the board")
+    parser.add_argument("desc",      help="la.json of the same build (probe list)")
+    parser.add_argument("--name",    default="la", help="CSR / memory region name of the analyzer")
+    parser.add_argument("--trigger", nargs="+", default=[], metavar="PROBE=VALUE",
+                        help="Trigger when all these probes match (default: at once)")
+    parser.add_argument("--post",    type=int, help="Entries to record from the trigger on (default depth / 2)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Seconds to wait for the trigger")
+    parser.add_argument("--vcd",     default="la_capture.vcd", help="Waveform to write")
+    parser.add_argument("--baud",    type=int, default=115200, help="Bridge baud rate (for the report)")
+    parser.add_argument("--port",    type=int, default=1234, help="litex_server port")
+    args = parser.parse_args()
+
+    with open(args.desc) as f:
+        desc = json.load(f)
+    try:
+        trigger = {k: int(v, 0) for k, v in (t.split("=", 1) for t in args.trigger)}
+        trigger_bits(desc, trigger)
+    except ValueError as e:
+        parser.error(f"--trigger: {e}")
+    csr  = load_csr(args.csr)
+    base = csr["memories"][args.name]["base"]
+
+    from litex import RemoteClient
+
+    client = RemoteClient(port=args.port)
+    client.open()
+    try:
+        regs = register_map_class(csr, class_name="LaRegs")(client)
+        arm(regs, desc, trigger, args.post, args.name)
+        status = wait_done(regs, args.name, args.timeout)
+        if not status & TRIGGERED:
+            print(f"No trigger within {args.timeout} s, writing the pre-trigger buffer")
+        runs, trig = read_capture(client, regs, desc, base, args.name)
+    finally:
+        client.close()
+
+    write_vcd(args.vcd, desc, runs, trig)
+    stats = transfer_stats(desc, runs, args.baud)
+    print(f"{stats['samples']} cycles in {stats['entries']} entries -> {args.vcd}")
+    print(f"read {stats['bytes']} bytes ({stats['seconds']:.2f} s at {args.baud} baud), "
+          f"uncompressed {stats['raw_bytes']} bytes ({stats['raw_seconds']:.2f} s): "
+          f"{stats['ratio']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
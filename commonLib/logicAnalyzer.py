@@ -0,0 +1,211 @@
+"""
+On-chip logic analyzer: trigger, run-length compressed ring buffer in block
+RAM, read back over the Wishbone bus (UARTWishboneBridge burst reads).
+
+    la = LogicAnalyzer([("bridge_cyc", bus.cyc), ("bridge_ack", bus.ack),
+                        ("crc_byte", crc32.data.r[:8])], depth=1024)
+
+Every sys_clk cycle while capturing, the probes are sampled as one word.
+Runs of identical samples are stored as one entry (value, run length), so a
+mostly idle bus costs a few entries instead of thousands of samples, and the
+host transfers correspondingly fewer words at 115200 baud.
+
+Capture sequence (CSRs):
+
+  trigger_mask / trigger_value   trigger when (sample & mask) == (value & mask);
+                                 mask 0 triggers on the first sample
+  post_trigger                   entries to record from the trigger on
+  arm                            any write starts a capture; entries before the
+                                 trigger fill the ring buffer, overwriting the oldest
+  stop                           any write ends the capture, storing the open run
+                                 (a probe that stays constant never ends its entry)
+  status                         bit 0 capturing, bit 1 triggered, bit 2 done
+  write_ptr / count / trigger_entry
+                                 ring position, valid entries, entry of the trigger
+
+Memory layout: entry i occupies `words` 32-bit words at byte offset
+4 × words × i, low word first; bits [width-1:0] hold the sample (probes
+concatenated, first probe in the LSBs), the bits above hold run length − 1.
+The trigger sample always starts a new entry, so its time is exact.
+
+add_logic_analyzer() adds one to a SoC (CSRs + a bus region) and
+commonLib/laCapture.py arms it, reads it back and writes a VCD.
+"""
+
+import json
+
+from migen import *
+from litex.soc.interconnect import wishbone
+from litex.soc.interconnect.csr import AutoCSR, CSR, CSRStatus, CSRStorage
+
+# Fewest run-length bits per entry; the rest of the entry's last word is also used
+MIN_RUN_BITS = 8
+
+
+def entry_layout(width):
+    """(words per entry, run-length bits) for samples of `width` bits."""
+    words = 1
+    while 32 * words < width + MIN_RUN_BITS:
+        words *= 2
+    return words, 32 * words - width
+
+
+# Create:
+#+----------------------------------------------+
+#|   LogicAnalyzer (AutoCSR + Wishbone slave)   |
+#|     - probes -> sample word                  |
+#|     - trigger: (sample & mask) == value      |
+#|     - RLE entries -> ring buffer (BRAM)      |
+#|     - bus: read-only view of the buffer      |
+#+----------------------------------------------+
+class LogicAnalyzer(Module, AutoCSR):
+    """Trigger + run-length compressed capture of `probes` into block RAM.
+
+    probes : list of (name, Signal / slice) pairs, first probe in the LSBs
+    depth  : ring buffer entries (power of two)
+
+    `bus` is a Wishbone slave of `size` bytes giving read access to the
+    buffer (writes are acknowledged and ignored); description() lists what
+    the host needs to decode it.
+    """
+
+    def __init__(self, probes, depth=1024):
+        if depth & (depth - 1):
+            raise ValueError(f"LogicAnalyzer depth {depth} is not a power of two")
+        self.probes = [(name, len(signal)) for name, signal in probes]
+        self.width  = width = sum(w for _, w in self.probes)
+        self.depth  = depth
+        self.words, self.run_bits = words, run_bits = entry_layout(width)
+        self.size   = 4 * words * depth
+        self.bus    = bus = wishbone.Interface(data_width=32, adr_width=30)
+
+        ptr_bits = log2_int(depth)
+
+        self.arm           = CSR(1, name="arm")      # Any write starts a capture
+        self.stop          = CSR(1, name="stop")     # Any write ends it
+        self.trigger_mask  = CSRStorage(width, name="trigger_mask",  description="Sample bits the trigger compares")
+        self.trigger_value = CSRStorage(width, name="trigger_value", description="Trigger value of the masked bits")
+        self.post_trigger  = CSRStorage(ptr_bits + 1, reset=depth // 2, name="post_trigger",
+                                        description="Entries recorded from the trigger on (<= depth)")
+        self.status        = CSRStatus(3, name="status", description="bit 0 capturing, bit 1 triggered, bit 2 done")
+        self.write_ptr     = CSRStatus(ptr_bits, name="write_ptr", description="Entry written next")
+        self.count         = CSRStatus(ptr_bits + 1, name="count", description="Valid entries in the buffer")
+        self.trigger_entry = CSRStatus(ptr_bits, name="trigger_entry", description="Entry starting at the trigger sample")
+
+        # # #
+
+        self.sample = sample = Signal(width)     # Probes of this cycle, as stored
+        self.comb += sample.eq(Cat(*[signal for _, signal in probes]))
+
+        capturing = Signal()
+        triggered = Signal()
+        done      = Signal()
+        is_open   = Signal()                # A run is being counted
+        run_value = Signal(width)
+        run_len   = Signal(run_bits)        # Run length − 1
+        post_left = Signal(ptr_bits + 1)
+        wr_ptr    = Signal(ptr_bits)
+        count     = Signal(ptr_bits + 1)
+        trig_at   = Signal(ptr_bits)
+
+        mask   = self.trigger_mask.storage
+        match  = (sample & mask) == (self.trigger_value.storage & mask)
+        trig   = Signal()
+        commit = Signal()                   # Write the open run to wr_ptr this cycle
+        self.comb += [
+            trig.eq(capturing & ~triggered & match),
+            commit.eq(capturing & is_open &
+                      (trig | self.stop.re | (sample != run_value) | (run_len == 2**run_bits - 1))),
+        ]
+
+        mem     = Memory(32 * words, depth)
+        wr_port = mem.get_port(write_capable=True)
+        rd_port = mem.get_port()
+        self.specials += mem, wr_port, rd_port
+        self.comb += [
+            wr_port.adr.eq(wr_ptr),
+            wr_port.dat_w.eq(Cat(run_value, run_len)),
+            wr_port.we.eq(commit),
+        ]
+
+        last = Signal()                     # This commit completes the post-trigger entries
+        self.comb += last.eq(triggered & (post_left <= 1))
+
+        self.sync += [
+            If(self.arm.re,
+                capturing.eq(1), triggered.eq(0), done.eq(0), is_open.eq(0),
+                wr_ptr.eq(0), count.eq(0),
+            ).Elif(capturing,
+                If(commit,
+                    wr_ptr.eq(wr_ptr + 1),
+                    If(count != depth, count.eq(count + 1)),
+                    If(triggered, post_left.eq(post_left - 1)),
+                    If(last,
+                        capturing.eq(0), done.eq(1),
+                    ),
+                ),
+                If(self.stop.re,
+                    capturing.eq(0), done.eq(1),
+                ),
+                # Open a new run with this sample, or extend the current one
+                If(~is_open | commit,
+                    is_open.eq(1), run_value.eq(sample), run_len.eq(0),
+                ).Else(
+                    run_len.eq(run_len + 1),
+                ),
+                If(trig,
+                    triggered.eq(1),
+                    post_left.eq(self.post_trigger.storage),
+                    trig_at.eq(Mux(is_open, wr_ptr + 1, wr_ptr)),
+                ),
+            ),
+        ]
+
+        self.comb += [
+            self.status.status.eq(Cat(capturing, triggered, done)),
+            self.write_ptr.status.eq(wr_ptr),
+            self.count.status.eq(count),
+            self.trigger_entry.status.eq(trig_at),
+        ]
+
+        # Read-only bus view: word k of entry i at word address words × i + k, one wait state
+        word_bits = log2_int(words)
+        word_sel  = Signal(max(word_bits, 1))
+        self.comb += rd_port.adr.eq(bus.adr[word_bits:word_bits + ptr_bits])
+        self.sync += [
+            bus.ack.eq(bus.cyc & bus.stb & ~bus.ack),
+            word_sel.eq(bus.adr[:word_bits] if word_bits else 0),
+        ]
+        self.comb += bus.dat_r.eq(Array(rd_port.dat_r[32 * k:32 * (k + 1)] for k in range(words))[word_sel]
+                                  if words > 1 else rd_port.dat_r)
+
+    def description(self):
+        """What the host needs to decode a capture (commonLib/laCapture.py)."""
+        return {
+            "probes":   [[name, width] for name, width in self.probes],
+            "depth":    self.depth,
+            "words":    self.words,
+            "run_bits": self.run_bits,
+        }
+
+
+def add_logic_analyzer(soc, name, probes, origin, depth=1024):
+    """Add a LogicAnalyzer as CSR peripheral `name` with its buffer at byte address `origin`.
+
+    Call before add_guarded_master() so the buffer region is part of the
+    bridge decoder table.
+    """
+    # litex.soc.integration.soc pulls in every CPU wrapper; only SoC builds need it
+    from litex.soc.integration.soc import SoCRegion
+
+    la = LogicAnalyzer(probes, depth)
+    setattr(soc.submodules, name, la)
+    soc.add_csr(name, use_loc_if_exists=True)
+    soc.bus.add_slave(name=name, slave=la.bus, region=SoCRegion(origin=origin, size=la.size, cached=False))
+    return la
+
+
+def write_description(la, path):
+    """Save la.description() next to csr.json, for commonLib/laCapture.py."""
+    with open(path, "w") as f:
+        json.dump(la.description(), f, indent=2)
@@ -0,0 +1,195 @@
+"""
+Asynchronous notifications over the UART bridge: the FPGA sends a short
+event frame when selected status bits change, instead of the host polling
+them with bridge reads.
+
+    self.submodules.notify = NotifyChannel([("button", btn), ("ev_pending", ev_pending)])
+    self.comb += [bridge.source.connect(notify.sink), notify.source.connect(phy.sink)]
+
+The channel is a tap on the bridge's transmit stream. It is off after reset,
+so litex_server keeps working unchanged. Once the host sets `enable`, the
+tap frames the stream like SLIP:
+
+  FRAME (0xC0)   starts an event frame: 9 payload bytes follow
+                   seq (1 byte), status (4 bytes, little-endian),
+                   changed (4 bytes, little-endian, bits changed since the last frame)
+  ESC   (0xDB)   a bridge reply byte or frame payload byte of 0xC0 / 0xDB
+                 is sent as 0xDB 0xDC / 0xDB 0xDD
+
+A frame can go out between any two reply bytes, so the host tells frames
+and replies apart without timing assumptions. It does need a client that
+decodes the stream (commonLib/notifyHost.py) instead of litex_server. Bit
+changes while a frame is waiting or being sent are merged into the next
+frame, so none are lost however fast the bits toggle; the frame rate is
+bounded by the UART. Frames and replies take turns: after a frame, a
+waiting reply byte goes out before the next frame, so a bit that toggles
+faster than a frame takes to send slows replies down (one frame per reply
+byte at most) but cannot starve them.
+
+CSRs:
+
+  enable   bit 0: frame the transmit stream and send event frames
+  mask     status bits whose changes send a frame (all after reset)
+  status   the status bits now
+  frames   event frames sent
+
+write_description() saves the bit layout for the host dispatcher.
+"""
+
+import json
+
+from migen import *
+from migen.genlib.cdc import MultiReg
+from litex.soc.interconnect import stream
+from litex.soc.interconnect.csr import AutoCSR, CSRStatus, CSRStorage
+
+FRAME      = 0xC0
+ESC        = 0xDB
+ESC_FRAME  = 0xDC
+ESC_ESC    = 0xDD
+PAYLOAD    = 9          # seq, status (4), changed (4)
+MAX_BITS   = 32
+
+
+# Create:
+#+----------------------------------------------+
+#|   NotifyChannel (AutoCSR, stream tap)        |
+#|     sources -> MultiReg -> change detect     |
+#|     sink (bridge TX) ──┬──► source (PHY)     |
+#|     event frame ───────┘   SLIP escaping     |
+#+----------------------------------------------+
+class NotifyChannel(Module, AutoCSR):
+    """Event frames on status changes, merged into the bridge transmit stream.
+
+    sources : list of (name, Signal) status bits, first in the LSBs, 32 bits in total at most
+    """
+
+    def __init__(self, sources):
+        self.sources = [(name, len(signal)) for name, signal in sources]
+        self.width   = width = sum(w for _, w in self.sources)
+        if not 1 <= width <= MAX_BITS:
+            raise ValueError(f"NotifyChannel: {width} status bits, 1..{MAX_BITS}")
+        self.sink   = sink   = stream.Endpoint([("data", 8)])
+        self.source = source = stream.Endpoint([("data", 8)])
+
+        self.enable = CSRStorage(1, name="enable", description="Frame the transmit stream and send event frames")
+        self.mask   = CSRStorage(width, reset=2**width - 1, name="mask",
+                                 description="Status bits whose changes send a frame")
+        self.status = CSRStatus(width, name="status", description="Status bits now")
+        self.frames = CSRStatus(32, name="frames", description="Event frames sent")
+
+        # # #
+
+        enable  = self.enable.storage
+        status  = Signal(width)
+        prev    = Signal(width)
+        changes = Signal(width)
+        pending = Signal(width)             # Changes not sent yet
+        self.specials += MultiReg(Cat(*[signal for _, signal in sources]), status)
+        self.comb += [
+            changes.eq((status ^ prev) & self.mask.storage),
+            self.status.status.eq(status),
+        ]
+
+        # Frame latched when it starts: status as of the changes it reports;
+        # seq is the low byte of the frame count
+        snap    = Signal(32)
+        changed = Signal(32)
+        frames  = Signal(32)
+        idx     = Signal(max=PAYLOAD)
+        start   = Signal()
+        done    = Signal()              # Last byte of a frame accepted
+        owed    = Signal()              # A frame went out: a waiting reply byte goes first
+        payload = Cat(frames[:8], snap, changed)
+        byte    = Signal(8)
+        self.comb += byte.eq(Array(payload[8 * i:8 * (i + 1)] for i in range(PAYLOAD))[idx])
+        self.comb += self.frames.status.eq(frames)
+
+        self.sync += [
+            prev.eq(status),
+            If(~enable,
+                pending.eq(0),
+            ).Else(
+                pending.eq(Mux(start, 0, pending) | changes),
+            ),
+            If(start,
+                snap.eq(prev),
+                changed.eq(pending),
+                frames.eq(frames + 1),
+            ),
+            If(done,
+                owed.eq(1),
+            ).Elif(sink.valid & sink.ready,
+                owed.eq(0),
+            ),
+        ]
+
+        special = lambda b: (b == FRAME) | (b == ESC)
+        escaped = lambda b: Mux(b == FRAME, ESC_FRAME, ESC_ESC)
+
+        # Between two bytes a pending frame goes first, unless the last thing sent was
+        # a frame and a reply byte is waiting (round-robin); with enable, reply bytes are escaped
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(enable & (pending != 0) & ~(owed & sink.valid),
+                start.eq(1),
+                NextValue(idx, 0),
+                NextState("EVENT"),
+            ).Elif(enable & sink.valid & special(sink.data),
+                source.valid.eq(1),
+                source.data.eq(ESC),
+                If(source.ready, NextState("REPLY-ESC")),
+            ).Else(
+                sink.connect(source),
+            ),
+        )
+        fsm.act("REPLY-ESC",                # Second byte of an escaped reply byte, then consume it
+            source.valid.eq(1),
+            source.data.eq(escaped(sink.data)),
+            If(source.ready,
+                sink.ready.eq(1),
+                NextState("IDLE"),
+            ),
+        )
+        fsm.act("EVENT",
+            source.valid.eq(1),
+            source.data.eq(FRAME),
+            If(source.ready, NextState("EVENT-BYTE")),
+        )
+        fsm.act("EVENT-BYTE",
+            source.valid.eq(1),
+            source.data.eq(Mux(special(byte), ESC, byte)),
+            If(source.ready,
+                If(special(byte),
+                    NextState("EVENT-ESC"),
+                ).Elif(idx == PAYLOAD - 1,
+                    done.eq(1),
+                    NextState("IDLE"),
+                ).Else(
+                    NextValue(idx, idx + 1),
+                ),
+            ),
+        )
+        fsm.act("EVENT-ESC",
+            source.valid.eq(1),
+            source.data.eq(escaped(byte)),
+            If(source.ready,
+                If(idx == PAYLOAD - 1,
+                    done.eq(1),
+                    NextState("IDLE"),
+                ).Else(
+                    NextValue(idx, idx + 1),
+                    NextState("EVENT-BYTE"),
+                ),
+            ),
+        )
+
+    def description(self):
+        """Status bit layout for the host dispatcher (commonLib/notifyHost.py)."""
+        return {"sources": [[name, width] for name, width in self.sources]}
+
+
+def write_description(notify, path):
+    """Save notify.description() next to csr.json, for commonLib/notifyHost.py."""
+    with open(path, "w") as f:
+        json.dump(notify.description(), f, indent=2)
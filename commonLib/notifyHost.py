@@ -0,0 +1,274 @@
+"""
+Host side of the notification channel (commonLib/notifyChannel.py): a
+bridge client that owns the serial port, separates event frames from the
+bridge replies and hands them to callbacks.
+
+    client = NotifyClient("/dev/ttyACM0", desc)        # desc: build/notify.json
+    client.open()                                      # also sets notify_enable
+    client.on("button", lambda name, value: print("button", value))
+    regs = LedRegs(client)                             # reads / writes as with RemoteClient
+    client.run(timeout=10.0)                           # deliver frames until the timeout
+
+With the channel enabled the FPGA frames its transmit stream, so the
+client talks to the UART itself instead of through litex_server. Frames
+arriving during a read are decoded on the way and delivered once the read
+has its reply, so callbacks may use the client themselves. Between reads,
+poll() / run() wait for frames. There is no spinning on status reads:
+the host blocks on the serial port until something changes.
+
+    python -m commonLib.notifyHost /dev/ttyACM0 02wishBoneMasterAndPerrial/build/csr.json \\
+        02wishBoneMasterAndPerrial/build/notify.json
+
+prints every notification until Ctrl-C. The decoding is plain Python with
+no serial port: Decoder turns received bytes into reply bytes and
+Notifications, Dispatcher maps them to callbacks.
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import namedtuple
+
+# Stream framing (notifyChannel.py)
+FRAME     = 0xC0
+ESC       = 0xDB
+ESC_FRAME = 0xDC
+ESC_ESC   = 0xDD
+PAYLOAD   = 9
+
+# Bridge commands (litex.tools.remote.comm_uart)
+CMD_WRITE_BURST_INCR = 0x01
+CMD_READ_BURST_INCR  = 0x02
+
+Notification = namedtuple("Notification", "seq status changed")
+
+
+# Create:
+#+----------------------------------------------+
+#|   Decoder                                    |
+#|     bytes -> reply bytes + Notifications     |
+#|     (SLIP-like unescaping, frame assembly)   |
+#+----------------------------------------------+
+class Decoder:
+    """Splits the framed transmit stream into reply bytes and Notifications."""
+
+    def __init__(self):
+        self.escaped = False
+        self.frame   = None             # Payload bytes of the frame being received
+
+    def feed(self, data):
+        """(reply bytes, [Notification]) from the next received bytes."""
+        reply, frames = bytearray(), []
+        for b in data:
+            if b == FRAME and not self.escaped:
+                self.frame = bytearray()
+                continue
+            if b == ESC and not self.escaped:
+                self.escaped = True
+                continue
+            if self.escaped:
+                b = FRAME if b == ESC_FRAME else ESC
+                self.escaped = False
+            if self.frame is None:
+                reply.append(b)
+                continue
+            self.frame.append(b)
+            if len(self.frame) == PAYLOAD:
+                f = self.frame
+                frames.append(Notification(f[0], int.from_bytes(f[1:5], "little"),
+                                           int.from_bytes(f[5:9], "little")))
+                self.frame = None
+        return bytes(reply), frames
+
+
+# Create:
+#+----------------------------------------------+
+#|   Dispatcher                                 |
+#|     Notification -> per-source callbacks     |
+#|     (name, value) for every changed source   |
+#+----------------------------------------------+
+class Dispatcher:
+    """Calls the callbacks of the sources whose bits a Notification reports as changed.
+
+    desc : notify.json contents ({"sources": [[name, width], ...]})
+    """
+
+    def __init__(self, desc):
+        self.fields = {}
+        offset = 0
+        for name, width in desc["sources"]:
+            self.fields[name] = (offset, width)
+            offset += width
+        self.callbacks = {}
+        self.any       = []
+        self.last_seq  = None
+        self.missed    = 0              # Frames lost in transit (sequence gaps)
+
+    def on(self, name, callback):
+        """callback(name, value) whenever source `name` changes."""
+        if name not in self.fields:
+            raise ValueError(f"Unknown notification source '{name}': {', '.join(self.fields)}")
+        self.callbacks.setdefault(name, []).append(callback)
+
+    def on_any(self, callback):
+        """callback(notification) for every frame."""
+        self.any.append(callback)
+
+    def value(self, status, name):
+        offset, width = self.fields[name]
+        return (status >> offset) & ((1 << width) - 1)
+
+    def dispatch(self, n):
+        if self.last_seq is not None:
+            self.missed += (n.seq - self.last_seq - 1) & 0xFF
+        self.last_seq = n.seq
+        for callback in self.any:
+            callback(n)
+        for name, (offset, width) in self.fields.items():
+            if (n.changed >> offset) & ((1 << width) - 1):
+                for callback in self.callbacks.get(name, ()):
+                    callback(name, self.value(n.status, name))
+
+
+# Create:
+#+----------------------------------------------+
+#|   NotifyClient                               |
+#|     read / write (bridge commands)           |
+#|     serial -> Decoder -> Dispatcher          |
+#+----------------------------------------------+
+class NotifyClient:
+    """UART bridge client with the notification channel enabled.
+
+    port   : serial device, or any object with read(n) / write(bytes) (e.g. a test double)
+    desc   : notify.json contents
+    enable : byte address of notify_enable (set on open, cleared on close), None to leave it
+    """
+
+    def __init__(self, port, desc, baudrate=115200, enable=None, timeout=0.05):
+        self.port       = port
+        self.baudrate   = baudrate
+        self.timeout    = timeout
+        self.enable     = enable
+        self.decoder    = Decoder()
+        self.dispatcher = Dispatcher(desc)
+        self.serial     = None
+        self.reply      = bytearray()   # Reply bytes received and not consumed yet
+        self.queued     = []            # Notifications waiting for the current read to finish
+
+    def on(self, name, callback):
+        self.dispatcher.on(name, callback)
+
+    def on_any(self, callback):
+        self.dispatcher.on_any(callback)
+
+    def open(self):
+        if isinstance(self.port, str):
+            import serial
+            self.serial = serial.Serial(self.port, self.baudrate, timeout=self.timeout)
+        else:
+            self.serial = self.port
+        if self.enable is not None:
+            # A write gets no reply: everything after it is framed
+            self.write(self.enable, 1)
+
+    def close(self):
+        if self.enable is not None:
+            self.write(self.enable, 0)
+            self.poll(self.timeout)     # Frames sent before the channel went off
+        if isinstance(self.port, str):
+            self.serial.close()
+        self.serial = None
+
+    # Client interface ----------------------------------------------------------
+
+    def read(self, addr, length=None, burst="incr"):
+        n = 1 if length is None else length
+        self.serial.write(bytes([CMD_READ_BURST_INCR, n]) + (addr // 4).to_bytes(4, "big"))
+        data = self._reply(4 * n)
+        self._deliver()
+        words = [int.from_bytes(data[4 * i:4 * i + 4], "big") for i in range(n)]
+        return words[0] if length is None else words
+
+    def write(self, addr, data, burst="incr"):
+        data = data if isinstance(data, list) else [data]
+        for offset in range(0, len(data), 8):
+            chunk = data[offset:offset + 8]
+            self.serial.write(bytes([CMD_WRITE_BURST_INCR, len(chunk)]) + (addr // 4 + offset).to_bytes(4, "big")
+                              + b"".join(value.to_bytes(4, "big") for value in chunk))
+
+    # Notifications -------------------------------------------------------------
+
+    def _receive(self):
+        data = self.serial.read(max(1, getattr(self.serial, "in_waiting", 0)))
+        reply, frames = self.decoder.feed(data)
+        self.reply  += reply
+        self.queued += frames
+        return bool(data)
+
+    def _reply(self, n):
+        idle = 0
+        while len(self.reply) < n:
+            if self._receive():
+                idle = 0
+            else:
+                idle += 1
+                if idle * self.timeout > 1.0:
+                    raise TimeoutError(f"Bridge reply: {len(self.reply)} of {n} bytes")
+        data, self.reply = bytes(self.reply[:n]), self.reply[n:]
+        return data
+
+    def _deliver(self):
+        queued, self.queued = self.queued, []
+        for n in queued:
+            self.dispatcher.dispatch(n)
+        return len(queued)
+
+    def poll(self, timeout=0.0):
+        """Deliver the frames received within `timeout` seconds (at least one serial read)."""
+        delivered = 0
+        for _ in range(max(1, int(timeout / self.timeout))):
+            self._receive()
+            delivered += self._deliver()
+        return delivered
+
+    def run(self, timeout=None):
+        """Deliver frames until `timeout` seconds have passed (forever with None)."""
+        import time
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            self.poll(self.timeout)
+
+
+def main():
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from commonLib.csrGen import load_csr
+
+    parser = argparse.ArgumentParser(description="Print the FPGA's notification frames")
+    parser.add_argument("port",       help="Serial port of the UART bridge (not shared with litex_server)")
+    parser.add_argument("csr",        help="csr.json of the build on the board")
+    parser.add_argument("desc",       help="notify.json of the same build")
+    parser.add_argument("--name",     default="notify", help="CSR name of the channel")
+    parser.add_argument("--baudrate", type=int, default=115200)
+    args = parser.parse_args()
+
+    with open(args.desc) as f:
+        desc = json.load(f)
+    csr    = load_csr(args.csr)
+    enable = csr["csr_registers"][f"{args.name}_enable"]["addr"]
+
+    client = NotifyClient(args.port, desc, args.baudrate, enable=enable)
+    client.on_any(lambda n: print(f"#{n.seq:3d}  status 0x{n.status:08x}  changed 0x{n.changed:08x}  "
+                                  + ", ".join(f"{name}={client.dispatcher.value(n.status, name)}"
+                                              for name, _ in desc["sources"])))
+    client.open()
+    try:
+        client.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Host side of the pattern sequencer (commonLib/patternSequencer.py).
+
+Uploads a table of (value, duration) entries through the UART bridge with
+burst writes, reads it back to verify it and starts playback; from then on
+the sequencer times every edge itself:
+
+    litex_server --uart --uart-port=/dev/ttyACM0 &
+    python -m commonLib.patternPlay 02wishBoneMasterAndPerrial/build/csr.json \\
+        1:100ms 0:100ms 1:100ms 0:700ms --loops 0
+
+A duration is a cycle count, or a time with the suffix s / ms / us converted
+at the build's sys_clk frequency (constant config_clock_frequency in csr.json).
+The same waveform written edge by edge costs one bridge round trip per edge
+and jitters with the host; uploaded it costs one burst of 2 words per entry.
+
+The helpers are plain functions of the data so the testbench can run them
+against the simulated sequencer: parse_entry() reads one entry,
+pattern_words() lays the table out as the bus sees it, upload_plan() splits
+it into bursts.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from commonLib.laCapture import MAX_BURST
+
+# status register bits (PatternSequencer.status)
+RUNNING = 0x1
+DONE    = 0x2
+
+# Bus words per table entry (patternSequencer.ENTRY_WORDS)
+ENTRY_WORDS = 2
+
+_UNITS = {"s": 1.0, "ms": 1e-3, "us": 1e-6}
+
+
+def parse_entry(text, clk_freq):
+    """(value, cycles) from "VALUE:DURATION"; the duration in cycles or with an s / ms / us suffix."""
+    value, _, duration = text.partition(":")
+    if not duration:
+        raise ValueError(f"'{text}': expected VALUE:DURATION")
+    for unit in sorted(_UNITS, key=len, reverse=True):
+        if duration.endswith(unit) and duration[:-len(unit)].replace(".", "", 1).isdigit():
+            return int(value, 0), max(1, round(float(duration[:-len(unit)]) * _UNITS[unit] * clk_freq))
+    return int(value, 0), int(duration, 0)
+
+
+def pattern_words(pattern):
+    """Table words as the bus sees them: value, duration (cycles) per entry."""
+    words = []
+    for value, cycles in pattern:
+        if not 0 <= value < 2**32 or not 1 <= cycles < 2**32:
+            raise ValueError(f"Entry ({value}, {cycles}): value and duration (>= 1 cycle) must fit 32 bits")
+        words += [value, cycles]
+    return words
+
+
+def upload_plan(base, words):
+    """Bursts (byte address, words) writing the table from `base`, each within MAX_BURST."""
+    return [(base + 4 * i, words[i:i + MAX_BURST]) for i in range(0, len(words), MAX_BURST)]
+
+
+def pattern_cycles(pattern, loops=1):
+    """sys_clk cycles of `loops` passes (None for loops=0, which plays until stopped)."""
+    return sum(cycles for _, cycles in pattern) * loops if loops else None
+
+
+# Board access ------------------------------------------------------------------
+
+def load(client, regs, base, pattern, loops=0, idle=0, name="seq", verify=True):
+    """Stop the sequencer, upload `pattern`, optionally read it back, and start it."""
+    reg   = lambda r: getattr(regs, f"{name}_{r}")
+    words = pattern_words(pattern)
+    reg("stop").write(1)
+    for addr, data in upload_plan(base, words):
+        client.write(addr, data)
+    if verify:
+        back = []
+        for addr, data in upload_plan(base, words):
+            back += client.read(addr, len(data))
+        if back != words:
+            raise RuntimeError("Pattern table readback differs from the upload")
+    reg("idle").write(idle)
+    reg("length").write(len(pattern))
+    reg("loops").write(loops)
+    reg("start").write(1)
+
+
+def wait_done(regs, name="seq", timeout=10.0, poll=0.05):
+    """Poll status until all loops are played; returns the status (RUNNING still set on timeout)."""
+    deadline = time.monotonic() + timeout
+    while True:
+        status = getattr(regs, f"{name}_status").read()
+        if not status & RUNNING or time.monotonic() > deadline:
+            return status
+        time.sleep(poll)
+
+
+def main():
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from commonLib.csrGen import load_csr, register_map_class
+
+    parser = argparse.ArgumentParser(description="Upload and play a pattern on the pattern sequencer")
+    parser.add_argument("csr",       help="csr.json of the build on the board")
+    parser.add_argument("entries",   nargs="*", metavar="VALUE:DURATION",
+                        help="Table entries; DURATION in cycles or with an s / ms / us suffix")
+    parser.add_argument("--name",    default="seq", help="CSR / memory region name of the sequencer")
+    parser.add_argument("--loops",   type=int, default=1, help="Passes through the table, 0 plays until --stop")
+    parser.add_argument("--idle",    type=lambda x: int(x, 0), default=0, help="Output value while stopped")
+    parser.add_argument("--stop",    action="store_true", help="Only stop the sequencer")
+    parser.add_argument("--wait",    action="store_true", help="Wait until all loops are played")
+    parser.add_argument("--port",    type=int, default=1234, help="litex_server port")
+    args = parser.parse_args()
+
+    csr      = load_csr(args.csr)
+    clk_freq = int(csr.get("constants", {}).get("config_clock_frequency", 10_000_000))
+    try:
+        pattern = [parse_entry(e, clk_freq) for e in args.entries]
+        pattern_words(pattern)
+    except ValueError as e:
+        parser.error(str(e))
+    if not args.stop and not pattern:
+        parser.error("no entries given")
+    base = csr["memories"][args.name]["base"]
+    if len(pattern) > csr["memories"][args.name]["size"] // (4 * ENTRY_WORDS):
+        parser.error(f"{len(pattern)} entries do not fit the table")
+
+    from litex import RemoteClient
+
+    client = RemoteClient(port=args.port)
+    client.open()
+    try:
+        regs = register_map_class(csr, class_name="SeqRegs")(client)
+        if args.stop:
+            getattr(regs, f"{args.name}_stop").write(1)
+            return
+        load(client, regs, base, pattern, args.loops, args.idle, args.name)
+        total = pattern_cycles(pattern, args.loops)
+        print(f"{len(pattern)} entries uploaded, playing "
+              + (f"{total} cycles ({total / clk_freq:.3f} s)" if total else "until --stop"))
+        if args.wait and total:
+            wait_done(regs, args.name, timeout=2 * total / clk_freq + 1)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Pattern sequencer: plays a table of (value, duration) entries from block RAM
+onto output pins at clock rate, so the timing of a waveform no longer
+depends on the host or the bridge.
+
+    seq = PatternSequencer(width=8, depth=256)
+    self.comb += led.eq(~seq.out[0])
+
+The host uploads the table once with burst writes through the bus region
+(commonLib/patternPlay.py), then starts it with one CSR write. Each entry
+holds its value on `out` for exactly `duration` sys_clk cycles; the next
+entry follows without a gap, and after the last one the table starts over.
+
+Memory layout: entry i occupies two 32-bit words at byte offset 8 × i,
+the value (low `width` bits) first, then the duration in cycles (0 counts
+as 1). The region is readable, so the host can verify an upload.
+
+CSRs:
+
+  length      entries played (1..depth)
+  loops       passes through the table; 0 plays until `stop`
+  idle        value of `out` while stopped
+  start       any write plays from entry 0
+  stop        any write stops at once (out ← idle)
+  status      bit 0 running, bit 1 done (all loops played)
+  entry       entry playing
+  loop_count  passes completed
+
+add_pattern_sequencer() adds one to a SoC (CSRs + a bus region).
+"""
+
+from migen import *
+from litex.soc.interconnect import wishbone
+from litex.soc.interconnect.csr import AutoCSR, CSR, CSRStatus, CSRStorage
+
+# Bus words per table entry: value, duration
+ENTRY_WORDS = 2
+
+
+# Create:
+#+----------------------------------------------+
+#|   PatternSequencer (AutoCSR + bus slave)     |
+#|     - bus: table (value, duration) in BRAM   |
+#|     - prefetch next entry -> out register    |
+#|     - duration counter, looping              |
+#+----------------------------------------------+
+class PatternSequencer(Module, AutoCSR):
+    """Plays (value, duration) entries from block RAM onto `out`.
+
+    width : output bits (1..32)
+    depth : table entries (power of two)
+
+    `bus` is a Wishbone slave of `size` bytes giving read / write access to
+    the table; `out` is registered and changes exactly at entry boundaries.
+    """
+
+    def __init__(self, width=8, depth=256):
+        if not 1 <= width <= 32:
+            raise ValueError(f"PatternSequencer width {width}: 1..32 bits")
+        if depth & (depth - 1):
+            raise ValueError(f"PatternSequencer depth {depth} is not a power of two")
+        self.width = width
+        self.depth = depth
+        self.size  = 4 * ENTRY_WORDS * depth
+        self.bus   = bus = wishbone.Interface(data_width=32, adr_width=30)
+        self.out   = Signal(width)
+
+        ptr_bits = log2_int(depth)
+
+        self.length     = CSRStorage(ptr_bits + 1, reset=depth, name="length",
+                                     description="Entries played (1..depth)")
+        self.loops      = CSRStorage(16, name="loops", description="Passes through the table, 0: until stop")
+        self.idle       = CSRStorage(width, name="idle", description="Output while stopped")
+        self.start      = CSR(1, name="start")     # Any write plays from entry 0
+        self.stop       = CSR(1, name="stop")      # Any write stops at once
+        self.status     = CSRStatus(2, name="status", description="bit 0 running, bit 1 done")
+        self.entry      = CSRStatus(ptr_bits, name="entry", description="Entry playing")
+        self.loop_count = CSRStatus(16, name="loop_count", description="Passes completed")
+
+        # # #
+
+        values    = Memory(width, depth, name="pattern_values")
+        durations = Memory(32, depth, name="pattern_durations")
+        play_value    = values.get_port()
+        play_duration = durations.get_port()
+        bus_value     = values.get_port(write_capable=True)
+        bus_duration  = durations.get_port(write_capable=True)
+        self.specials += values, durations, play_value, play_duration, bus_value, bus_duration
+
+        # Playback: the read ports always hold entry `nxt`, fetched while the
+        # current entry plays, so even one-cycle entries follow back to back
+        running   = Signal()
+        done      = Signal()
+        loading   = Signal()                # First entry after start
+        nxt       = Signal(ptr_bits + 1)    # Entry loaded at the next advance
+        remaining = Signal(32)              # Cycles left of the entry on `out`
+        current   = Signal(ptr_bits)
+        passes    = Signal(16)
+
+        length  = self.length.storage
+        advance = Signal()
+        after   = Signal(ptr_bits + 1)      # Entry following nxt
+        wrapped = Signal()                  # Advancing to entry 0 again: one pass complete
+        last    = Signal()                  # ... and it was the last one
+        self.comb += [
+            advance.eq(running & (loading | (remaining == 1))),
+            after.eq(Mux(nxt + 1 >= length, 0, nxt + 1)),
+            wrapped.eq(advance & ~loading & (nxt == 0)),
+            last.eq(wrapped & (self.loops.storage != 0) & (passes + 1 == self.loops.storage)),
+            play_value.adr.eq(Mux(self.start.re, 0, Mux(advance, after, nxt))),
+            play_duration.adr.eq(play_value.adr),
+        ]
+
+        self.sync += [
+            If(self.start.re,
+                running.eq(length != 0), loading.eq(1), done.eq(length == 0),
+                nxt.eq(0), passes.eq(0),
+            ).Elif(self.stop.re,
+                running.eq(0),
+            ).Elif(advance,
+                If(wrapped, passes.eq(passes + 1)),
+                If(last,
+                    running.eq(0), done.eq(1),
+                ).Else(
+                    loading.eq(0),
+                    current.eq(nxt),
+                    nxt.eq(after),
+                    remaining.eq(Mux(play_duration.dat_r == 0, 1, play_duration.dat_r)),
+                ),
+            ).Elif(running,
+                remaining.eq(remaining - 1),
+            ),
+            # Registered output: the new entry's value from the advance on, idle when stopped
+            If(advance & ~last & ~self.start.re & ~self.stop.re,
+                self.out.eq(play_value.dat_r),
+            ).Elif(~running | last | self.stop.re,
+                self.out.eq(self.idle.storage),
+            ),
+        ]
+
+        self.comb += [
+            self.status.status.eq(Cat(running, done)),
+            self.entry.status.eq(current),
+            self.loop_count.status.eq(passes),
+        ]
+
+        # Bus view: word 0 of entry i is its value, word 1 its duration; one wait state
+        write   = Signal()
+        is_dur  = Signal()
+        self.comb += [
+            bus_value.adr.eq(bus.adr[1:1 + ptr_bits]),
+            bus_duration.adr.eq(bus.adr[1:1 + ptr_bits]),
+            bus_value.dat_w.eq(bus.dat_w),
+            bus_duration.dat_w.eq(bus.dat_w),
+            write.eq(bus.cyc & bus.stb & bus.we & ~bus.ack),
+            bus_value.we.eq(write & ~bus.adr[0]),
+            bus_duration.we.eq(write & bus.adr[0]),
+            bus.dat_r.eq(Mux(is_dur, bus_duration.dat_r, bus_value.dat_r)),
+        ]
+        self.sync += [
+            bus.ack.eq(bus.cyc & bus.stb & ~bus.ack),
+            is_dur.eq(bus.adr[0]),
+        ]
+
+
+def add_pattern_sequencer(soc, name, origin, width=8, depth=256):
+    """Add a PatternSequencer as CSR peripheral `name` with its table at byte address `origin`.
+
+    Call before add_guarded_master() so the table region is part of the
+    bridge decoder table. Drive pins from the returned sequencer's `out`.
+    """
+    # litex.soc.integration.soc pulls in every CPU wrapper; only SoC builds need it
+    from litex.soc.integration.soc import SoCRegion
+
+    seq = PatternSequencer(width, depth)
+    setattr(soc.submodules, name, seq)
+    soc.add_csr(name, use_loc_if_exists=True)
+    soc.bus.add_slave(name=name, slave=seq.bus, region=SoCRegion(origin=origin, size=seq.size, cached=False))
+    return seq
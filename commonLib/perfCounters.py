@@ -0,0 +1,143 @@
+"""
+Hardware performance counters for SoC profiling.
+
+PerfCounters is an AutoCSR peripheral of free-running event counters that
+the host (through the UART bridge) or the CPU reads over CSRs:
+
+  cycles                   64-bit sys_clk cycle counter
+  <bus>_reads / _writes    Wishbone accesses acknowledged on a watched bus
+  <bus>_busy_cycles        64-bit, cycles with CYC & STB (sum of all ACK latencies)
+  <bus>_latency<i>         ACK latency histogram, power-of-two bins (latency_bins())
+  <stream>                 stream beats, e.g. bridge bytes in / out
+  <event>                  any one-cycle pulse, e.g. CRC32 bytes processed
+
+Counters run all the time; what the CSRs show is a snapshot. Writing the
+control register with SNAPSHOT copies every counter into its CSR in the same
+cycle, so a multi-word read over the bridge sees one consistent set; CLEAR
+restarts the counters from zero (SNAPSHOT | CLEAR snapshots first):
+
+    perf = PerfCounters()
+    perf.add_wishbone("bridge", self.bridge.wishbone)
+    perf.add_stream("bridge_rx_bytes", self.bridge.sink)
+    perf.add_counter("crc_bytes", self.crc32.data.re)
+
+add_perf_counters() does this for a SoC and registers the CSRs;
+commonLib/perfReport.py reads and prints them from the host.
+"""
+
+from migen import *
+from litex.soc.interconnect.csr import AutoCSR, CSR, CSRStatus
+# Control bits and histogram bins are shared with the host reader (no Migen there)
+from commonLib.perfReport import CLEAR, SNAPSHOT, latency_bins
+
+# Default histogram size: bins 0..6 up to 64 cycles, bin 7 above (bridge watchdog timeouts)
+LATENCY_BINS = 8
+
+
+# Create:
+#+----------------------------------------------+
+#|   PerfCounters (AutoCSR peripheral)          |
+#|     - control: SNAPSHOT / CLEAR              |
+#|     - live counters -> snapshot CSRs         |
+#|     - cycles, Wishbone, stream, event        |
+#+----------------------------------------------+
+class PerfCounters(Module, AutoCSR):
+    """Event counters with snapshot / clear over CSRs.
+
+    width : width of the event counters (cycle counters are always 64-bit)
+
+    Each add_*() call adds CSRStatus registers in call order, after
+    `control` and `cycles`, so the register layout follows the SoC code.
+    """
+
+    def __init__(self, width=32):
+        self.width   = width
+        self.control = CSR(2, name="control")     # Write: bit 0 SNAPSHOT, bit 1 CLEAR
+
+        self.snapshot = Signal()
+        self.clear    = Signal()
+        self.comb += [
+            self.snapshot.eq(self.control.re & self.control.r[0]),
+            self.clear.eq(self.control.re & self.control.r[1]),
+        ]
+
+        self.add_counter("cycles", 1, width=64)
+
+    def add_counter(self, name, event, width=None, description=None):
+        """Count the cycles in which `event` is set; returns the live counter signal."""
+        if hasattr(self, name):
+            raise ValueError(f"PerfCounters: '{name}' is already used")
+        width  = width or self.width
+        live   = Signal(width, name=f"{name}_live")
+        status = CSRStatus(width, name=name, description=description or f"{name} (at the last snapshot)")
+        setattr(self, name, status)
+
+        self.sync += [
+            If(self.clear,
+                live.eq(0),
+            ).Elif(event,
+                live.eq(live + 1),
+            ),
+            If(self.snapshot,
+                status.status.eq(live),
+            ),
+        ]
+        return live
+
+    def add_stream(self, name, endpoint):
+        """Count the beats (valid & ready) of a LiteX stream endpoint, e.g. UART bytes."""
+        return self.add_counter(name, endpoint.valid & endpoint.ready,
+                                description=f"{name}: stream beats (at the last snapshot)")
+
+    def add_wishbone(self, name, bus, bins=LATENCY_BINS):
+        """Watch a Wishbone interface: reads, writes, busy cycles and an ACK latency histogram.
+
+        The monitor only reads the bus signals. Every acknowledged (or
+        ERR-terminated) beat is one access, so a burst counts once per beat.
+        """
+        active = Signal(name=f"{name}_active")
+        done   = Signal(name=f"{name}_done")
+        wait   = Signal(16, name=f"{name}_wait")   # Cycles waited so far, saturating
+        self.comb += [
+            active.eq(bus.cyc & bus.stb),
+            done.eq(active & (bus.ack | bus.err)),
+        ]
+        self.sync += [
+            If(done | ~active,
+                wait.eq(0),
+            ).Elif(wait != 2**len(wait) - 1,
+                wait.eq(wait + 1),
+            ),
+        ]
+        latency = wait + 1
+
+        self.add_counter(f"{name}_reads",  done & ~bus.we, description=f"{name}: read accesses")
+        self.add_counter(f"{name}_writes", done & bus.we,  description=f"{name}: write accesses")
+        self.add_counter(f"{name}_busy_cycles", active, width=64,
+                         description=f"{name}: cycles with CYC & STB (sum of ACK latencies)")
+        for i, (low, high) in enumerate(latency_bins(bins)):
+            in_bin = (latency >= low) if high is None else ((latency >= low) & (latency <= high))
+            self.add_counter(f"{name}_latency{i}", done & in_bin,
+                             description=f"{name}: accesses with ACK latency {low}..{high or 'max'} cycles")
+
+
+def add_perf_counters(soc, buses=(), streams=(), events=(), name="perf"):
+    """Add a PerfCounters peripheral to a LiteX SoC as CSR peripheral `name`.
+
+    buses   : (name, wishbone.Interface) pairs to watch
+    streams : (name, stream endpoint) pairs whose beats are counted
+    events  : (name, signal) pairs counted while the signal is set
+
+    The peripheral takes the CSR location of `name` in the SoC's csr_map, or
+    the next free one.
+    """
+    perf = PerfCounters()
+    for bus_name, bus in buses:
+        perf.add_wishbone(bus_name, bus)
+    for stream_name, endpoint in streams:
+        perf.add_stream(stream_name, endpoint)
+    for event_name, signal in events:
+        perf.add_counter(event_name, signal)
+    setattr(soc.submodules, name, perf)
+    soc.add_csr(name, use_loc_if_exists=True)
+    return perf
@@ -0,0 +1,129 @@
+"""
+Host-side reader for the PerfCounters peripheral (commonLib/perfCounters.py).
+
+Reads the perf_* registers of a build through the UART bridge and prints
+throughput and latency figures:
+
+    litex_server --uart --uart-port=/dev/ttyACM0 &
+    python -m commonLib.perfReport 03wishBoneCsrHdl/build/csr.json             # since reset / last clear
+    python -m commonLib.perfReport 03wishBoneCsrHdl/build/csr.json --interval 5  # over the next 5 s
+
+The register layout comes from the build's csr.json, so the report follows
+whatever buses, streams and events the SoC watches. The host's own accesses
+(one control write, one burst read per snapshot) are part of the counts.
+
+From a script, with a generated map (e.g. crc32Regs.py of a --perf-counters build):
+
+    counters = read_counters(Crc32Regs(RemoteClient()))
+    print(format_report(counters, clk_freq=10e6))
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# control register bits, shared with the gateware (commonLib/perfCounters.py imports
+# them from here, so host scripts do not need Migen)
+SNAPSHOT = 0x1
+CLEAR    = 0x2
+
+
+def latency_bins(bins):
+    """(low, high) ACK latency in cycles per histogram bin, inclusive; high is None for the last bin.
+
+    Latency counts the cycles from CYC & STB to ACK, both included: a
+    combinatorial ACK is 1, a registered one 2.
+    """
+    edges = [(1, 1)] + [(2**(i - 1) + 1, 2**i) for i in range(1, bins - 1)]
+    return edges + [(2**(bins - 2) + 1, None)]
+
+
+def clear_counters(regs, name="perf"):
+    """Restart every counter from zero."""
+    getattr(regs, f"{name}_control").write(CLEAR)
+
+
+def read_counters(regs, name="perf", clear=False):
+    """Snapshot the counters and read them in one burst: {counter: value}.
+
+    regs  : RegisterMap (commonLib/csrAccess.py) of a build with PerfCounters `name`
+    clear : also restart the counters (after the snapshot)
+    """
+    getattr(regs, f"{name}_control").write(SNAPSHOT | (CLEAR if clear else 0))
+    counters = regs.read_group(name)
+    counters.pop("control", None)
+    return counters
+
+
+def _buses(counters):
+    # Watched buses: names with a "<bus>_busy_cycles" counter
+    return [key[:-len("_busy_cycles")] for key in counters if key.endswith("_busy_cycles")]
+
+
+def format_report(counters, clk_freq):
+    """Text report of read_counters() output; rates use the snapshot's cycle count."""
+    cycles  = counters.get("cycles", 0)
+    seconds = cycles / clk_freq if clk_freq else 0
+    lines   = [f"cycles            {cycles:>14}   ({seconds:.6f} s at {clk_freq / 1e6:g} MHz)"]
+
+    shown = {"cycles"}
+    for bus in _buses(counters):
+        reads, writes = counters[f"{bus}_reads"], counters[f"{bus}_writes"]
+        busy     = counters[f"{bus}_busy_cycles"]
+        accesses = reads + writes
+        hist     = [counters[key] for key in sorted((k for k in counters if k.startswith(f"{bus}_latency")),
+                                                    key=lambda k: int(k[len(f"{bus}_latency"):]))]
+        shown   |= {f"{bus}_reads", f"{bus}_writes", f"{bus}_busy_cycles"}
+        shown   |= {f"{bus}_latency{i}" for i in range(len(hist))}
+
+        lines.append(f"{bus + ' accesses':<17} {accesses:>14}   ({reads} reads, {writes} writes"
+                     + (f", {accesses / seconds:.1f}/s)" if seconds else ")"))
+        lines.append(f"{bus + ' busy':<17} {busy:>14}   "
+                     f"({100 * busy / cycles if cycles else 0:.2f} % of cycles, "
+                     f"mean ACK latency {busy / accesses if accesses else 0:.2f} cycles)")
+        peak = max(hist, default=0)
+        for (low, high), count in zip(latency_bins(len(hist)), hist):
+            label = f"{low}" if low == high else f"{low}..{high}" if high else f">={low}"
+            bar   = "#" * round(40 * count / peak) if peak else ""
+            lines.append(f"  latency {label:>8} {count:>10}  {bar}")
+
+    for key in sorted(k for k in counters if k not in shown):
+        rate = f"   ({counters[key] / seconds:.1f}/s)" if seconds else ""
+        lines.append(f"{key:<17} {counters[key]:>14}{rate}")
+    return "\n".join(lines)
+
+
+def main():
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from commonLib.csrGen import load_csr, register_map_class
+
+    parser = argparse.ArgumentParser(description="Read the PerfCounters of a running build")
+    parser.add_argument("csr",        help="csr.json / csr.csv of the build on the board")
+    parser.add_argument("--name",     default="perf", help="CSR name of the PerfCounters peripheral")
+    parser.add_argument("--interval", type=float, help="Clear, wait this many seconds, then read")
+    parser.add_argument("--clear",    action="store_true", help="Clear the counters after reading")
+    parser.add_argument("--clk-freq", type=float,
+                        help="sys_clk frequency in Hz (default: config_clock_frequency of the csr file)")
+    parser.add_argument("--port",     type=int, default=1234, help="litex_server port")
+    args = parser.parse_args()
+
+    from litex import RemoteClient
+
+    csr      = load_csr(args.csr)
+    clk_freq = args.clk_freq or float(csr["constants"].get("config_clock_frequency", 10e6))
+
+    client = RemoteClient(port=args.port)
+    client.open()
+    try:
+        regs = register_map_class(csr, class_name="PerfRegs")(client)
+        if args.interval:
+            clear_counters(regs, args.name)
+            time.sleep(args.interval)
+        print(format_report(read_counters(regs, args.name, clear=args.clear), clk_freq))
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Selective waveform capture for Migen simulations.
+
+run_simulation(tb, gen, vcd_name=...) records every signal on every edge:
+the trace dominates run time and easily reaches gigabytes on long CRC runs.
+SimTrace narrows that down:
+
+  off (default)   run_traced(tb, gen) without a trace uses the Migen fast path
+  allowlist       signals=[...]: Signals, Records (bus interfaces), Modules
+                  (their whole hierarchy) or glob patterns on the VCD names,
+                  e.g. ["master_*", "*crc*"]
+  window          window=(pre, post): keep only the last `pre` cycles in
+                  memory; trace.trigger() (e.g. from a failing check) writes
+                  them out and records `post` more cycles
+  format          file name ending in .vcd, .vcd.gz (gzip) or .fst
+                  (converted with GTKWave's vcd2fst when it is installed)
+
+    trace = SimTrace("crc.vcd.gz", signals=[tb.master, "*crc_in*"], window=(200, 50))
+    run_traced(tb, run_test(tb), trace)
+
+`python testBench*.py --vcd FILE [--vcd-signals PATTERN ...] [--vcd-window PRE POST]`
+exposes the same options on the command line (add_trace_arguments()).
+"""
+
+import fnmatch
+import gzip
+import os
+import shutil
+import subprocess
+from collections import deque
+
+from migen import *
+from migen.fhdl.namer import build_namespace
+from migen.fhdl.tools import list_signals
+from migen.genlib.record import Record
+from migen.sim.core import Simulator
+from migen.sim.vcd import VCDWriter
+
+
+def _expand(item):
+    """Signals selected by one allowlist entry (patterns are resolved later)."""
+    if isinstance(item, Signal):
+        return {item}
+    if isinstance(item, Record):
+        return set(item.flatten())
+    if isinstance(item, Module):
+        return set(list_signals(item.get_fragment()))
+    raise TypeError(f"Cannot trace {type(item).__name__}; use a Signal, Record, Module or pattern")
+
+
+# Create:
+#+----------------------------------------------+
+#|   SimTrace                                   |
+#|     - which signals (allowlist)              |
+#|     - when (always / window around trigger)  |
+#|     - where (.vcd / .vcd.gz / .fst)          |
+#+----------------------------------------------+
+class SimTrace:
+    """Waveform capture settings; pass to run_traced().
+
+    filename : output file (.vcd, .vcd.gz or .fst)
+    signals  : allowlist, None records everything
+    window   : (pre, post) sys cycles kept around each trigger(), None records always
+    """
+
+    def __init__(self, filename, signals=None, window=None):
+        self.filename = filename
+        self.signals  = signals
+        self.window   = window
+        self.triggers = 0
+        self._writer  = None
+
+    def trigger(self):
+        """Write the buffered pre-trigger window and record the next `post` cycles."""
+        self.triggers += 1
+        if self._writer is not None:
+            self._writer.trigger()
+
+    def _select(self, all_signals):
+        if self.signals is None:
+            return None
+        selected = set()
+        patterns = []
+        for item in self.signals:
+            if isinstance(item, str):
+                patterns.append(item)
+            else:
+                selected |= _expand(item)
+        if patterns:
+            ns = build_namespace(all_signals)
+            selected |= {s for s in all_signals
+                         if any(fnmatch.fnmatchcase(ns.get_name(s), p) for p in patterns)}
+        return {s.duid for s in selected}
+
+
+# Create:
+#+----------------------------------------------+
+#|   _TraceWriter (VCDWriter)                   |
+#|     - drops signals outside the allowlist    |
+#|     - windowed: changes kept in a ring       |
+#|       buffer until trigger()                 |
+#+----------------------------------------------+
+class _TraceWriter(VCDWriter):
+    def __init__(self, filename, module_name, allow, window, delays_per_cycle):
+        VCDWriter.__init__(self, filename, module_name)
+        self.allow   = allow                  # duids to record, None = all
+        self.chunks  = None                   # deque of (t, [(signal, old, new)]), windowed only
+        self.current = []                     # Changes since the last delay()
+        self.post    = 0                      # delay() calls still to record after a trigger
+        if window is not None:
+            self.chunks      = deque(maxlen=max(window[0], 1) * delays_per_cycle)
+            self.post_delays = window[1] * delays_per_cycle
+
+    def set(self, signal, value):
+        if self.allow is not None and signal.duid not in self.allow:
+            return
+        if signal in self.signal_values and self.signal_values[signal] == value:
+            return
+        if self.chunks is None or self.post:
+            self._write_value(self.buffer_file, signal, value)
+        elif signal in self.signal_values:
+            self.current.append((signal, self.signal_values[signal], value))
+        self.signal_values[signal] = value
+
+    def delay(self, delay):
+        if self.chunks is None or self.post:
+            self.t += delay
+            self.buffer_file.write(f"#{self.t}\n")
+            self.post = max(self.post - 1, 0)
+        else:
+            self.chunks.append((self.t, self.current))     # Changes made at time t
+            self.current = []
+            self.t += delay
+
+    def trigger(self):
+        if self.chunks is None:
+            return                            # Continuous capture, nothing buffered
+        if not self.post:
+            self.chunks.append((self.t, self.current))
+            self.current = []
+            # Values at the start of the window: roll the buffered changes back
+            state = dict(self.signal_values)
+            for _, changes in reversed(self.chunks):
+                for signal, old, _ in reversed(changes):
+                    state[signal] = old
+            for i, (t, changes) in enumerate(self.chunks):
+                self.buffer_file.write(f"#{t}\n")
+                if i == 0:
+                    state.update((signal, new) for signal, _, new in changes)
+                    for signal, value in state.items():
+                        self._write_value(self.buffer_file, signal, value)
+                else:
+                    for signal, _, new in changes:
+                        self._write_value(self.buffer_file, signal, new)
+            self.chunks.clear()
+        self.post = self.post_delays
+
+    def _write_header(self, out):
+        # Same layout as VCDWriter.close(), with $dumpvars written to `out`
+        # (VCDWriter appends the initial values to the end of the trace)
+        out.write(f"$scope module {self.module_name} $end\n")
+        ns = build_namespace(self.codes.keys())
+        for signal, code in self.codes.items():
+            if hasattr(signal, "_enumeration"):
+                size = max(len(v) for v in signal._enumeration.values()) * 8
+            else:
+                size = len(signal)
+            out.write(f"$var wire {size} {code} {ns.get_name(signal)} $end\n")
+        out.write("$upscope $end\n$enddefinitions $end\n$dumpvars\n")
+        buffer_file, self.buffer_file = self.buffer_file, out
+        for signal in self.codes.keys():
+            self._write_value(out, signal, signal.reset.value)
+        self.buffer_file = buffer_file
+        out.write("$end\n#0\n")
+
+    def close(self):
+        fst = self.filename.endswith(".fst")
+        vcd = self.filename[:-len(".fst")] + ".vcd" if fst else self.filename
+        with (gzip.open(vcd, "wt") if vcd.endswith(".gz") else open(vcd, "w")) as out:
+            self._write_header(out)
+            self.buffer_file.seek(0)
+            shutil.copyfileobj(self.buffer_file, out)
+        self.buffer_file.close()
+        if fst:
+            if shutil.which("vcd2fst") is None:
+                print(f"vcd2fst not found, waveform left as {vcd}")
+                return
+            subprocess.run(["vcd2fst", vcd, self.filename], check=True)
+            os.remove(vcd)
+
+
+# Create:
+#+----------------------------------------------+
+#|   _TracedSimulator (migen Simulator)         |
+#|     - swaps in _TraceWriter after init       |
+#+----------------------------------------------+
+class _TracedSimulator(Simulator):
+    def __init__(self, fragment_or_module, generators, trace, clocks):
+        Simulator.__init__(self, fragment_or_module, generators, clocks=clocks,
+                           vcd_name=trace.filename)
+        signals = [s for s in self._duid2sig if s is not None]
+        self.vcd.buffer_file.close()            # Full-trace writer opened by Migen
+        self.vcd = _TraceWriter(trace.filename, self.vcd.module_name,
+                                trace._select(signals), trace.window,
+                                delays_per_cycle=2 * len(clocks))
+        trace._writer = self.vcd
+        for signal in signals:
+            self.vcd.set(signal, signal.reset.value)
+
+
+def run_traced(tb, generators, trace=None, clocks={"sys": 10}):
+    """run_simulation() with optional, selective waveform capture (see SimTrace)."""
+    if trace is None:
+        run_simulation(tb, generators, clocks=clocks)
+        return
+    with _TracedSimulator(tb, generators, trace, clocks) as sim:
+        sim.run()
+    trace._writer = None
+
+
+def add_trace_arguments(parser, default_name):
+    """--vcd / --vcd-signals / --vcd-window options for a testbench script."""
+    parser.add_argument("--vcd", nargs="?", const=default_name, default=None, metavar="FILE",
+                        help=f"Write a waveform (.vcd, .vcd.gz or .fst, default {default_name})")
+    parser.add_argument("--vcd-signals", nargs="+", default=None, metavar="PATTERN",
+                        help="Only record signals whose VCD name matches a glob pattern")
+    parser.add_argument("--vcd-window", nargs=2, type=int, default=None, metavar=("PRE", "POST"),
+                        help="Only record PRE cycles before and POST cycles after each failing check")
+
+
+def trace_from_args(args, signals=(), case=None):
+    """SimTrace for the parsed --vcd options (None when tracing is off).
+
+    `signals` are added to the allowlist when --vcd-signals is given.
+    `case` is appended to the file name, giving one waveform per test case
+    (e.g. test_crc32_peripheral_test03_known_vector.vcd.gz).
+    """
+    if args.vcd is None:
+        return None
+    filename = args.vcd
+    if case is not None:
+        stem, ext = filename, ""
+        for suffix in (".vcd.gz", ".vcd", ".fst"):
+            if filename.endswith(suffix):
+                stem, ext = filename[:-len(suffix)], suffix
+                break
+        filename = f"{stem}_{case}{ext}"
+    allow = None
+    if args.vcd_signals is not None:
+        allow = list(signals) + list(args.vcd_signals)
+    return SimTrace(filename, signals=allow, window=args.vcd_window)
@@ -0,0 +1,144 @@
+"""
+Fill / readback / memcpy throughput of the SoC SRAM through the UART bridge.
+
+Builds with --sram-size map block RAM at mem_map["sram"]; this script fills
+it with a seeded pattern, reads it back, copies one half onto the other and
+checks every word, once per burst length:
+
+    litex_server --uart --uart-port=/dev/ttyACM0 &
+    python -m commonLib.sramBench 03wishBoneCsrHdl/build/csr.json
+    python -m commonLib.sramBench 03wishBoneCsrHdl/build/csr.json --burst 1 8 255 --words 1024
+
+Measured rates are set against what the UART alone allows: a bridge command
+is 6 bytes (command, length, 32-bit address) plus 4 per word, 10 bits per
+byte on the wire. The host splits writes into 8-word commands
+(litex.tools.remote.comm_uart) and reads into commands of at most 255 words
+(the length byte), so short bursts pay the header more often and long
+write bursts gain nothing past 8 words.
+
+uart_bytes() / uart_limit() are plain functions, also used by the CRC32
+testbench.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+HEADER_BYTES   = 6      # Command, length, 32-bit word address
+MAX_READ_BURST = 255    # Bridge length field is one byte
+WRITE_CHUNK    = 8      # CommUART.write() sends at most 8 words per command
+
+
+def uart_bytes(words, burst, write):
+    """Bytes on the UART (both directions) to move `words` words in bursts of `burst`."""
+    per_command = min(burst, WRITE_CHUNK) if write else min(burst, MAX_READ_BURST)
+    commands    = -(-words // per_command)
+    return HEADER_BYTES * commands + 4 * words
+
+
+def uart_limit(words, burst, write, baud=115200):
+    """Payload bytes per second the UART allows for that transfer (8N1)."""
+    return 4 * words / (uart_bytes(words, burst, write) * 10 / baud)
+
+
+def pattern(words, seed=1):
+    """Seeded random 32-bit words."""
+    rng = random.Random(seed)
+    return [rng.getrandbits(32) for _ in range(words)]
+
+
+def write_words(client, addr, data, burst):
+    """Write `data` from `addr` on, `burst` words per client call."""
+    for i in range(0, len(data), burst):
+        client.write(addr + 4 * i, data[i:i + burst])
+
+
+def read_words(client, addr, words, burst):
+    """Read `words` words from `addr` on, `burst` words per client call."""
+    data = []
+    for i in range(0, words, burst):
+        data += client.read(addr + 4 * i, min(burst, words - i))
+    return data
+
+
+def run(client, base, words, burst, seed=1):
+    """Fill, read back and copy `words` words at `base`; returns timings and mismatches."""
+    data  = pattern(words, seed)
+    half  = words // 2
+
+    t0 = time.perf_counter()
+    write_words(client, base, data, burst)
+    t1 = time.perf_counter()
+    back = read_words(client, base, words, burst)
+    t2 = time.perf_counter()
+    # memcpy through the host: first half onto the second half
+    write_words(client, base + 4 * half, read_words(client, base, half, burst), burst)
+    t3 = time.perf_counter()
+    copied = read_words(client, base + 4 * half, half, burst)
+
+    return {
+        "burst":       burst,
+        "words":       words,
+        "fill_s":      t1 - t0,
+        "read_s":      t2 - t1,
+        "copy_s":      t3 - t2,
+        "errors":      sum(a != b for a, b in zip(back, data)) + sum(a != b for a, b in zip(copied, data[:half])),
+    }
+
+
+def format_results(results, baud):
+    """Table of run() results: payload bytes per second against the UART limit."""
+    lines = [f"{'burst':>5} {'fill B/s':>10} {'(UART max)':>10} {'read B/s':>10} {'(UART max)':>10} "
+             f"{'memcpy B/s':>10}  check"]
+    for r in results:
+        words, burst = r["words"], r["burst"]
+        check = f"{r['errors']} errors" if r["errors"] else "PASS"
+        lines.append(f"{burst:>5} {4 * words / r['fill_s']:>10.0f} {uart_limit(words, burst, True, baud):>10.0f} "
+                     f"{4 * words / r['read_s']:>10.0f} {uart_limit(words, burst, False, baud):>10.0f} "
+                     f"{4 * (words // 2) / r['copy_s']:>10.0f}  {check}")
+    return "\n".join(lines)
+
+
+def main():
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from commonLib.csrGen import load_csr
+
+    parser = argparse.ArgumentParser(description="SRAM fill / readback throughput through the UART bridge")
+    parser.add_argument("csr",     help="csr.json / csr.csv of a build with --sram-size")
+    parser.add_argument("--name",  default="sram", help="Memory region of the SRAM")
+    parser.add_argument("--words", type=int, help="Words per pass (default: the whole SRAM, at most 4096)")
+    parser.add_argument("--burst", type=int, nargs="+", default=[1, 8, 64, 255],
+                        help=f"Burst lengths to measure (1..{MAX_READ_BURST})")
+    parser.add_argument("--seed",  type=int, default=1, help="Pattern seed")
+    parser.add_argument("--baud",  type=int, default=115200, help="Bridge baud rate (for the UART limit)")
+    parser.add_argument("--port",  type=int, default=1234, help="litex_server port")
+    args = parser.parse_args()
+
+    if any(not 1 <= b <= MAX_READ_BURST for b in args.burst):
+        parser.error(f"--burst: lengths must be 1..{MAX_READ_BURST}")
+    memories = load_csr(args.csr)["memories"]
+    if args.name not in memories:
+        parser.error(f"{args.csr} has no '{args.name}' region (build with --sram-size)")
+    region = memories[args.name]
+    words  = args.words or min(region["size"] // 4, 4096)
+    if words > region["size"] // 4:
+        parser.error(f"--words: the SRAM holds {region['size'] // 4} words")
+
+    from litex import RemoteClient
+
+    client = RemoteClient(port=args.port)
+    client.open()
+    try:
+        results = [run(client, region["base"], words, burst, args.seed) for burst in args.burst]
+    finally:
+        client.close()
+
+    print(f"{words} words at 0x{region['base']:08x}, {args.baud} baud")
+    print(format_results(results, args.baud))
+    raise SystemExit(1 if any(r["errors"] for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
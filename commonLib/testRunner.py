@@ -0,0 +1,204 @@
+"""
+Case registry and parallel runner for the testbench scripts.
+
+Each test case is a plain function that elaborates its own TestBench, runs
+its simulation(s) and records its checks on the CaseResult it is given:
+
+    suite = TestSuite("crc32_peripheral")
+
+    @suite.case("known_vector")
+    def case_known_vector(result):
+        tb = TestBench()
+        run_simulation(tb, run_known_vector(tb, result))
+
+    add_runner_arguments(parser)
+    args = parser.parse_args()
+    raise SystemExit(suite.run(args))
+
+Cases share no simulator state, so the runner can hand them to a pool of
+worker processes (-j N). Output of each case is captured in its worker and
+printed in registration order; per-case pass/fail counts and wall time can
+be written as JUnit XML (--junit) and JSON (--json).
+
+Command line (add_runner_arguments()):
+  -j / --jobs N     worker processes (default: one per CPU core)
+  -k PATTERN        only run cases whose name matches a glob pattern
+  --list            list the case names and exit
+  --junit FILE      JUnit XML report
+  --json FILE       JSON report
+"""
+
+import contextlib
+import fnmatch
+import io
+import json
+import os
+import time
+import traceback
+
+
+# Create:
+#+----------------------------------------------+
+#|   CaseResult                                 |
+#|     - pass / fail counts of one case         |
+#|     - failure messages for the reports       |
+#+----------------------------------------------+
+class CaseResult:
+    """Checks recorded by one test case."""
+
+    def __init__(self, name):
+        self.name     = name
+        self.passed   = 0
+        self.failed   = 0
+        self.failures = []      # Messages of the failed checks
+        self.error    = None    # Traceback when the case raised
+        self.output   = ""      # Captured stdout
+        self.seconds  = 0.0
+
+    def record(self, ok, message=""):
+        """Count one check; returns `ok` so it can be used inline."""
+        if ok:
+            self.passed += 1
+        else:
+            self.failed += 1
+            self.failures.append(message)
+        return ok
+
+    @property
+    def ok(self):
+        return self.failed == 0 and self.error is None
+
+    def as_dict(self):
+        return {
+            "name":     self.name,
+            "passed":   self.passed,
+            "failed":   self.failed,
+            "ok":       self.ok,
+            "seconds":  round(self.seconds, 3),
+            "failures": self.failures,
+            "error":    self.error,
+        }
+
+
+# Process-pool workers look the suite up here (inherited through fork())
+_suite = None
+
+
+def _run_case(name):
+    result = CaseResult(name)
+    out = io.StringIO()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        try:
+            _suite.cases[name](result)
+        except Exception:
+            result.error = traceback.format_exc()
+    result.seconds = time.perf_counter() - t0
+    result.output  = out.getvalue()
+    return result
+
+
+# Create:
+#+----------------------------------------------+
+#|   TestSuite                                  |
+#|     - name → case function                   |
+#|     - serial or process-pool run             |
+#|     - console / JUnit / JSON reports         |
+#+----------------------------------------------+
+class TestSuite:
+    """Ordered collection of independent test cases."""
+
+    def __init__(self, name):
+        self.name  = name
+        self.cases = {}
+
+    def case(self, name):
+        """Decorator registering `func(result)` as case `name`."""
+        def register(func):
+            if name in self.cases:
+                raise ValueError(f"Duplicate test case '{name}'")
+            self.cases[name] = func
+            return func
+        return register
+
+    def select(self, patterns=None):
+        if not patterns:
+            return list(self.cases)
+        return [n for n in self.cases if any(fnmatch.fnmatchcase(n, p) for p in patterns)]
+
+    def run(self, args):
+        """Run the selected cases as given by add_runner_arguments(); returns the exit code."""
+        global _suite
+
+        names = self.select(args.k)
+        if args.list:
+            print("\n".join(names))
+            return 0
+
+        jobs = max(1, min(args.jobs or os.cpu_count() or 1, len(names)))
+        _suite = self
+        t0 = time.perf_counter()
+        if jobs == 1:
+            results = [_run_case(name) for name in names]
+            for result in results:
+                self._print(result)
+        else:
+            import multiprocessing      # Only for -j > 1: keeps the testbench start-up short
+            results = []
+            with multiprocessing.get_context("fork").Pool(jobs) as pool:
+                for result in pool.imap(_run_case, names):
+                    self._print(result)
+                    results.append(result)
+        elapsed = time.perf_counter() - t0
+
+        passed = sum(r.passed for r in results)
+        failed = sum(r.failed for r in results) + sum(r.error is not None for r in results)
+        print(f"\n{'='*50}")
+        for r in results:
+            print(f"  [{'PASS' if r.ok else 'FAIL'}] {r.name:<32} {r.passed:>3} passed, "
+                  f"{r.failed:>3} failed  {r.seconds:6.2f} s")
+        print(f"{len(results)} cases on {jobs} process(es) in {elapsed:.2f} s")
+        print(f"Results: {passed} passed, {failed} failed")
+
+        if args.junit:
+            self.write_junit(args.junit, results)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump({"suite": self.name, "seconds": round(elapsed, 3), "jobs": jobs,
+                           "passed": passed, "failed": failed,
+                           "cases": [r.as_dict() for r in results]}, f, indent=2)
+        return 1 if failed else 0
+
+    @staticmethod
+    def _print(result):
+        print(result.output, end="")
+        if result.error:
+            print(result.error, end="")
+
+    def write_junit(self, filename, results):
+        import xml.etree.ElementTree as ET
+        suite = ET.Element("testsuite", name=self.name, tests=str(len(results)),
+                           failures=str(sum(r.failed > 0 for r in results)),
+                           errors=str(sum(r.error is not None for r in results)),
+                           time=f"{sum(r.seconds for r in results):.3f}")
+        for r in results:
+            case = ET.SubElement(suite, "testcase", classname=self.name, name=r.name,
+                                 time=f"{r.seconds:.3f}")
+            if r.error:
+                ET.SubElement(case, "error", message="exception").text = r.error
+            elif r.failed:
+                ET.SubElement(case, "failure", message=f"{r.failed} check(s) failed").text = \
+                    "\n".join(r.failures)
+            ET.SubElement(case, "system-out").text = r.output
+        ET.ElementTree(suite).write(filename, encoding="utf-8", xml_declaration=True)
+
+
+def add_runner_arguments(parser):
+    """-j / -k / --list / --junit / --json options for a testbench script."""
+    parser.add_argument("-j", "--jobs", type=int, default=None, metavar="N",
+                        help="Worker processes (default: one per CPU core)")
+    parser.add_argument("-k", nargs="+", default=None, metavar="PATTERN",
+                        help="Only run test cases whose name matches a glob pattern")
+    parser.add_argument("--list", action="store_true", help="List the test cases and exit")
+    parser.add_argument("--junit", default=None, metavar="FILE", help="Write a JUnit XML report")
+    parser.add_argument("--json",  default=None, metavar="FILE", help="Write a JSON report")
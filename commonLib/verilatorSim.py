@@ -0,0 +1,418 @@
+"""
+Verilator backend for Migen testbenches.
+
+run_simulation() interprets the design in Python, which is fine for a few
+dozen bus transactions but far too slow for long CRC streams or a CPU SoC.
+run_verilator() keeps the same generator API and runs the design compiled
+by Verilator instead:
+
+    run_simulation(tb, run_test(tb), vcd_name="x.vcd")                 # Migen
+    run_verilator(tb, run_test(tb), ios=tb.sim_ios(),
+                  sources=["hdl/crc.v"], vcd_name="x.vcd")              # Verilator
+
+Flow:
+
+    TestBench (Migen Module)
+        |  migen.fhdl.verilog.convert(ios=...)
+        v
+    tb_top.v + black-box sources (hdl/crc.v, ...)
+        |  verilator --cc --build   +  generated C harness (set/get/tick)
+        v
+    libtb_top_<key>.so  --ctypes-->  generators (yield sig / yield sig.eq(v) / yield)
+
+Built models are cached in build/verilator/<name>_<key>/. With params=...
+the key is elabCache.design_key() (repo sources, HDL sources, tool versions,
+params), so a repeated run skips convert() and the Verilator build; without
+it the key is the hash of the converted Verilog.
+
+Differences from run_simulation():
+  - Generators can only read and write the signals listed in `ios`; they
+    become the ports of the generated top. Everything else is internal to
+    the compiled model.
+  - Only the "sys" clock domain is supported; sys_rst is held low, signals
+    start from their reset values as in the Migen simulator.
+  - Ports are at most 64 bits wide.
+  - Instance() black boxes are simulated from their real HDL sources.
+
+Generator timing matches the Migen simulator: reads return the values just
+before the rising edge, writes take effect on that edge.
+"""
+
+import ctypes
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+from migen import *
+from migen.fhdl import verilog
+from migen.fhdl.structure import _Assign, _Slice
+from migen.fhdl.tools import list_special_ios, list_targets
+
+from commonLib.elabCache import REPO_ROOT, design_key
+
+# Default build directory, relative to the current working directory
+VERILATOR_BUILD_DIR = os.path.join("build", "verilator")
+
+
+def verilator_available():
+    """True when the verilator executable is on PATH."""
+    return shutil.which("verilator") is not None
+
+
+# Create:
+#+----------------------------------------------+
+#|   SourceCollector                            |
+#|     - stands in for the platform argument    |
+#|     - records platform.add_source() calls    |
+#+----------------------------------------------+
+class SourceCollector(list):
+    """Collect the HDL files a peripheral registers with platform.add_source().
+
+    Peripherals such as CRC32Peripheral take the LiteX platform only to add
+    their black-box sources; pass a SourceCollector instead and hand it to
+    run_verilator(sources=...).
+    """
+
+    def add_source(self, filename, language=None, library=None, copy=False):
+        if filename not in self:
+            self.append(filename)
+
+
+def _ports(ios):
+    """Port order shared by the C harness and the simulator (that of convert())."""
+    return sorted(ios, key=lambda s: s.duid)
+
+
+def _harness(top, ports, clk, trace):
+    """C++ glue exposing the Verilated model through a flat C ABI."""
+    set_cases = "\n".join(f"        case {i}: s->top->{name} = v; break;"
+                          for i, (name, is_input) in enumerate(ports) if is_input)
+    get_cases = "\n".join(f"        case {i}: return s->top->{name};"
+                          for i, (name, _) in enumerate(ports))
+    return f"""// Generated by commonLib/verilatorSim.py
+#define TRACE {int(trace)}
+#include <cstdint>
+#include "verilated.h"
+#if TRACE
+#include "verilated_vcd_c.h"
+#endif
+#include "V{top}.h"
+
+struct Sim {{
+    VerilatedContext *ctx;
+    V{top} *top;
+#if TRACE
+    VerilatedVcdC *vcd;
+#endif
+    uint64_t time;
+}};
+
+static void step(Sim *s) {{
+    s->top->eval();
+#if TRACE
+    if (s->vcd) s->vcd->dump(s->time);
+#endif
+    s->time++;
+}}
+
+extern "C" {{
+
+Sim *sim_new(const char *vcd) {{
+    Sim *s = new Sim();
+    s->ctx = new VerilatedContext;
+    s->ctx->traceEverOn(TRACE);
+    s->top = new V{top}(s->ctx);
+#if TRACE
+    s->vcd = nullptr;
+    if (vcd && vcd[0]) {{
+        s->vcd = new VerilatedVcdC;
+        s->top->trace(s->vcd, 99);
+        s->vcd->open(vcd);
+    }}
+#endif
+    s->time = 0;
+    s->top->{clk} = 0;
+    step(s);
+    return s;
+}}
+
+void sim_set(Sim *s, int port, uint64_t v) {{
+    switch (port) {{
+{set_cases}
+        default: break;
+    }}
+}}
+
+uint64_t sim_get(Sim *s, int port) {{
+    switch (port) {{
+{get_cases}
+        default: return 0;
+    }}
+}}
+
+// Rising edge: registers update from the values present before the edge
+void sim_rise(Sim *s) {{
+    s->top->{clk} = 1;
+    step(s);
+}}
+
+// Settle the inputs written after the edge, then falling edge
+void sim_fall(Sim *s) {{
+    s->top->eval();
+    s->top->{clk} = 0;
+    step(s);
+}}
+
+void sim_free(Sim *s) {{
+    s->top->final();
+#if TRACE
+    if (s->vcd) {{
+        s->vcd->close();
+        delete s->vcd;
+    }}
+#endif
+    delete s->top;
+    delete s->ctx;
+    delete s;
+}}
+
+}}
+"""
+
+
+def _verilator_version():
+    return subprocess.run(["verilator", "--version"], check=True, capture_output=True,
+                          text=True).stdout.strip()
+
+
+def build_verilator(tb, ios, sources=(), name="tb_top", build_dir=None, trace=False, params=None):
+    """Convert `tb` to Verilog and build it with Verilator into a shared library.
+
+    Returns (library path, port signals, [(port name, is_input)]). The port
+    signals are `ios` in creation order followed by the sys clock and reset
+    added by convert().
+
+    Models are cached in `build_dir` under a content key:
+      params given : key = design_key(params) (repo sources + HDL sources +
+                     tool versions + params); a hit skips convert() as well
+      params None  : key = hash of the converted Verilog; a hit only skips
+                     the Verilator / C++ compile
+    `params` must identify everything that changes the design (TestBench
+    class, constructor arguments, ...).
+    """
+    build_dir = os.path.abspath(build_dir or VERILATOR_BUILD_DIR)
+    ios       = _ports(ios)
+    extra     = (name, trace, [os.path.relpath(os.path.abspath(s), REPO_ROOT) for s in sources],
+                 len(ios), _verilator_version())
+
+    conv = None
+    if params is not None:
+        key = design_key((params, extra), sources)
+    else:
+        conv = verilog.convert(tb.get_fragment(), ios=set(ios), name=name)
+        key  = hashlib.sha256((str(conv) + repr(extra)).encode()).hexdigest()[:16]
+
+    # One directory (and library file name) per design: dlopen() would hand
+    # back an already loaded library of the same path even after a rebuild
+    model_dir = os.path.join(build_dir, f"{name}_{key}")
+    lib       = os.path.join(model_dir, f"lib{name}_{key}.so")
+    port_file = os.path.join(model_dir, "ports.json")
+    if os.path.exists(lib) and os.path.exists(port_file):
+        with open(port_file) as fh:
+            ports = [tuple(p) for p in json.load(fh)]
+        # Clock and reset only exist in the converted design; generators never touch them
+        return lib, ios, ports
+
+    f       = tb.get_fragment()
+    targets = list_targets(f) | list_special_ios(f, False, True, True)
+    if conv is None:
+        conv = verilog.convert(f, ios=set(ios), name=name)
+    ns      = conv.ns
+    cd_sys  = ns.clock_domains["sys"]
+
+    port_sigs = ios + [cd_sys.clk, cd_sys.rst]
+    ports     = []
+    for s in port_sigs:
+        if len(s) > 64:
+            raise ValueError(f"Port '{ns.get_name(s)}' is {len(s)} bits wide; run_verilator supports up to 64")
+        ports.append((ns.get_name(s), s not in targets))
+
+    # Build next to the cache, then move into place: parallel test runners
+    # building the same model never see a half-written directory
+    os.makedirs(build_dir, exist_ok=True)
+    work = tempfile.mkdtemp(prefix=f".{name}_", dir=build_dir)
+    try:
+        top_v = os.path.join(work, f"{name}.v")
+        conv.write(top_v)
+        harness = os.path.join(work, f"{name}_harness.cpp")
+        with open(harness, "w") as fh:
+            fh.write(_harness(name, ports, ns.get_name(cd_sys.clk), trace))
+
+        obj_dir = os.path.join(work, "obj_dir")
+        cmd = ["verilator", "--cc", "--build", "-j", "0", "-O3",
+               "--top-module", name, "--Mdir", obj_dir,
+               "-Wno-fatal", "-Wno-lint", "-Wno-style",
+               "-CFLAGS", "-fPIC -O2"]
+        if trace:
+            cmd.append("--trace")
+        cmd += [top_v] + [os.path.abspath(src) for src in sources]
+        subprocess.run(cmd, check=True, cwd=work)
+
+        root = subprocess.run(["verilator", "--getenv", "VERILATOR_ROOT"],
+                              check=True, capture_output=True, text=True).stdout.strip()
+        subprocess.run(["g++", "-shared", "-fPIC", "-O2",
+                        "-I", os.path.join(root, "include"),
+                        "-I", os.path.join(root, "include", "vltstd"),
+                        "-I", obj_dir,
+                        harness,
+                        os.path.join(obj_dir, f"V{name}__ALL.a"),
+                        os.path.join(obj_dir, "libverilated.a"),
+                        "-lpthread", "-o", os.path.join(work, os.path.basename(lib))], check=True)
+        with open(os.path.join(work, "ports.json"), "w") as fh:
+            json.dump(ports, fh)
+        try:
+            os.rename(work, model_dir)
+        except OSError:
+            pass                                # Another process finished the same model first
+    finally:
+        if os.path.isdir(work):
+            shutil.rmtree(work)
+
+    return lib, port_sigs, ports
+
+
+# Create:
+#+----------------------------------------------+
+#|   VerilatorSimulator                         |
+#|     - loads the built library (ctypes)       |
+#|     - runs generators once per sys cycle     |
+#|     - yield sig / sig.eq(v) → sim_get/set    |
+#+----------------------------------------------+
+class VerilatorSimulator:
+    """Drive a Verilator-built TestBench from Migen-style generators."""
+
+    def __init__(self, lib_path, port_sigs, ports, vcd_name=None):
+        self.lib   = ctypes.CDLL(lib_path)
+        self.ports = ports                                          # [(name, is_input)]
+        self.index = {s.duid: i for i, s in enumerate(port_sigs)}
+        lib = self.lib
+        lib.sim_new.restype   = ctypes.c_void_p
+        lib.sim_new.argtypes  = [ctypes.c_char_p]
+        lib.sim_set.argtypes  = [ctypes.c_void_p, ctypes.c_int, ctypes.c_uint64]
+        lib.sim_get.restype   = ctypes.c_uint64
+        lib.sim_get.argtypes  = [ctypes.c_void_p, ctypes.c_int]
+        for fn in (lib.sim_rise, lib.sim_fall, lib.sim_free):
+            fn.argtypes = [ctypes.c_void_p]
+        self.handle = lib.sim_new((vcd_name or "").encode())
+        self.cycles = 0
+
+    def close(self):
+        if self.handle:
+            self.lib.sim_free(self.handle)
+            self.handle = None
+
+    # Signal access -------------------------------------------------------------
+
+    def _port(self, signal):
+        try:
+            return self.index[signal.duid]
+        except KeyError:
+            raise KeyError(f"Signal '{signal.backtrace[-1][0]}' is not a port; add it to ios") from None
+
+    def _read(self, expr):
+        if isinstance(expr, Signal):
+            value = self.lib.sim_get(self.handle, self._port(expr)) & ((1 << len(expr)) - 1)
+            if expr.signed and value & (1 << (len(expr) - 1)):
+                value -= 1 << len(expr)
+            return value
+        if isinstance(expr, _Slice) and isinstance(expr.value, Signal):
+            value = self.lib.sim_get(self.handle, self._port(expr.value))
+            return (value >> expr.start) & ((1 << (expr.stop - expr.start)) - 1)
+        if isinstance(expr, Constant):
+            return expr.value
+        raise TypeError(f"run_verilator cannot read {type(expr).__name__} expressions")
+
+    def _write(self, stmt, pending):
+        value = stmt.r.value if isinstance(stmt.r, Constant) else stmt.r
+        if not isinstance(value, int):
+            raise TypeError("run_verilator only assigns constants to ports")
+        if isinstance(stmt.l, Signal):
+            port, mask, shift = self._port(stmt.l), (1 << len(stmt.l)) - 1, 0
+        elif isinstance(stmt.l, _Slice) and isinstance(stmt.l.value, Signal):
+            port  = self._port(stmt.l.value)
+            mask  = (1 << (stmt.l.stop - stmt.l.start)) - 1
+            shift = stmt.l.start
+        else:
+            raise TypeError(f"run_verilator cannot assign to {type(stmt.l).__name__}")
+        if not self.ports[port][1]:
+            raise ValueError(f"Port '{self.ports[port][0]}' is driven by the design")
+        old = pending.get(port, self.lib.sim_get(self.handle, port))
+        pending[port] = (old & ~(mask << shift)) | ((value & mask) << shift)
+
+    def _exec(self, request, pending):
+        if isinstance(request, _Assign):
+            self._write(request, pending)
+            return None
+        if isinstance(request, (list, tuple)):
+            return [self._exec(r, pending) for r in request]
+        return self._read(request)
+
+    # Main loop -----------------------------------------------------------------
+
+    def run(self, generators):
+        if not isinstance(generators, (list, tuple)):
+            generators = [generators]
+        generators = list(generators)
+        passive    = set()
+        while generators and set(generators) - passive:
+            pending   = {}
+            exhausted = []
+            for generator in generators:
+                reply = None
+                while True:
+                    try:
+                        request = generator.send(reply)
+                    except StopIteration:
+                        exhausted.append(generator)
+                        break
+                    if request is None:
+                        break                   # Next cycle
+                    if isinstance(request, str):
+                        if request == "passive":
+                            passive.add(generator)
+                        elif request == "active":
+                            passive.discard(generator)
+                        else:
+                            raise ValueError(f"Unknown simulator command: '{request}'")
+                        reply = None
+                    else:
+                        reply = self._exec(request, pending)
+            for generator in exhausted:
+                generators.remove(generator)
+            self.lib.sim_rise(self.handle)
+            for port, value in pending.items():
+                self.lib.sim_set(self.handle, port, value)
+            self.lib.sim_fall(self.handle)
+            self.cycles += 1
+
+
+def run_verilator(tb, generators, ios, sources=(), vcd_name=None, name="tb_top", build_dir=None,
+                  params=None):
+    """Verilator counterpart of migen's run_simulation().
+
+    ios     : signals the generators read or write (e.g. bus.flatten())
+    sources : Verilog files of the Instance() black boxes in `tb`
+    params  : design parameters; lets a cached model skip convert() (see build_verilator())
+    Returns the number of simulated sys clock cycles.
+    """
+    lib, port_sigs, ports = build_verilator(tb, ios, sources, name=name, build_dir=build_dir,
+                                            trace=vcd_name is not None, params=params)
+    sim = VerilatorSimulator(lib, port_sigs, ports, vcd_name)
+    try:
+        sim.run(generators)
+    finally:
+        sim.close()
+    return sim.cycles
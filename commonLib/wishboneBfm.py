@@ -0,0 +1,241 @@
+"""
+Wishbone bus-functional model (BFM) for Migen testbenches.
+
+Replaces the wb_write / wb_read helpers that used to be copy-pasted in every
+testbench. All methods are generators, used from a run_simulation() process:
+
+    bfm = WishboneBFM(dut.master)
+    res = yield from bfm.write(0x40000400, 0x1)       # res.ack, res.err, res.cycles
+    res = yield from bfm.read(0x40000400)             # res.value
+    res = yield from bfm.burst_write(0x40010000, data, incrementing=False)
+
+Transaction styles:
+
+  classic      write() / read(): CYC dropped and one idle cycle after each
+               access (what the original helpers did, ~1 access per 4 cycles
+               through Wishbone2CSR).
+  back-to-back transfer(): CYC held, next request presented right after ACK.
+  burst        burst_write() / burst_read(): back-to-back with CTI/BTE
+               (incrementing or constant address, CTI=END on the last beat).
+  pipelined    pipelined=True on the burst calls: Wishbone B4 pipelined, one
+               request per cycle while STALL is low, ACKs counted in order.
+               Only for slaves that ACK once per accepted STB (e.g. a
+               zero-wait WishboneCSRBank); classic slaves need the above.
+
+Addresses are byte addresses; the BFM converts them to word addresses.
+Every access is recorded in `bfm.stats` (cycles from STB to ACK/ERR).
+"""
+
+from collections import Counter, namedtuple
+
+from litex.soc.interconnect.wishbone import (
+    CTI_BURST_NONE, CTI_BURST_CONSTANT, CTI_BURST_INCREMENTING, CTI_BURST_END,
+)
+
+# value : read data (None for writes)
+# ack / err : how the access ended (both False → timed out)
+# cycles : clock cycles from STB asserted to ACK/ERR seen
+WishboneResult = namedtuple("WishboneResult", "value ack err cycles")
+
+
+class LatencyStats:
+    """Per-transaction latency record of a WishboneBFM."""
+
+    def __init__(self):
+        self.samples = []   # (byte_addr, we, WishboneResult)
+        self.cycles  = 0    # Simulation cycles spent inside the BFM
+
+    def record(self, byte_addr, we, result):
+        self.samples.append((byte_addr, we, result))
+
+    def clear(self):
+        self.samples = []
+        self.cycles  = 0
+
+    def histogram(self):
+        """{latency in cycles: number of accesses}"""
+        return dict(sorted(Counter(r.cycles for _, _, r in self.samples).items()))
+
+    def per_address(self):
+        """{byte address: number of accesses}"""
+        return dict(sorted(Counter(a for a, _, _ in self.samples).items()))
+
+    def summary(self):
+        lat = [r.cycles for _, _, r in self.samples]
+        n   = len(lat)
+        return {
+            "accesses":  n,
+            "errors":    sum(r.err for _, _, r in self.samples),
+            "timeouts":  sum(not (r.ack or r.err) for _, _, r in self.samples),
+            "min":       min(lat) if n else 0,
+            "max":       max(lat) if n else 0,
+            "mean":      sum(lat) / n if n else 0.0,
+            "cycles":    self.cycles,
+            "per_cycle": n / self.cycles if self.cycles else 0.0,
+        }
+
+    def report(self, title="Wishbone BFM"):
+        s = self.summary()
+        print(f"  {title}: {s['accesses']} accesses in {s['cycles']} cycles "
+              f"({s['per_cycle']:.2f} accesses/cycle), latency min/mean/max = "
+              f"{s['min']}/{s['mean']:.2f}/{s['max']} cycles, "
+              f"{s['errors']} errors, {s['timeouts']} timeouts")
+
+
+class WishboneBFM:
+    """Wishbone master driving `bus` (a wishbone.Interface) from a simulation generator.
+
+    timeout : cycles to wait for ACK/ERR before giving up on an access.
+    """
+
+    def __init__(self, bus, timeout=10):
+        self.bus     = bus
+        self.timeout = timeout
+        self.stats   = LatencyStats()
+
+    # Low level ---------------------------------------------------------------
+
+    def _tick(self):
+        yield
+        self.stats.cycles += 1
+
+    def _present(self, byte_addr, we, value=0, sel=0xF, cti=CTI_BURST_NONE, bte=0):
+        bus = self.bus
+        yield bus.adr.eq(byte_addr >> 2)
+        yield bus.we.eq(we)
+        yield bus.dat_w.eq(value)
+        yield bus.sel.eq(sel)
+        yield bus.cti.eq(cti)
+        yield bus.bte.eq(bte)
+        yield bus.cyc.eq(1)
+        yield bus.stb.eq(1)
+
+    def _wait(self, byte_addr, we):
+        """Wait for the presented request to end; returns a WishboneResult."""
+        ack = err = False
+        cycles = 0
+        while cycles < self.timeout:
+            yield from self._tick()
+            cycles += 1
+            ack = bool((yield self.bus.ack))
+            err = bool((yield self.bus.err))
+            if ack or err:
+                break
+        value = None if we else (yield self.bus.dat_r)
+        result = WishboneResult(value, ack, err, cycles)
+        self.stats.record(byte_addr, we, result)
+        return result
+
+    def idle(self, cycles=1):
+        """Drop CYC/STB and wait `cycles` clock cycles."""
+        bus = self.bus
+        yield bus.cyc.eq(0)
+        yield bus.stb.eq(0)
+        yield bus.we.eq(0)
+        yield bus.cti.eq(CTI_BURST_NONE)
+        for _ in range(cycles):
+            yield from self._tick()
+
+    # Classic single accesses -------------------------------------------------
+
+    def write(self, byte_addr, value, sel=0xF):
+        """Single write, followed by one idle cycle."""
+        yield from self._present(byte_addr, 1, value, sel)
+        result = yield from self._wait(byte_addr, 1)
+        yield from self.idle()
+        return result
+
+    def read(self, byte_addr, sel=0xF):
+        """Single read, followed by one idle cycle."""
+        yield from self._present(byte_addr, 0, sel=sel)
+        result = yield from self._wait(byte_addr, 0)
+        yield from self.idle()
+        return result
+
+    # Back-to-back and burst ----------------------------------------------------
+
+    def transfer(self, ops):
+        """Back-to-back accesses in one bus cycle (CYC held between them).
+
+        ops : list of ("w", byte_addr, value) / ("r", byte_addr) tuples.
+        Returns the list of WishboneResults. Stops early on ERR or timeout.
+        """
+        results = []
+        for op in ops:
+            we = op[0] == "w"
+            yield from self._present(op[1], we, op[2] if we else 0)
+            result = yield from self._wait(op[1], we)
+            results.append(result)
+            if not result.ack:
+                break
+        yield from self.idle()
+        return results
+
+    def _burst(self, byte_addr, values, we, incrementing, pipelined):
+        n = len(values)
+        cti = CTI_BURST_INCREMENTING if incrementing else CTI_BURST_CONSTANT
+        reqs = [(byte_addr + 4*i if incrementing else byte_addr,
+                 values[i],
+                 CTI_BURST_END if i == n - 1 else cti) for i in range(n)]
+        if pipelined:
+            results = yield from self._pipelined(reqs, we)
+            return results
+        results = []
+        for adr, value, beat_cti in reqs:
+            yield from self._present(adr, we, value, cti=beat_cti)
+            result = yield from self._wait(adr, we)
+            results.append(result)
+            if not result.ack:
+                break
+        yield from self.idle()
+        return results
+
+    def burst_write(self, byte_addr, values, incrementing=True, pipelined=False):
+        """Write `values` as one CTI burst (constant address when incrementing=False)."""
+        results = yield from self._burst(byte_addr, list(values), 1, incrementing, pipelined)
+        return results
+
+    def burst_read(self, byte_addr, n, incrementing=True, pipelined=False):
+        """Read `n` words as one CTI burst; returns the WishboneResults."""
+        results = yield from self._burst(byte_addr, [0]*n, 0, incrementing, pipelined)
+        return results
+
+    def _pipelined(self, reqs, we):
+        """Wishbone B4 pipelined: new request every cycle STALL is low, ACKs in order."""
+        bus     = self.bus
+        stall   = getattr(bus, "stall", None)
+        n       = len(reqs)
+        start   = [0] * n
+        results = []
+        cycle   = 0
+        cur     = 0
+        yield from self._present(reqs[0][0], we, reqs[0][1], cti=reqs[0][2])
+        while len(results) < n:
+            yield from self._tick()
+            cycle += 1
+            stalled = bool((yield stall)) if stall is not None else False
+            ack = bool((yield bus.ack))
+            err = bool((yield bus.err))
+            if cur < n and not stalled:
+                start[cur] = cycle          # Request `cur` accepted at the end of this cycle
+            if ack or err:
+                i = len(results)
+                result = WishboneResult(None if we else (yield bus.dat_r), ack, err, cycle - start[i] + 1)
+                self.stats.record(reqs[i][0], we, result)
+                results.append(result)
+                if err:
+                    break
+            elif cycle - start[len(results)] >= self.timeout:
+                i = len(results)
+                result = WishboneResult(None, False, False, self.timeout)
+                self.stats.record(reqs[i][0], we, result)
+                results.append(result)
+                break
+            if cur < n and not stalled:
+                cur += 1
+                if cur < n:
+                    yield from self._present(reqs[cur][0], we, reqs[cur][1], cti=reqs[cur][2])
+                else:
+                    yield bus.stb.eq(0)
+        yield from self.idle()
+        return results
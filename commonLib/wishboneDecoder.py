@@ -0,0 +1,208 @@
+"""
+Table-driven Wishbone address decoder with bus-error response, plus a
+bridge-side timeout watchdog.
+
+WishboneLed (02wishBoneMasterAndPerrial) and Wishbone2CSR both ACK every
+address they see, so a misdirected host access silently "succeeds".
+These two modules make such accesses fail fast instead:
+
+  WishboneErrDecoder : routes each access to the slave owning the address
+                       (region table) and answers unmapped addresses with ERR
+                       one cycle after CYC & STB.
+  WishboneWatchdog   : sits behind a master that has no ERR input
+                       (UARTWishboneBridge). It ends every cycle that gets ERR,
+                       or no ACK within `cycles` clocks, with an ACK and
+                       BUS_ERROR_DATA on the read data bus.
+
+     UARTWishboneBridge
+            |
+            v
+     WishboneWatchdog     err / timeout -> ack + BUS_ERROR_DATA
+            |
+            v
+     WishboneErrDecoder   unmapped address -> err
+       |        |
+       v        v
+     slave0   slave1 ...
+"""
+
+from functools import reduce
+from operator import or_
+
+from migen import *
+from migen.genlib.record import DIR_M_TO_S
+from litex.soc.interconnect import wishbone
+
+# Read data returned to the bridge for accesses that ended in ERR or timed out
+BUS_ERROR_DATA = 0xDEADC0DE
+
+# Default watchdog limit — far above the few cycles any peripheral here needs
+BUS_TIMEOUT_CYCLES = 1024
+
+
+def slot_regions(base, paging, slot_map):
+    """Build (name, byte_base, byte_size) entries from a LiteX-style slot map.
+
+    E.g. slot_regions(0x40000000, 0x400, Top.csr_map) gives one region of
+    `paging` bytes per peripheral slot.
+    """
+    return [(name, base + slot * paging, paging)
+            for name, slot in sorted(slot_map.items(), key=lambda kv: kv[1])]
+
+
+# Create:
+#+----------------------------------------------+
+#|   WishboneErrDecoder                         |
+#|     - region table → one compare per region  |
+#|     - mapped   : forwarded to its slave      |
+#|     - unmapped : ERR after one cycle         |
+#+----------------------------------------------+
+class WishboneErrDecoder(Module):
+    """Wishbone address decoder that answers unmapped accesses with ERR.
+
+    regions : list of (name, byte_base, byte_size, slave) tuples.
+              byte_size must be a power of two (>= 4) and byte_base aligned to
+              it, so every region is decoded by a single compare on the upper
+              word-address bits. Several regions may share one slave bus.
+
+    Mapped accesses are passed through combinatorially (no added latency).
+    Unmapped accesses see `err` asserted for one cycle, one cycle after
+    CYC & STB, and `error` pulses so the event can be counted.
+    """
+
+    def __init__(self, master, regions):
+        self.error = Signal()   # One-cycle pulse per unmapped access
+
+        if not regions:
+            raise ValueError("WishboneErrDecoder needs at least one region")
+
+        # Validate the table and convert byte addresses to word addresses
+        decode = []
+        for name, base, size, slave in regions:
+            if size < 4 or size & (size - 1):
+                raise ValueError(f"Region '{name}': size 0x{size:x} is not a power of two >= 4")
+            if base % size:
+                raise ValueError(f"Region '{name}': base 0x{base:08x} is not aligned to size 0x{size:x}")
+            decode.append((name, base >> 2, size >> 2, slave))
+
+        spans = sorted((word_base, word_base + word_size, name) for name, word_base, word_size, _ in decode)
+        for (_, end0, name0), (base1, _, name1) in zip(spans, spans[1:]):
+            if base1 < end0:
+                raise ValueError(f"Regions '{name0}' and '{name1}' overlap")
+
+        # One hit signal per region, ORed into one select per (unique) slave
+        slaves  = []
+        selects = []
+        for name, word_base, word_size, slave in decode:
+            shift = log2_int(word_size)
+            hit = Signal(name=f"{name}_hit")
+            self.comb += hit.eq(master.adr[shift:] == (word_base >> shift))
+            for i, s in enumerate(slaves):
+                if s is slave:
+                    selects[i].append(hit)
+                    break
+            else:
+                slaves.append(slave)
+                selects.append([hit])
+
+        sel_slave = Signal(len(slaves))
+        self.comb += [sel_slave[i].eq(reduce(or_, hits)) for i, hits in enumerate(selects)]
+
+        # Master → slaves: everything except cyc is broadcast, cyc is gated by the select
+        for i, slave in enumerate(slaves):
+            for name, _, direction in master.layout:
+                if direction == DIR_M_TO_S and name != "cyc":
+                    self.comb += getattr(slave, name).eq(getattr(master, name))
+            self.comb += slave.cyc.eq(master.cyc & sel_slave[i])
+
+        # Unmapped access: answer with err for one cycle (registered, like a slave ack)
+        err_unmapped = Signal()
+        self.sync += err_unmapped.eq(master.cyc & master.stb & (sel_slave == 0) & ~err_unmapped)
+
+        # Slaves → master: OR acks/errs, one-hot mux of the read data
+        self.comb += [
+            master.ack.eq(reduce(or_, [s.ack for s in slaves])),
+            master.err.eq(reduce(or_, [s.err for s in slaves]) | err_unmapped),
+            master.dat_r.eq(reduce(or_, [Replicate(sel_slave[i], len(master.dat_r)) & s.dat_r
+                                         for i, s in enumerate(slaves)])),
+            self.error.eq(err_unmapped),
+        ]
+
+
+# Create:
+#+----------------------------------------------+
+#|   WishboneWatchdog (bridge side)             |
+#|     - slave err        → ack + error data    |
+#|     - no ack in N clks → ack + error data    |
+#|     - counts terminated accesses             |
+#+----------------------------------------------+
+class WishboneWatchdog(Module):
+    """Terminate bus cycles that end in ERR or are never acknowledged.
+
+    UARTWishboneBridge only waits for `ack`: an ERR response would stall it
+    until its 100 ms receive timeout. The watchdog converts ERR, or a missing
+    ACK after `cycles` clocks, into an immediate ACK carrying `error_data`,
+    so the host gets an answer straight away and can recognise the failure.
+
+    Set err_as_ack=False for masters that handle `err` themselves; the
+    access is then terminated with ERR instead.
+    """
+
+    def __init__(self, master, slave, cycles=BUS_TIMEOUT_CYCLES, error_data=BUS_ERROR_DATA, err_as_ack=True):
+        self.error       = Signal()     # One-cycle pulse per terminated access
+        self.error_count = Signal(32)   # Total terminated accesses since reset
+
+        count   = Signal(max=cycles + 1)
+        expired = Signal()
+        pending = Signal()
+
+        self.comb += [
+            master.connect(slave, omit={"ack", "err", "dat_r"}),
+            pending.eq(master.cyc & master.stb),
+            expired.eq(count == cycles),
+            self.error.eq(pending & (slave.err | (expired & ~slave.ack))),
+            If(self.error,
+                master.ack.eq(int(err_as_ack)),
+                master.err.eq(int(not err_as_ack)),
+                master.dat_r.eq(error_data),
+            ).Else(
+                master.ack.eq(slave.ack),
+                master.dat_r.eq(slave.dat_r),
+            ),
+        ]
+
+        self.sync += [
+            If(pending & ~slave.ack & ~self.error,
+                count.eq(count + 1),
+            ).Else(
+                count.eq(0),
+            ),
+            If(self.error,
+                self.error_count.eq(self.error_count + 1),
+            ),
+        ]
+
+
+def add_guarded_master(soc, name, master, cycles=BUS_TIMEOUT_CYCLES):
+    """Add `master` to a LiteX SoC bus behind a WishboneWatchdog + WishboneErrDecoder.
+
+    The decoder table holds the regions already declared on `soc.bus`, plus
+    the CSR window (which LiteX only adds to soc.bus in finalize()), so call
+    this after all other slaves have been added. Accesses outside those
+    regions are answered at once with BUS_ERROR_DATA instead of being ACKed
+    by whichever slave the interconnect falls back to.
+    """
+    guarded = wishbone.Interface.like(master)
+    soc_bus = wishbone.Interface.like(master)
+
+    regions = {region_name: (region.origin, region.size_pow2)
+               for region_name, region in soc.bus.regions.items()}
+    regions.setdefault("csr", (soc.mem_map["csr"], 2**(soc.csr.address_width + 2)))
+
+    watchdog = WishboneWatchdog(master, guarded, cycles=cycles)
+    decoder  = WishboneErrDecoder(guarded, [(region_name, origin, size, soc_bus)
+                                            for region_name, (origin, size) in regions.items()])
+    setattr(soc.submodules, f"{name}_watchdog", watchdog)
+    setattr(soc.submodules, f"{name}_decoder",  decoder)
+    soc.bus.add_master(name=name, master=soc_bus)
+    return watchdog, decoder
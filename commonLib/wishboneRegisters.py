@@ -0,0 +1,118 @@
+"""
+Wishbone-native register file for small AutoCSR peripherals.
+
+In the SoCMini tops every CSR access travels
+
+    Wishbone -> Wishbone2CSR (FSM: IDLE -> WRITE-READ -> ACK) -> CSR bus -> CSRBank
+
+which costs wait states per access and a 1 KB CSR slot per peripheral.
+WishboneCSRBank maps the same CSR / CSRStorage / CSRStatus objects straight
+onto a Wishbone slave, one 32-bit word per register:
+
+    registered=False : zero-wait-state, ACK in the same cycle as CYC & STB
+    registered=True  : one wait state, ACK and read data come from flip-flops
+                       (breaks the combinatorial stb -> ack path for timing)
+
+The peripheral itself is unchanged: it still sees c.r / c.re / c.w / c.we
+exactly as it would behind a CSRBank.
+"""
+
+from migen import *
+from litex.soc.interconnect import wishbone
+from litex.soc.interconnect.csr import GenericBank
+
+
+def register_file_size(n_words):
+    """Smallest power-of-two byte size holding `n_words` 32-bit registers."""
+    return 4 * 2**log2_int(max(n_words, 1), need_pow2=False)
+
+
+# Create:
+#+----------------------------------------------+
+#|   WishboneCSRBank (Wishbone slave)           |
+#|     - word i  -> i-th simple CSR             |
+#|     - write   -> c.r = dat_w, c.re pulse     |
+#|     - read    -> dat_r = c.w,  c.we pulse    |
+#|     - ack     -> same cycle (or +1 cycle)    |
+#+----------------------------------------------+
+class WishboneCSRBank(GenericBank):
+    """Expose the CSRs of `periph` (an AutoCSR module) directly on `self.bus`.
+
+    The bank only decodes the low word-address bits; the upper bits are left
+    to the interconnect (SoC bus or WishboneErrDecoder) that selects it.
+    `periph` becomes a submodule of the bank, so do not also add it to the
+    SoC — its CSRs would otherwise be claimed a second time by the CSR bus.
+    """
+
+    def __init__(self, periph, bus=None, registered=False, ordering="big"):
+        if bus is None:
+            bus = wishbone.Interface(data_width=32, adr_width=30)
+        self.bus = bus
+        self.submodules.periph = periph
+        self.csrs = periph.get_csrs()       # As declared (multi-word CSRs not yet split)
+
+        GenericBank.__init__(self,
+            description = self.csrs,
+            busword     = len(bus.dat_w),
+            ordering    = ordering,
+        )
+
+        self.size = register_file_size(len(self.simple_csrs))   # Region size in bytes
+
+        # # #
+
+        offset_bits = log2_int(self.size // 4)
+        offset      = bus.adr[:offset_bits] if offset_bits else Constant(0, 1)
+        access      = Signal()
+        ack         = Signal()
+
+        self.comb += access.eq(bus.cyc & bus.stb & (bus.sel != 0) & ~ack)
+
+        # Write / read strobes towards the peripheral (same convention as CSRBank)
+        for i, c in enumerate(self.simple_csrs):
+            self.comb += [
+                c.r.eq(bus.dat_w[:c.size]),
+                If(access & (offset == i),
+                    c.re.eq(bus.we),
+                    c.we.eq(~bus.we),
+                ),
+            ]
+
+        read_cases = {i: bus.dat_r.eq(c.w) for i, c in enumerate(self.simple_csrs)}
+        read_cases["default"] = bus.dat_r.eq(0)
+
+        if registered:
+            # ACK one cycle after the request, read data captured with it
+            self.sync += [
+                ack.eq(bus.cyc & bus.stb & ~ack),
+                If(access, Case(offset, read_cases)),
+            ]
+            self.comb += bus.ack.eq(ack)
+        else:
+            # Zero wait states: ACK and read data combinatorially from the request
+            self.comb += [
+                bus.ack.eq(bus.cyc & bus.stb),
+                Case(offset, read_cases),
+            ]
+
+
+def add_wishbone_csr_peripheral(soc, name, periph, origin, registered=False):
+    """Map `periph` on the SoC bus as a WishboneCSRBank at byte address `origin`.
+
+    Replaces ``soc.submodules.<name> = periph`` for peripherals that should
+    bypass the CSR bus. Call before add_guarded_master() so the new region
+    is part of the bridge decoder table.
+
+    The registers are also listed as a CSR region, so the Builder exports
+    them (csr.csv / csr.json / csr.svd / csr.h) like CSR-bus registers:
+    `<name>_<csr>` at `origin` + 4 × word index.
+    """
+    # litex.soc.integration.soc pulls in every CPU wrapper; only SoC builds need it
+    from litex.soc.integration.soc import SoCCSRRegion, SoCRegion
+
+    bank = WishboneCSRBank(periph, registered=registered)
+    setattr(soc.submodules, name, bank)
+    soc.bus.add_slave(name=name, slave=bank.bus,
+                      region=SoCRegion(origin=origin, size=bank.size, cached=False))
+    soc.csr.add_region(name, SoCCSRRegion(origin=origin, busword=len(bank.bus.dat_w), obj=bank.csrs))
+    return bank
@@ -101,6 +101,17 @@ class CologneChipToolchain(GenericToolchain):
         tools.write_to_file(f"{self._build_name}.ccf", "\n".join(ccf))
         return (f"{self._build_name}.ccf", "CCF")
 
+    # Timing Constraints (in pre_pack file) --------------------------------------------------------
+
+    def build_timing_constraints(self, vns):
+        # The .ccf has no clock constraints: nextpnr takes one ctx.addClock() per clock
+        # (MHz) from a pre-pack script, so each clock domain gets its own target
+        r = ""
+        for clk, [period, _] in self.clocks.items():
+            r += """ctx.addClock("{}", {})\n""".format(vns.get_name(clk), 1e3/period)
+        tools.write_to_file(self._build_name + "_pre_pack.py", r)
+        return (self._build_name + "_pre_pack.py", "PY")
+
     # Project (.ys) --------------------------------------------------------------------------------
 
     def build_project(self):
@@ -148,16 +159,22 @@ class CologneChipToolchain(GenericToolchain):
             if _check_cfg_io_used(self.named_sc):
                 cfg_io_opts = " --vopt ccf_cfg_io=yes"
 
+            # timing targets: one per constrained clock (sys, PLL outputs)
+            clock_opts = ""
+            if self.clocks:
+                clock_opts = " --pre-pack {}_pre_pack.py".format(self._build_name)
+
             # nextpnr-himbaechel call
             script_contents += (
                 "nextpnr-himbaechel --device {device} "
                 "--json {build_name}_synth.json "
                 "--vopt ccf={build_name}.ccf "
                 "--vopt out={build_name}_pnr.config"
-                "{cfg_io_opts}\n"
+                "{clock_opts}{cfg_io_opts}\n"
             ).format(
                 device      = device,
                 build_name  = self._build_name,
+                clock_opts  = clock_opts,
                 cfg_io_opts = cfg_io_opts,
             )
             script_contents += fail_stmt
@@ -210,9 +227,6 @@ class CologneChipToolchain(GenericToolchain):
             raise OSError("Error occured during toolchain script execution.")
 
 
-    def add_period_constraint(self, platform, clk, period):
-        pass
-
 def colognechip_args(parser):
     # TODO: yosys args
     # TODO: nextpnr / p_r args